@@ -5,7 +5,7 @@ Admin para Audit Log
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import AuditLog, AuditLogSummary, UserSession
+from .models import AuditLog, AuditLogArchive, AuditLogSummary, UserSession
 
 
 @admin.register(AuditLog)
@@ -136,6 +136,20 @@ class AuditLogSummaryAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(AuditLogArchive)
+class AuditLogArchiveAdmin(admin.ModelAdmin):
+    """Admin para arquivos gerados pela retenção de Audit Log."""
+
+    list_display = ["month", "row_count", "size_bytes", "file", "created_at"]
+    ordering = ["-month"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(UserSession)
 class UserSessionAdmin(admin.ModelAdmin):
     """Admin para sessões de usuário."""
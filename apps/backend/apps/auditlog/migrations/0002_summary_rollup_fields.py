@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-19 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auditlog", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="auditlogsummary",
+            name="severity_counts",
+            field=models.JSONField(
+                blank=True, default=dict, verbose_name="Contagem por Severidade"
+            ),
+        ),
+        migrations.AddField(
+            model_name="auditlogsummary",
+            name="user_counts",
+            field=models.JSONField(
+                blank=True, default=dict, verbose_name="Ações por Usuário"
+            ),
+        ),
+        migrations.AddField(
+            model_name="auditlogsummary",
+            name="users_sketch",
+            field=models.BinaryField(
+                blank=True, default=bytes, verbose_name="Sketch de Usuários"
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.15 on 2026-10-19 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auditlog", "0002_summary_rollup_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditLogArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField(db_index=True, verbose_name="Mês")),
+                ("file", models.CharField(max_length=255, verbose_name="Arquivo")),
+                (
+                    "row_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Registros"),
+                ),
+                ("first_id", models.BigIntegerField(verbose_name="Primeiro ID")),
+                ("last_id", models.BigIntegerField(verbose_name="Último ID")),
+                (
+                    "size_bytes",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Tamanho (bytes)"
+                    ),
+                ),
+                ("sha256", models.CharField(max_length=64, verbose_name="SHA-256")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Criado em"),
+                ),
+            ],
+            options={
+                "verbose_name": "Arquivo de Auditoria",
+                "verbose_name_plural": "Arquivos de Auditoria",
+                "ordering": ["-month", "-last_id"],
+            },
+        ),
+    ]
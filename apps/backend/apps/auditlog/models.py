@@ -13,6 +13,41 @@ from django.utils import timezone
 class AuditLogManager(models.Manager):
     """Manager customizado para AuditLog."""
 
+    def _log_fields(
+        self,
+        action: str,
+        user=None,
+        tenant=None,
+        content_object=None,
+        description: str = "",
+        ip_address: str = None,
+        user_agent: str = None,
+        metadata: dict = None,
+        severity: str = "INFO",
+    ) -> dict:
+        """Campos do registro (IDs das FKs, sem instâncias de modelo)."""
+        fields = {
+            "timestamp": timezone.now(),
+            "action": action,
+            "user_id": getattr(user, "pk", None),
+            "tenant_id": getattr(tenant, "pk", None),
+            "description": description,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "metadata": metadata or {},
+            "severity": severity,
+        }
+
+        if content_object:
+            # get_for_model usa o cache de ContentType do processo
+            fields["content_type_id"] = ContentType.objects.get_for_model(
+                content_object
+            ).pk
+            fields["object_id"] = content_object.pk
+            fields["object_repr"] = str(content_object)[:200]
+
+        return fields
+
     def create_log(
         self,
         action: str,
@@ -26,7 +61,7 @@ class AuditLogManager(models.Manager):
         severity: str = "INFO",
     ):
         """
-        Cria um novo registro de audit log.
+        Cria um novo registro de audit log (INSERT síncrono).
 
         Args:
             action: Tipo da ação (ex: 'CREATE', 'UPDATE', 'DELETE', 'LOGIN')
@@ -40,24 +75,47 @@ class AuditLogManager(models.Manager):
             severity: Nível de severidade (INFO, WARNING, ERROR, CRITICAL)
         """
         log = self.model(
-            action=action,
-            user=user,
-            tenant=tenant,
-            description=description,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            metadata=metadata or {},
-            severity=severity,
+            **self._log_fields(
+                action,
+                user=user,
+                tenant=tenant,
+                content_object=content_object,
+                description=description,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                metadata=metadata,
+                severity=severity,
+            )
         )
-
-        if content_object:
-            log.content_type = ContentType.objects.get_for_model(content_object)
-            log.object_id = content_object.pk
-            log.object_repr = str(content_object)[:200]
-
         log.save()
         return log
 
+    def record(self, action: str, sync: bool = None, **kwargs):
+        """
+        Registra um evento pelo sink de auditoria (apps.auditlog.sink).
+
+        Ações de segurança (AUDIT_LOG_SYNC_ACTIONS) e severidade
+        ERROR/CRITICAL são gravadas na hora com create_log; as demais vão
+        para o buffer após o commit e são gravadas em lote.
+
+        Args:
+            action: Tipo da ação
+            sync: Força gravação síncrona (True) ou assíncrona (False)
+            **kwargs: Mesmos argumentos de create_log
+
+        Returns:
+            AuditLog criado (síncrono) ou None (assíncrono)
+        """
+        from .sink import get_audit_sink, is_sync_event
+
+        if sync is None:
+            sync = is_sync_event(action, kwargs.get("severity", "INFO"))
+        if sync:
+            return self.create_log(action, **kwargs)
+
+        get_audit_sink().emit(self._log_fields(action, **kwargs))
+        return None
+
     def for_tenant(self, tenant):
         """Retorna logs filtrados por tenant."""
         return self.filter(tenant=tenant)
@@ -220,6 +278,8 @@ class AuditLogSummary(models.Model):
     """
     Modelo para armazenar resumos agregados de audit logs.
     Útil para analytics e dashboards sem precisar agregar em tempo real.
+
+    Mantido por apps.auditlog.rollup (um registro por tenant, dia e ação).
     """
 
     date = models.DateField("Data", db_index=True)
@@ -234,6 +294,13 @@ class AuditLogSummary(models.Model):
     action = models.CharField("Ação", max_length=50, db_index=True)
     count = models.PositiveIntegerField("Contagem", default=0)
     unique_users = models.PositiveIntegerField("Usuários Únicos", default=0)
+    severity_counts = models.JSONField(
+        "Contagem por Severidade", default=dict, blank=True
+    )
+    # {user_id: contagem} dos usuários mais ativos do dia
+    user_counts = models.JSONField("Ações por Usuário", default=dict, blank=True)
+    # Registradores HyperLogLog dos usuários (somável entre dias e ações)
+    users_sketch = models.BinaryField("Sketch de Usuários", default=bytes, blank=True)
 
     class Meta:
         verbose_name = "Resumo de Auditoria"
@@ -248,6 +315,33 @@ class AuditLogSummary(models.Model):
         return f"{self.date} - {self.action}: {self.count}"
 
 
+class AuditLogArchive(models.Model):
+    """
+    Lote de audit logs antigos movido para um arquivo comprimido.
+    Gerado pela política de retenção (apps.auditlog.retention): cada mês
+    fora do período de retenção vira um arquivo JSON Lines + gzip e sai da
+    tabela principal.
+    """
+
+    month = models.DateField("Mês", db_index=True)
+    file = models.CharField("Arquivo", max_length=255)
+    row_count = models.PositiveIntegerField("Registros", default=0)
+    # Faixa de IDs arquivada (retomada sem duplicar após falha)
+    first_id = models.BigIntegerField("Primeiro ID")
+    last_id = models.BigIntegerField("Último ID")
+    size_bytes = models.PositiveBigIntegerField("Tamanho (bytes)", default=0)
+    sha256 = models.CharField("SHA-256", max_length=64)
+    created_at = models.DateTimeField("Criado em", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Arquivo de Auditoria"
+        verbose_name_plural = "Arquivos de Auditoria"
+        ordering = ["-month", "-last_id"]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} ({self.row_count} registros)"
+
+
 class UserSession(models.Model):
     """
     Rastreia sessões de usuário para análise de comportamento.
@@ -0,0 +1,211 @@
+"""
+Política de retenção do Audit Log
+Meses fora do período de retenção (AUDIT_LOG_RETENTION_MONTHS) são movidos
+da tabela principal para arquivos JSON Lines + gzip (um AuditLogArchive por
+lote), mantendo o tamanho da tabela e dos índices estável.
+
+- O arquivo é gravado em STORAGES["auditlog_archive"] (durável, fora do
+  disco do worker), relido e conferido (sha256) e registrado antes de remover
+  os logs; a remoção é em lotes de DELETE_BATCH_SIZE IDs
+- Retomada: logs de um mês com ID já coberto por um arquivo (falha durante
+  a remoção) são apenas removidos, sem novo arquivo
+- Analytics não depende dos logs arquivados: usa AuditLogSummary
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import tempfile
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import Storage, storages
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import AuditLog, AuditLogArchive
+from .rollup import start_of_day
+
+logger = logging.getLogger(__name__)
+
+RETENTION_LOCK_KEY = "auditlog:retention_lock"
+
+# Linhas lidas por vez do cursor ao gerar o arquivo
+ARCHIVE_CHUNK_SIZE = 2000
+DELETE_BATCH_SIZE = 5000
+
+ARCHIVE_FIELDS = [field.attname for field in AuditLog._meta.concrete_fields]
+
+
+class ArchiveVerificationError(Exception):
+    """Arquivo gravado não confere com o gerado (logs não são removidos)"""
+
+
+def get_archive_storage() -> Storage:
+    """Armazenamento dos arquivos (STORAGES["auditlog_archive"], não público)"""
+    return storages["auditlog_archive"]
+
+
+def add_months(month: date, months: int) -> date:
+    """Primeiro dia do mês deslocado em `months` meses"""
+    year, index = divmod(month.month - 1 + months, 12)
+    return date(month.year + year, index + 1, 1)
+
+
+def _month_logs(month: date):
+    return AuditLog.objects.filter(
+        timestamp__gte=start_of_day(month),
+        timestamp__lt=start_of_day(add_months(month, 1)),
+    )
+
+
+def _delete_logs(logs) -> int:
+    deleted = 0
+    while True:
+        ids = list(logs.order_by().values_list("id", flat=True)[:DELETE_BATCH_SIZE])
+        if not ids:
+            return deleted
+        AuditLog.objects.filter(pk__in=ids).delete()
+        deleted += len(ids)
+
+
+def _write_archive(logs, fileobj) -> Tuple[int, int]:
+    """Grava os logs (ordem de ID) como JSON Lines comprimido"""
+    count = 0
+    first_id = None
+    with gzip.GzipFile(fileobj=fileobj, mode="wb", mtime=0) as archive:
+        rows = logs.order_by("id").values(*ARCHIVE_FIELDS)
+        for row in rows.iterator(chunk_size=ARCHIVE_CHUNK_SIZE):
+            if first_id is None:
+                first_id = row["id"]
+            line = json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+            archive.write(line.encode() + b"\n")
+            count += 1
+    return count, first_id
+
+
+def _sha256(fileobj) -> str:
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(1024 * 1024), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def _verify_archive(storage: Storage, name: str, sha256: str) -> None:
+    """Relê o arquivo gravado e confere o sha256 antes de remover os logs"""
+    if not storage.exists(name):
+        raise ArchiveVerificationError(f"Arquivo {name} não encontrado após gravar")
+    with storage.open(name, "rb") as stored:
+        stored_sha256 = _sha256(stored)
+    if stored_sha256 != sha256:
+        raise ArchiveVerificationError(
+            f"Arquivo {name} com sha256 {stored_sha256}, esperado {sha256}"
+        )
+
+
+def archive_month(month: date) -> Optional[AuditLogArchive]:
+    """
+    Move os logs de um mês para um arquivo comprimido
+
+    Args:
+        month: Primeiro dia do mês
+
+    Returns:
+        AuditLogArchive criado, ou None se não havia logs a arquivar
+
+    Raises:
+        ArchiveVerificationError: Arquivo gravado ausente ou diferente
+    """
+    logs = _month_logs(month)
+
+    archived_through = AuditLogArchive.objects.filter(month=month).aggregate(
+        last=Max("last_id")
+    )["last"]
+    if archived_through is not None:
+        _delete_logs(logs.filter(id__lte=archived_through))
+        logs = logs.filter(id__gt=archived_through)
+
+    last_id = logs.aggregate(last=Max("id"))["last"]
+    if last_id is None:
+        return None
+    logs = logs.filter(id__lte=last_id)
+
+    with tempfile.TemporaryFile() as tmp:
+        row_count, first_id = _write_archive(logs, tmp)
+        size = tmp.tell()
+        sha256 = _sha256(tmp)
+        storage = get_archive_storage()
+        name = storage.save(
+            f"{month:%Y-%m}/auditlog-{month:%Y-%m}-{first_id}-{last_id}.jsonl.gz",
+            File(tmp),
+        )
+    _verify_archive(storage, name, sha256)
+
+    archive = AuditLogArchive.objects.create(
+        month=month,
+        file=name,
+        row_count=row_count,
+        first_id=first_id,
+        last_id=last_id,
+        size_bytes=size,
+        sha256=sha256,
+    )
+    deleted = _delete_logs(logs)
+    logger.info(
+        f"🗄️ Audit log {month:%Y-%m} arquivado: {row_count} registros "
+        f"({size} bytes), {deleted} removidos da tabela"
+    )
+    return archive
+
+
+def read_archive(archive: AuditLogArchive) -> Iterator[Dict[str, Any]]:
+    """Registros de um arquivo (dicts com os campos de AuditLog)"""
+    with get_archive_storage().open(archive.file, "rb") as fileobj:
+        with gzip.GzipFile(fileobj=fileobj, mode="rb") as lines:
+            for line in lines:
+                yield json.loads(line)
+
+
+def apply_retention() -> List[AuditLogArchive]:
+    """
+    Arquiva os meses anteriores ao período de retenção
+
+    AUDIT_LOG_RETENTION_MONTHS meses completos são mantidos além do mês
+    atual; 0 desativa a retenção.
+
+    Returns:
+        Arquivos criados
+    """
+    months = getattr(settings, "AUDIT_LOG_RETENTION_MONTHS", 0)
+    if months <= 0:
+        return []
+
+    cutoff = add_months(timezone.localdate().replace(day=1), -months)
+    oldest = (
+        AuditLog.objects.order_by("timestamp").values_list("timestamp", flat=True)
+    ).first()
+    if oldest is None or oldest >= start_of_day(cutoff):
+        return []
+
+    if not cache.add(RETENTION_LOCK_KEY, True, timeout=60 * 60 * 6):
+        logger.info("⏭️ Retenção do audit log já em execução")
+        return []
+
+    archives = []
+    try:
+        month = timezone.localdate(oldest).replace(day=1)
+        while month < cutoff:
+            archive = archive_month(month)
+            if archive is not None:
+                archives.append(archive)
+            month = add_months(month, 1)
+    finally:
+        cache.delete(RETENTION_LOCK_KEY)
+    return archives
@@ -0,0 +1,302 @@
+"""
+Agregação incremental do Audit Log em AuditLogSummary
+Cada dia fechado é resumido uma vez por (tenant, data, ação): contagem,
+contagem por severidade, usuários mais ativos e um sketch HyperLogLog dos
+usuários (estimativa de usuários distintos que pode ser somada entre dias e
+ações sem voltar aos logs).
+
+- rollup_summaries (tarefa rollup_audit_log_summaries): resume os dias
+  ainda não resumidos até ontem. O dia só é resumido AUDIT_LOG_ROLLUP_DELAY
+  segundos após a meia-noite, para incluir eventos ainda no buffer do sink.
+- collect_activity: analytics e by_date leem os resumos até o último dia
+  resumido e os logs brutos só depois dele (normalmente apenas hoje).
+"""
+
+import hashlib
+import logging
+import math
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AuditLog, AuditLogSummary
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_LOCK_KEY = "auditlog:rollup_lock"
+
+# 2^10 registradores de 1 byte: ~3% de erro padrão, 1 KB por resumo
+HLL_PRECISION = 10
+HLL_REGISTERS = 1 << HLL_PRECISION
+
+# Usuários mantidos por resumo em user_counts (top usuários é aproximado)
+TOP_USERS_PER_SUMMARY = 50
+
+SECURITY_ACTIONS = (
+    "LOGIN_FAILED",
+    "SECURITY_ALERT",
+    "SUSPICIOUS_ACTIVITY",
+    "ACCESS_DENIED",
+)
+
+
+class HyperLogLog:
+    """Sketch HyperLogLog de cardinalidade (união por máximo de registradores)"""
+
+    def __init__(self, registers: Optional[bytes] = None):
+        if registers and len(registers) == HLL_REGISTERS:
+            self.registers = bytearray(registers)
+        else:
+            self.registers = bytearray(HLL_REGISTERS)
+
+    def add(self, value: Any) -> None:
+        digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        index = hashed & (HLL_REGISTERS - 1)
+        rank = (64 - HLL_PRECISION) - (hashed >> HLL_PRECISION).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        zeros = self.registers.count(0)
+        if zeros == HLL_REGISTERS:
+            return 0
+        m = HLL_REGISTERS
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0**-register for register in self.registers)
+        if estimate <= 2.5 * m and zeros:
+            # Correção para cardinalidades pequenas (contagem linear)
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+
+def start_of_day(day: date) -> datetime:
+    """Início do dia no fuso do projeto (mesmo corte do TruncDate)"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def last_rollup_date() -> Optional[date]:
+    """Último dia já resumido (None antes do primeiro rollup)"""
+    return AuditLogSummary.objects.aggregate(last=Max("date"))["last"]
+
+
+def _log_rows(logs) -> Iterable[Dict[str, Any]]:
+    """Contagens por (dia, tenant, ação, severidade, usuário): uma query"""
+    return (
+        logs.order_by()
+        .annotate(day=TruncDate("timestamp"))
+        .values("day", "tenant_id", "action", "severity", "user_id")
+        .annotate(count=Count("id"))
+        .iterator()
+    )
+
+
+class _SummaryBucket:
+    """Acumulador de um AuditLogSummary (tenant, data, ação)"""
+
+    def __init__(self):
+        self.count = 0
+        self.severities: Counter = Counter()
+        self.users: Counter = Counter()
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.count += row["count"]
+        self.severities[row["severity"]] += row["count"]
+        if row["user_id"] is not None:
+            self.users[row["user_id"]] += row["count"]
+
+    def to_summary(self, day: date, tenant_id, action: str) -> AuditLogSummary:
+        sketch = HyperLogLog()
+        for user_id in self.users:
+            sketch.add(user_id)
+        return AuditLogSummary(
+            date=day,
+            tenant_id=tenant_id,
+            action=action,
+            count=self.count,
+            unique_users=len(self.users),
+            severity_counts=dict(self.severities),
+            user_counts={
+                str(user_id): count
+                for user_id, count in self.users.most_common(TOP_USERS_PER_SUMMARY)
+            },
+            users_sketch=sketch.to_bytes(),
+        )
+
+
+def rollup_day(day: date) -> int:
+    """
+    (Re)calcula os resumos de um dia a partir dos logs brutos
+
+    Idempotente: os resumos do dia são substituídos na mesma transação.
+
+    Returns:
+        Número de resumos gravados
+    """
+    logs = AuditLog.objects.filter(
+        timestamp__gte=start_of_day(day),
+        timestamp__lt=start_of_day(day + timedelta(days=1)),
+    )
+    buckets: Dict[Tuple[Any, str], _SummaryBucket] = defaultdict(_SummaryBucket)
+    for row in _log_rows(logs):
+        buckets[(row["tenant_id"], row["action"])].add(row)
+
+    summaries = [
+        bucket.to_summary(day, tenant_id, action)
+        for (tenant_id, action), bucket in buckets.items()
+    ]
+    with transaction.atomic():
+        AuditLogSummary.objects.filter(date=day).delete()
+        AuditLogSummary.objects.bulk_create(summaries, batch_size=500)
+    return len(summaries)
+
+
+def rollup_summaries(since: Optional[date] = None, until: Optional[date] = None) -> int:
+    """
+    Resume os dias fechados desde o último rollup
+
+    Args:
+        since: Primeiro dia (default: dia seguinte ao último resumido, ou o
+            dia do log mais antigo no primeiro rollup)
+        until: Último dia (default: ontem, após AUDIT_LOG_ROLLUP_DELAY)
+
+    Returns:
+        Número de dias resumidos
+    """
+    delay = getattr(settings, "AUDIT_LOG_ROLLUP_DELAY", 300)
+    if until is None:
+        until = timezone.localdate(timezone.now() - timedelta(seconds=delay))
+        until -= timedelta(days=1)
+    if since is None:
+        last = last_rollup_date()
+        if last is not None:
+            since = last + timedelta(days=1)
+        else:
+            first = (
+                AuditLog.objects.order_by("timestamp")
+                .values_list("timestamp", flat=True)
+                .first()
+            )
+            if first is None:
+                return 0
+            since = timezone.localdate(first)
+
+    if since > until:
+        return 0
+    if not cache.add(ROLLUP_LOCK_KEY, True, timeout=60 * 60):
+        logger.info("⏭️ Rollup do audit log já em execução")
+        return 0
+
+    days = 0
+    try:
+        day = since
+        while day <= until:
+            rollup_day(day)
+            day += timedelta(days=1)
+            days += 1
+    finally:
+        cache.delete(ROLLUP_LOCK_KEY)
+
+    logger.info(f"📊 Audit log resumido: {days} dia(s) de {since} a {until}")
+    return days
+
+
+class AuditActivity:
+    """Totais de atividade combinando resumos e logs brutos"""
+
+    def __init__(self):
+        self.total = 0
+        self.actions: Counter = Counter()
+        self.severities: Counter = Counter()
+        self.users: Counter = Counter()
+        self.users_sketch = HyperLogLog()
+        self.daily: Dict[date, Counter] = defaultdict(Counter)
+        self.daily_users: Dict[date, HyperLogLog] = defaultdict(HyperLogLog)
+
+    def add_summary(self, summary: AuditLogSummary) -> None:
+        self.total += summary.count
+        self.actions[summary.action] += summary.count
+        self.severities.update(summary.severity_counts)
+        self.users.update(
+            {int(user_id): count for user_id, count in summary.user_counts.items()}
+        )
+        self.daily[summary.date][summary.action] += summary.count
+
+        sketch = HyperLogLog(bytes(summary.users_sketch or b""))
+        self.users_sketch.merge(sketch)
+        self.daily_users[summary.date].merge(sketch)
+
+    def add_log_row(self, row: Dict[str, Any]) -> None:
+        self.total += row["count"]
+        self.actions[row["action"]] += row["count"]
+        self.severities[row["severity"]] += row["count"]
+        self.daily[row["day"]][row["action"]] += row["count"]
+        if row["user_id"] is not None:
+            self.users[row["user_id"]] += row["count"]
+            self.users_sketch.add(row["user_id"])
+            self.daily_users[row["day"]].add(row["user_id"])
+
+    @property
+    def unique_users(self) -> int:
+        return self.users_sketch.count()
+
+    @property
+    def security_alerts(self) -> int:
+        return sum(self.actions[action] for action in SECURITY_ACTIONS)
+
+
+def collect_activity(
+    summaries,
+    logs,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> AuditActivity:
+    """
+    Atividade do período a partir dos resumos e, após o último dia
+    resumido, dos logs brutos
+
+    Args:
+        summaries: Queryset de AuditLogSummary já restrito ao escopo
+        logs: Queryset de AuditLog com o mesmo escopo
+        date_from: Primeiro dia (inclusive)
+        date_to: Último dia (inclusive)
+    """
+    activity = AuditActivity()
+    rolled_through = last_rollup_date()
+
+    if rolled_through is not None:
+        summaries = summaries.filter(date__lte=rolled_through)
+        if date_from:
+            summaries = summaries.filter(date__gte=date_from)
+        if date_to:
+            summaries = summaries.filter(date__lte=date_to)
+        for summary in summaries.order_by().iterator():
+            activity.add_summary(summary)
+
+        if date_to and date_to <= rolled_through:
+            return activity
+        logs = logs.filter(
+            timestamp__gte=start_of_day(rolled_through + timedelta(days=1))
+        )
+
+    if date_from:
+        logs = logs.filter(timestamp__gte=start_of_day(date_from))
+    if date_to:
+        logs = logs.filter(timestamp__lt=start_of_day(date_to + timedelta(days=1)))
+    for row in _log_rows(logs):
+        activity.add_log_row(row)
+
+    return activity
@@ -1,5 +1,7 @@
 """
 Signals para capturar eventos automaticamente no Audit Log
+Gravados via AuditLog.objects.record: em lote (sink assíncrono), exceto
+ações de segurança, gravadas na hora
 """
 
 from django.contrib.auth import get_user_model
@@ -28,7 +30,7 @@ def log_user_login(sender, request, user, **kwargs):
     # Tenta obter tenant do usuário
     tenant = getattr(user, "client", None)
 
-    AuditLog.objects.create_log(
+    AuditLog.objects.record(
         action="LOGIN",
         user=user,
         tenant=tenant,
@@ -49,7 +51,7 @@ def log_user_logout(sender, request, user, **kwargs):
     user_agent = request.META.get("HTTP_USER_AGENT", "") if request else ""
     tenant = getattr(user, "client", None)
 
-    AuditLog.objects.create_log(
+    AuditLog.objects.record(
         action="LOGOUT",
         user=user,
         tenant=tenant,
@@ -75,7 +77,7 @@ def log_user_login_failed(sender, credentials, request, **kwargs):
     except User.DoesNotExist:
         pass
 
-    AuditLog.objects.create_log(
+    AuditLog.objects.record(
         action="LOGIN_FAILED",
         user=user,
         tenant=tenant,
@@ -119,6 +121,8 @@ def get_request_context():
 # ===== FEEDBACK SIGNALS =====
 
 try:
+    from apps.feedbacks.bulk import feedbacks_atualizados_em_lote
+    from apps.feedbacks.interactions import interacao_registrada
     from apps.feedbacks.models import Feedback
 
     @receiver(post_save, sender=Feedback)
@@ -126,7 +130,7 @@ try:
         """Registra criação ou atualização de feedback."""
         action = "FEEDBACK_CREATED" if created else "FEEDBACK_UPDATED"
 
-        AuditLog.objects.create_log(
+        AuditLog.objects.record(
             action=action,
             tenant=instance.client,
             content_object=instance,
@@ -148,7 +152,7 @@ try:
         try:
             old_instance = Feedback.objects.get(pk=instance.pk)
             if old_instance.status != instance.status:
-                AuditLog.objects.create_log(
+                AuditLog.objects.record(
                     action="FEEDBACK_STATUS_CHANGED",
                     tenant=instance.client,
                     content_object=instance,
@@ -162,6 +166,35 @@ try:
         except Feedback.DoesNotExist:
             pass
 
+    @receiver(interacao_registrada)
+    def log_interaction_status_change(sender, feedback, status_anterior=None, **kwargs):
+        """Mudança de status por interação (UPDATE direto, sem pre_save)."""
+        if not status_anterior:
+            return
+
+        AuditLog.objects.record(
+            action="FEEDBACK_STATUS_CHANGED",
+            tenant=feedback.client,
+            content_object=feedback,
+            description=f"Feedback #{feedback.protocolo}: status alterado de '{status_anterior}' para '{feedback.status}'",
+            metadata={
+                "protocolo": feedback.protocolo,
+                "old_status": status_anterior,
+                "new_status": feedback.status,
+            },
+        )
+
+    @receiver(feedbacks_atualizados_em_lote)
+    def log_feedback_bulk_update(sender, tenant, user, alteracoes, **kwargs):
+        """Operação em lote: um único registro com os campos por feedback."""
+        AuditLog.objects.record(
+            action="FEEDBACK_UPDATED",
+            user=user,
+            tenant=tenant,
+            description=f"Atualização em lote de {len(alteracoes)} feedbacks",
+            metadata={"bulk": True, "changes": alteracoes},
+        )
+
 except ImportError:
     pass  # App feedbacks não instalado
 
@@ -174,7 +207,7 @@ def log_user_changes(sender, instance, created, **kwargs):
     """Registra criação de usuários."""
     if created:
         tenant = getattr(instance, "client", None)
-        AuditLog.objects.create_log(
+        AuditLog.objects.record(
             action="CREATE",
             user=instance,
             tenant=tenant,
@@ -197,7 +230,7 @@ try:
         """Registra criação ou atualização de tenants."""
         action = "TENANT_CREATED" if created else "TENANT_UPDATED"
 
-        AuditLog.objects.create_log(
+        AuditLog.objects.record(
             action=action,
             tenant=instance,
             content_object=instance,
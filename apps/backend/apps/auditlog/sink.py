@@ -0,0 +1,292 @@
+"""
+Gravação assíncrona do Audit Log
+Eventos não críticos vão para um buffer (stream Redis ou memória do
+processo) após o commit e são gravados em lote com bulk_create; ações de
+segurança (AUDIT_LOG_SYNC_ACTIONS) e severidade ERROR/CRITICAL continuam
+com INSERT síncrono na requisição.
+
+Entrega:
+- Redis: XADD no stream; o flush (tarefa Celery agendada no primeiro evento
+  da janela + beat) lê com XRANGE, grava e remove com XDEL. Pelo menos uma
+  vez: uma falha entre o INSERT e o XDEL pode duplicar o lote.
+- Memória do processo (sem Redis): flush ao atingir AUDIT_LOG_BATCH_SIZE,
+  por uma thread após AUDIT_LOG_FLUSH_INTERVAL segundos e no encerramento do
+  processo (atexit: restart/deploy do gunicorn e do Celery). Lotes que falham
+  voltam ao buffer; eventos no buffer se perdem só se o processo for morto
+  sem encerramento normal (SIGKILL).
+"""
+
+import atexit
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connections, transaction
+
+from apps.core.redis_utils import get_redis_client, redis_key
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "auditlog:stream"
+SCHEDULED_KEY = "auditlog:flush_scheduled"
+FLUSH_LOCK_KEY = "auditlog:flush_lock"
+
+# Tamanho máximo aproximado do stream (proteção se o flush parar)
+STREAM_MAXLEN = 1_000_000
+
+DEFAULT_SYNC_ACTIONS = (
+    "PASSWORD_CHANGE",
+    "PASSWORD_RESET",
+    "MFA_ENABLED",
+    "MFA_DISABLED",
+    "PERMISSION_CHANGED",
+    "USER_REMOVED",
+    "TENANT_SUSPENDED",
+    "EXPORT",
+    "SECURITY_ALERT",
+    "SUSPICIOUS_ACTIVITY",
+    "ACCESS_DENIED",
+)
+SYNC_SEVERITIES = ("ERROR", "CRITICAL")
+
+Event = Dict[str, Any]
+
+
+def is_sync_event(action: str, severity: str = "INFO") -> bool:
+    """Ações de segurança e erros são gravados na própria requisição"""
+    if not getattr(settings, "AUDIT_LOG_ASYNC", True):
+        return True
+    if severity in SYNC_SEVERITIES:
+        return True
+    return action in getattr(settings, "AUDIT_LOG_SYNC_ACTIONS", DEFAULT_SYNC_ACTIONS)
+
+
+def _batch_size() -> int:
+    return getattr(settings, "AUDIT_LOG_BATCH_SIZE", 500)
+
+
+def _flush_interval() -> float:
+    return getattr(settings, "AUDIT_LOG_FLUSH_INTERVAL", 2)
+
+
+def write_events(events: List[Event]) -> int:
+    """
+    Grava eventos com bulk_create
+
+    Se o lote falhar por integridade (ex: usuário removido entre o evento e
+    o flush), grava um a um e descarta apenas os inválidos.
+    """
+    from .models import AuditLog
+
+    if not events:
+        return 0
+
+    logs = [AuditLog(**event) for event in events]
+    try:
+        with transaction.atomic():
+            AuditLog.objects.bulk_create(logs, batch_size=_batch_size())
+        return len(logs)
+    except IntegrityError:
+        written = 0
+        for log in logs:
+            try:
+                with transaction.atomic():
+                    log.save(force_insert=True)
+                written += 1
+            except IntegrityError as e:
+                logger.error(f"❌ Evento de auditoria descartado ({log.action}): {e}")
+        return written
+
+
+class _RedisStreamBuffer:
+    """Eventos em um stream Redis (JSON em um campo por entrada)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.key = redis_key(STREAM_KEY)
+
+    def add(self, event: Event) -> None:
+        self.client.xadd(
+            self.key,
+            {"event": json.dumps(event, cls=DjangoJSONEncoder)},
+            maxlen=STREAM_MAXLEN,
+            approximate=True,
+        )
+
+    def read(self, count: int) -> List[Tuple[Any, Event]]:
+        entries = self.client.xrange(self.key, count=count)
+        batch = []
+        for entry_id, fields in entries:
+            event = json.loads(fields.get(b"event") or fields.get("event"))
+            event["timestamp"] = datetime.fromisoformat(event["timestamp"])
+            batch.append((entry_id, event))
+        return batch
+
+    def ack(self, entry_ids: List[Any]) -> None:
+        if entry_ids:
+            self.client.xdel(self.key, *entry_ids)
+
+    def restore(self, batch: List[Tuple[Any, Event]]) -> None:
+        # Entradas sem XDEL continuam no stream para o próximo flush
+        pass
+
+    def __len__(self) -> int:
+        return int(self.client.xlen(self.key))
+
+
+class _LocalBuffer:
+    """Eventos na memória do processo (sem Redis)"""
+
+    def __init__(self):
+        self._events: deque = deque()
+        self._lock = threading.Lock()
+
+    def add(self, event: Event) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    def read(self, count: int) -> List[Tuple[Any, Event]]:
+        # Leitura destrutiva: só há um leitor por processo (lock do sink)
+        with self._lock:
+            size = min(count, len(self._events))
+            return [(None, self._events.popleft()) for _ in range(size)]
+
+    def ack(self, entry_ids: List[Any]) -> None:
+        pass
+
+    def restore(self, batch: List[Tuple[Any, Event]]) -> None:
+        with self._lock:
+            self._events.extendleft(event for _, event in reversed(batch))
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+class AuditLogSink:
+    """
+    Buffer de eventos de auditoria com gravação em lote
+
+    Usage:
+        get_audit_sink().emit(event)  # após o commit da transação atual
+        get_audit_sink().flush()      # tarefa flush_audit_log_buffer
+    """
+
+    def __init__(self):
+        redis = get_redis_client()
+        self.buffer = _RedisStreamBuffer(redis) if redis else _LocalBuffer()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        if not self.is_shared:
+            # O beat só esvazia o buffer do próprio Celery: cada processo
+            # grava o que restou do seu ao encerrar
+            atexit.register(self.flush_at_exit)
+
+    @property
+    def is_shared(self) -> bool:
+        return isinstance(self.buffer, _RedisStreamBuffer)
+
+    def emit(self, event: Event) -> None:
+        """Enfileira o evento quando a transação atual for confirmada"""
+        transaction.on_commit(lambda: self._enqueue(event))
+
+    def _enqueue(self, event: Event) -> None:
+        try:
+            self.buffer.add(event)
+        except Exception as e:
+            logger.warning(f"⚠️ Buffer de auditoria indisponível: {e}")
+            write_events([event])
+            return
+
+        if not self.is_shared and len(self.buffer) >= _batch_size():
+            self.flush()
+        else:
+            self.schedule_flush()
+
+    def schedule_flush(self) -> None:
+        """Agenda um flush ao fim da janela, se nenhum estiver agendado"""
+        interval = _flush_interval()
+        if self.is_shared:
+            if cache.add(SCHEDULED_KEY, True, timeout=max(interval * 10, 10)):
+                from .tasks import flush_audit_log_buffer
+
+                flush_audit_log_buffer.apply_async(  # type: ignore[attr-defined]
+                    countdown=interval
+                )
+            return
+
+        with self._flush_lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(interval, self._flush_in_thread)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_in_thread(self) -> None:
+        try:
+            self.flush()
+        finally:
+            # Conexões abertas por esta thread não são reaproveitadas
+            connections.close_all()
+
+    def flush_at_exit(self) -> None:
+        """Grava o buffer do processo no encerramento (atexit)"""
+        with self._flush_lock:
+            timer = self._timer
+        if timer is not None:
+            timer.cancel()
+        self.flush()
+
+    def flush(self) -> int:
+        """
+        Grava todos os eventos pendentes em lotes de AUDIT_LOG_BATCH_SIZE
+
+        Returns:
+            Número de eventos gravados
+        """
+        if self.is_shared:
+            # Liberar o agendamento antes de ler: eventos novos agendam outro
+            cache.delete(SCHEDULED_KEY)
+            if not cache.add(FLUSH_LOCK_KEY, True, timeout=60):
+                return 0
+        else:
+            with self._flush_lock:
+                self._timer = None
+
+        written = 0
+        try:
+            while True:
+                batch = self.buffer.read(_batch_size())
+                if not batch:
+                    break
+                try:
+                    written += write_events([event for _, event in batch])
+                except Exception:
+                    self.buffer.restore(batch)
+                    raise
+                self.buffer.ack([entry_id for entry_id, _ in batch])
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar eventos de auditoria: {e}")
+        finally:
+            if self.is_shared:
+                cache.delete(FLUSH_LOCK_KEY)
+
+        if written:
+            logger.debug(f"📋 {written} evento(s) de auditoria gravados em lote")
+        return written
+
+
+_audit_sink: Optional[AuditLogSink] = None
+
+
+def get_audit_sink() -> AuditLogSink:
+    """Sink compartilhado do processo (buffer local único por processo)"""
+    global _audit_sink
+    if _audit_sink is None:
+        _audit_sink = AuditLogSink()
+    return _audit_sink
@@ -0,0 +1,56 @@
+"""
+Celery tasks do Audit Log
+
+Tasks disponíveis:
+- flush_audit_log_buffer: Grava em lote os eventos pendentes no stream Redis
+- rollup_audit_log_summaries: Resume os dias fechados em AuditLogSummary
+- archive_old_audit_logs: Move meses fora da retenção para arquivos gzip
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def flush_audit_log_buffer():
+    """
+    Grava com bulk_create os eventos de auditoria pendentes no buffer
+    """
+    from .sink import get_audit_sink
+
+    try:
+        return get_audit_sink().flush()
+    except Exception as e:
+        logger.error(f"Erro ao gravar eventos de auditoria: {e}")
+        return 0
+
+
+@shared_task(ignore_result=True)
+def rollup_audit_log_summaries():
+    """
+    Atualiza AuditLogSummary com os dias fechados ainda não resumidos
+    """
+    from .rollup import rollup_summaries
+
+    try:
+        return rollup_summaries()
+    except Exception as e:
+        logger.error(f"Erro ao resumir audit log: {e}")
+        return 0
+
+
+@shared_task(ignore_result=True)
+def archive_old_audit_logs():
+    """
+    Aplica a política de retenção (AUDIT_LOG_RETENTION_MONTHS)
+    """
+    from .retention import apply_retention
+
+    try:
+        return len(apply_retention())
+    except Exception as e:
+        logger.error(f"Erro ao arquivar audit logs: {e}")
+        return 0
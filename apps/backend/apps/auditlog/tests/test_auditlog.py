@@ -5,13 +5,18 @@ Sprint 2 Correções: Auditoria 30/01/2026
 Cobertura:
 - test_audit_log_creation: Criação de logs de auditoria
 - test_audit_log_queries: Queries e filtros de logs
+- test_audit_log_sink: Gravação assíncrona em lote e ações síncronas
 """
 
 import uuid
+from unittest.mock import MagicMock, patch
 
 import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
+from apps.auditlog import sink as audit_sink
 from apps.auditlog.models import AuditLog
 from apps.tenants.models import Client
 
@@ -318,3 +323,114 @@ class TestAuditLogWithoutTenant:
 
         assert log.user is None
         assert log.tenant == test_tenant
+
+
+# ======================
+# TESTES DO SINK ASSÍNCRONO
+# ======================
+
+
+@pytest.fixture
+def local_sink(settings):
+    """Sink assíncrono com buffer do processo, sem agendamento de flush."""
+    settings.AUDIT_LOG_ASYNC = True
+    sink = audit_sink.AuditLogSink.__new__(audit_sink.AuditLogSink)
+    sink.buffer = audit_sink._LocalBuffer()
+    sink._flush_lock = MagicMock()
+    sink._timer = None
+    with (
+        patch.object(audit_sink, "get_audit_sink", return_value=sink),
+        patch.object(audit_sink.AuditLogSink, "schedule_flush"),
+    ):
+        yield sink
+
+
+@pytest.mark.django_db
+class TestAuditLogSink:
+    """Testes do buffer de auditoria e da gravação em lote."""
+
+    def test_security_actions_are_written_synchronously(
+        self, local_sink, test_user, test_tenant
+    ):
+        """Ações críticas não passam pelo buffer."""
+        log = AuditLog.objects.record(
+            "PASSWORD_CHANGE", user=test_user, tenant=test_tenant
+        )
+
+        assert log.pk is not None
+        assert len(local_sink.buffer) == 0
+
+    def test_events_buffered_after_commit_and_bulk_inserted(
+        self, local_sink, test_user, test_tenant, django_capture_on_commit_callbacks
+    ):
+        """Eventos comuns entram no buffer no commit e são gravados em um INSERT."""
+        with django_capture_on_commit_callbacks(execute=True):
+            for i in range(3):
+                assert (
+                    AuditLog.objects.record(
+                        "LOGIN",
+                        user=test_user,
+                        tenant=test_tenant,
+                        content_object=test_tenant,
+                        description=f"Login {i}",
+                    )
+                    is None
+                )
+            assert len(local_sink.buffer) == 0
+
+        assert len(local_sink.buffer) == 3
+        assert not AuditLog.objects.filter(description__startswith="Login ").exists()
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert local_sink.flush() == 3
+
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        assert len(inserts) == 1
+        logs = AuditLog.objects.filter(description__startswith="Login ")
+        assert logs.count() == 3
+        assert {log.content_object for log in logs} == {test_tenant}
+
+    def test_local_buffer_flushed_at_process_exit(
+        self, local_sink, test_user, django_capture_on_commit_callbacks
+    ):
+        """Sem Redis, eventos pendentes são gravados no encerramento."""
+        with patch.object(audit_sink.atexit, "register") as register:
+            sink = audit_sink.AuditLogSink()
+        register.assert_called_once_with(sink.flush_at_exit)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            AuditLog.objects.record("LOGIN", user=test_user, description="Saída")
+        assert len(local_sink.buffer) == 1
+
+        local_sink.flush_at_exit()
+
+        assert len(local_sink.buffer) == 0
+        assert AuditLog.objects.filter(description="Saída").exists()
+
+    def test_rolled_back_events_are_dropped(
+        self, local_sink, test_user, django_capture_on_commit_callbacks
+    ):
+        """Evento de transação desfeita não é gravado (como no INSERT síncrono)."""
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    AuditLog.objects.record("LOGIN", user=test_user)
+                    raise RuntimeError("rollback")
+
+        assert len(local_sink.buffer) == 0
+
+    def test_redis_stream_entries_decoded(self):
+        """Entradas do stream voltam com timestamp datetime."""
+        client = MagicMock()
+        client.xrange.return_value = [
+            (
+                b"1-0",
+                {b"event": b'{"action": "LOGIN", "timestamp": "2026-01-30T12:00:00Z"}'},
+            )
+        ]
+
+        ((entry_id, event),) = audit_sink._RedisStreamBuffer(client).read(10)
+
+        assert entry_id == b"1-0"
+        assert event["action"] == "LOGIN"
+        assert event["timestamp"].year == 2026
@@ -0,0 +1,136 @@
+"""
+Testes da exportação em streaming e da retenção do Audit Log
+Cobertura: CSV sem limite gerado por cursor, arquivamento mensal comprimido
+retomada após falha na remoção e conferência do arquivo gravado
+"""
+
+import csv
+import io
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+from apps.auditlog import retention
+from apps.auditlog import views as audit_views
+from apps.auditlog.models import AuditLog, AuditLogArchive
+from apps.auditlog.retention import (
+    ArchiveVerificationError,
+    add_months,
+    apply_retention,
+    archive_month,
+    read_archive,
+)
+from apps.auditlog.rollup import start_of_day
+
+pytestmark = pytest.mark.django_db
+
+EXPORT_URL = "/api/auditlog/logs/export/"
+
+
+@pytest.fixture(autouse=True)
+def archive_root(settings, tmp_path, monkeypatch):
+    # Sem sobrescrever STORAGES: a troca recria os storages de outros campos
+    storage = FileSystemStorage(location=str(tmp_path))
+    monkeypatch.setattr(retention, "get_archive_storage", lambda: storage)
+    settings.AUDIT_LOG_RETENTION_MONTHS = 2
+    return tmp_path
+
+
+def log_in_month(month, description="", **kwargs):
+    return AuditLog.objects.create(
+        timestamp=start_of_day(month) + timedelta(days=1),
+        action="LOGIN",
+        description=description,
+        **kwargs,
+    )
+
+
+class TestStreamingExport:
+    def test_streams_all_rows_in_chunks(self, api_client, superuser_factory, tenant):
+        admin = superuser_factory()
+        api_client.force_authenticate(user=admin)
+        api_client.credentials(HTTP_HOST=f"{tenant.subdominio}.localhost")
+        AuditLog.objects.all().delete()
+        for i in range(5):
+            AuditLog.objects.create(action="UPDATE", user=admin, description=f"#{i}")
+        AuditLog.objects.create(action="DELETE", description="sem usuário")
+
+        with patch.object(audit_views, "EXPORT_CHUNK_SIZE", 2):
+            response = api_client.get(EXPORT_URL)
+            assert response.streaming
+            content = b"".join(response.streaming_content).decode()
+
+        header, *rows = list(csv.reader(io.StringIO(content)))
+        assert header[0] == "Data/Hora"
+        assert len(rows) == 6
+        assert {row[3] for row in rows} == {admin.email, "Sistema"}
+
+        export_log = AuditLog.objects.get(action="EXPORT")
+        assert export_log.metadata == {"streaming": True, "count": 6}
+
+    def test_filters_apply_to_export(self, api_client, superuser_factory, tenant):
+        admin = superuser_factory()
+        api_client.force_authenticate(user=admin)
+        api_client.credentials(HTTP_HOST=f"{tenant.subdominio}.localhost")
+        AuditLog.objects.create(action="UPDATE", severity="WARNING")
+        AuditLog.objects.create(action="UPDATE")
+
+        response = api_client.get(EXPORT_URL, {"severity": "WARNING"})
+        rows = list(csv.reader(io.StringIO(b"".join(response).decode())))[1:]
+
+        assert [row[2] for row in rows] == ["Aviso"]
+
+
+class TestRetention:
+    def test_old_months_archived_and_removed(self):
+        current = timezone.localdate().replace(day=1)
+        old = add_months(current, -4)
+        kept = add_months(current, -2)
+        log_in_month(old, description="antigo 1")
+        log_in_month(old, description="antigo 2")
+        log_in_month(kept, description="mantido")
+
+        (archive,) = apply_retention()
+
+        assert archive.month == old
+        assert archive.row_count == 2
+        assert len(archive.sha256) == 64
+        rows = list(read_archive(archive))
+        assert [row["description"] for row in rows] == ["antigo 1", "antigo 2"]
+        assert list(AuditLog.objects.values_list("description", flat=True)) == [
+            "mantido"
+        ]
+        assert apply_retention() == []
+
+    def test_resume_removes_already_archived_rows_without_new_file(self):
+        month = add_months(timezone.localdate().replace(day=1), -6)
+        log_in_month(month)
+        log_in_month(month)
+
+        with patch("apps.auditlog.retention._delete_logs", return_value=0):
+            archive_month(month)
+        assert AuditLog.objects.count() == 2
+
+        assert archive_month(month) is None
+        assert AuditLog.objects.count() == 0
+        assert AuditLogArchive.objects.count() == 1
+
+    def test_logs_kept_when_stored_archive_differs(self, archive_root):
+        class CorruptingStorage(FileSystemStorage):
+            def _save(self, name, content):
+                return super()._save(name, ContentFile(b"corrompido"))
+
+        month = add_months(timezone.localdate().replace(day=1), -6)
+        log_in_month(month)
+        storage = CorruptingStorage(location=str(archive_root))
+
+        with patch.object(retention, "get_archive_storage", return_value=storage):
+            with pytest.raises(ArchiveVerificationError):
+                archive_month(month)
+
+        assert AuditLog.objects.count() == 1
+        assert not AuditLogArchive.objects.exists()
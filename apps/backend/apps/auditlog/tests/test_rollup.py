@@ -0,0 +1,174 @@
+"""
+Testes do rollup incremental do Audit Log (apps.auditlog.rollup)
+Cobertura: sketch HyperLogLog, resumos por (tenant, dia, ação) e endpoints
+analytics/by_date servidos pelos resumos
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.auditlog.models import AuditLog, AuditLogSummary
+from apps.auditlog.rollup import (
+    HyperLogLog,
+    last_rollup_date,
+    rollup_day,
+    rollup_summaries,
+    start_of_day,
+)
+
+pytestmark = pytest.mark.django_db
+
+ANALYTICS_URL = "/api/auditlog/logs/analytics/"
+BY_DATE_URL = "/api/auditlog/summaries/by_date/"
+
+
+def log_at(day, action="LOGIN", user=None, tenant=None, severity="INFO"):
+    return AuditLog.objects.create(
+        timestamp=start_of_day(day) + timedelta(hours=12),
+        action=action,
+        user=user,
+        tenant=tenant,
+        severity=severity,
+    )
+
+
+@pytest.fixture
+def superuser_client(api_client, superuser_factory, tenant):
+    user = superuser_factory()
+    api_client.force_authenticate(user=user)
+    api_client.credentials(HTTP_HOST=f"{tenant.subdominio}.localhost")
+    return api_client, user
+
+
+class TestHyperLogLog:
+    def test_small_cardinality_and_merge_is_union(self):
+        a, b = HyperLogLog(), HyperLogLog()
+        for user_id in range(40):
+            a.add(user_id)
+        for user_id in range(20, 60):
+            b.add(user_id)
+
+        a.merge(HyperLogLog(b.to_bytes()))
+
+        # Contagem linear: erro de poucas unidades em cardinalidades pequenas
+        assert abs(b.count() - 40) <= 2
+        assert abs(a.count() - 60) <= 2
+
+    def test_large_cardinality_within_error(self):
+        sketch = HyperLogLog()
+        for user_id in range(20_000):
+            sketch.add(user_id)
+        assert abs(sketch.count() - 20_000) / 20_000 < 0.1
+
+
+class TestRollup:
+    def test_day_summarized_per_tenant_and_action(self, tenant, user_factory):
+        alice = user_factory(email="alice@example.com")
+        bob = user_factory(email="bob@example.com")
+        day = timezone.localdate() - timedelta(days=1)
+        log_at(day, user=alice, tenant=tenant)
+        log_at(day, user=alice, tenant=tenant, severity="WARNING")
+        log_at(day, user=bob, tenant=tenant)
+        log_at(day, action="UPDATE", user=bob, tenant=tenant)
+        log_at(day - timedelta(days=1), user=bob, tenant=tenant)
+
+        assert rollup_day(day) == 2
+        assert rollup_day(day) == 2  # idempotente
+
+        login = AuditLogSummary.objects.get(date=day, action="LOGIN")
+        assert (login.tenant_id, login.count, login.unique_users) == (tenant.id, 3, 2)
+        assert login.severity_counts == {"INFO": 2, "WARNING": 1}
+        assert login.user_counts == {str(alice.id): 2, str(bob.id): 1}
+        assert HyperLogLog(bytes(login.users_sketch)).count() == 2
+
+    def test_rollup_resumes_after_last_summarized_day(self):
+        today = timezone.localdate()
+        log_at(today - timedelta(days=3))
+        log_at(today - timedelta(days=1))
+        log_at(today)
+
+        assert rollup_summaries() == 3
+        assert last_rollup_date() == today - timedelta(days=1)
+        assert not AuditLogSummary.objects.filter(date=today).exists()
+        assert rollup_summaries() == 0
+
+
+class TestEndpoints:
+    def test_analytics_reads_summaries_plus_raw_today(
+        self, superuser_client, user_factory
+    ):
+        client, admin = superuser_client
+        alice = user_factory(email="alice@example.com")
+        AuditLog.objects.all().delete()  # Logs gerados pelos fixtures
+        today = timezone.localdate()
+        yesterday = today - timedelta(days=1)
+        log_at(yesterday, user=alice)
+        log_at(yesterday, action="LOGIN_FAILED", user=alice, severity="WARNING")
+        rollup_summaries()
+        # Logs já resumidos não são mais lidos
+        AuditLog.objects.filter(timestamp__lt=start_of_day(today)).delete()
+        log_at(today, user=admin)
+
+        data = client.get(ANALYTICS_URL, {"period": 7}).data
+
+        assert data["total_logs"] == 3
+        assert data["total_users_active"] == 2
+        assert data["security_alerts"] == 1
+        assert {item["action"]: item["count"] for item in data["action_breakdown"]} == {
+            "LOGIN": 2,
+            "LOGIN_FAILED": 1,
+        }
+        assert [item["count"] for item in data["time_series"]] == [2, 1]
+        assert data["top_users"][0]["user_id"] == alice.id
+        assert data["top_users"][0]["action_count"] == 2
+
+    def test_by_date_totals_per_day(self, superuser_client, user_factory):
+        client, _ = superuser_client
+        alice = user_factory(email="alice@example.com")
+        AuditLog.objects.all().delete()  # Logs gerados pelos fixtures
+        today = timezone.localdate()
+        yesterday = today - timedelta(days=1)
+        log_at(yesterday, user=alice)
+        log_at(yesterday, action="UPDATE", user=alice)
+        rollup_summaries()
+        log_at(today)
+
+        data = client.get(BY_DATE_URL, {"days": 7}).data
+
+        assert data == [
+            {
+                "date": yesterday,
+                "total_count": 2,
+                "total_actions": 2,
+                "unique_users": 1,
+            },
+            {"date": today, "total_count": 1, "total_actions": 1, "unique_users": 0},
+        ]
+
+    def test_tenant_admin_sees_only_request_tenant(
+        self, api_client, authenticated_user, tenant_factory, user_factory
+    ):
+        admin, own_tenant = authenticated_user
+        other_tenant = tenant_factory(nome="Outra", subdominio="outra")
+        alice = user_factory(email="alice@example.com")
+        AuditLog.objects.all().delete()  # Logs gerados pelos fixtures
+        today = timezone.localdate()
+        yesterday = today - timedelta(days=1)
+        log_at(yesterday, user=alice, tenant=own_tenant)
+        log_at(yesterday, user=alice, tenant=other_tenant)
+        log_at(yesterday, user=alice)
+        rollup_summaries()
+        log_at(today, user=admin, tenant=own_tenant)
+        log_at(today, user=alice, tenant=other_tenant)
+        log_at(today, user=alice)
+        api_client.force_authenticate(user=admin)
+        api_client.credentials(HTTP_HOST=f"{own_tenant.subdominio}.localhost")
+
+        analytics = api_client.get(ANALYTICS_URL, {"period": 7}).data
+        by_date = api_client.get(BY_DATE_URL, {"days": 7}).data
+
+        assert analytics["total_logs"] == 2
+        assert analytics["total_users_active"] == 2
+        assert [row["total_count"] for row in by_date] == [1, 1]
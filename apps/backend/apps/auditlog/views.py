@@ -2,11 +2,14 @@
 Views para Audit Log API
 """
 
+import csv
 from datetime import timedelta
 
+from django.contrib.auth import get_user_model
 from django.db.models import Count, Q
-from django.db.models.functions import TruncDate
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
 from rest_framework.decorators import action
@@ -14,7 +17,10 @@ from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.utils import get_current_tenant
+
 from .models import AuditLog, AuditLogSummary, UserSession
+from .rollup import collect_activity, start_of_day
 from .serializers import (
     AuditAnalyticsSerializer,
     AuditLogSerializer,
@@ -22,6 +28,33 @@ from .serializers import (
     UserSessionSerializer,
 )
 
+User = get_user_model()
+
+# Linhas lidas por vez do cursor na exportação
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """Pseudo-arquivo para csv.writer: devolve a linha em vez de gravar."""
+
+    def write(self, value):
+        return value
+
+
+def _request_tenant(request):
+    """Tenant da requisição (membership validada pelo TenantIsolationMiddleware)"""
+    return getattr(request, "tenant", None) or get_current_tenant()
+
+
+def _tenant_scope(request, queryset):
+    """Superusuário vê todos os tenants; demais, apenas o da requisição."""
+    if request.user.is_superuser:
+        return queryset
+    tenant = _request_tenant(request)
+    if tenant is None:
+        return queryset.none()
+    return queryset.filter(tenant=tenant)
+
 
 class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -42,6 +75,8 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ["description", "object_repr", "user__email"]
     ordering_fields = ["timestamp", "action", "severity"]
     ordering = ["-timestamp"]
+    # Paginação por cursor opt-in (?cursor=) - índice (tenant, -timestamp)
+    cursor_ordering = ("timestamp", "id")
 
     def get_queryset(self):
         """Filtra logs por tenant do usuário."""
@@ -53,7 +88,7 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
         else:
             # Usuário comum vê apenas logs do seu tenant
             queryset = AuditLog.objects.filter(
-                Q(tenant=getattr(user, "client", None)) | Q(user=user)
+                Q(tenant=_request_tenant(self.request)) | Q(user=user)
             )
 
         # Filtros adicionais via query params
@@ -72,102 +107,95 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
         """
         Retorna dados de analytics consolidados para dashboards.
 
+        Lê os resumos diários (AuditLogSummary) e os logs brutos apenas dos
+        dias ainda não resumidos (normalmente hoje). O período começa no
+        início do dia; usuários ativos é uma estimativa (HyperLogLog) e top
+        usuários considera os mais ativos de cada resumo.
+
         Query params:
         - period: Período em dias (default: 30)
+        - date_from / date_to: Limites opcionais (YYYY-MM-DD)
         """
         period_days = int(request.query_params.get("period", 30))
-        period_start = timezone.now() - timedelta(days=period_days)
-        period_end = timezone.now()
-
-        queryset = self.get_queryset().filter(timestamp__gte=period_start)
-
-        # Total de logs
-        total_logs = queryset.count()
-
-        # Usuários ativos únicos
-        total_users_active = (
-            queryset.exclude(user__isnull=True).values("user").distinct().count()
+        date_from = timezone.localdate() - timedelta(days=period_days)
+        date_to = None
+
+        param_from = parse_date(request.query_params.get("date_from") or "")
+        param_to = parse_date(request.query_params.get("date_to") or "")
+        if param_from and param_from > date_from:
+            date_from = param_from
+        if param_to:
+            date_to = param_to
+
+        activity = collect_activity(
+            _tenant_scope(request, AuditLogSummary.objects.all()),
+            _tenant_scope(request, AuditLog.objects.all()),
+            date_from=date_from,
+            date_to=date_to,
         )
 
         # Breakdown por ação
-        action_breakdown = list(
-            queryset.values("action")
-            .annotate(count=Count("id"))
-            .order_by("-count")[:10]
-        )
-
-        # Adicionar display names
         action_dict = dict(AuditLog.ACTION_CHOICES)
-        for item in action_breakdown:
-            item["action_display"] = action_dict.get(item["action"], item["action"])
+        action_breakdown = [
+            {
+                "action": action,
+                "action_display": action_dict.get(action, action),
+                "count": count,
+            }
+            for action, count in activity.actions.most_common(10)
+        ]
 
         # Breakdown por severidade
-        severity_counts = list(
-            queryset.values("severity").annotate(count=Count("id")).order_by("-count")
-        )
-
         severity_dict = dict(AuditLog.SEVERITY_CHOICES)
-        total_for_percentage = sum(item["count"] for item in severity_counts) or 1
-        severity_breakdown = []
-        for item in severity_counts:
-            severity_breakdown.append(
-                {
-                    "severity": item["severity"],
-                    "severity_display": severity_dict.get(
-                        item["severity"], item["severity"]
-                    ),
-                    "count": item["count"],
-                    "percentage": round(item["count"] / total_for_percentage * 100, 1),
-                }
-            )
-
-        # Série temporal (últimos N dias)
-        time_series = list(
-            queryset.annotate(date=TruncDate("timestamp"))
-            .values("date")
-            .annotate(count=Count("id"))
-            .order_by("date")
-        )
-
-        # Top usuários por atividade
-        top_users_qs = (
-            queryset.exclude(user__isnull=True)
-            .values("user__id", "user__email", "user__first_name", "user__last_name")
-            .annotate(action_count=Count("id"))
-            .order_by("-action_count")[:5]
-        )
-        top_users = [
+        total_for_percentage = activity.total or 1
+        severity_breakdown = [
             {
-                "user_id": item["user__id"],
-                "user_email": item["user__email"],
-                "user_full_name": (
-                    f"{item['user__first_name']} {item['user__last_name']}".strip()
-                    or item["user__email"].split("@")[0]
-                ),
-                "action_count": item["action_count"],
+                "severity": severity,
+                "severity_display": severity_dict.get(severity, severity),
+                "count": count,
+                "percentage": round(count / total_for_percentage * 100, 1),
             }
-            for item in top_users_qs
+            for severity, count in activity.severities.most_common()
+            if count
         ]
 
-        # Alertas de segurança
-        security_actions = [
-            "LOGIN_FAILED",
-            "SECURITY_ALERT",
-            "SUSPICIOUS_ACTIVITY",
-            "ACCESS_DENIED",
+        # Série temporal (últimos N dias)
+        time_series = [
+            {"date": day, "count": sum(counts.values())}
+            for day, counts in sorted(activity.daily.items())
         ]
-        security_alerts = queryset.filter(action__in=security_actions).count()
+
+        # Top usuários por atividade
+        top_counts = dict(activity.users.most_common(5))
+        users = User.objects.filter(pk__in=top_counts).only(
+            "id", "email", "first_name", "last_name"
+        )
+        top_users = sorted(
+            (
+                {
+                    "user_id": user.id,
+                    "user_email": user.email,
+                    "user_full_name": (
+                        f"{user.first_name} {user.last_name}".strip()
+                        or user.email.split("@")[0]
+                    ),
+                    "action_count": top_counts[user.id],
+                }
+                for user in users
+            ),
+            key=lambda item: -item["action_count"],
+        )
 
         data = {
-            "total_logs": total_logs,
-            "total_users_active": total_users_active,
+            "total_logs": activity.total,
+            "total_users_active": activity.unique_users,
             "action_breakdown": action_breakdown,
             "severity_breakdown": severity_breakdown,
             "time_series": time_series,
             "top_users": top_users,
-            "security_alerts": security_alerts,
-            "period_start": period_start,
-            "period_end": period_end,
+            "security_alerts": activity.security_alerts,
+            "period_start": start_of_day(date_from),
+            "period_end": timezone.now(),
         }
 
         serializer = AuditAnalyticsSerializer(data)
@@ -186,24 +214,42 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=["get"])
     def export(self, request):
         """
-        Exporta logs para CSV.
+        Exporta logs para CSV (streaming, sem limite de registros).
+
+        As linhas são lidas do banco em blocos por um cursor e enviadas à
+        medida que são geradas (memória constante). Logs já arquivados pela
+        retenção não entram na exportação.
 
         Query params:
         - format: csv (default)
         - date_from: Data inicial
         - date_to: Data final
+        - action / severity / user / search: Mesmos filtros da listagem
         """
-        import csv
-
-        from django.http import HttpResponse
+        queryset = self.filter_queryset(self.get_queryset())
 
-        queryset = self.get_queryset()[:10000]  # Limite de 10k registros
+        # Registrar a exportação antes do envio (contagem ao final)
+        export_log = AuditLog.objects.record(
+            action="EXPORT",
+            sync=True,
+            user=request.user if request.user.is_authenticated else None,
+            description="Exportação de logs de auditoria",
+            ip_address=self._get_client_ip(request),
+            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            metadata={"streaming": True},
+        )
 
-        response = HttpResponse(content_type="text/csv")
+        response = StreamingHttpResponse(
+            self._export_csv_rows(queryset.exclude(pk=export_log.pk), export_log),
+            content_type="text/csv",
+        )
         response["Content-Disposition"] = 'attachment; filename="audit_logs.csv"'
+        return response
 
-        writer = csv.writer(response)
-        writer.writerow(
+    def _export_csv_rows(self, queryset, export_log):
+        """Linhas do CSV geradas sob demanda (uma query com JOIN em usuário)."""
+        writer = csv.writer(_Echo())
+        yield writer.writerow(
             [
                 "Data/Hora",
                 "Ação",
@@ -215,31 +261,37 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
             ]
         )
 
-        for log in queryset:
-            writer.writerow(
+        action_dict = dict(AuditLog.ACTION_CHOICES)
+        severity_dict = dict(AuditLog.SEVERITY_CHOICES)
+        rows = queryset.values_list(
+            "timestamp",
+            "action",
+            "severity",
+            "user__email",
+            "description",
+            "ip_address",
+            "object_repr",
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+        count = 0
+        for timestamp, action_code, severity, email, description, ip, obj in rows:
+            count += 1
+            yield writer.writerow(
                 [
-                    log.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                    log.get_action_display(),
-                    log.get_severity_display(),
-                    log.user.email if log.user else "Sistema",
-                    log.description,
-                    log.ip_address or "",
-                    log.object_repr,
+                    timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                    action_dict.get(action_code, action_code),
+                    severity_dict.get(severity, severity),
+                    email or "Sistema",
+                    description,
+                    ip or "",
+                    obj,
                 ]
             )
 
-        # Registrar a exportação
-        AuditLog.objects.create_log(
-            action="EXPORT",
-            user=request.user if request.user.is_authenticated else None,
-            description="Exportação de logs de auditoria",
-            ip_address=self._get_client_ip(request),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
-            metadata={"count": queryset.count()},
+        AuditLog.objects.filter(pk=export_log.pk).update(
+            metadata={**export_log.metadata, "count": count}
         )
 
-        return response
-
     @action(detail=False, methods=["get"])
     def recent_security(self, request):
         """
@@ -282,37 +334,39 @@ class AuditLogSummaryViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ["-date"]
 
     def get_queryset(self):
-        """Filtra por tenant do usuário."""
-        user = self.request.user
-
-        if user.is_superuser:
-            return AuditLogSummary.objects.all()
-
-        return AuditLogSummary.objects.filter(tenant=getattr(user, "client", None))
+        """Filtra por tenant da requisição."""
+        return _tenant_scope(self.request, AuditLogSummary.objects.all())
 
     @action(detail=False, methods=["get"])
     def by_date(self, request):
         """
         Retorna resumo agregado por data.
 
+        Dias ainda não resumidos (hoje) são calculados dos logs brutos.
+
         Query params:
         - days: Número de dias (default: 30)
         """
         days = int(request.query_params.get("days", 30))
-        date_from = timezone.now().date() - timedelta(days=days)
-
-        queryset = self.get_queryset().filter(date__gte=date_from)
+        date_from = timezone.localdate() - timedelta(days=days)
 
-        # Agregar por data
-        aggregated = (
-            queryset.values("date")
-            .annotate(
-                total_count=Count("id"), total_actions=Count("action", distinct=True)
-            )
-            .order_by("date")
+        activity = collect_activity(
+            self.get_queryset(),
+            _tenant_scope(request, AuditLog.objects.all()),
+            date_from=date_from,
         )
 
-        return Response(list(aggregated))
+        return Response(
+            [
+                {
+                    "date": day,
+                    "total_count": sum(counts.values()),
+                    "total_actions": len(counts),
+                    "unique_users": activity.daily_users[day].count(),
+                }
+                for day, counts in sorted(activity.daily.items())
+            ]
+        )
 
 
 class UserSessionViewSet(viewsets.ReadOnlyModelViewSet):
@@ -339,7 +393,7 @@ class UserSessionViewSet(viewsets.ReadOnlyModelViewSet):
             return UserSession.objects.all()
 
         return UserSession.objects.filter(
-            Q(tenant=getattr(user, "client", None)) | Q(user=user)
+            Q(tenant=_request_tenant(self.request)) | Q(user=user)
         ).select_related("user")
 
     @action(detail=False, methods=["get"])
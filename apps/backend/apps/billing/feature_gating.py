@@ -11,8 +11,14 @@ from typing import List, Optional
 from rest_framework import status
 from rest_framework.response import Response
 
+from apps.core.two_tier_cache import TwoTierCache
+
 from .models import Subscription
 
+# Assinatura ativa (com plano) por tenant; invalidada pelos signals de
+# Subscription (escopo do tenant) e Plan (namespace inteiro)
+subscription_cache = TwoTierCache("billing:subscription", timeout=60 * 60)
+
 
 def require_plan(
     required_features: Optional[List[str]] = None,
@@ -62,18 +68,7 @@ def require_plan(
                 )
 
             # Busca subscription ativa
-            subscription = (
-                Subscription.objects.filter(
-                    client=client,
-                    status__in=[
-                        Subscription.STATUS_ACTIVE,
-                        Subscription.STATUS_TRIALING,
-                        Subscription.STATUS_PAST_DUE,
-                    ],
-                )
-                .select_related("plan")
-                .first()
-            )
+            subscription = get_client_subscription(client)
 
             if not subscription:
                 return Response(
@@ -169,9 +164,18 @@ def get_client_subscription(client):
     Args:
         client: Instância do Client (tenant)
 
+    Servida pelo cache em dois níveis: a instância retornada é compartilhada
+    e não deve ser modificada.
+
     Returns:
         Subscription ou None
     """
+    return subscription_cache.get_or_set(
+        "active", lambda: _query_client_subscription(client), scope=client.pk
+    )
+
+
+def _query_client_subscription(client):
     # Usa all_tenants() para evitar filtro do TenantAwareManager
     # já que estamos filtrando explicitamente pelo client
     return (
@@ -5,16 +5,20 @@ Sprint 4 - Feature 4.2: Planos & Trial
 Signals para:
 - Auto-iniciar trial quando novo tenant é criado
 - Enviar notificações de trial expirando
+- Invalidar o cache de assinaturas/planos usado no feature gating
+- Invalidar os ETags da listagem pública de planos
 """
 
 import logging
 
 from django.db import IntegrityError
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from apps.core.conditional import bump_resource_version
 from apps.tenants.models import Client
 
+from .feature_gating import subscription_cache
 from .models import Plan, Subscription
 
 logger = logging.getLogger(__name__)
@@ -73,3 +77,18 @@ def auto_start_trial_for_new_tenant(sender, instance, created, **kwargs):
         logger.info(f"Subscription já existe para {instance.nome}")
     except Exception as e:
         logger.error(f"Erro ao criar trial para {instance.nome}: {e}")
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def invalidate_subscription_cache(sender, instance, **kwargs):
+    """Invalida a assinatura em cache do tenant."""
+    subscription_cache.invalidate(scope=instance.client_id)
+
+
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+def invalidate_plan_cache(sender, instance, **kwargs):
+    """Planos mudaram: invalida as assinaturas em cache e os ETags da listagem."""
+    subscription_cache.invalidate()
+    bump_resource_version("plans")
@@ -22,6 +22,8 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.conditional import ConditionalResponseMixin
+
 from . import stripe_service
 from .models import Invoice, Plan, Subscription
 from .serializers import (
@@ -39,16 +41,21 @@ from .serializers import (
 logger = logging.getLogger(__name__)
 
 
-class PlanViewSet(viewsets.ReadOnlyModelViewSet):
+class PlanViewSet(ConditionalResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para planos de assinatura.
 
     GET /api/v1/billing/plans/ - Lista planos ativos
     GET /api/v1/billing/plans/{id}/ - Detalhes de um plano
+
+    GET condicional: versão global "plans" (signals de Plan) + updated_at
     """
 
     queryset = Plan.objects.filter(is_active=True)
     permission_classes = [AllowAny]  # Planos são públicos
+    conditional_resource = "plans"
+    conditional_per_tenant = False
+    conditional_last_modified_field = "updated_at"
 
     def get_serializer_class(self):
         if self.request.user.is_authenticated:
@@ -278,9 +285,7 @@ class UsageStatsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        from django.utils import timezone
-        from apps.feedbacks.models import Feedback
-        from .feature_gating import get_client_subscription
+        from apps.core.cache_service import CacheService
 
         client = getattr(request.user, "client", None)
         if not client:
@@ -289,15 +294,35 @@ class UsageStatsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Busca subscription ativa
-        subscription = get_client_subscription(client)
-        
-        if not subscription:
+        # Cache curto protegido contra stampede (o frontend consulta a cada
+        # tela); invalidado quando um feedback é criado
+        service = CacheService(tenant_id=client.id)
+        data = service.get_or_set(
+            service._build_key(CacheService.USAGE_PREFIX, "stats"),
+            lambda: self._compute_usage(client),
+            timeout=60,
+        )
+
+        if data is None:
             return Response(
                 {"error": "Assinatura não encontrada"},
                 status=status.HTTP_402_PAYMENT_REQUIRED,
             )
 
+        return Response(data)
+
+    def _compute_usage(self, client):
+        """Calcula o uso do mês (None se o client não tiver assinatura)."""
+        from django.utils import timezone
+        from apps.feedbacks.models import Feedback
+        from .feature_gating import get_client_subscription
+
+        # Busca subscription ativa
+        subscription = get_client_subscription(client)
+
+        if not subscription:
+            return None
+
         plan = subscription.plan
 
         # Conta feedbacks do mês atual
@@ -341,5 +366,5 @@ class UsageStatsView(APIView):
 
         from .serializers import UsageStatsSerializer
         serializer = UsageStatsSerializer(data)
-        return Response(serializer.data)
+        return dict(serializer.data)
 
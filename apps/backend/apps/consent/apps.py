@@ -5,3 +5,7 @@ class ConsentConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.consent"
     verbose_name = "Consent Management"
+
+    def ready(self):
+        """Registra signals quando o app é carregado."""
+        import apps.consent.signals  # noqa: F401
@@ -0,0 +1,18 @@
+"""
+Consent Signals - Ouvify
+
+Invalida o cache dos termos obrigatórios quando uma versão muda.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ConsentVersion
+from .views import required_consents_cache
+
+
+@receiver(post_save, sender=ConsentVersion)
+@receiver(post_delete, sender=ConsentVersion)
+def invalidate_required_consents(sender, instance, **kwargs):
+    """Nova versão (ou mudança de vigência) invalida a lista de obrigatórios."""
+    required_consents_cache.invalidate()
@@ -3,6 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.two_tier_cache import TwoTierCache
+
 from .models import ConsentLog, ConsentVersion, UserConsent
 from .serializers import (
     AcceptConsentSerializer,
@@ -10,6 +12,9 @@ from .serializers import (
     UserConsentSerializer,
 )
 
+# Termos obrigatórios vigentes (invalidado pelos signals de ConsentVersion)
+required_consents_cache = TwoTierCache("consent:required", timeout=60 * 60 * 24)
+
 
 class ConsentVersionViewSet(viewsets.ReadOnlyModelViewSet):
     """Endpoint para obter versões atuais dos termos"""
@@ -21,9 +26,13 @@ class ConsentVersionViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=["get"])
     def required(self, request):
         """Retorna apenas os consentimentos obrigatórios"""
-        required = self.queryset.filter(is_required=True)
-        serializer = self.get_serializer(required, many=True)
-        return Response(serializer.data)
+
+        def serialize_required():
+            required = self.get_queryset().filter(is_required=True)
+            return list(self.get_serializer(required, many=True).data)
+
+        data = required_consents_cache.get_or_set("list", serialize_required)
+        return Response(data)
 
 
 class UserConsentViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,197 @@
+"""
+Contabilização adiada de uso das API keys
+Cada requisição autenticada por API key incrementa contadores no Redis
+(HINCRBY + HSET, sem escrita no banco); a tarefa periódica
+flush_api_key_usage grava tudo com um único UPDATE por lote de keys.
+
+Sem Redis o cache de cada processo não é visto pelo worker do Celery: o uso
+vai direto ao banco, no máximo uma vez por key a cada
+API_KEY_USAGE_WRITE_INTERVAL segundos em cada processo.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.db.models import Case, DateTimeField, F, PositiveIntegerField, Value, When
+
+from apps.core.redis_utils import get_redis_client, redis_key
+
+logger = logging.getLogger(__name__)
+
+COUNTS_KEY = "api_key_usage:counts"
+LAST_USED_KEY = "api_key_usage:last_used"
+
+# Keys por UPDATE no flush (tamanho do CASE gerado)
+FLUSH_BATCH_SIZE = 500
+
+# {api_key_id: (requisições, último uso em epoch)}
+Usage = Dict[int, Tuple[int, float]]
+
+
+class _RedisUsageStore:
+    """Contadores em dois hashes: requisições e último uso por key"""
+
+    def __init__(self, client):
+        self.client = client
+        self.counts_key = redis_key(COUNTS_KEY)
+        self.last_used_key = redis_key(LAST_USED_KEY)
+
+    def add(self, usage: Usage) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for key_id, (count, used_at) in usage.items():
+            pipe.hincrby(self.counts_key, key_id, count)
+            pipe.hset(self.last_used_key, key_id, used_at)
+        pipe.execute()
+
+    def drain(self) -> Usage:
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hgetall(self.counts_key)
+        pipe.hgetall(self.last_used_key)
+        pipe.delete(self.counts_key, self.last_used_key)
+        counts, last_used, _ = pipe.execute()
+        return {
+            int(key_id): (int(count), float(last_used.get(key_id, time.time())))
+            for key_id, count in counts.items()
+        }
+
+
+class _DatabaseUsageStore:
+    """
+    Fallback sem Redis: grava direto no banco, limitado por key e processo
+
+    Requisições dentro do intervalo somam-se à gravação seguinte da mesma
+    key neste processo (perdidas se o processo terminar antes dela).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Usage = {}
+        self._written_at: Dict[int, float] = {}
+
+    @staticmethod
+    def _interval() -> float:
+        return getattr(settings, "API_KEY_USAGE_WRITE_INTERVAL", 60)
+
+    def add(self, usage: Usage) -> None:
+        now = time.monotonic()
+        due: Usage = {}
+        with self._lock:
+            for key_id, (count, used_at) in usage.items():
+                previous_count, previous_used = self._pending.get(key_id, (0, 0.0))
+                self._pending[key_id] = (
+                    previous_count + count,
+                    max(previous_used, used_at),
+                )
+                written_at = self._written_at.get(key_id)
+                if written_at is None or now - written_at >= self._interval():
+                    due[key_id] = self._pending.pop(key_id)
+                    self._written_at[key_id] = now
+        if not due:
+            return
+
+        try:
+            write_usage(due)
+        except Exception:
+            with self._lock:
+                for key_id, (count, used_at) in due.items():
+                    previous_count, previous_used = self._pending.get(key_id, (0, 0.0))
+                    self._pending[key_id] = (
+                        previous_count + count,
+                        max(previous_used, used_at),
+                    )
+            raise
+
+    def drain(self) -> Usage:
+        with self._lock:
+            pending = dict(self._pending)
+            self._pending.clear()
+        return pending
+
+
+_database_store = _DatabaseUsageStore()
+
+
+def _get_store():
+    client = get_redis_client()
+    if client is not None:
+        return _RedisUsageStore(client)
+    return _database_store
+
+
+def record_api_key_usage(api_key_id: int) -> None:
+    """Registra uma requisição da key (sem tocar no banco)"""
+    try:
+        _get_store().add({api_key_id: (1, time.time())})
+    except Exception as e:
+        logger.warning(f"⚠️ Erro ao registrar uso da API key {api_key_id}: {e}")
+
+
+def write_usage(usage: Usage) -> int:
+    """
+    Soma o uso ao banco em um único UPDATE (CASE por ID)
+
+    Returns:
+        Número de API keys atualizadas
+    """
+    from apps.core.api_keys import APIKey
+
+    return (
+        APIKey.objects.all_tenants()
+        .filter(pk__in=usage)
+        .update(
+            requests_count=F("requests_count")
+            + Case(
+                *[
+                    When(pk=key_id, then=Value(count))
+                    for key_id, (count, _) in usage.items()
+                ],
+                default=Value(0),
+                output_field=PositiveIntegerField(),
+            ),
+            last_used_at=Case(
+                *[
+                    When(
+                        pk=key_id,
+                        then=Value(datetime.fromtimestamp(used_at, tz=dt_timezone.utc)),
+                    )
+                    for key_id, (_, used_at) in usage.items()
+                ],
+                default=F("last_used_at"),
+                output_field=DateTimeField(),
+            ),
+        )
+    )
+
+
+def flush_api_key_usage() -> int:
+    """
+    Grava no banco o uso acumulado desde o último flush
+
+    Um UPDATE por lote de FLUSH_BATCH_SIZE keys (CASE por ID). Em caso de
+    erro no banco, o uso drenado volta para o armazenamento.
+
+    Returns:
+        Número de API keys atualizadas
+    """
+    store = _get_store()
+    usage = store.drain()
+    if not usage:
+        return 0
+
+    items = list(usage.items())
+    updated = 0
+    for start in range(0, len(items), FLUSH_BATCH_SIZE):
+        try:
+            updated += write_usage(dict(items[start : start + FLUSH_BATCH_SIZE]))
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar uso das API keys: {e}")
+            store.add(dict(items[start:]))
+            break
+
+    logger.debug(f"🔑 Uso de {updated} API key(s) gravado no banco")
+    return updated
@@ -8,6 +8,11 @@ Funcionalidades:
 - Geração de API keys para acesso programático
 - Validação e autenticação via API key
 - Rate limiting por API key
+
+Keys validadas ficam em cache pelo hash (invalidado ao revogar/alterar);
+o uso (requests_count/last_used_at) é acumulado no Redis e gravado em lote
+pela tarefa flush_api_key_usage, ou gravado direto no banco com limite de
+frequência quando não há Redis (apps.core.api_key_usage).
 """
 
 import hashlib
@@ -15,13 +20,35 @@ import logging
 import secrets
 from datetime import timedelta
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from apps.core.models import TenantAwareModel
+from apps.core.utils import get_current_tenant
 
 logger = logging.getLogger(__name__)
 
+VALIDATED_KEY_CACHE_KEY = "api_key:validated:{key_hash}"
+
+# Campos guardados no cache de validação (dict simples: serializável por
+# qualquer serializer do cache, inclusive JSON); os demais ficam adiados
+VALIDATED_KEY_FIELDS = (
+    "id",
+    "client_id",
+    "name",
+    "prefix",
+    "key_hash",
+    "permissions",
+    "expires_at",
+    "is_active",
+    "rate_limit",
+)
+
 
 class APIKey(TenantAwareModel):
     """
@@ -154,6 +181,10 @@ class APIKey(TenantAwareModel):
         """
         Valida uma API key.
 
+        A key validada fica em cache pelo hash (API_KEY_CACHE_TTL, limitado
+        à expiração) como dict de VALIDATED_KEY_FIELDS; o uso é registrado
+        por record_api_key_usage, sem escrita no banco a cada requisição.
+
         Args:
             raw_key: A key completa fornecida na requisição
 
@@ -165,56 +196,118 @@ class APIKey(TenantAwareModel):
 
         prefix = raw_key[:8]
         key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
+        cache_key = VALIDATED_KEY_CACHE_KEY.format(key_hash=key_hash)
 
-        try:
-            api_key = cls.objects.select_related("client").get(
-                prefix=prefix, key_hash=key_hash, is_active=True
-            )
-
-            # Verificar expiração
-            if api_key.expires_at and api_key.expires_at < timezone.now():
-                logger.warning(f"⚠️ API Key expirada: {api_key.name}")
+        api_key = cls._from_cache(cache_key)
+        if api_key is not None:
+            # Mesmo escopo da consulta: apenas keys do tenant atual
+            tenant = get_current_tenant()
+            if tenant is None or tenant.pk != api_key.client_id:
                 return None
+            api_key.client = tenant
+        else:
+            try:
+                api_key = cls.objects.select_related("client").get(
+                    prefix=prefix, key_hash=key_hash, is_active=True
+                )
+            except cls.DoesNotExist:
+                return None
+            api_key._cache_validated(cache_key)
+
+        # Verificar expiração
+        if api_key.expires_at and api_key.expires_at < timezone.now():
+            logger.warning(f"⚠️ API Key expirada: {api_key.name}")
+            return None
 
-            # Atualizar último uso
-            api_key.last_used_at = timezone.now()
-            api_key.requests_count += 1
-            api_key.save(update_fields=["last_used_at", "requests_count"])
+        # Registrar uso (gravado no banco em lote por flush_api_key_usage)
+        from apps.core.api_key_usage import record_api_key_usage
 
-            return api_key
+        record_api_key_usage(api_key.id)
 
-        except cls.DoesNotExist:
+        return api_key
+
+    @classmethod
+    def _from_cache(cls, cache_key: str):
+        """Reconstrói a key validada do cache (None se ausente)"""
+        try:
+            data = cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao ler API key do cache: {e}")
             return None
+        if not isinstance(data, dict) or not data.keys() >= set(VALIDATED_KEY_FIELDS):
+            return None
+
+        values = dict(data)
+        if isinstance(values["expires_at"], str):
+            values["expires_at"] = parse_datetime(values["expires_at"])
+        return cls.from_db(
+            "default", VALIDATED_KEY_FIELDS, [values[f] for f in VALIDATED_KEY_FIELDS]
+        )
+
+    def _cache_validated(self, cache_key: str) -> None:
+        timeout = getattr(settings, "API_KEY_CACHE_TTL", 300)
+        if self.expires_at:
+            remaining = (self.expires_at - timezone.now()).total_seconds()
+            timeout = min(timeout, int(remaining))
+        if timeout <= 0:
+            return
+
+        data = {field: getattr(self, field) for field in VALIDATED_KEY_FIELDS}
+        if data["expires_at"]:
+            data["expires_at"] = data["expires_at"].isoformat()
+        try:
+            cache.set(cache_key, data, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar API key no cache: {e}")
+
+    def invalidate_cache(self) -> None:
+        """Remove a key validada do cache (revogação/alteração)."""
+        cache.delete(VALIDATED_KEY_CACHE_KEY.format(key_hash=self.key_hash))
 
     def is_rate_limited(self) -> bool:
         """
         Verifica se a key excedeu o rate limit.
 
+        Janela deslizante de 1 hora (SlidingWindowRateLimiter): contagem e
+        registro atômicos, sem corrida entre requisições simultâneas.
+
         Returns:
             True se rate limited, False caso contrário
         """
-        from django.core.cache import cache
+        from apps.core.rate_limiter import get_rate_limiter
 
-        cache_key = f"api_key_rate:{self.id}"
-        current = cache.get(cache_key, 0)
+        result = get_rate_limiter().hit(
+            f"api_key_rate:{self.id}", self.rate_limit, window=3600
+        )
 
-        if current >= self.rate_limit:
+        if not result.allowed:
             logger.warning(
-                f"⚠️ Rate limit excedido: {self.name} ({current}/{self.rate_limit})"
+                f"⚠️ Rate limit excedido: {self.name} ({self.rate_limit}/hora) | "
+                f"Aguardar: {int(result.retry_after)}s"
             )
             return True
 
-        # Incrementar contador (expira em 1 hora)
-        cache.set(cache_key, current + 1, timeout=3600)
         return False
 
     def revoke(self):
-        """Revoga (desativa) a API key."""
+        """
+        Revoga (desativa) a API key.
+
+        O post_save remove a key do cache de validação: requisições
+        seguintes voltam a consultar o banco e são rejeitadas.
+        """
         self.is_active = False
         self.save(update_fields=["is_active"])
         logger.info(f"🔒 API Key revogada: {self.name}")
 
 
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def invalidate_validated_api_key(sender, instance, **kwargs):
+    """Expiração/rate limit/permissões alterados: descarta a key em cache."""
+    instance.invalidate_cache()
+
+
 # =============================================================================
 # AUTENTICAÇÃO POR API KEY
 # =============================================================================
@@ -6,14 +6,144 @@ Abstrai operações de cache com padrões comuns
 import hashlib
 import json
 import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from django.conf import settings
 from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
 
+# =========================================================================
+# Namespaces versionados (gerações)
+# =========================================================================
+#
+# Cada namespace (tenant inteiro ou domínio + tenant) tem um contador de
+# geração embutido nas chaves. Invalidar = um INCR; as chaves antigas deixam
+# de ser lidas e expiram pelo TTL, sem SCAN/delete_pattern no keyspace.
+
+GENERATION_KEY = "cache:generation:{namespace}"
+
+# Cópia local (por processo) das gerações: evita uma ida ao cache por chave.
+# Invalidações feitas em outros processos ficam visíveis em até
+# CACHE_GENERATION_LOCAL_TTL segundos.
+_local_generations: Dict[str, Tuple[int, float]] = {}
+_local_lock = threading.Lock()
+
+
+def tenant_namespace(tenant_id: Any, prefix: Optional[str] = None) -> str:
+    """Namespace do tenant inteiro ou de um domínio (analytics, dashboard...)"""
+    if prefix:
+        return f"{prefix}:tenant:{tenant_id}"
+    return f"tenant:{tenant_id}"
+
+
+def _local_ttl() -> float:
+    return getattr(settings, "CACHE_GENERATION_LOCAL_TTL", 2)
+
+
+def _initial_generation() -> int:
+    # Baseada no relógio: se o contador for removido do cache, a nova geração
+    # não coincide com gerações antigas cujas chaves ainda não expiraram
+    return int(time.time() * 1000)
+
+
+def get_generations(*namespaces: str, local_ttl: Optional[float] = None) -> List[int]:
+    """
+    Retorna a geração atual de cada namespace
+
+    Usa a cópia local quando válida; as ausentes são lidas com um único
+    get_many e inicializadas com cache.add se ainda não existirem.
+
+    Args:
+        local_ttl: Validade da cópia local em segundos
+            (padrão CACHE_GENERATION_LOCAL_TTL)
+    """
+    now = time.monotonic()
+    result: Dict[str, int] = {}
+    missing = []
+
+    with _local_lock:
+        for namespace in namespaces:
+            local = _local_generations.get(namespace)
+            if local and local[1] > now:
+                result[namespace] = local[0]
+            else:
+                missing.append(namespace)
+
+    if missing:
+        keys = {GENERATION_KEY.format(namespace=ns): ns for ns in missing}
+        try:
+            stored = cache.get_many(list(keys))
+            for key, namespace in keys.items():
+                generation = stored.get(key)
+                if generation is None:
+                    generation = _initial_generation()
+                    if not cache.add(key, generation, timeout=None):
+                        generation = cache.get(key) or generation
+                result[namespace] = generation
+        except Exception as e:
+            logger.warning(f"Erro ao ler gerações de cache: {e}")
+            return [result.get(ns, 0) for ns in namespaces]
+
+        expires_at = now + (_local_ttl() if local_ttl is None else local_ttl)
+        with _local_lock:
+            for namespace in missing:
+                _local_generations[namespace] = (result[namespace], expires_at)
+
+    return [result[ns] for ns in namespaces]
+
+
+def bump_generation(namespace: str) -> int:
+    """
+    Invalida todas as chaves do namespace (um INCR)
+
+    Returns:
+        Nova geração do namespace
+    """
+    key = GENERATION_KEY.format(namespace=namespace)
+    try:
+        try:
+            generation = cache.incr(key)
+        except ValueError:
+            # Contador ausente: nova geração baseada no relógio
+            if not cache.add(key, _initial_generation(), timeout=None):
+                generation = cache.incr(key)
+            else:
+                generation = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Erro ao invalidar namespace de cache {namespace}: {e}")
+        return 0
+
+    with _local_lock:
+        _local_generations[namespace] = (generation, time.monotonic() + _local_ttl())
+    return generation
+
+
+def clear_local_generations() -> None:
+    """Descarta a cópia local das gerações (testes / após cache.clear())"""
+    with _local_lock:
+        _local_generations.clear()
+
+
+def namespace_token(prefix: str, tenant_id: Any) -> str:
+    """
+    Segmento de chave com as gerações do tenant e do domínio (ex: g17.3)
+
+    Invalidar o tenant inteiro ou apenas o domínio muda o segmento.
+    """
+    tenant_gen, domain_gen = get_generations(
+        tenant_namespace(tenant_id), tenant_namespace(tenant_id, prefix)
+    )
+    return f"g{tenant_gen}.{domain_gen}"
+
+
 class CacheService:
     """
     Service de cache com operações de alto nível
@@ -29,6 +159,7 @@ class CacheService:
     ANALYTICS_PREFIX = "analytics"
     FEEDBACKS_PREFIX = "feedbacks"
     DASHBOARD_PREFIX = "dashboard"
+    USAGE_PREFIX = "usage"
     USER_PREFIX = "user"
 
     # Timeouts padrão (segundos)
@@ -58,6 +189,7 @@ class CacheService:
 
         if self.tenant_id:
             parts.append(f"tenant:{self.tenant_id}")
+            parts.append(namespace_token(prefix, self.tenant_id))
 
         parts.extend([str(arg) for arg in args])
 
@@ -122,6 +254,9 @@ class CacheService:
         """
         Remove todas as chaves que correspondem ao padrão
 
+        ⚠️ Varre o keyspace (SCAN no Redis). Para invalidar dados de um
+        tenant/domínio use invalidate_tenant_cache/invalidate_prefix.
+
         Args:
             pattern: Padrão de chave (ex: 'feedbacks:tenant:1:*')
 
@@ -146,31 +281,28 @@ class CacheService:
             return 0
 
     def get_or_set(
-        self, key: str, factory: Callable[[], Any], timeout: Optional[int] = None
+        self,
+        key: str,
+        factory: Callable[[], Any],
+        timeout: Optional[int] = None,
+        stale_ttl: int = 0,
     ) -> Any:
         """
-        Pattern cache-aside: obtém do cache ou executa factory
+        Pattern cache-aside com proteção contra stampede
 
         Args:
             key: Chave do cache
             factory: Função que gera o valor se não estiver em cache
-            timeout: TTL em segundos
+            timeout: TTL em segundos (usa MEDIUM_TTL se não informado)
+            stale_ttl: Janela (s) em que o valor expirado ainda é servido
+                enquanto uma tarefa em background o recalcula
 
         Returns:
             Valor do cache ou resultado do factory
         """
-        value = self.get(key)
-
-        if value is not None:
-            return value
-
-        # Executar factory
-        value = factory()
-
-        if value is not None:
-            self.set(key, value, timeout)
-
-        return value
+        return protected_get_or_set(
+            key, factory, timeout or self.MEDIUM_TTL, stale_ttl=stale_ttl
+        )
 
     # =========================================================================
     # Operações específicas por domínio
@@ -215,21 +347,215 @@ class CacheService:
         return self.set(key, data, timeout or self.SHORT_TTL)
 
     def invalidate_tenant_cache(self) -> int:
-        """Invalida todo cache do tenant atual"""
+        """
+        Invalida todo cache do tenant atual
+
+        Incrementa a geração do tenant; as chaves antigas expiram pelo TTL.
+
+        Returns:
+            Nova geração do tenant (0 se não houver tenant)
+        """
+        if not self.tenant_id:
+            return 0
+
+        generation = bump_generation(tenant_namespace(self.tenant_id))
+        logger.info(
+            f"Cache do tenant {self.tenant_id} invalidado (geração {generation})"
+        )
+        return generation
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Invalida um domínio (analytics, dashboard, feedbacks...) do tenant atual
+
+        Returns:
+            Nova geração do domínio (0 se não houver tenant)
+        """
         if not self.tenant_id:
             return 0
 
-        patterns = [
-            f"*:tenant:{self.tenant_id}:*",
-            f"*:tenant:{self.tenant_id}",
-        ]
+        return bump_generation(tenant_namespace(self.tenant_id, prefix))
 
-        count = 0
-        for pattern in patterns:
-            count += self.delete_pattern(pattern)
 
-        logger.info(f"Invalidadas {count} chaves do tenant {self.tenant_id}")
-        return count
+# =========================================================================
+# get_or_set protegido contra stampede
+# =========================================================================
+#
+# Entradas são gravadas como {"value", "delta", "expires_at"}:
+# - single-flight: apenas quem obtém o lock (cache.add) recalcula a chave
+# - XFetch: antes de expirar, cada leitura decide recalcular com probabilidade
+#   crescente (now - delta * beta * ln(rand) >= expires_at), espalhando o
+#   recálculo em vez de todos expirarem juntos
+# - stale-while-revalidate: com stale_ttl, a entrada vive timeout + stale_ttl;
+#   após expirar, o valor antigo é servido enquanto uma tarefa em background
+#   (thread do pool, com o tenant do request) recalcula
+
+LOCK_SUFFIX = ":lock"
+LOCK_TTL = 30  # Limite caso o processo dono do lock morra
+WAIT_TIMEOUT = 2.0
+WAIT_INTERVAL = 0.05
+XFETCH_BETA = 1.0
+
+_refresh_executor = None
+_refresh_executor_lock = threading.Lock()
+
+
+def _read_entry(key: str) -> Optional[dict]:
+    try:
+        entry = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Erro ao ler cache: {e}")
+        return None
+    if isinstance(entry, dict) and "expires_at" in entry and "value" in entry:
+        return entry
+    return None
+
+
+def _compute_and_store(
+    key: str, factory: Callable[[], Any], timeout: int, stale_ttl: int
+) -> Any:
+    started = time.monotonic()
+    value = factory()
+    if value is None:
+        return None
+
+    entry = {
+        "value": value,
+        "delta": time.monotonic() - started,
+        "expires_at": time.time() + timeout,
+    }
+    try:
+        cache.set(key, entry, timeout=timeout + stale_ttl)
+    except Exception as e:
+        logger.warning(f"Erro ao escrever cache: {e}")
+    return value
+
+
+def _acquire_lock(lock_key: str) -> bool:
+    """Lock de recálculo; com o cache indisponível, quem chama calcula sem lock"""
+    try:
+        return cache.add(lock_key, True, timeout=LOCK_TTL)
+    except Exception as e:
+        logger.warning(f"Erro ao obter lock de cache: {e}")
+        return True
+
+
+def _release_lock(lock_key: str) -> None:
+    try:
+        cache.delete(lock_key)
+    except Exception as e:
+        logger.warning(f"Erro ao liberar lock de cache: {e}")
+
+
+def _should_recompute(entry: dict, beta: float) -> bool:
+    """XFetch: recálculo antecipado probabilístico"""
+    gap = entry["delta"] * beta * -math.log(max(random.random(), 1e-12))
+    return time.time() + gap >= entry["expires_at"]
+
+
+def _get_refresh_executor():
+    global _refresh_executor
+    with _refresh_executor_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "CACHE_REFRESH_WORKERS", 4),
+                thread_name_prefix="cache-refresh",
+            )
+    return _refresh_executor
+
+
+def _refresh(key, factory, timeout, stale_ttl, lock_key, tenant) -> None:
+    from django.db import close_old_connections
+
+    from apps.core.utils import tenant_context
+
+    try:
+        with tenant_context(tenant):
+            _compute_and_store(key, factory, timeout, stale_ttl)
+    except Exception as e:
+        logger.error(f"Erro ao recalcular cache {key}: {e}")
+    finally:
+        _release_lock(lock_key)
+        close_old_connections()
+
+
+def _schedule_refresh(key, factory, timeout, stale_ttl, lock_key) -> None:
+    """Recalcula em background (ou na própria thread, se desabilitado)"""
+    from apps.core.utils import get_current_tenant
+
+    if not getattr(settings, "CACHE_REFRESH_IN_BACKGROUND", True):
+        try:
+            _compute_and_store(key, factory, timeout, stale_ttl)
+        finally:
+            _release_lock(lock_key)
+        return
+
+    _get_refresh_executor().submit(
+        _refresh, key, factory, timeout, stale_ttl, lock_key, get_current_tenant()
+    )
+
+
+def _wait_for_entry(key: str) -> Optional[dict]:
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = _read_entry(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def protected_get_or_set(
+    key: str,
+    factory: Callable[[], Any],
+    timeout: int,
+    stale_ttl: int = 0,
+    beta: float = XFETCH_BETA,
+) -> Any:
+    """
+    Obtém do cache ou calcula uma única vez por chave (ver comentário acima)
+
+    Args:
+        key: Chave do cache
+        factory: Calcula o valor (None não é armazenado)
+        timeout: Validade do valor em segundos
+        stale_ttl: Janela (s) de stale-while-revalidate (0 = desabilitado)
+        beta: Agressividade do XFetch (> 1 recalcula mais cedo)
+    """
+    lock_key = f"{key}{LOCK_SUFFIX}"
+    entry = _read_entry(key)
+
+    if entry is not None:
+        if not _should_recompute(entry, beta):
+            return entry["value"]
+
+        expired = time.time() >= entry["expires_at"]
+        if not _acquire_lock(lock_key):
+            # Outra requisição já está recalculando: serve o valor atual
+            return entry["value"]
+
+        if expired and stale_ttl:
+            _schedule_refresh(key, factory, timeout, stale_ttl, lock_key)
+            return entry["value"]
+
+        try:
+            value = _compute_and_store(key, factory, timeout, stale_ttl)
+        finally:
+            _release_lock(lock_key)
+        return entry["value"] if value is None else value
+
+    if not _acquire_lock(lock_key):
+        # Single-flight: aguarda o valor calculado por outra requisição
+        entry = _wait_for_entry(key)
+        if entry is not None:
+            return entry["value"]
+        logger.debug(f"Timeout aguardando recálculo de {key}")
+        return factory()
+
+    try:
+        return _compute_and_store(key, factory, timeout, stale_ttl)
+    finally:
+        _release_lock(lock_key)
 
 
 # =========================================================================
@@ -279,19 +605,10 @@ def cached(
 
                 cache_key = ":".join(key_parts)
 
-            # Tentar obter do cache
-            result = cache.get(cache_key)
-            if result is not None:
-                return result
-
-            # Executar função
-            result = func(*args, **kwargs)
-
-            # Salvar no cache
-            if result is not None:
-                cache.set(cache_key, result, timeout=timeout)
-
-            return result
+            # Obter do cache ou executar (uma vez por chave)
+            return protected_get_or_set(
+                cache_key, lambda: func(*args, **kwargs), timeout
+            )
 
         return wrapper
 
@@ -314,11 +631,12 @@ def cached_method(prefix: str, timeout: int = 60 * 15, tenant_aware: bool = True
             # Construir chave
             key_parts = [prefix]
 
-            # Incluir tenant se disponível
+            # Incluir tenant (e gerações do namespace) se disponível
             if tenant_aware:
                 tenant_id = getattr(self, "tenant_id", None)
                 if tenant_id:
                     key_parts.append(f"tenant:{tenant_id}")
+                    key_parts.append(namespace_token(prefix, tenant_id))
 
             key_parts.append(method.__name__)
             key_parts.extend([str(a) for a in args])
@@ -332,19 +650,10 @@ def cached_method(prefix: str, timeout: int = 60 * 15, tenant_aware: bool = True
                 )
             cache_key = ":".join(key_parts)
 
-            # Tentar obter do cache
-            result = cache.get(cache_key)
-            if result is not None:
-                return result
-
-            # Executar método
-            result = method(self, *args, **kwargs)
-
-            # Salvar no cache
-            if result is not None:
-                cache.set(cache_key, result, timeout=timeout)
-
-            return result
+            # Obter do cache ou executar (uma vez por chave)
+            return protected_get_or_set(
+                cache_key, lambda: method(self, *args, **kwargs), timeout
+            )
 
         return wrapper
 
@@ -388,7 +697,6 @@ def invalidate_on_change(model_class, cache_prefix: str):
         )
 
         if tenant_id:
-            service = CacheService(tenant_id=tenant_id)
-            service.delete_pattern(f"{cache_prefix}:tenant:{tenant_id}:*")
+            CacheService(tenant_id=tenant_id).invalidate_prefix(cache_prefix)
 
     return receiver
@@ -0,0 +1,178 @@
+"""
+Respostas condicionais (ETag / If-None-Match) para views DRF de leitura
+
+O ETag não é calculado a partir do corpo: combina um contador de versão do
+recurso (por tenant, ou global) com a data de atualização do objeto
+(data_atualizacao/updated_at) no retrieve. Assim o 304 é respondido antes de
+avaliar o queryset e de serializar:
+
+- list: nenhuma query (apenas o contador de versão, normalmente em memória)
+- retrieve: uma query de uma coluna (data de atualização ou pk)
+
+Os signals de cada app incrementam o contador (bump_resource_version) quando
+algo exibido pela resposta muda sem alterar a data do objeto (interações,
+tags, exclusões...). A versão usa as gerações de apps.core.cache_service:
+invalidate_tenant_cache() também invalida os ETags do tenant.
+
+Last-Modified é enviado quando há data de atualização, mas a decisão do 304
+usa apenas o ETag: If-Modified-Since é ignorado, pois mudanças em objetos
+relacionados não alteram a data.
+"""
+
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from apps.core.cache_service import bump_generation, get_generations, tenant_namespace
+from apps.core.utils import get_current_tenant
+
+logger = logging.getLogger(__name__)
+
+VERSION_PREFIX = "etag"
+
+
+def _version_namespaces(resource: str, tenant_id: Any) -> Tuple[str, ...]:
+    if tenant_id is None:
+        return (f"{VERSION_PREFIX}:{resource}",)
+    return (
+        tenant_namespace(tenant_id),
+        tenant_namespace(tenant_id, f"{VERSION_PREFIX}:{resource}"),
+    )
+
+
+def resource_version(resource: str, tenant_id: Any = None) -> str:
+    """Versão atual do recurso do tenant (ou global se tenant_id for None)"""
+    generations = get_generations(*_version_namespaces(resource, tenant_id))
+    return ".".join(str(generation) for generation in generations)
+
+
+def bump_resource_version(resource: str, tenant_id: Any = None) -> None:
+    """Invalida os ETags do recurso do tenant (ou global): um INCR"""
+    bump_generation(_version_namespaces(resource, tenant_id)[-1])
+
+
+class _NotModified(Exception):
+    """Interrompe o dispatch após autenticação/permissões com uma resposta 304"""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalResponseMixin:
+    """
+    Mixin de GET condicional para APIView/ViewSet do DRF
+
+    Roda após autenticação, permissões e throttling (initial): com
+    If-None-Match correspondente, responde 304 sem chamar o handler.
+    Respostas 200 recebem ETag (fraco) e, se houver, Last-Modified.
+
+    O ETag varia por recurso, versão, validador do objeto, usuário e URL
+    completa (filtros e paginação).
+
+    Usage:
+        class TagViewSet(ConditionalResponseMixin, viewsets.ModelViewSet):
+            conditional_resource = "tags"
+
+        # Em um signal de algo exibido pelo recurso:
+        bump_resource_version("tags", instance.client_id)
+    """
+
+    conditional_resource: str = ""
+    # Ações (ViewSet) ou métodos HTTP (APIView, ex: "get") condicionais
+    conditional_actions: Tuple[str, ...] = ("list", "retrieve")
+    # Data de atualização lida no retrieve (None = apenas existência)
+    conditional_last_modified_field: Optional[str] = None
+    # False: recurso global (ex: planos), versão única para todos os tenants
+    conditional_per_tenant = True
+
+    def get_conditional_tenant_id(self, request) -> Any:
+        if not self.conditional_per_tenant:
+            return None
+        tenant = getattr(request, "tenant", None) or get_current_tenant()
+        return getattr(tenant, "pk", None)
+
+    def get_conditional_validator(self, request, *args, **kwargs) -> Any:
+        """
+        Parte do ETag própria do objeto
+
+        list: "" (coberta pelo contador de versão). retrieve: data de
+        atualização (ou pk) lida com uma query de uma coluna.
+
+        Returns:
+            Validador, ou None para responder sem GET condicional
+            (ex: objeto inexistente, deixando o handler retornar 404)
+        """
+        if getattr(self, "action", None) != "retrieve":
+            return ""
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = {self.lookup_field: kwargs.get(lookup_url_kwarg)}
+        field = self.conditional_last_modified_field or "pk"
+        try:
+            rows = list(
+                self.get_queryset()
+                .prefetch_related(None)
+                .filter(**lookup)
+                .order_by()
+                .values_list(field, flat=True)[:1]
+            )
+        except (TypeError, ValueError):
+            return None
+        if not rows:
+            return None
+        return rows[0] if rows[0] is not None else ""
+
+    def _conditional_etag(self, request, validator: Any) -> str:
+        user = getattr(request, "user", None)
+        parts = [
+            self.conditional_resource,
+            resource_version(
+                self.conditional_resource, self.get_conditional_tenant_id(request)
+            ),
+            validator.isoformat() if isinstance(validator, datetime) else validator,
+            getattr(user, "pk", None) or "anon",
+            request.get_full_path(),
+        ]
+        seed = "|".join(str(part) for part in parts)
+        return f'W/"{hashlib.md5(seed.encode(), usedforsecurity=False).hexdigest()}"'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._conditional_headers = None
+
+        action = getattr(self, "action", None) or request.method.lower()
+        if request.method not in ("GET", "HEAD"):
+            return
+        if action not in self.conditional_actions:
+            return
+
+        validator = self.get_conditional_validator(request, *args, **kwargs)
+        if validator is None:
+            return
+
+        headers = {"ETag": self._conditional_etag(request, validator)}
+        if isinstance(validator, datetime):
+            headers["Last-Modified"] = http_date(validator.timestamp())
+        self._conditional_headers = headers
+
+        response = get_conditional_response(request, etag=headers["ETag"])
+        if response is not None:
+            raise _NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        headers = getattr(self, "_conditional_headers", None)
+        if headers and response.status_code in (200, 304):
+            for name, value in headers.items():
+                response.headers.setdefault(name, value)
+        return response
@@ -0,0 +1,26 @@
+"""
+Funções de banco compartilhadas (agregações portáveis PostgreSQL/SQLite)
+"""
+
+from django.db.models import Aggregate, JSONField
+
+
+class JSONArrayAgg(Aggregate):
+    """
+    Agrega valores em um array JSON
+
+    - PostgreSQL: JSONB_AGG (jsonb chega como texto e é decodificado pelo JSONField)
+    - SQLite: JSON_GROUP_ARRAY
+
+    Usage:
+        JSONArrayAgg(JSONObject(id="tag__id", nome="tag__nome"))
+    """
+
+    function = "JSON_GROUP_ARRAY"
+    name = "JSONArrayAgg"
+    output_field = JSONField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, function="JSONB_AGG", **extra_context
+        )
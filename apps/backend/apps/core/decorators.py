@@ -91,12 +91,82 @@ def require_active_tenant(view_func):
     return wrapped_view
 
 
+def _render_cache_entry(view, request, response) -> dict:
+    """
+    Renderiza a Response para JSON uma única vez e monta a entrada de cache
+
+    A entrada contém apenas strings (compatível com serializers pickle e
+    JSON do django-redis): corpos acima de CACHE_RESPONSE_COMPRESS_MIN_BYTES
+    são comprimidos com zlib e codificados em base64.
+    """
+    import base64
+    import hashlib
+    import zlib
+
+    from django.conf import settings
+    from rest_framework.renderers import JSONRenderer
+
+    renderer = JSONRenderer()
+    body = renderer.render(
+        response.data,
+        renderer.media_type,
+        {"request": request, "view": view, "response": response},
+    )
+    etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+    entry = {"etag": etag, "content_type": renderer.media_type}
+
+    min_bytes = getattr(settings, "CACHE_RESPONSE_COMPRESS_MIN_BYTES", 1024)
+    if min_bytes is not None and len(body) >= min_bytes:
+        entry["encoding"] = "zlib"
+        entry["body"] = base64.b64encode(zlib.compress(body)).decode("ascii")
+    else:
+        entry["encoding"] = "identity"
+        entry["body"] = body.decode("utf-8")
+    return entry
+
+
+def _response_from_entry(request, entry: dict):
+    """
+    HttpResponse com os bytes já renderizados (ou 304 se o ETag bater)
+
+    Não passa pelo renderer do DRF.
+    """
+    import base64
+    import zlib
+
+    from django.http import HttpResponse, HttpResponseNotModified
+    from django.utils.http import parse_etags
+
+    etag = entry["etag"]
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        # Comparação fraca (RFC 9110): ignora o prefixo W/
+        client_etags = {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
+        if "*" in client_etags or etag in client_etags:
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+    if entry["encoding"] == "zlib":
+        body = zlib.decompress(base64.b64decode(entry["body"]))
+    else:
+        body = entry["body"].encode("utf-8")
+
+    response = HttpResponse(body, content_type=entry["content_type"])
+    response["ETag"] = etag
+    return response
+
+
 def cache_response(
     timeout: int = 300, key_prefix: str = "view", vary_on_user: bool = True
 ):
     """
     Decorator para cache de responses de views DRF.
 
+    Armazena o JSON já renderizado (comprimido acima do limite) e o ETag:
+    hits retornam um HttpResponse com os bytes, sem re-renderizar, e
+    requisições com If-None-Match correspondente recebem 304.
+
     Uso:
         @cache_response(timeout=600, key_prefix='feedbacks-list')
         def list(self, request):
@@ -114,9 +184,16 @@ def cache_response(
 
     from django.core.cache import cache
 
+    from apps.core.cache_service import get_generations, namespace_token
+
     def decorator(view_func):
         @wraps(view_func)
         def wrapped_view(self, request, *args, **kwargs):
+            # Apenas JSON: outros formatos (ex: API navegável) não são cacheados
+            renderer = getattr(request, "accepted_renderer", None)
+            if renderer is not None and renderer.format != "json":
+                return view_func(self, request, *args, **kwargs)
+
             # Construir chave de cache
             cache_key_parts = [key_prefix, request.path]
 
@@ -131,26 +208,32 @@ def cache_response(
             if vary_on_user and request.user.is_authenticated:
                 cache_key_parts.append(f"user:{request.user.id}")
 
-            # Adicionar tenant se existir
+            # Adicionar tenant (e gerações do namespace) se existir
             tenant = getattr(request, "tenant", None)
             if tenant:
                 cache_key_parts.append(f"tenant:{tenant.id}")
+                cache_key_parts.append(namespace_token(key_prefix, tenant.id))
+            else:
+                (generation,) = get_generations(key_prefix)
+                cache_key_parts.append(f"g{generation}")
 
             cache_key = ":".join(cache_key_parts)
 
             # Tentar obter do cache
-            cached_response = cache.get(cache_key)
-            if cached_response is not None:
-                return cached_response
+            entry = cache.get(cache_key)
+            if entry is not None:
+                return _response_from_entry(request, entry)
 
             # Executar view
             response = view_func(self, request, *args, **kwargs)
 
-            # Cachear apenas responses de sucesso
-            if response.status_code == 200:
-                cache.set(cache_key, response, timeout)
+            # Cachear apenas responses de sucesso com dados serializáveis
+            if response.status_code != 200 or not hasattr(response, "data"):
+                return response
 
-            return response
+            entry = _render_cache_entry(self, request, response)
+            cache.set(cache_key, entry, timeout)
+            return _response_from_entry(request, entry)
 
         return wrapped_view
 
@@ -166,10 +249,21 @@ def invalidate_cache(patterns: list):
         def create(self, request):
             ...
 
+    Cada padrão é reduzido ao seu prefixo (trecho antes do primeiro ':' ou
+    '*'), cuja geração é incrementada para o tenant do request (ou global,
+    sem tenant). Padrões sem prefixo ('*:tenant:{tenant_id}:*') invalidam o
+    tenant inteiro. Não há varredura de chaves (delete_pattern).
+
     Args:
         patterns: Lista de padrões de chave para invalidar
     """
-    from django.core.cache import cache
+    from apps.core.cache_service import bump_generation, tenant_namespace
+
+    prefixes = []
+    for pattern in patterns:
+        prefix = pattern.split(":", 1)[0].split("*", 1)[0] or None
+        if prefix not in prefixes:
+            prefixes.append(prefix)
 
     def decorator(view_func):
         @wraps(view_func)
@@ -180,13 +274,11 @@ def invalidate_cache(patterns: list):
             if response.status_code in [200, 201, 204]:
                 tenant = getattr(request, "tenant", None)
 
-                for pattern in patterns:
-                    if tenant and "{tenant_id}" in pattern:
-                        pattern = pattern.replace("{tenant_id}", str(tenant.id))
-
-                    # Tentar delete_pattern se disponível (django-redis)
-                    if hasattr(cache, "delete_pattern"):
-                        cache.delete_pattern(pattern)
+                for prefix in prefixes:
+                    if tenant:
+                        bump_generation(tenant_namespace(tenant.id, prefix))
+                    elif prefix:
+                        bump_generation(prefix)
 
             return response
 
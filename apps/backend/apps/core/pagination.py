@@ -3,10 +3,167 @@ Custom pagination classes for the Ouvify API.
 Provides consistent pagination across all endpoints.
 """
 
+import base64
+import hashlib
+import json
 from collections import OrderedDict
+from datetime import datetime
 
-from rest_framework.pagination import PageNumberPagination
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) sobre (campo de data, id), decrescente.
+
+    Em vez de OFFSET, cada página filtra a partir da última linha vista:
+        WHERE (data < X) OR (data = X AND id < Y) ORDER BY data DESC, id DESC
+    O custo por página é constante e usa os índices compostos existentes
+    (ex: (client, -data_criacao)), independente da profundidade.
+
+    O total não é exato a cada página: é calculado uma vez e mantido em cache
+    por COUNT_CACHE_TTL segundos (omitido com ?include_count=false).
+
+    Uso:
+    GET /api/feedbacks/?cursor=                 (primeira página)
+    GET /api/feedbacks/?cursor=eyJ2Ijo...       (próximas páginas)
+
+    Resposta:
+    {
+        "count": 150,
+        "count_is_approximate": true,
+        "next": "http://example.com/api/feedbacks/?cursor=...",
+        "previous": null,
+        "page_size": 20,
+        "results": [...]
+    }
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 20
+    max_page_size = 100
+    COUNT_CACHE_TTL = 60
+    invalid_cursor_message = "Cursor inválido"
+
+    def __init__(self, ordering=("data_criacao", "id")):
+        self.field, self.tiebreaker = ordering
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), "page")
+        self.page_size_value = self.get_page_size(request)
+        self.count = None
+        if request.query_params.get("include_count", "true").lower() not in (
+            "false",
+            "0",
+        ):
+            self.count = self.get_count(queryset)
+
+        cursor = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        reverse = bool(cursor and cursor["d"] == "prev")
+
+        if cursor:
+            value, pk = cursor["v"], cursor["id"]
+            op = "gt" if reverse else "lt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{op}": value})
+                | Q(**{self.field: value, f"{self.tiebreaker}__{op}": pk})
+            )
+
+        prefix = "" if reverse else "-"
+        queryset = queryset.order_by(
+            f"{prefix}{self.field}", f"{prefix}{self.tiebreaker}"
+        )
+
+        rows = list(queryset[: self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[: self.page_size_value]
+        if reverse:
+            rows.reverse()
+
+        # Navegando para trás sempre existe a página de onde viemos
+        has_next = has_more if not reverse else True
+        has_previous = (cursor is not None) if not reverse else has_more
+
+        self.next_cursor = (
+            self.encode_cursor(rows[-1], "next") if rows and has_next else None
+        )
+        self.previous_cursor = (
+            self.encode_cursor(rows[0], "prev") if rows and has_previous else None
+        )
+        return rows
+
+    def get_count(self, queryset) -> int:
+        """Total em cache, chaveado pelo SQL (já inclui filtros de tenant/usuário)"""
+        queryset = queryset.order_by()
+        sql, params = queryset.query.sql_with_params()
+        digest = hashlib.md5(
+            f"{sql}{params!r}".encode(), usedforsecurity=False
+        ).hexdigest()
+        key = f"pagination:count:{digest}"
+
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, timeout=self.COUNT_CACHE_TTL)
+        return count
+
+    def encode_cursor(self, obj, direction: str) -> str:
+        value = getattr(obj, self.field)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps(
+            {"v": value, "id": getattr(obj, self.tiebreaker), "d": direction},
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, encoded):
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            value = cursor["v"]
+            if isinstance(value, str):
+                value = parse_datetime(value) or value
+            return {"v": value, "id": int(cursor["id"]), "d": cursor.get("d", "next")}
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),
+                    ("count_is_approximate", self.count is not None),
+                    ("next", self.get_link(self.next_cursor)),
+                    ("previous", self.get_link(self.previous_cursor)),
+                    ("page_size", self.page_size_value),
+                    ("results", data),
+                ]
+            )
+        )
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -29,16 +186,36 @@ class StandardResultsSetPagination(PageNumberPagination):
         "previous": "http://example.com/api/feedbacks/?page=1",
         "results": [...]
     }
+
+    Views que definem `cursor_ordering` (ex: ("data_criacao", "id")) aceitam
+    paginação por cursor opt-in com ?cursor= ou ?pagination=cursor
+    (ver KeysetPagination).
     """
 
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
 
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        ordering = getattr(view, "cursor_ordering", None)
+        if ordering and (
+            KeysetPagination.cursor_query_param in request.query_params
+            or request.query_params.get("pagination") == "cursor"
+        ):
+            self.keyset = KeysetPagination(ordering)
+            self.keyset.page_size = self.page_size
+            self.keyset.max_page_size = self.max_page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
         """
         Customiza a resposta de paginação com informações adicionais.
         """
+        if getattr(self, "keyset", None) is not None:
+            return self.keyset.get_paginated_response(data)
+
         return Response(
             OrderedDict(
                 [
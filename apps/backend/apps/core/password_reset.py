@@ -14,11 +14,10 @@ from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 from rest_framework.views import APIView
 
 from apps.core.decorators import require_2fa_verification  # P1-001: 2FA enforcement
-from apps.core.throttling import PasswordResetConfirmThrottle
+from apps.core.throttling import AnonRateThrottle, PasswordResetConfirmThrottle
 
 from .email_service import EmailService
 
@@ -0,0 +1,176 @@
+"""
+Rate limiter de janela deslizante (sliding window log) atômico
+Usa um sorted set no Redis manipulado por script Lua (uma ida ao servidor,
+sem corrida entre leitura e escrita) e cai para um limiter em memória do
+processo quando o cache não é Redis (testes/desenvolvimento).
+"""
+
+import logging
+import secrets
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+from django.conf import settings
+
+from apps.core.redis_utils import get_redis_client, redis_key
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = sorted set da chave; ARGV = agora (ms), janela (ms), limite, membro
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, limit - count - 1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local retry = 0
+if oldest[2] then
+    retry = tonumber(oldest[2]) + window - now
+end
+return {0, 0, retry}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    """Resultado de uma tentativa no limiter"""
+
+    allowed: bool
+    remaining: int
+    retry_after: float  # Segundos até a próxima requisição permitida
+
+
+class InMemorySlidingWindow:
+    """
+    Janela deslizante em memória (fallback sem Redis)
+
+    O estado é por processo, como o LocMemCache usado pelos throttles do DRF
+    quando não há Redis. Protegido por lock para servidores com threads.
+    """
+
+    SWEEP_EVERY = 1000  # Remove chaves expiradas a cada N tentativas
+
+    def __init__(self):
+        self._windows: Dict[str, Deque[float]] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        now = time.monotonic()
+        with self._lock:
+            self._calls += 1
+            if self._calls % self.SWEEP_EVERY == 0:
+                self._sweep(now)
+
+            history = self._windows.setdefault(key, deque())
+            while history and history[0] <= now - window:
+                history.popleft()
+
+            if len(history) < limit:
+                history.append(now)
+                self._expires[key] = now + window
+                return RateLimitResult(True, limit - len(history), 0.0)
+
+            return RateLimitResult(False, 0, history[0] + window - now)
+
+    def reset(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._windows.clear()
+                self._expires.clear()
+            else:
+                self._windows.pop(key, None)
+                self._expires.pop(key, None)
+
+    def _sweep(self, now: float) -> None:
+        expired = [key for key, expires in self._expires.items() if expires <= now]
+        for key in expired:
+            self._windows.pop(key, None)
+            self._expires.pop(key, None)
+
+
+class SlidingWindowRateLimiter:
+    """
+    Limiter de janela deslizante com Redis (Lua) e fallback em memória
+
+    Features:
+    - Atômico: remoção dos registros antigos, contagem e inserção em um
+      único script Lua (sem get-then-set entre processos)
+    - O(log N) por requisição no Redis; nenhum histórico trafega pela rede
+    - Redis indisponível: usa o limiter em memória do processo
+
+    Usage:
+        result = get_rate_limiter().hit("throttle_login_ana", limit=5, window=3600)
+        if not result.allowed:
+            ...  # aguardar result.retry_after segundos
+    """
+
+    def __init__(self, alias: Optional[str] = None):
+        self.alias = alias or getattr(settings, "RATE_LIMIT_CACHE_ALIAS", "default")
+        self.memory = InMemorySlidingWindow()
+        self._client: Any = None
+        self._script: Any = None
+        self._resolved = False
+
+    def _get_script(self):
+        if not self._resolved:
+            self._client = get_redis_client(self.alias)
+            if self._client is not None:
+                self._script = self._client.register_script(SLIDING_WINDOW_SCRIPT)
+            self._resolved = True
+        return self._script
+
+    def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        """
+        Registra uma tentativa e informa se ela está dentro do limite
+
+        Args:
+            key: Identificador do limite (ex: throttle_tenant_1)
+            limit: Máximo de tentativas na janela
+            window: Tamanho da janela em segundos
+        """
+        script = self._get_script()
+        if script is None:
+            return self.memory.hit(key, limit, window)
+
+        now_ms = int(time.time() * 1000)
+        window_ms = max(1, int(window * 1000))
+        member = f"{now_ms}-{secrets.token_hex(4)}"
+        try:
+            allowed, remaining, retry_ms = script(
+                keys=[redis_key(key, self.alias)],
+                args=[now_ms, window_ms, limit, member],
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Rate limiter Redis indisponível, usando memória: {e}")
+            return self.memory.hit(key, limit, window)
+
+        return RateLimitResult(bool(allowed), int(remaining), int(retry_ms) / 1000)
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Remove o histórico de uma chave (ou de todas, apenas em memória)"""
+        self.memory.reset(key)
+        script = self._get_script()
+        if script is not None and key is not None:
+            self._client.delete(redis_key(key, self.alias))
+
+
+_rate_limiter: Optional[SlidingWindowRateLimiter] = None
+
+
+def get_rate_limiter() -> SlidingWindowRateLimiter:
+    """Limiter compartilhado do processo (script Lua registrado uma vez)"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = SlidingWindowRateLimiter()
+    return _rate_limiter
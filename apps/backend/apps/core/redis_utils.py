@@ -0,0 +1,47 @@
+"""
+Acesso ao client Redis nativo por trás do cache do Django
+Permite usar estruturas Redis (sorted sets, hashes, scripts Lua) quando
+o backend de cache é o django-redis, com fallback quando não é.
+"""
+
+import logging
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def get_redis_client(alias: str = "default") -> Optional[Any]:
+    """
+    Retorna o client redis-py do cache informado
+
+    Args:
+        alias: Alias do cache em settings.CACHES
+
+    Returns:
+        Client Redis ou None se o backend não for django-redis
+        (ex: LocMemCache em testes/desenvolvimento)
+    """
+    try:
+        from django_redis import get_redis_connection
+    except ImportError:
+        return None
+
+    try:
+        return get_redis_connection(alias)
+    except NotImplementedError:
+        return None
+    except Exception as e:
+        logger.warning(f"Redis indisponível para cache '{alias}': {e}")
+        return None
+
+
+def redis_key(key: str, alias: str = "default") -> str:
+    """
+    Aplica KEY_PREFIX/VERSION do cache a uma chave usada diretamente no Redis
+
+    Mantém as chaves manipuladas via client nativo no mesmo namespace
+    das chaves gravadas via django.core.cache.
+    """
+    from django.core.cache import caches
+
+    return caches[alias].make_key(key)
@@ -0,0 +1,130 @@
+"""
+Cache de resultados da busca global
+Chaves por (tenant, query normalizada, filtros, página), invalidadas por uma
+versão do índice por tenant e com coalescência de requisições idênticas.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PREFIX = "search"
+VERSION_KEY = "search:version:tenant:{tenant_id}"
+
+# Sentinela para resultados vazios/None (cache.get devolve None no miss)
+_EMPTY = "__search_cache_empty__"
+
+
+def normalize_query(query: str) -> str:
+    """Normaliza o termo: minúsculas e espaços colapsados"""
+    return " ".join((query or "").lower().split())
+
+
+def get_search_version(tenant_id: int) -> int:
+    """Versão atual do índice de busca do tenant"""
+    return cache.get(VERSION_KEY.format(tenant_id=tenant_id)) or 1
+
+
+def bump_search_version(tenant_id: int) -> None:
+    """
+    Invalida todos os resultados em cache do tenant
+
+    As chaves antigas deixam de ser lidas e expiram pelo TTL curto,
+    sem necessidade de varrer o cache (delete_pattern).
+    """
+    key = VERSION_KEY.format(tenant_id=tenant_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Primeira alteração: a versão implícita era 1
+        if not cache.add(key, 2, timeout=None):
+            cache.incr(key)
+
+
+class SearchResultCache:
+    """
+    Cache de curta duração na frente de GlobalSearchService
+
+    Features:
+    - Chave por tenant + versão do índice + hash de (query, filtros, página)
+    - Single-flight: apenas uma requisição calcula um resultado ausente;
+      requisições idênticas simultâneas aguardam o valor no cache
+
+    Usage:
+        SearchResultCache(tenant_id).get_or_compute(
+            "search", {"q": query, "page": 1}, lambda: backend.search(...)
+        )
+    """
+
+    DEFAULT_TTL = 60
+    LOCK_TTL = 10  # Limite de espera caso o processo dono do lock morra
+    WAIT_TIMEOUT = 2.0
+    WAIT_INTERVAL = 0.05
+
+    def __init__(self, tenant_id: int, timeout: Optional[int] = None):
+        self.tenant_id = tenant_id
+        self.timeout = timeout or getattr(
+            settings, "SEARCH_CACHE_TTL", self.DEFAULT_TTL
+        )
+        self._service = CacheService(tenant_id=tenant_id)
+
+    def build_key(self, kind: str, params: Dict[str, Any]) -> str:
+        version = get_search_version(self.tenant_id)
+        return self._service._build_key(
+            SEARCH_PREFIX, kind, f"v{version}", self._service._hash_params(params)
+        )
+
+    def get_or_compute(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        factory: Callable[[], Any],
+        timeout: Optional[int] = None,
+    ) -> Any:
+        """
+        Retorna o resultado em cache ou executa factory (uma vez por chave)
+
+        Args:
+            kind: Tipo da consulta (search, autocomplete)
+            params: Parâmetros já normalizados que identificam a consulta
+            factory: Executa a busca real
+            timeout: TTL em segundos (usa SEARCH_CACHE_TTL se não informado)
+        """
+        key = self.build_key(kind, params)
+        cached_value = cache.get(key)
+        if cached_value is not None:
+            return None if cached_value == _EMPTY else cached_value
+
+        lock_key = f"{key}:lock"
+        if not cache.add(lock_key, True, timeout=self.LOCK_TTL):
+            # Outra requisição já está calculando o mesmo resultado
+            cached_value = self._wait_for(key)
+            if cached_value is not None:
+                return None if cached_value == _EMPTY else cached_value
+            logger.debug(f"Timeout aguardando resultado de busca em {key}")
+            return factory()
+
+        try:
+            value = factory()
+            cache.set(
+                key, _EMPTY if value is None else value, timeout=timeout or self.timeout
+            )
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    def _wait_for(self, key: str) -> Any:
+        deadline = time.monotonic() + self.WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(self.WAIT_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                return value
+        return None
@@ -0,0 +1,243 @@
+"""
+Busca full-text no banco de dados (fallback do ElasticSearch)
+
+No PostgreSQL usa a coluna Feedback.search_vector (tsvector em português,
+mantida por trigger e indexada com GIN) e índices trigram para protocolo
+e e-mail. Em outros bancos (SQLite em testes) recorre a icontains.
+"""
+
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q, QuerySet, Value
+
+SEARCH_CONFIG = "portuguese"
+
+# Campos lidos para montar os resultados - evita carregar o tsvector
+RESULT_FIELDS = ("id", "protocolo", "titulo", "descricao", "tipo", "status")
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def is_full_text_supported() -> bool:
+    """Busca full-text nativa disponível apenas no PostgreSQL"""
+    return connection.vendor == "postgresql"
+
+
+def build_prefix_query(term: str) -> Optional[SearchQuery]:
+    """
+    Monta um tsquery de prefixo ("atend" encontra "atendimento")
+
+    Apenas palavras (\\w+) são aproveitadas, evitando erros de sintaxe
+    do to_tsquery com entrada do usuário.
+    """
+    words = _WORD_RE.findall(term)
+    if not words:
+        return None
+    raw = " & ".join(f"{word}:*" for word in words)
+    return SearchQuery(raw, config=SEARCH_CONFIG, search_type="raw")
+
+
+def filter_feedbacks_by_text(queryset: QuerySet, term: str) -> QuerySet:
+    """
+    Filtra feedbacks por termo livre (protocolo, título/descrição ou e-mail)
+
+    No PostgreSQL o texto é resolvido pelo índice GIN do tsvector e
+    protocolo/e-mail pelos índices trigram; nos demais bancos mantém
+    o comportamento com icontains.
+    """
+    term = term.strip()
+    if not term:
+        return queryset
+
+    lookup = Q(protocolo__icontains=term) | Q(email_contato__icontains=term)
+
+    if is_full_text_supported():
+        prefix_query = build_prefix_query(term)
+        if prefix_query is not None:
+            lookup |= Q(search_vector=prefix_query)
+    else:
+        lookup |= Q(titulo__icontains=term)
+
+    return queryset.filter(lookup)
+
+
+class DatabaseSearchBackend:
+    """
+    Backend de busca no banco com o mesmo contrato do ElasticSearch
+
+    Retorna SearchResponse/SearchResult, de modo que GlobalSearchService
+    pode alternar entre os backends sem impacto nas views.
+    """
+
+    def __init__(self, tenant_id: int):
+        self.tenant_id = tenant_id
+
+    def get_queryset(self) -> QuerySet:
+        from apps.feedbacks.models import Feedback
+
+        return Feedback.objects.all_tenants().filter(client_id=self.tenant_id)
+
+    def search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: int = 20,
+        highlight: bool = True,
+    ):
+        from apps.core.search_service import SearchResponse, SearchResult
+
+        started = time.monotonic()
+        queryset = self._apply_filters(self.get_queryset(), filters or {})
+        query = (query or "").strip()
+        search_query = None
+
+        if query and is_full_text_supported():
+            search_query = SearchQuery(
+                query, config=SEARCH_CONFIG, search_type="websearch"
+            )
+            queryset = queryset.filter(
+                Q(search_vector=search_query)
+                | Q(protocolo__icontains=query)
+                | Q(email_contato__icontains=query)
+            ).annotate(score=SearchRank(F("search_vector"), search_query))
+            ordering = ("-score", "-data_criacao")
+        else:
+            if query:
+                queryset = queryset.filter(
+                    Q(titulo__icontains=query)
+                    | Q(descricao__icontains=query)
+                    | Q(protocolo__icontains=query)
+                    | Q(email_contato__icontains=query)
+                )
+            queryset = queryset.annotate(score=Value(1.0))
+            ordering = ("-data_criacao",)
+
+        total = queryset.count()
+        start = (page - 1) * page_size
+        rows = list(
+            queryset.order_by(*ordering).values(*RESULT_FIELDS, "score")[
+                start : start + page_size
+            ]
+        )
+
+        highlights: Dict[int, Dict[str, List[str]]] = {}
+        if highlight and search_query is not None and rows:
+            highlights = self._highlights([row["id"] for row in rows], search_query)
+
+        results = [
+            SearchResult(
+                id=row["id"],
+                protocolo=row["protocolo"] or "",
+                titulo=row["titulo"],
+                descricao=row["descricao"],
+                tipo=row["tipo"],
+                status=row["status"],
+                score=float(row["score"] or 0),
+                highlight=highlights.get(row["id"], {}),
+            )
+            for row in rows
+        ]
+
+        return SearchResponse(
+            results=results,
+            total=total,
+            page=page,
+            page_size=page_size,
+            took_ms=int((time.monotonic() - started) * 1000),
+            query=query,
+        )
+
+    def autocomplete(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        term = query.strip()
+        lookup = Q(protocolo__istartswith=term)
+
+        if is_full_text_supported():
+            prefix_query = build_prefix_query(term)
+            if prefix_query is not None:
+                lookup |= Q(search_vector=prefix_query)
+        else:
+            lookup |= Q(titulo__icontains=term)
+
+        rows = (
+            self.get_queryset()
+            .filter(lookup)
+            .order_by("-data_criacao")
+            .values("id", "titulo", "protocolo")[:limit]
+        )
+        return [
+            {
+                "id": str(row["id"]),
+                "titulo": row["titulo"],
+                "protocolo": row["protocolo"],
+            }
+            for row in rows
+        ]
+
+    def search_by_protocol(self, protocol: str):
+        from apps.core.search_service import SearchResult
+
+        row = (
+            self.get_queryset()
+            .filter(protocolo=protocol.strip().upper())
+            .values(*RESULT_FIELDS)
+            .first()
+        )
+        if row is None:
+            return None
+
+        return SearchResult(score=1.0, highlight={}, **row)
+
+    def _highlights(
+        self, ids: List[int], search_query: SearchQuery
+    ) -> Dict[int, Dict[str, List[str]]]:
+        """Gera os trechos destacados apenas para a página retornada"""
+        options = {
+            "config": SEARCH_CONFIG,
+            "start_sel": "<mark>",
+            "stop_sel": "</mark>",
+        }
+        rows = (
+            self.get_queryset()
+            .filter(id__in=ids)
+            .annotate(
+                titulo_hl=SearchHeadline("titulo", search_query, **options),
+                descricao_hl=SearchHeadline(
+                    "descricao", search_query, max_fragments=3, **options
+                ),
+            )
+            .values("id", "titulo_hl", "descricao_hl")
+        )
+
+        highlights: Dict[int, Dict[str, List[str]]] = {}
+        for row in rows:
+            fields = {
+                field: [row[f"{field}_hl"]]
+                for field in ("titulo", "descricao")
+                if "<mark>" in (row[f"{field}_hl"] or "")
+            }
+            if fields:
+                highlights[row["id"]] = fields
+        return highlights
+
+    def _apply_filters(self, queryset: QuerySet, filters: Dict[str, Any]) -> QuerySet:
+        if filters.get("tipo"):
+            queryset = queryset.filter(tipo=filters["tipo"])
+
+        if filters.get("status"):
+            queryset = queryset.filter(status=filters["status"])
+
+        if filters.get("data_inicio"):
+            queryset = queryset.filter(data_criacao__date__gte=filters["data_inicio"])
+
+        if filters.get("data_fim"):
+            queryset = queryset.filter(data_criacao__date__lte=filters["data_fim"])
+
+        if "anonimo" in filters:
+            queryset = queryset.filter(anonimo=filters["anonimo"])
+
+        return queryset
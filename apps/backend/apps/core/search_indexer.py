@@ -0,0 +1,390 @@
+"""
+Motor de indexação em lote para o ElasticSearch
+Reindexação via _bulk paralelo, índices versionados e checkpoints
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+try:
+    from elasticsearch.helpers import parallel_bulk
+    from elasticsearch_dsl.connections import connections
+
+    from apps.feedbacks.documents import feedbacks_index
+
+    ELASTICSEARCH_AVAILABLE = True
+except ImportError:
+    ELASTICSEARCH_AVAILABLE = False
+    parallel_bulk = None  # type: ignore[assignment]
+    connections = None  # type: ignore[assignment]
+    feedbacks_index = None  # type: ignore[assignment]
+
+
+# Alias público consultado pelo FeedbackDocument
+FEEDBACKS_ALIAS = "feedbacks"
+
+# Colunas lidas via values() - evita instanciar models durante a reindexação
+FEEDBACK_INDEX_FIELDS = (
+    "id",
+    "client_id",
+    "client__nome",
+    "client__subdominio",
+    "titulo",
+    "descricao",
+    "protocolo",
+    "tipo",
+    "status",
+    "email_contato",
+    "anonimo",
+    "data_criacao",
+    "data_atualizacao",
+)
+
+CHECKPOINT_PREFIX = "search_reindex:checkpoint"
+CHECKPOINT_TTL = 60 * 60 * 24 * 7  # 7 dias
+
+
+def feedback_row_to_document(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte uma linha de values() no corpo do documento ElasticSearch
+
+    Espelha os campos declarados em FeedbackDocument.
+    """
+    return {
+        "tenant_id": row["client_id"],
+        "titulo": row["titulo"],
+        "descricao": row["descricao"],
+        "protocolo": row["protocolo"],
+        "tipo": row["tipo"],
+        "status": row["status"],
+        "categoria": None,
+        "created_at": row["data_criacao"],
+        "updated_at": row["data_atualizacao"],
+        "email_contato": row["email_contato"],
+        "anonimo": row["anonimo"],
+        "tenant": {
+            "id": row["client_id"],
+            "nome": row["client__nome"],
+            "subdominio": row["client__subdominio"],
+        },
+    }
+
+
+def get_elasticsearch_client():
+    """
+    Retorna o client ElasticSearch padrão
+
+    Usa a conexão registrada pelo django-elasticsearch-dsl e, na ausência dela,
+    cria uma a partir de settings.ELASTICSEARCH_DSL.
+    """
+    if not ELASTICSEARCH_AVAILABLE:
+        raise RuntimeError("ElasticSearch não está disponível")
+
+    try:
+        return connections.get_connection()
+    except KeyError:
+        config = getattr(settings, "ELASTICSEARCH_DSL", None)
+        if not config:
+            raise RuntimeError("ELASTICSEARCH_DSL não configurado")
+        connections.configure(**config)
+        return connections.get_connection()
+
+
+@dataclass
+class ReindexResult:
+    """Resultado de uma reindexação em lote"""
+
+    index: str
+    indexed: int
+    errors: int
+    resumed: bool
+    alias_swapped: bool
+    error_samples: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class BulkReindexer:
+    """
+    Reindexa feedbacks no ElasticSearch usando requisições _bulk paralelas
+
+    Features:
+    - Leitura em chunks via values() (cursor server-side no PostgreSQL)
+    - _bulk paralelo com batch_size e concurrency configuráveis
+    - Rebuild sem downtime: escreve em índice versionado e troca o alias
+    - Checkpoint por batch: rebuild interrompido retoma de onde parou
+
+    Usage:
+        # Rebuild completo (novo índice versionado + troca de alias)
+        BulkReindexer().run()
+
+        # Reindexação de um tenant no índice atual
+        BulkReindexer(tenant_id=42).run()
+    """
+
+    DEFAULT_BATCH_SIZE = 500
+    DEFAULT_CONCURRENCY = 4
+
+    def __init__(
+        self,
+        tenant_id: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        client=None,
+    ):
+        """
+        Args:
+            tenant_id: Reindexa apenas o tenant informado (in-place, sem troca de alias)
+            batch_size: Documentos por requisição _bulk
+            concurrency: Número de requisições _bulk simultâneas
+            client: Client ElasticSearch (usa a conexão padrão se não informado)
+        """
+        self.tenant_id = tenant_id
+        self.batch_size = batch_size or getattr(
+            settings, "SEARCH_REINDEX_BATCH_SIZE", self.DEFAULT_BATCH_SIZE
+        )
+        self.concurrency = concurrency or getattr(
+            settings, "SEARCH_REINDEX_CONCURRENCY", self.DEFAULT_CONCURRENCY
+        )
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_elasticsearch_client()
+        return self._client
+
+    # =========================================================================
+    # Checkpoint
+    # =========================================================================
+
+    @property
+    def checkpoint_key(self) -> str:
+        scope = f"tenant:{self.tenant_id}" if self.tenant_id else "all"
+        return f"{CHECKPOINT_PREFIX}:{scope}"
+
+    def get_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Retorna o checkpoint salvo (index, last_id, indexed) ou None"""
+        return cache.get(self.checkpoint_key)
+
+    def save_checkpoint(self, index: str, last_id: int, indexed: int) -> None:
+        cache.set(
+            self.checkpoint_key,
+            {"index": index, "last_id": last_id, "indexed": indexed},
+            timeout=CHECKPOINT_TTL,
+        )
+
+    def clear_checkpoint(self) -> None:
+        cache.delete(self.checkpoint_key)
+
+    # =========================================================================
+    # Leitura
+    # =========================================================================
+
+    def get_queryset(self, after_id: int = 0):
+        """Queryset ordenado por PK, a partir do último ID confirmado"""
+        from apps.feedbacks.models import Feedback
+
+        qs = Feedback.objects.all_tenants().filter(client__isnull=False)
+        if self.tenant_id:
+            qs = qs.filter(client_id=self.tenant_id)
+        if after_id:
+            qs = qs.filter(id__gt=after_id)
+        return qs.order_by("id").values(*FEEDBACK_INDEX_FIELDS)
+
+    def generate_actions(self, index: str, after_id: int = 0) -> Iterator[dict]:
+        """Gera ações de indexação para o helper _bulk"""
+        rows = self.get_queryset(after_id).iterator(chunk_size=self.batch_size)
+        for row in rows:
+            yield {
+                "_op_type": "index",
+                "_index": index,
+                "_id": row["id"],
+                "_source": feedback_row_to_document(row),
+            }
+
+    def action_batches(self, index: str, after_id: int = 0) -> Iterator[List[dict]]:
+        """
+        Ações em lotes de batch_size * concurrency, lidas na thread chamadora
+
+        O parallel_bulk consome o iterável de ações em uma thread própria; um
+        queryset lido lá abriria outra conexão (e cursor) que ninguém fecha.
+        """
+        size = self.batch_size * self.concurrency
+        batch: List[dict] = []
+        for action in self.generate_actions(index, after_id):
+            batch.append(action)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    # =========================================================================
+    # Índices e alias
+    # =========================================================================
+
+    def new_index_name(self) -> str:
+        return f"{FEEDBACKS_ALIAS}_v{timezone.now().strftime('%Y%m%d%H%M%S')}"
+
+    def create_index(self, name: str) -> None:
+        """Cria índice versionado com settings/mappings do FeedbackDocument"""
+        body = feedbacks_index.clone(name=name).to_dict()
+        # Réplicas e refresh desligados durante a carga; restaurados no swap
+        body.setdefault("settings", {}).update(
+            {"number_of_replicas": 0, "refresh_interval": "-1"}
+        )
+        self.client.indices.create(index=name, **body)
+
+    def swap_alias(self, new_index: str) -> List[str]:
+        """
+        Aponta o alias para o novo índice em uma única operação atômica
+
+        Returns:
+            Lista de índices antigos que deixaram o alias
+        """
+        replicas = (
+            feedbacks_index.to_dict().get("settings", {}).get("number_of_replicas", 1)
+        )
+        self.client.indices.put_settings(
+            index=new_index,
+            settings={"number_of_replicas": replicas, "refresh_interval": "1s"},
+        )
+        self.client.indices.refresh(index=new_index)
+
+        actions: List[Dict[str, Any]] = []
+        old_indices: List[str] = []
+
+        if self.client.indices.exists_alias(name=FEEDBACKS_ALIAS):
+            old_indices = list(
+                self.client.indices.get_alias(name=FEEDBACKS_ALIAS).keys()
+            )
+            actions.extend(
+                {"remove": {"index": old, "alias": FEEDBACKS_ALIAS}}
+                for old in old_indices
+                if old != new_index
+            )
+        elif self.client.indices.exists(index=FEEDBACKS_ALIAS):
+            # Índice legado concreto chamado "feedbacks": removido no mesmo swap
+            actions.append({"remove_index": {"index": FEEDBACKS_ALIAS}})
+
+        actions.append({"add": {"index": new_index, "alias": FEEDBACKS_ALIAS}})
+        self.client.indices.update_aliases(actions=actions)
+
+        logger.info(f"Alias '{FEEDBACKS_ALIAS}' apontado para {new_index}")
+        return [old for old in old_indices if old != new_index]
+
+    # =========================================================================
+    # Execução
+    # =========================================================================
+
+    def run(self, resume: bool = True, delete_old: bool = False) -> ReindexResult:
+        """
+        Executa a reindexação
+
+        Args:
+            resume: Retoma a partir do checkpoint salvo, se houver
+            delete_old: Remove os índices antigos após a troca do alias
+
+        Returns:
+            ReindexResult com totais
+        """
+        checkpoint = self.get_checkpoint() if resume else None
+        resumed = checkpoint is not None
+
+        if checkpoint:
+            index = checkpoint["index"]
+            last_id = checkpoint["last_id"]
+            indexed = checkpoint["indexed"]
+            logger.info(
+                f"Retomando reindexação em {index} a partir do ID {last_id} "
+                f"({indexed} já indexados)"
+            )
+        else:
+            last_id = 0
+            indexed = 0
+            if self.tenant_id:
+                index = FEEDBACKS_ALIAS
+            else:
+                index = self.new_index_name()
+                self.create_index(index)
+
+        errors = 0
+        error_samples: List[Dict[str, Any]] = []
+        since_checkpoint = 0
+
+        results = (
+            result
+            for batch in self.action_batches(index, after_id=last_id)
+            for result in parallel_bulk(
+                self.client,
+                batch,
+                thread_count=self.concurrency,
+                chunk_size=self.batch_size,
+                raise_on_error=False,
+                raise_on_exception=False,
+            )
+        )
+
+        # parallel_bulk devolve os resultados na ordem das ações. O checkpoint só
+        # avança enquanto não houver falhas, garantindo que tudo até last_id foi
+        # confirmado; após o primeiro erro ele fica congelado para a retomada.
+        confirmed = indexed
+        for ok, item in results:
+            info = item.get("index", item)
+            if not ok:
+                errors += 1
+                if len(error_samples) < 10:
+                    error_samples.append(info)
+                continue
+
+            indexed += 1
+            if errors:
+                continue
+
+            confirmed = indexed
+            last_id = int(info.get("_id", last_id))
+            since_checkpoint += 1
+            if since_checkpoint >= self.batch_size:
+                self.save_checkpoint(index, last_id, confirmed)
+                since_checkpoint = 0
+
+        if errors:
+            # Mantém o checkpoint para permitir nova tentativa sem recomeçar
+            self.save_checkpoint(index, last_id, confirmed)
+            logger.error(
+                f"Reindexação em {index} concluída com {errors} erros; "
+                f"alias não foi alterado"
+            )
+            return ReindexResult(
+                index=index,
+                indexed=indexed,
+                errors=errors,
+                resumed=resumed,
+                alias_swapped=False,
+                error_samples=error_samples,
+            )
+
+        alias_swapped = False
+        if index != FEEDBACKS_ALIAS:
+            old_indices = self.swap_alias(index)
+            alias_swapped = True
+            if delete_old:
+                for old in old_indices:
+                    self.client.indices.delete(index=old, ignore_unavailable=True)
+
+        self.clear_checkpoint()
+        logger.info(f"Reindexação concluída em {index}: {indexed} documentos")
+
+        return ReindexResult(
+            index=index,
+            indexed=indexed,
+            errors=0,
+            resumed=resumed,
+            alias_swapped=alias_swapped,
+        )
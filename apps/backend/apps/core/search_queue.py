@@ -0,0 +1,370 @@
+"""
+Fila de indexação near-real-time para o ElasticSearch
+Agrupa atualizações por feedback dentro de uma janela curta (debounce) e
+envia tudo em uma única requisição _bulk, registrando métricas de atraso.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.redis_utils import get_redis_client, redis_key
+
+logger = logging.getLogger(__name__)
+
+try:
+    from elasticsearch.helpers import streaming_bulk
+
+    ELASTICSEARCH_AVAILABLE = True
+except ImportError:
+    ELASTICSEARCH_AVAILABLE = False
+    streaming_bulk = None  # type: ignore[assignment]
+
+
+PENDING_KEY = "search_index:pending"
+TENANTS_KEY = "search_index:tenants"
+SCHEDULED_KEY = "search_index:flush_scheduled"
+METRICS_KEY = "search_index:metrics"
+COALESCED_KEY = "search_index:coalesced"
+
+
+class _RedisPendingStore:
+    """
+    IDs pendentes em um sorted set (score = primeiro enqueue)
+
+    ZADD NX preserva o timestamp mais antigo, de modo que o atraso medido
+    no flush reflete a primeira alteração não indexada. O tenant de cada ID
+    (quando informado) fica em um hash à parte: feedbacks removidos não
+    existem mais no banco para descobri-lo no flush.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.key = redis_key(PENDING_KEY)
+        self.tenants_key = redis_key(TENANTS_KEY)
+
+    def add(
+        self, feedback_id: int, enqueued_at: float, tenant_id: Optional[int] = None
+    ) -> bool:
+        if tenant_id is not None:
+            self.client.hset(self.tenants_key, feedback_id, tenant_id)
+        return bool(self.client.zadd(self.key, {feedback_id: enqueued_at}, nx=True))
+
+    def add_many(
+        self, pending: Dict[int, float], tenants: Optional[Dict[int, int]] = None
+    ) -> None:
+        if tenants:
+            self.client.hset(self.tenants_key, mapping=tenants)
+        if pending:
+            self.client.zadd(self.key, pending, nx=True)
+
+    def drain(self) -> Tuple[Dict[int, float], Dict[int, int]]:
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zrange(self.key, 0, -1, withscores=True)
+        pipe.hgetall(self.tenants_key)
+        pipe.delete(self.key, self.tenants_key)
+        items, tenants, _ = pipe.execute()
+        return (
+            {int(member): score for member, score in items},
+            {int(member): int(tenant) for member, tenant in tenants.items()},
+        )
+
+    def size(self) -> int:
+        return int(self.client.zcard(self.key))
+
+    def oldest(self) -> Optional[float]:
+        items = self.client.zrange(self.key, 0, 0, withscores=True)
+        return items[0][1] if items else None
+
+
+class _CachePendingStore:
+    """
+    Fallback sobre django.core.cache (LocMemCache em testes/desenvolvimento)
+
+    Não é atômico entre processos; adequado apenas para um único worker.
+    """
+
+    def add(
+        self, feedback_id: int, enqueued_at: float, tenant_id: Optional[int] = None
+    ) -> bool:
+        if tenant_id is not None:
+            self._set_tenants({feedback_id: tenant_id})
+        pending = cache.get(PENDING_KEY) or {}
+        if feedback_id in pending:
+            return False
+        pending[feedback_id] = enqueued_at
+        cache.set(PENDING_KEY, pending, timeout=None)
+        return True
+
+    def add_many(
+        self, items: Dict[int, float], tenants: Optional[Dict[int, int]] = None
+    ) -> None:
+        if tenants:
+            self._set_tenants(tenants)
+        pending = cache.get(PENDING_KEY) or {}
+        for feedback_id, enqueued_at in items.items():
+            pending.setdefault(feedback_id, enqueued_at)
+        cache.set(PENDING_KEY, pending, timeout=None)
+
+    def drain(self) -> Tuple[Dict[int, float], Dict[int, int]]:
+        pending = cache.get(PENDING_KEY) or {}
+        tenants = cache.get(TENANTS_KEY) or {}
+        cache.delete_many([PENDING_KEY, TENANTS_KEY])
+        return pending, tenants
+
+    def _set_tenants(self, items: Dict[int, int]) -> None:
+        tenants = cache.get(TENANTS_KEY) or {}
+        tenants.update(items)
+        cache.set(TENANTS_KEY, tenants, timeout=None)
+
+    def size(self) -> int:
+        return len(cache.get(PENDING_KEY) or {})
+
+    def oldest(self) -> Optional[float]:
+        pending = cache.get(PENDING_KEY) or {}
+        return min(pending.values()) if pending else None
+
+
+@dataclass
+class FlushResult:
+    """Resultado de um flush da fila de indexação"""
+
+    indexed: int
+    deleted: int
+    failed: int
+    max_lag_ms: int
+    avg_lag_ms: int
+
+
+class SearchIndexQueue:
+    """
+    Fila de atualizações do índice de busca com coalescência por feedback
+
+    Fluxo:
+    1. enqueue(feedback_id) registra o ID pendente (duplicatas são coalescidas)
+    2. O primeiro enqueue da janela agenda flush_search_index_queue com countdown
+    3. O flush lê todos os IDs pendentes via values() e envia um único _bulk
+
+    Usage:
+        SearchIndexQueue().enqueue(feedback.id)
+    """
+
+    DEFAULT_DEBOUNCE_SECONDS = 2
+
+    def __init__(self, client=None):
+        """
+        Args:
+            client: Client ElasticSearch (usa a conexão padrão se não informado)
+        """
+        redis = get_redis_client()
+        self.store = _RedisPendingStore(redis) if redis else _CachePendingStore()
+        self.debounce_seconds = getattr(
+            settings, "SEARCH_INDEX_DEBOUNCE_SECONDS", self.DEFAULT_DEBOUNCE_SECONDS
+        )
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from apps.core.search_indexer import get_elasticsearch_client
+
+            self._client = get_elasticsearch_client()
+        return self._client
+
+    def enqueue(self, feedback_id: int, tenant_id: Optional[int] = None) -> bool:
+        """
+        Marca um feedback para (re)indexação
+
+        Args:
+            feedback_id: ID do feedback
+            tenant_id: Tenant do feedback; necessário para invalidar o cache de
+                busca quando o feedback foi removido antes do flush
+
+        Returns:
+            True se o ID entrou na fila, False se foi coalescido com um pendente
+        """
+        added = self.store.add(int(feedback_id), time.time(), tenant_id)
+        if not added:
+            self._incr(COALESCED_KEY)
+
+        # Apenas o primeiro enqueue da janela agenda o flush
+        self.schedule_flush()
+        return added
+
+    def flush(self) -> Optional[FlushResult]:
+        """
+        Envia todas as atualizações pendentes em uma única requisição _bulk
+
+        Feedbacks que não existem mais são removidos do índice. Falhas voltam
+        para a fila com o timestamp original e serão tentadas no próximo flush;
+        um erro antes do _bulk (banco, conexão com o ElasticSearch) devolve
+        todos os IDs drenados.
+        """
+        # Liberar o agendamento antes de drenar: enqueues concorrentes a partir
+        # daqui agendam um novo flush e nada fica esquecido na fila.
+        cache.delete(SCHEDULED_KEY)
+
+        pending, tenants = self.store.drain()
+        if not pending:
+            return None
+
+        indexed = deleted = 0
+        failed: Dict[int, float] = {}
+
+        try:
+            actions = list(self._build_actions(pending.keys()))
+            for ok, item in streaming_bulk(
+                self.client,
+                actions,
+                chunk_size=len(actions),
+                raise_on_error=False,
+                raise_on_exception=False,
+            ):
+                op_type, info = next(iter(item.items()))
+                feedback_id = int(info.get("_id", 0))
+
+                if op_type == "delete" and (ok or info.get("status") == 404):
+                    deleted += 1
+                elif ok:
+                    indexed += 1
+                else:
+                    failed[feedback_id] = pending.get(feedback_id, time.time())
+        except Exception:
+            self.store.add_many(pending, tenants)
+            logger.warning(
+                f"Flush de indexação interrompido: {len(pending)} feedbacks "
+                f"voltaram para a fila"
+            )
+            raise
+
+        # Resultados em cache calculados antes da indexação (ou da remoção)
+        # ficam obsoletos
+        from apps.core.search_cache import bump_search_version
+
+        affected_tenants = set()
+        for action in actions:
+            if action["_op_type"] == "index":
+                affected_tenants.add(action["_source"]["tenant_id"])
+            elif action["_id"] in tenants:
+                affected_tenants.add(tenants[action["_id"]])
+        for tenant_id in affected_tenants:
+            bump_search_version(tenant_id)
+
+        if failed:
+            # Reprocessados no próximo flush (por novo enqueue ou pelo beat)
+            self.store.add_many(
+                failed, {fid: tenants[fid] for fid in failed if fid in tenants}
+            )
+            logger.warning(
+                f"{len(failed)} feedbacks falharam na indexação e voltaram para a fila"
+            )
+
+        now = time.time()
+        lags = [
+            (now - enqueued_at) * 1000
+            for feedback_id, enqueued_at in pending.items()
+            if feedback_id not in failed
+        ]
+        result = FlushResult(
+            indexed=indexed,
+            deleted=deleted,
+            failed=len(failed),
+            max_lag_ms=int(max(lags)) if lags else 0,
+            avg_lag_ms=int(sum(lags) / len(lags)) if lags else 0,
+        )
+        self._record_metrics(result, now)
+
+        logger.debug(
+            f"Flush de indexação: {indexed} indexados, {deleted} removidos, "
+            f"{len(failed)} falhas | atraso máx {result.max_lag_ms}ms"
+        )
+        return result
+
+    def schedule_flush(self) -> None:
+        """Agenda um flush ao fim da janela, se nenhum estiver agendado"""
+        if cache.add(SCHEDULED_KEY, True, timeout=self.debounce_seconds * 10):
+            from apps.core.tasks import flush_search_index_queue
+
+            flush_search_index_queue.apply_async(  # type: ignore[attr-defined]
+                countdown=self.debounce_seconds
+            )
+
+    def _build_actions(self, feedback_ids: Iterable[int]):
+        from apps.core.search_indexer import (
+            FEEDBACK_INDEX_FIELDS,
+            FEEDBACKS_ALIAS,
+            feedback_row_to_document,
+        )
+        from apps.feedbacks.models import Feedback
+
+        ids = set(feedback_ids)
+        rows = (
+            Feedback.objects.all_tenants()
+            .filter(id__in=ids, client__isnull=False)
+            .values(*FEEDBACK_INDEX_FIELDS)
+        )
+
+        for row in rows:
+            ids.discard(row["id"])
+            yield {
+                "_op_type": "index",
+                "_index": FEEDBACKS_ALIAS,
+                "_id": row["id"],
+                "_source": feedback_row_to_document(row),
+            }
+
+        for feedback_id in ids:
+            yield {"_op_type": "delete", "_index": FEEDBACKS_ALIAS, "_id": feedback_id}
+
+    # =========================================================================
+    # Métricas
+    # =========================================================================
+
+    def _incr(self, key: str) -> None:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+
+    def _record_metrics(self, result: FlushResult, flushed_at: float) -> None:
+        metrics = cache.get(METRICS_KEY) or {"total_indexed": 0, "total_flushes": 0}
+        metrics.update(
+            {
+                "last_flush_at": flushed_at,
+                "last_batch_size": result.indexed + result.deleted,
+                "last_max_lag_ms": result.max_lag_ms,
+                "last_avg_lag_ms": result.avg_lag_ms,
+                "last_failed": result.failed,
+                "total_indexed": metrics["total_indexed"]
+                + result.indexed
+                + result.deleted,
+                "total_flushes": metrics["total_flushes"] + 1,
+            }
+        )
+        cache.set(METRICS_KEY, metrics, timeout=None)
+
+    def get_metrics(self) -> dict:
+        """
+        Métricas de atraso da indexação
+
+        Returns:
+            Dict com pending, oldest_pending_age_ms, coalesced, último flush etc.
+        """
+        metrics = dict(cache.get(METRICS_KEY) or {})
+        metrics["pending"] = self.store.size()
+        metrics["coalesced"] = cache.get(COALESCED_KEY, 0)
+
+        oldest = self.store.oldest()
+        metrics["oldest_pending_age_ms"] = (
+            int((time.time() - oldest) * 1000) if oldest else 0
+        )
+
+        last_flush_at = metrics.get("last_flush_at")
+        metrics["seconds_since_last_flush"] = (
+            round(time.time() - last_flush_at, 3) if last_flush_at else None
+        )
+        return metrics
@@ -1,19 +1,30 @@
 """
 Service de busca global com ElasticSearch
 Suporta busca multi-tenant com isolamento de dados
+Fallback para busca full-text no banco quando o ElasticSearch não está disponível
 """
 
+import logging
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-from elasticsearch_dsl import Search
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.search_cache import SearchResultCache, normalize_query
+from apps.core.search_database import DatabaseSearchBackend
+
+logger = logging.getLogger(__name__)
 
 try:
+    from elasticsearch_dsl import Search
+
     from apps.feedbacks.documents import FeedbackDocument
 
     ELASTICSEARCH_AVAILABLE = True
 except ImportError:
     ELASTICSEARCH_AVAILABLE = False
+    Search = Any  # type: ignore[misc,assignment]
 
     # Create a placeholder class for type checking
     class FeedbackDocument:  # type: ignore[no-redef]
@@ -51,6 +62,11 @@ class SearchResponse:
     query: str
 
 
+# Flag de circuito aberto: após uma falha o ElasticSearch não é consultado
+# por SEARCH_ES_RETRY_SECONDS, evitando timeouts em cada busca durante a queda
+ES_UNAVAILABLE_KEY = "search:elasticsearch_unavailable"
+
+
 class GlobalSearchService:
     """
     Service de busca global usando ElasticSearch
@@ -61,26 +77,66 @@ class GlobalSearchService:
     - Filtros por tipo, status, data
     - Isolamento multi-tenant
     - Highlighting de resultados
+    - Fallback para PostgreSQL full-text (tsvector + GIN) sem ElasticSearch
+    - Cache de resultados por tenant com coalescência (SearchResultCache)
+
+    settings.SEARCH_BACKEND:
+    - "auto": ElasticSearch se configurado, com fallback para o banco
+    - "elasticsearch": apenas ElasticSearch
+    - "database": apenas banco
     """
 
-    def __init__(self, tenant_id: int):
+    def __init__(self, tenant_id: int, backend: Optional[str] = None):
         """
         Inicializa o service com isolamento de tenant
 
         Args:
             tenant_id: ID do tenant para isolamento de dados
+            backend: Sobrescreve settings.SEARCH_BACKEND
         """
         self.tenant_id = tenant_id
+        self.backend = backend or getattr(settings, "SEARCH_BACKEND", "auto")
+        self.database = DatabaseSearchBackend(tenant_id)
+        self.cache = SearchResultCache(tenant_id)
         self._validate_elasticsearch()
 
     def _validate_elasticsearch(self) -> None:
-        """Valida se ElasticSearch está disponível"""
-        if not ELASTICSEARCH_AVAILABLE:
+        """Valida se ElasticSearch está disponível quando exigido"""
+        if self.backend == "elasticsearch" and not ELASTICSEARCH_AVAILABLE:
             raise RuntimeError(
                 "ElasticSearch não está disponível. "
                 "Instale django-elasticsearch-dsl: pip install django-elasticsearch-dsl"
             )
 
+    @property
+    def use_elasticsearch(self) -> bool:
+        """Indica se a próxima consulta deve ir para o ElasticSearch"""
+        if self.backend == "database" or not ELASTICSEARCH_AVAILABLE:
+            return False
+        if self.backend == "elasticsearch":
+            return True
+        return bool(getattr(settings, "ELASTICSEARCH_DSL", None)) and not cache.get(
+            ES_UNAVAILABLE_KEY
+        )
+
+    def _call(self, method: str, *args, **kwargs):
+        """Executa no ElasticSearch com fallback para o banco em caso de falha"""
+        if self.use_elasticsearch:
+            try:
+                return getattr(self, f"_es_{method}")(*args, **kwargs)
+            except Exception as e:
+                if self.backend == "elasticsearch":
+                    raise
+                cache.set(
+                    ES_UNAVAILABLE_KEY,
+                    True,
+                    timeout=getattr(settings, "SEARCH_ES_RETRY_SECONDS", 30),
+                )
+                logger.warning(
+                    f"ElasticSearch indisponível, usando busca no banco: {e}"
+                )
+        return getattr(self.database, method)(*args, **kwargs)
+
     def search(
         self,
         query: str,
@@ -102,6 +158,64 @@ class GlobalSearchService:
         Returns:
             SearchResponse com resultados paginados
         """
+        params = {
+            "q": normalize_query(query),
+            "filters": {
+                k: v for k, v in (filters or {}).items() if v not in (None, "")
+            },
+            "page": page,
+            "page_size": page_size,
+            "highlight": highlight,
+        }
+        return self.cache.get_or_compute(
+            "search",
+            params,
+            lambda: self._call("search", query, filters, page, page_size, highlight),
+        )
+
+    def autocomplete(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Retorna sugestões de autocomplete
+
+        Args:
+            query: Termo parcial para autocomplete
+            limit: Número máximo de sugestões
+
+        Returns:
+            Lista de sugestões com id, titulo e protocolo
+        """
+        params = {"q": normalize_query(query), "limit": limit}
+        return self.cache.get_or_compute(
+            "autocomplete",
+            params,
+            lambda: self._call("autocomplete", query, limit),
+            timeout=getattr(settings, "SEARCH_AUTOCOMPLETE_CACHE_TTL", None),
+        )
+
+    def search_by_protocol(self, protocol: str) -> Optional[SearchResult]:
+        """
+        Busca feedback por protocolo exato
+
+        Args:
+            protocol: Protocolo do feedback (ex: OUVY-1234-5678)
+
+        Returns:
+            SearchResult ou None se não encontrado
+        """
+        return self._call("search_by_protocol", protocol)
+
+    # =========================================================================
+    # ElasticSearch
+    # =========================================================================
+
+    def _es_search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: int = 20,
+        highlight: bool = True,
+    ) -> SearchResponse:
         # Criar busca base com filtro de tenant
         s = FeedbackDocument.search()
         s = s.filter("term", tenant_id=self.tenant_id)
@@ -161,17 +275,7 @@ class GlobalSearchService:
             query=query,
         )
 
-    def autocomplete(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
-        """
-        Retorna sugestões de autocomplete
-
-        Args:
-            query: Termo parcial para autocomplete
-            limit: Número máximo de sugestões
-
-        Returns:
-            Lista de sugestões com id, titulo e protocolo
-        """
+    def _es_autocomplete(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
         s = FeedbackDocument.search()
         s = s.filter("term", tenant_id=self.tenant_id)
 
@@ -193,16 +297,7 @@ class GlobalSearchService:
             for hit in response
         ]
 
-    def search_by_protocol(self, protocol: str) -> Optional[SearchResult]:
-        """
-        Busca feedback por protocolo exato
-
-        Args:
-            protocol: Protocolo do feedback (ex: OUVY-1234-5678)
-
-        Returns:
-            SearchResult ou None se não encontrado
-        """
+    def _es_search_by_protocol(self, protocol: str) -> Optional[SearchResult]:
         s = FeedbackDocument.search()
         s = s.filter("term", tenant_id=self.tenant_id)
         s = s.filter("term", protocolo=protocol.upper())
@@ -273,25 +368,20 @@ class GlobalSearchService:
 
         return results
 
-    def rebuild_index(self) -> int:
+    def rebuild_index(self, resume: bool = True) -> int:
         """
-        Reconstrói índice do tenant
+        Reconstrói índice do tenant via _bulk paralelo
+
+        Args:
+            resume: Retoma a partir do último checkpoint, se houver
 
         Returns:
             Número de documentos indexados
         """
-        from apps.feedbacks.models import Feedback
-
-        # Buscar feedbacks do tenant
-        feedbacks = Feedback.objects.filter(client_id=self.tenant_id)
+        from apps.core.search_indexer import BulkReindexer
 
-        # Reindexar em batch
-        count = 0
-        for feedback in feedbacks.iterator(chunk_size=100):
-            FeedbackDocument().update(feedback)
-            count += 1
-
-        return count
+        result = BulkReindexer(tenant_id=self.tenant_id).run(resume=resume)
+        return result.indexed
 
 
 # Função helper para uso em views
@@ -307,6 +397,10 @@ def get_search_service(request) -> GlobalSearchService:
     """
     tenant_id = getattr(request, "tenant_id", None)
 
+    if not tenant_id and getattr(request, "tenant", None) is not None:
+        # Tenant resolvido pelo TenantMiddleware
+        tenant_id = request.tenant.id
+
     if not tenant_id:
         # Tentar obter do usuário autenticado
         if hasattr(request, "user") and hasattr(request.user, "tenant_id"):
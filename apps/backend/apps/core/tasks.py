@@ -10,7 +10,6 @@ from typing import List, Optional
 from celery import shared_task
 from django.conf import settings
 from django.core.mail import send_mail
-from django.db import models
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -165,50 +164,35 @@ Equipe Ouvify
 @shared_task
 def update_analytics_cache():
     """
-    Atualiza cache de analytics para todos os tenants ativos
-    """
-    from django.core.cache import cache
-    from django.db.models import Count
+    Reconcilia os contadores de estatísticas de todos os tenants ativos
 
-    from apps.feedbacks.models import Feedback
+    Os contadores do dashboard/analytics são mantidos por delta a cada
+    escrita (apps.feedbacks.stats_counters); esta tarefa periódica os refaz
+    a partir do banco, corrigindo desvios e descartando buckets antigos.
+    """
+    from apps.feedbacks.stats_counters import reconcile
     from apps.tenants.models import Client
 
-    tenants = Client.objects.filter(ativo=True)
+    tenant_ids = list(Client.objects.filter(ativo=True).values_list("id", flat=True))
 
-    for tenant in tenants:
+    for tenant_id in tenant_ids:
         try:
-            stats = Feedback.objects.filter(client=tenant).aggregate(
-                total=Count("id"),
-                novos=Count("id", filter=models.Q(status="novo")),
-                em_andamento=Count("id", filter=models.Q(status="em_andamento")),
-                resolvidos=Count("id", filter=models.Q(status="resolvido")),
-            )
-
-            cache_key = f"analytics:tenant:{tenant.id}"
-            cache.set(cache_key, stats, timeout=60 * 60)  # 1 hora
-
-            logger.debug(f"Cache atualizado para tenant {tenant.id}")
-
+            reconcile(tenant_id)
         except Exception as e:
-            logger.error(f"Erro ao atualizar cache do tenant {tenant.id}: {e}")
+            logger.error(f"Erro ao reconciliar tenant {tenant_id}: {e}")
 
-    return len(tenants)
+    return len(tenant_ids)
 
 
 @shared_task
 def invalidate_tenant_cache(tenant_id: int):
     """
     Invalida cache de um tenant específico
+    (incrementa a geração do namespace do tenant)
     """
-    from django.core.cache import cache
-
-    cache_keys = [
-        f"analytics:tenant:{tenant_id}",
-        f"feedbacks:tenant:{tenant_id}",
-        f"dashboard:tenant:{tenant_id}",
-    ]
+    from apps.core.cache_service import CacheService
 
-    cache.delete_many(cache_keys)
+    CacheService(tenant_id=tenant_id).invalidate_tenant_cache()
     logger.info(f"Cache invalidado para tenant {tenant_id}")
 
     return True
@@ -218,33 +202,12 @@ def invalidate_tenant_cache(tenant_id: int):
 def warm_cache_for_tenant(tenant_id: int):
     """
     Aquece cache para um tenant específico
+    (reconstrói os contadores do dashboard/analytics)
     """
-    from django.core.cache import cache
-    from django.db.models import Count, Q
-
-    from apps.feedbacks.models import Feedback
-    from apps.tenants.models import Client
+    from apps.feedbacks.stats_counters import reconcile
 
     try:
-        tenant = Client.objects.get(id=tenant_id)
-
-        # Stats básicas
-        stats = Feedback.objects.filter(client=tenant).aggregate(
-            total=Count("id"),
-            novos=Count("id", filter=Q(status="novo")),
-            em_andamento=Count("id", filter=Q(status="em_andamento")),
-            resolvidos=Count("id", filter=Q(status="resolvido")),
-        )
-        cache.set(f"analytics:tenant:{tenant_id}", stats, timeout=60 * 60)
-
-        # Feedbacks recentes
-        recent = list(
-            Feedback.objects.filter(client=tenant)
-            .order_by("-created_at")[:10]
-            .values("id", "protocolo", "titulo", "status", "created_at")
-        )
-        cache.set(f"recent:tenant:{tenant_id}", recent, timeout=60 * 15)
-
+        reconcile(tenant_id)
         logger.info(f"Cache aquecido para tenant {tenant_id}")
         return True
 
@@ -253,6 +216,20 @@ def warm_cache_for_tenant(tenant_id: int):
         return False
 
 
+@shared_task(ignore_result=True)
+def flush_api_key_usage():
+    """
+    Grava no banco o uso das API keys acumulado no Redis (um UPDATE por lote)
+    """
+    from apps.core.api_key_usage import flush_api_key_usage as flush
+
+    try:
+        return flush()
+    except Exception as e:
+        logger.error(f"Erro ao gravar uso das API keys: {e}")
+        return 0
+
+
 # =============================================================================
 # Tasks de Cleanup
 # =============================================================================
@@ -417,46 +394,73 @@ def generate_report_async(
 @shared_task
 def index_feedback_async(feedback_id: int):
     """
-    Indexa feedback no ElasticSearch de forma assíncrona
+    Enfileira feedback para indexação no ElasticSearch
+
+    Atualizações do mesmo feedback dentro da janela de debounce são
+    coalescidas e enviadas em um único _bulk por flush_search_index_queue.
+    """
+    from apps.core.search_queue import SearchIndexQueue
+
+    queued = SearchIndexQueue().enqueue(feedback_id)
+
+    logger.debug(
+        f"Feedback {feedback_id} {'enfileirado' if queued else 'coalescido'} "
+        f"para indexação"
+    )
+    return queued
+
+
+@shared_task(ignore_result=True)
+def flush_search_index_queue():
+    """
+    Envia as atualizações pendentes do índice de busca em um único _bulk
     """
     try:
-        from apps.feedbacks.documents import FeedbackDocument
-        from apps.feedbacks.models import Feedback
+        from apps.core.search_queue import ELASTICSEARCH_AVAILABLE, SearchIndexQueue
 
-        feedback = Feedback.objects.get(id=feedback_id)
-        FeedbackDocument().update(feedback)
+        if not ELASTICSEARCH_AVAILABLE:
+            raise ImportError("elasticsearch")
 
-        logger.debug(f"Feedback {feedback_id} indexado")
-        return True
+        result = SearchIndexQueue().flush()
+        return result.indexed + result.deleted if result else 0
 
     except ImportError:
         logger.warning("ElasticSearch não disponível")
-        return False
+        return 0
     except Exception as e:
-        logger.error(f"Erro ao indexar feedback: {e}")
-        return False
+        logger.error(f"Erro ao processar fila de indexação: {e}")
+        return 0
 
 
 @shared_task
-def rebuild_search_index(tenant_id: Optional[int] = None):
+def rebuild_search_index(
+    tenant_id: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    resume: bool = True,
+):
     """
     Reconstrói índice de busca
+
+    Sem tenant_id, grava em um novo índice versionado e troca o alias
+    "feedbacks" ao final (sem downtime). Com tenant_id, reindexa in-place.
+    Interrupções retomam a partir do último checkpoint.
     """
     try:
-        from apps.feedbacks.documents import FeedbackDocument
-        from apps.feedbacks.models import Feedback
+        from apps.core.search_indexer import ELASTICSEARCH_AVAILABLE, BulkReindexer
 
-        qs = Feedback.objects.all()
-        if tenant_id:
-            qs = qs.filter(client_id=tenant_id)
+        if not ELASTICSEARCH_AVAILABLE:
+            raise ImportError("elasticsearch")
 
-        count = 0
-        for feedback in qs.iterator(chunk_size=100):
-            FeedbackDocument().update(feedback)
-            count += 1
+        result = BulkReindexer(
+            tenant_id=tenant_id, batch_size=batch_size, concurrency=concurrency
+        ).run(resume=resume)
 
-        logger.info(f"Índice reconstruído: {count} documentos")
-        return count
+        logger.info(
+            f"Índice reconstruído: {result.indexed} documentos em {result.index} "
+            f"({result.errors} erros)"
+        )
+        return result.indexed
 
     except ImportError:
         logger.warning("ElasticSearch não disponível")
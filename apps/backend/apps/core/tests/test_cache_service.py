@@ -0,0 +1,272 @@
+"""
+Testes do CacheService: namespaces versionados e get_or_set protegido
+Cobertura: invalidação por INCR, isolamento, cópia local, decorators
+(bytes pré-renderizados, ETag/304), single-flight, XFetch e
+stale-while-revalidate
+"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from apps.core import cache_service
+from apps.core.cache_service import (
+    GENERATION_KEY,
+    CacheService,
+    clear_local_generations,
+    invalidate_on_change,
+    protected_get_or_set,
+    tenant_namespace,
+)
+from apps.core.decorators import cache_response, invalidate_cache
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    clear_local_generations()
+    yield
+    cache.clear()
+    clear_local_generations()
+
+
+class TestGenerationNamespaces:
+    def test_tenant_invalidation_hides_all_domains(self):
+        service = CacheService(tenant_id=1)
+        service.set_dashboard_stats({"total": 1})
+        service.set_analytics({"kpi": 2})
+
+        service.invalidate_tenant_cache()
+
+        assert service.get_dashboard_stats() is None
+        assert service.get_analytics() is None
+
+    def test_prefix_invalidation_is_scoped(self):
+        service = CacheService(tenant_id=1)
+        other = CacheService(tenant_id=2)
+        service.set_dashboard_stats({"total": 1})
+        service.set_analytics({"kpi": 2})
+        other.set_dashboard_stats({"total": 9})
+
+        service.invalidate_prefix(CacheService.DASHBOARD_PREFIX)
+
+        assert service.get_dashboard_stats() is None
+        assert service.get_analytics() == {"kpi": 2}
+        assert other.get_dashboard_stats() == {"total": 9}
+
+    def test_no_pattern_scan_on_invalidation(self):
+        service = CacheService(tenant_id=1)
+        with patch.object(CacheService, "delete_pattern") as delete_pattern:
+            service.invalidate_tenant_cache()
+            service.invalidate_prefix("analytics")
+
+        delete_pattern.assert_not_called()
+
+    def test_local_generations_avoid_cache_reads(self):
+        service = CacheService(tenant_id=1)
+        service._build_key("analytics")
+
+        with patch.object(cache_service.cache, "get_many") as get_many:
+            for _ in range(10):
+                service._build_key("analytics", "x")
+
+        get_many.assert_not_called()
+
+    @override_settings(CACHE_GENERATION_LOCAL_TTL=0)
+    def test_bump_from_other_process_is_visible(self):
+        service = CacheService(tenant_id=1)
+        service.set_dashboard_stats({"total": 1})
+
+        # Outro processo incrementa diretamente o contador compartilhado
+        cache.incr(GENERATION_KEY.format(namespace=tenant_namespace(1)))
+
+        assert service.get_dashboard_stats() is None
+
+    def test_invalidate_on_change_receiver(self):
+        service = CacheService(tenant_id=3)
+        service.set_recent_feedbacks([{"id": 1}])
+
+        receiver = invalidate_on_change(object, CacheService.FEEDBACKS_PREFIX)
+        receiver(sender=object, instance=SimpleNamespace(client_id=3))
+
+        assert service.get_recent_feedbacks() is None
+
+
+class FakeView:
+    calls = 0
+    itens: list = []
+
+    @cache_response(timeout=60, key_prefix="feedbacks", vary_on_user=False)
+    def list(self, request):
+        FakeView.calls += 1
+        return Response({"calls": FakeView.calls, "itens": self.itens})
+
+    @invalidate_cache(["feedbacks:tenant:{tenant_id}:*"])
+    def create(self, request):
+        return Response(status=201)
+
+
+class TestCacheDecorators:
+    @pytest.fixture(autouse=True)
+    def reset_view(self):
+        FakeView.calls = 0
+        FakeView.itens = []
+
+    @staticmethod
+    def request(method, tenant_id, **extra):
+        req = getattr(APIRequestFactory(), method)("/api/feedbacks/", **extra)
+        req.user = SimpleNamespace(is_authenticated=False)
+        req.tenant = SimpleNamespace(id=tenant_id)
+        return req
+
+    def test_invalidate_cache_bumps_view_namespace(self):
+        view = FakeView()
+
+        def calls(tenant_id):
+            response = view.list(self.request("get", tenant_id))
+            return json.loads(response.content)["calls"]
+
+        assert calls(1) == 1
+        assert calls(1) == 1
+        assert calls(2) == 2
+
+        view.create(self.request("post", 1))
+
+        assert calls(1) == 3
+        assert calls(2) == 2
+
+    def test_hit_returns_same_bytes_without_rendering(self):
+        view = FakeView()
+        first = view.list(self.request("get", 1))
+
+        with patch("rest_framework.renderers.JSONRenderer.render") as render:
+            second = view.list(self.request("get", 1))
+
+        render.assert_not_called()
+        assert second.content == first.content
+        assert second["Content-Type"] == "application/json"
+        assert second["ETag"] == first["ETag"]
+
+    def test_if_none_match_returns_304(self):
+        view = FakeView()
+        etag = view.list(self.request("get", 1))["ETag"]
+
+        response = view.list(self.request("get", 1, HTTP_IF_NONE_MATCH=f"W/{etag}"))
+        assert response.status_code == 304
+        assert response.content == b""
+
+        other = view.list(self.request("get", 1, HTTP_IF_NONE_MATCH='"outro"'))
+        assert other.status_code == 200
+
+    @override_settings(CACHE_RESPONSE_COMPRESS_MIN_BYTES=256)
+    def test_large_bodies_stored_compressed(self):
+        FakeView.itens = [{"id": i, "texto": "feedback repetido"} for i in range(50)]
+        view = FakeView()
+        with patch.object(cache, "set", wraps=cache.set) as cache_set:
+            content = view.list(self.request("get", 1)).content
+
+        entry = cache_set.call_args.args[1]
+        assert entry["encoding"] == "zlib"
+        assert len(entry["body"]) < len(content)
+
+        hit = view.list(self.request("get", 1))
+        assert hit.content == content
+        assert json.loads(content)["itens"] == FakeView.itens
+        assert FakeView.calls == 1
+
+
+class TestProtectedGetOrSet:
+    def test_single_flight_on_concurrent_miss(self):
+        calls = []
+
+        def slow_factory():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"total": 42}
+
+        results = []
+
+        def worker():
+            results.append(protected_get_or_set("stats", slow_factory, timeout=60))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"total": 42}] * 8
+
+    def test_xfetch_recomputes_early_only_near_expiry(self):
+        cache.set(
+            "fresh",
+            {"value": "old", "delta": 0.01, "expires_at": time.time() + 300},
+            timeout=300,
+        )
+        cache.set(
+            "near",
+            {"value": "old", "delta": 5.0, "expires_at": time.time() + 1},
+            timeout=300,
+        )
+
+        # random() pequeno = antecipação grande (delta * -ln(rand))
+        with patch.object(cache_service.random, "random", return_value=0.01):
+            assert protected_get_or_set("fresh", lambda: "new", timeout=60) == "old"
+            assert protected_get_or_set("near", lambda: "new", timeout=60) == "new"
+
+    @override_settings(CACHE_REFRESH_IN_BACKGROUND=True)
+    def test_stale_while_revalidate_serves_old_value(self):
+        cache.set(
+            "swr",
+            {"value": "old", "delta": 0.0, "expires_at": time.time() - 1},
+            timeout=60,
+        )
+        refreshed = threading.Event()
+
+        def factory():
+            refreshed.set()
+            return "new"
+
+        value = protected_get_or_set("swr", factory, timeout=60, stale_ttl=30)
+
+        assert value == "old"
+        assert refreshed.wait(timeout=2)
+        deadline = time.monotonic() + 2
+        while cache.get("swr")["value"] != "new" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert protected_get_or_set("swr", factory, timeout=60) == "new"
+
+    def test_none_is_not_cached(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+
+        protected_get_or_set("empty", factory, timeout=60)
+        protected_get_or_set("empty", factory, timeout=60)
+
+        assert len(calls) == 2
+
+    def test_lock_errors_fall_back_to_factory(self):
+        with (
+            patch.object(cache, "add", side_effect=ConnectionError("redis down")),
+            patch.object(cache, "delete", side_effect=ConnectionError("redis down")),
+        ):
+            assert protected_get_or_set("down", lambda: "value", timeout=60) == "value"
+
+        cache.set(
+            "down-near",
+            {"value": "old", "delta": 0.0, "expires_at": time.time() - 1},
+            timeout=60,
+        )
+        with patch.object(cache, "add", side_effect=ConnectionError("redis down")):
+            assert protected_get_or_set("down-near", lambda: "new", timeout=60) == "new"
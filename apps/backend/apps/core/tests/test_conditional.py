@@ -0,0 +1,152 @@
+"""
+Testes do GET condicional (apps.core.conditional)
+Cobertura: 304 antes de avaliar o queryset, invalidação por versão/data e
+endpoints de feedback, tags, templates, planos e tenant-info
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.feedbacks.models import FeedbackInteracao, ResponseTemplate, Tag
+
+pytestmark = pytest.mark.django_db
+
+TAGS_URL = "/api/tags/"
+TEMPLATES_URL = "/api/response-templates/"
+PLANS_URL = "/api/v1/billing/plans/"
+
+
+def table_queries(ctx, table):
+    return [q for q in ctx.captured_queries if table in q["sql"]]
+
+
+def revalidate(client, url, etag, **extra):
+    return client.get(url, HTTP_IF_NONE_MATCH=etag, **extra)
+
+
+class TestFeedbackDetail:
+    def test_304_reads_single_column_only(
+        self, authenticated_api_client, authenticated_user, feedback_factory
+    ):
+        _, tenant = authenticated_user
+        feedback = feedback_factory(client=tenant)
+        url = f"/api/feedbacks/{feedback.id}/"
+
+        first = authenticated_api_client.get(url)
+        assert first.status_code == 200
+        assert first["ETag"].startswith('W/"')
+        assert "Last-Modified" in first
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = revalidate(authenticated_api_client, url, first["ETag"])
+
+        assert response.status_code == 304
+        assert response["ETag"] == first["ETag"]
+        assert len(table_queries(ctx, 'feedbacks_feedback"')) <= 1
+        assert table_queries(ctx, "feedbacks_feedbackinteracao") == []
+
+    def test_feedback_and_interaction_changes_invalidate(
+        self, authenticated_api_client, authenticated_user, feedback_factory
+    ):
+        user, tenant = authenticated_user
+        feedback = feedback_factory(client=tenant)
+        url = f"/api/feedbacks/{feedback.id}/"
+        etag = authenticated_api_client.get(url)["ETag"]
+
+        FeedbackInteracao.objects.create(
+            client=tenant,
+            feedback=feedback,
+            autor=user,
+            tipo="NOTA_INTERNA",
+            mensagem="Analisando",
+        )
+        response = revalidate(authenticated_api_client, url, etag)
+        assert response.status_code == 200
+        etag = response["ETag"]
+
+        feedback.titulo = "Novo título"
+        feedback.save()
+        response = revalidate(authenticated_api_client, url, etag)
+        assert response.status_code == 200
+        assert response.data["titulo"] == "Novo título"
+
+    def test_missing_feedback_is_404_even_with_wildcard(self, authenticated_api_client):
+        response = revalidate(authenticated_api_client, "/api/feedbacks/999/", "*")
+        assert response.status_code == 404
+
+
+class TestTenantCollections:
+    def test_tag_list_304_without_queries_until_tag_changes(
+        self, authenticated_api_client, authenticated_user
+    ):
+        _, tenant = authenticated_user
+        Tag.objects.create(client=tenant, nome="Urgente")
+        etag = authenticated_api_client.get(TAGS_URL)["ETag"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = revalidate(authenticated_api_client, TAGS_URL, etag)
+        assert response.status_code == 304
+        assert table_queries(ctx, "feedbacks_tag") == []
+
+        Tag.objects.create(client=tenant, nome="Bug")
+        response = revalidate(authenticated_api_client, TAGS_URL, etag)
+        assert response.status_code == 200
+        assert response.data["count"] == 2
+
+    def test_tag_count_changes_when_feedback_tagged(
+        self, authenticated_api_client, authenticated_user, feedback_factory
+    ):
+        _, tenant = authenticated_user
+        tag = Tag.objects.create(client=tenant, nome="Urgente")
+        etag = authenticated_api_client.get(TAGS_URL)["ETag"]
+
+        feedback_factory(client=tenant).tags.add(tag)
+
+        response = revalidate(authenticated_api_client, TAGS_URL, etag)
+        assert response.status_code == 200
+
+    def test_query_string_changes_etag(self, authenticated_api_client):
+        first = authenticated_api_client.get(TEMPLATES_URL)
+        second = authenticated_api_client.get(TEMPLATES_URL, {"ativo": "true"})
+        assert first["ETag"] != second["ETag"]
+
+    def test_template_list_invalidated_by_write(
+        self, authenticated_api_client, authenticated_user
+    ):
+        _, tenant = authenticated_user
+        etag = authenticated_api_client.get(TEMPLATES_URL)["ETag"]
+        response = revalidate(authenticated_api_client, TEMPLATES_URL, etag)
+        assert response.status_code == 304
+
+        ResponseTemplate.objects.create(
+            client=tenant, nome="Agradecimento", conteudo="Obrigado!"
+        )
+
+        response = revalidate(authenticated_api_client, TEMPLATES_URL, etag)
+        assert response.status_code == 200
+        assert response.data["count"] == 1
+
+
+class TestPublicResources:
+    def test_plans_global_version(self, api_client, plan_factory):
+        plan = plan_factory()
+        etag = api_client.get(PLANS_URL)["ETag"]
+        assert revalidate(api_client, PLANS_URL, etag).status_code == 304
+
+        plan.save()
+
+        assert revalidate(api_client, PLANS_URL, etag).status_code == 200
+
+    def test_tenant_info_304_until_branding_update(self, api_client, tenant):
+        headers = {"HTTP_X_TENANT_ID": str(tenant.id)}
+        etag = api_client.get("/api/tenant-info/", **headers)["ETag"]
+        response = revalidate(api_client, "/api/tenant-info/", etag, **headers)
+        assert response.status_code == 304
+
+        tenant.cor_primaria = "#123456"
+        tenant.save()
+
+        response = revalidate(api_client, "/api/tenant-info/", etag, **headers)
+        assert response.status_code == 200
+        assert response.data["cor_primaria"] == "#123456"
@@ -0,0 +1,81 @@
+"""
+Testes da paginação por cursor (KeysetPagination)
+Cobertura: opt-in, percurso completo com empate de data, voltar página, count
+"""
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.feedbacks.models import Feedback
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def feedbacks(authenticated_user, feedback_factory):
+    cache.clear()
+    _, tenant = authenticated_user
+    created = [
+        feedback_factory(client=tenant, titulo=f"Feedback {i}") for i in range(5)
+    ]
+    # Três feedbacks com a mesma data: o desempate é feito pelo id
+    same_time = timezone.now()
+    tied = [f.id for f in created[1:4]]
+    Feedback.objects.all_tenants().filter(id__in=tied).update(data_criacao=same_time)
+    return created
+
+
+def expected_order(feedbacks):
+    rows = Feedback.objects.all_tenants().filter(id__in=[f.id for f in feedbacks])
+    return list(rows.order_by("-data_criacao", "-id").values_list("id", flat=True))
+
+
+class TestKeysetPagination:
+    def test_page_number_is_default(self, authenticated_api_client, feedbacks):
+        response = authenticated_api_client.get("/api/feedbacks/", {"page_size": 2})
+
+        assert response.status_code == 200
+        assert response.data["current_page"] == 1
+        assert response.data["total_pages"] == 3
+
+    def test_cursor_walks_all_pages_without_duplicates(
+        self, authenticated_api_client, feedbacks
+    ):
+        response = authenticated_api_client.get(
+            "/api/feedbacks/", {"cursor": "", "page_size": 2}
+        )
+        assert response.status_code == 200
+        assert response.data["count"] == 5
+        assert response.data["count_is_approximate"] is True
+        assert response.data["previous"] is None
+
+        seen = [item["id"] for item in response.data["results"]]
+        pages = [response.data]
+        while response.data["next"]:
+            response = authenticated_api_client.get(response.data["next"])
+            assert response.status_code == 200
+            seen.extend(item["id"] for item in response.data["results"])
+            pages.append(response.data)
+
+        assert seen == expected_order(feedbacks)
+        assert len(pages) == 3
+
+        # Voltar da última página devolve a página anterior
+        response = authenticated_api_client.get(pages[-1]["previous"])
+        assert [i["id"] for i in response.data["results"]] == [
+            i["id"] for i in pages[1]["results"]
+        ]
+
+    def test_invalid_cursor_returns_404(self, authenticated_api_client, feedbacks):
+        response = authenticated_api_client.get("/api/feedbacks/", {"cursor": "xx"})
+
+        assert response.status_code == 404
+
+    def test_count_can_be_skipped(self, authenticated_api_client, feedbacks):
+        response = authenticated_api_client.get(
+            "/api/feedbacks/", {"pagination": "cursor", "include_count": "false"}
+        )
+
+        assert response.data["count"] is None
+        assert len(response.data["results"]) == 5
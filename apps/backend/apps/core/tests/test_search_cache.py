@@ -0,0 +1,76 @@
+"""
+Testes do cache de resultados da busca (SearchResultCache)
+Cobertura: hit por query normalizada, versão por tenant, coalescência
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.cache import cache
+
+from apps.core.search_cache import (
+    SearchResultCache,
+    bump_search_version,
+    get_search_version,
+)
+from apps.core.search_service import GlobalSearchService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestSearchResultCache:
+    def test_identical_normalized_queries_hit_cache(self, tenant, monkeypatch):
+        service = GlobalSearchService(tenant_id=tenant.id)
+        backend_search = MagicMock(return_value="resultado")
+        monkeypatch.setattr(service.database, "search", backend_search)
+
+        assert service.search("  Atendimento  Ruim") == "resultado"
+        assert service.search("atendimento ruim") == "resultado"
+        assert backend_search.call_count == 1
+
+        # Página diferente é outra entrada
+        service.search("atendimento ruim", page=2)
+        assert backend_search.call_count == 2
+
+    def test_version_bump_isolated_per_tenant(self, tenant, tenant_factory):
+        other = tenant_factory(nome="Outra", subdominio="outra")
+        key = SearchResultCache(tenant.id).build_key("search", {"q": "x"})
+        other_key = SearchResultCache(other.id).build_key("search", {"q": "x"})
+
+        bump_search_version(tenant.id)
+
+        assert SearchResultCache(tenant.id).build_key("search", {"q": "x"}) != key
+        assert SearchResultCache(other.id).build_key("search", {"q": "x"}) == other_key
+
+    def test_feedback_change_bumps_version_on_commit(
+        self, tenant, feedback_factory, django_capture_on_commit_callbacks
+    ):
+        before = get_search_version(tenant.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            feedback_factory(client=tenant)
+
+        assert get_search_version(tenant.id) == before + 1
+
+    def test_concurrent_identical_requests_are_coalesced(self, tenant):
+        search_cache = SearchResultCache(tenant.id)
+        params = {"q": "atendimento"}
+        key = search_cache.build_key("search", params)
+        factory = MagicMock(return_value="duplicado")
+
+        # Simula outra requisição segurando o lock e gravando o resultado
+        cache.add(f"{key}:lock", True)
+        timer = threading.Timer(0.1, lambda: cache.set(key, "primeiro"))
+        timer.start()
+
+        assert search_cache.get_or_compute("search", params, factory) == "primeiro"
+        factory.assert_not_called()
+        timer.join()
@@ -0,0 +1,113 @@
+"""
+Testes da busca no banco (fallback do ElasticSearch)
+Cobertura: contrato SearchResponse, isolamento de tenant, fallback e view
+"""
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from apps.core import search_service
+from apps.core.search_database import DatabaseSearchBackend
+from apps.core.search_service import (
+    ES_UNAVAILABLE_KEY,
+    GlobalSearchService,
+    SearchResponse,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def feedbacks(tenant, tenant_factory, feedback_factory):
+    other = tenant_factory(nome="Outra", subdominio="outra")
+    return {
+        "atendimento": feedback_factory(
+            client=tenant, titulo="Problema no atendimento", tipo="reclamacao"
+        ),
+        "produto": feedback_factory(
+            client=tenant, titulo="Sugestão de produto", tipo="sugestao"
+        ),
+        "outro_tenant": feedback_factory(client=other, titulo="Atendimento ruim"),
+    }
+
+
+class TestDatabaseSearchBackend:
+    def test_search_returns_search_response_scoped_to_tenant(self, tenant, feedbacks):
+        response = DatabaseSearchBackend(tenant.id).search("atendimento")
+
+        assert isinstance(response, SearchResponse)
+        assert response.total == 1
+        assert [r.id for r in response.results] == [feedbacks["atendimento"].id]
+
+    def test_search_by_protocol_prefix_and_filters(self, tenant, feedbacks):
+        backend = DatabaseSearchBackend(tenant.id)
+        protocolo = feedbacks["produto"].protocolo
+
+        assert backend.search(protocolo[:9].lower()).total >= 1
+        assert backend.search("", filters={"tipo": "sugestao"}).total == 1
+        assert (
+            backend.search_by_protocol(protocolo.lower()).id == feedbacks["produto"].id
+        )
+        assert backend.search_by_protocol(feedbacks["outro_tenant"].protocolo) is None
+
+    def test_autocomplete(self, tenant, feedbacks):
+        suggestions = DatabaseSearchBackend(tenant.id).autocomplete("produto")
+
+        assert suggestions == [
+            {
+                "id": str(feedbacks["produto"].id),
+                "titulo": "Sugestão de produto",
+                "protocolo": feedbacks["produto"].protocolo,
+            }
+        ]
+
+
+class TestGlobalSearchFallback:
+    def test_database_backend_without_elasticsearch_config(self, tenant, feedbacks):
+        service = GlobalSearchService(tenant_id=tenant.id)
+
+        assert service.use_elasticsearch is False
+        assert service.search("atendimento").total == 1
+
+    @override_settings(ELASTICSEARCH_DSL={"default": {"hosts": "localhost:9200"}})
+    def test_elasticsearch_failure_falls_back_and_opens_circuit(
+        self, monkeypatch, tenant, feedbacks
+    ):
+        if not search_service.ELASTICSEARCH_AVAILABLE:
+            pytest.skip("elasticsearch-dsl não instalado")
+
+        calls = []
+
+        def failing_search(*args, **kwargs):
+            calls.append(1)
+            raise ConnectionError("ES fora do ar")
+
+        service = GlobalSearchService(tenant_id=tenant.id)
+        monkeypatch.setattr(service, "_es_search", failing_search)
+
+        assert service.search("atendimento").total == 1
+        assert cache.get(ES_UNAVAILABLE_KEY) is True
+
+        # Circuito aberto: próxima busca vai direto ao banco
+        assert service.search("problema").total == 1
+        assert len(calls) == 1
+
+    def test_global_search_view_uses_database(
+        self, authenticated_api_client, authenticated_user, feedback_factory
+    ):
+        _, tenant = authenticated_user
+        feedback_factory(client=tenant, titulo="Demora no atendimento")
+
+        response = authenticated_api_client.get("/api/search/", {"q": "atendimento"})
+
+        assert response.status_code == 200
+        assert response.data["total"] == 1
+        assert response.data["results"][0]["titulo"] == "Demora no atendimento"
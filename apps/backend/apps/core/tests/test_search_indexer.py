@@ -0,0 +1,127 @@
+"""
+Testes do motor de reindexação em lote (BulkReindexer)
+Cobertura: leitura via values(), troca de alias, checkpoint/retomada
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.cache import cache
+
+from apps.core import search_indexer
+from apps.core.search_indexer import FEEDBACKS_ALIAS, BulkReindexer
+
+pytestmark = pytest.mark.django_db
+
+
+def fake_parallel_bulk(fail_ids=()):
+    """Simula helpers.parallel_bulk consumindo as ações em ordem"""
+    sent = []
+
+    def _bulk(client, actions, **kwargs):
+        for action in actions:
+            sent.append(action)
+            ok = action["_id"] not in fail_ids
+            yield ok, {
+                "index": {"_id": str(action["_id"]), "status": 201 if ok else 500}
+            }
+
+    return _bulk, sent
+
+
+@pytest.fixture
+def es_client():
+    client = MagicMock()
+    client.indices.exists_alias.return_value = True
+    client.indices.get_alias.return_value = {"feedbacks_v1": {}}
+    return client
+
+
+@pytest.fixture
+def feedbacks(tenant, feedback_factory):
+    cache.clear()
+    return [feedback_factory(client=tenant, titulo=f"Feedback {i}") for i in range(5)]
+
+
+class TestBulkReindexer:
+    def test_full_rebuild_writes_new_index_and_swaps_alias(
+        self, monkeypatch, es_client, feedbacks
+    ):
+        bulk, sent = fake_parallel_bulk()
+        monkeypatch.setattr(search_indexer, "parallel_bulk", bulk)
+
+        result = BulkReindexer(client=es_client, batch_size=2).run()
+
+        assert result.indexed == 5
+        assert result.alias_swapped is True
+        assert result.index.startswith(f"{FEEDBACKS_ALIAS}_v")
+        assert {a["_index"] for a in sent} == {result.index}
+        es_client.indices.create.assert_called_once()
+
+        actions = es_client.indices.update_aliases.call_args.kwargs["actions"]
+        assert {
+            "remove": {"index": "feedbacks_v1", "alias": FEEDBACKS_ALIAS}
+        } in actions
+        assert {"add": {"index": result.index, "alias": FEEDBACKS_ALIAS}} in actions
+        assert BulkReindexer().get_checkpoint() is None
+
+    def test_document_built_from_values_row(self, monkeypatch, es_client, feedbacks):
+        bulk, sent = fake_parallel_bulk()
+        monkeypatch.setattr(search_indexer, "parallel_bulk", bulk)
+
+        BulkReindexer(tenant_id=feedbacks[0].client_id, client=es_client).run()
+
+        source = sent[0]["_source"]
+        assert source["tenant_id"] == feedbacks[0].client_id
+        assert source["protocolo"] == feedbacks[0].protocolo
+        assert source["created_at"] == feedbacks[0].data_criacao
+        assert source["tenant"]["subdominio"] == feedbacks[0].client.subdominio
+        # Reindexação por tenant é in-place, sem troca de alias
+        assert sent[0]["_index"] == FEEDBACKS_ALIAS
+        es_client.indices.update_aliases.assert_not_called()
+
+    def test_rows_read_before_reaching_bulk_threads(
+        self, monkeypatch, es_client, feedbacks
+    ):
+        bulk, sent = fake_parallel_bulk()
+        batches = []
+
+        def _bulk(client, actions, **kwargs):
+            # Lote já materializado: nenhuma query nas threads do parallel_bulk
+            batches.append(actions)
+            return bulk(client, actions, **kwargs)
+
+        monkeypatch.setattr(search_indexer, "parallel_bulk", _bulk)
+
+        BulkReindexer(client=es_client, batch_size=1, concurrency=2).run()
+
+        assert all(isinstance(batch, list) for batch in batches)
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert len(sent) == 5
+
+    def test_failure_keeps_checkpoint_and_resume_continues(
+        self, monkeypatch, es_client, feedbacks
+    ):
+        ids = sorted(f.id for f in feedbacks)
+        bulk, _ = fake_parallel_bulk(fail_ids={ids[3]})
+        monkeypatch.setattr(search_indexer, "parallel_bulk", bulk)
+
+        first = BulkReindexer(client=es_client, batch_size=1).run()
+
+        assert first.errors == 1
+        assert first.alias_swapped is False
+        checkpoint = BulkReindexer().get_checkpoint()
+        assert checkpoint["last_id"] == ids[2]
+        assert checkpoint["index"] == first.index
+
+        bulk, sent = fake_parallel_bulk()
+        monkeypatch.setattr(search_indexer, "parallel_bulk", bulk)
+
+        second = BulkReindexer(client=es_client, batch_size=1).run()
+
+        assert second.resumed is True
+        assert second.indexed == 5
+        assert second.index == first.index
+        assert [a["_id"] for a in sent] == ids[3:]
+        assert second.alias_swapped is True
+        assert es_client.indices.create.call_count == 1
@@ -0,0 +1,155 @@
+"""
+Testes da fila de indexação near-real-time (SearchIndexQueue)
+Cobertura: coalescência, flush em _bulk único, reenfileiramento, métricas e
+invalidação do cache de busca após remoções
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.cache import cache
+
+from apps.core import search_queue, tasks
+from apps.core.search_cache import get_search_version
+from apps.core.search_queue import SearchIndexQueue
+from apps.feedbacks.models import Feedback
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clean_queue(monkeypatch):
+    cache.clear()
+    flush_task = MagicMock()
+    monkeypatch.setattr(tasks, "flush_search_index_queue", flush_task)
+    yield flush_task
+    cache.clear()
+
+
+def fake_streaming_bulk(calls, fail_ids=()):
+    def _bulk(client, actions, **kwargs):
+        calls.append(list(actions))
+        for action in calls[-1]:
+            op = action["_op_type"]
+            if action["_id"] in fail_ids:
+                yield False, {op: {"_id": str(action["_id"]), "status": 503}}
+            elif op == "delete":
+                yield False, {op: {"_id": str(action["_id"]), "status": 404}}
+            else:
+                yield True, {op: {"_id": str(action["_id"]), "status": 200}}
+
+    return _bulk
+
+
+class TestSearchIndexQueue:
+    def test_updates_to_same_feedback_are_coalesced(self, clean_queue):
+        queue = SearchIndexQueue(client=MagicMock())
+
+        assert queue.enqueue(1) is True
+        assert queue.enqueue(1) is False
+        assert queue.enqueue(1) is False
+        assert queue.enqueue(2) is True
+
+        metrics = queue.get_metrics()
+        assert metrics["pending"] == 2
+        assert metrics["coalesced"] == 2
+        # Um único flush agendado para a janela inteira
+        assert clean_queue.apply_async.call_count == 1
+
+    def test_flush_sends_single_bulk_with_index_and_delete(
+        self, monkeypatch, tenant, feedback_factory
+    ):
+        feedback = feedback_factory(client=tenant)
+        calls = []
+        monkeypatch.setattr(search_queue, "streaming_bulk", fake_streaming_bulk(calls))
+
+        queue = SearchIndexQueue(client=MagicMock())
+        queue.enqueue(feedback.id)
+        queue.enqueue(feedback.id)
+        queue.enqueue(999999)  # Feedback removido
+
+        result = queue.flush()
+
+        assert len(calls) == 1
+        ops = {(a["_op_type"], a["_id"]) for a in calls[0]}
+        assert ops == {("index", feedback.id), ("delete", 999999)}
+        assert result.indexed == 1
+        assert result.deleted == 1
+        assert result.failed == 0
+
+        metrics = queue.get_metrics()
+        assert metrics["pending"] == 0
+        assert metrics["last_batch_size"] == 2
+        assert metrics["total_flushes"] == 1
+        assert metrics["last_max_lag_ms"] >= 0
+
+    def test_failed_documents_return_to_queue(
+        self, monkeypatch, tenant, feedback_factory
+    ):
+        ok_feedback = feedback_factory(client=tenant)
+        bad_feedback = feedback_factory(client=tenant)
+        calls = []
+        monkeypatch.setattr(
+            search_queue,
+            "streaming_bulk",
+            fake_streaming_bulk(calls, fail_ids={bad_feedback.id}),
+        )
+
+        queue = SearchIndexQueue(client=MagicMock())
+        queue.enqueue(ok_feedback.id)
+        queue.enqueue(bad_feedback.id)
+
+        result = queue.flush()
+
+        assert result.indexed == 1
+        assert result.failed == 1
+        assert queue.get_metrics()["pending"] == 1
+
+    def test_flush_with_empty_queue_is_noop(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(search_queue, "streaming_bulk", fake_streaming_bulk(calls))
+
+        assert SearchIndexQueue(client=MagicMock()).flush() is None
+        assert calls == []
+
+    @pytest.mark.parametrize("failure", ["database", "client"])
+    def test_error_before_bulk_returns_drained_ids(
+        self, monkeypatch, tenant, feedback_factory, failure
+    ):
+        feedback = feedback_factory(client=tenant)
+        calls = []
+        monkeypatch.setattr(search_queue, "streaming_bulk", fake_streaming_bulk(calls))
+        queue = SearchIndexQueue()
+        if failure == "database":
+            monkeypatch.setattr(
+                queue, "_build_actions", MagicMock(side_effect=RuntimeError("db"))
+            )
+        else:
+            monkeypatch.setattr(
+                "apps.core.search_indexer.get_elasticsearch_client",
+                MagicMock(side_effect=ConnectionError("es")),
+            )
+        queue.enqueue(feedback.id)
+        queue.enqueue(999999)
+
+        with pytest.raises((RuntimeError, ConnectionError)):
+            queue.flush()
+
+        assert calls == []
+        assert queue.get_metrics()["pending"] == 2
+
+    def test_delete_bumps_search_version_of_its_tenant(
+        self, monkeypatch, tenant, feedback_factory
+    ):
+        feedback = feedback_factory(client=tenant)
+        monkeypatch.setattr(search_queue, "streaming_bulk", fake_streaming_bulk([]))
+        queue = SearchIndexQueue(client=MagicMock())
+        queue.enqueue(feedback.id, tenant.id)
+        feedback_id = feedback.id
+        Feedback.objects.all_tenants().filter(id=feedback_id).delete()
+        version = get_search_version(tenant.id)
+
+        result = queue.flush()
+
+        assert result.deleted == 1
+        assert get_search_version(tenant.id) == version + 1
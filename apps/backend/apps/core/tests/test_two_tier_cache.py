@@ -0,0 +1,161 @@
+"""
+Testes do cache em dois níveis (apps.core.two_tier_cache)
+Cobertura: LRU/TTL local, invalidação por versão, contadores e integrações
+(feature gating, termos obrigatórios, branding e templates de resposta)
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.billing.feature_gating import get_client_subscription
+from apps.billing.models import Subscription
+from apps.consent.models import ConsentVersion
+from apps.core import two_tier_cache
+from apps.core.cache_service import GENERATION_KEY
+from apps.core.two_tier_cache import LocalLRUCache, TwoTierCache, get_two_tier_stats
+from apps.feedbacks.models import ResponseTemplate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLocalLRUCache:
+    def test_evicts_least_recently_used(self):
+        lru = LocalLRUCache(maxsize=2)
+        lru.set("a", 1, ttl=60)
+        lru.set("b", 2, ttl=60)
+        lru.get("a")
+        lru.set("c", 3, ttl=60)
+
+        assert lru.get("a") == 1
+        assert lru.get("b") is two_tier_cache._MISSING
+        assert len(lru) == 2
+
+    def test_entries_expire(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(two_tier_cache.time, "monotonic", clock)
+        lru = LocalLRUCache()
+        lru.set("a", 1, ttl=10)
+
+        clock.now += 11
+
+        assert lru.get("a") is two_tier_cache._MISSING
+
+
+class TestTwoTierCache:
+    def test_local_hit_skips_shared_cache(self):
+        tiered = TwoTierCache("test:local")
+        calls = []
+        tiered.get_or_set("k", lambda: calls.append(1) or "v")
+
+        with patch.object(two_tier_cache.cache, "get") as shared_get:
+            assert tiered.get_or_set("k", lambda: "novo") == "v"
+
+        shared_get.assert_not_called()
+        assert calls == [1]
+        assert get_two_tier_stats()["test:local"]["local_hits"] == 1
+
+    def test_shared_tier_fills_other_process(self):
+        tiered = TwoTierCache("test:shared")
+        tiered.get_or_set("k", lambda: {"valor": 1})
+
+        # Outro processo: nível local vazio, nível compartilhado preenchido
+        two_tier_cache._get_local_cache().clear()
+
+        assert tiered.get_or_set("k", lambda: {"valor": 2}) == {"valor": 1}
+        stats = get_two_tier_stats()["test:shared"]
+        assert (stats["misses"], stats["shared_hits"]) == (1, 1)
+        assert stats["hit_rate"] == 50.0
+
+    def test_none_is_cached(self):
+        tiered = TwoTierCache("test:none")
+        calls = []
+
+        for _ in range(3):
+            assert tiered.get_or_set("k", lambda: calls.append(1)) is None
+
+        assert calls == [1]
+
+    def test_scope_and_namespace_invalidation(self):
+        tiered = TwoTierCache("test:scope")
+        tiered.get_or_set("k", lambda: "a1", scope=1)
+        tiered.get_or_set("k", lambda: "b1", scope=2)
+
+        tiered.invalidate(scope=1)
+        assert tiered.get_or_set("k", lambda: "a2", scope=1) == "a2"
+        assert tiered.get_or_set("k", lambda: "b2", scope=2) == "b1"
+
+        tiered.invalidate()
+        assert tiered.get_or_set("k", lambda: "b3", scope=2) == "b3"
+
+    @override_settings(TWO_TIER_CACHE_VERSION_CHECK=0)
+    def test_version_bump_from_other_worker_drops_local_entry(self):
+        tiered = TwoTierCache("test:workers")
+        tiered.get_or_set("k", lambda: "antigo")
+
+        # Outro worker invalida incrementando a versão compartilhada
+        cache.incr(GENERATION_KEY.format(namespace="two_tier:test:workers"))
+
+        assert tiered.get_or_set("k", lambda: "novo") == "novo"
+
+
+@pytest.mark.django_db
+class TestTwoTierIntegrations:
+    def test_subscription_cached_and_invalidated(self, tenant):
+        first = get_client_subscription(tenant)
+        with CaptureQueriesContext(connection) as ctx:
+            assert get_client_subscription(tenant) is first
+        assert len(ctx.captured_queries) == 0
+
+        Subscription.objects.all_tenants().filter(pk=first.pk).first().cancel(
+            at_period_end=False
+        )
+
+        assert get_client_subscription(tenant) is None
+
+    def test_required_consents_invalidated_on_new_version(self, api_client):
+        ConsentVersion.objects.create(
+            document_type="terms", version="1.0", content_url="/termos/v1"
+        )
+        url = "/api/consent/versions/required/"
+        assert [v["version"] for v in api_client.get(url).data] == ["1.0"]
+
+        ConsentVersion.objects.create(
+            document_type="terms", version="2.0", content_url="/termos/v2"
+        )
+
+        assert [v["version"] for v in api_client.get(url).data] == ["2.0"]
+
+    def test_tenant_info_reflects_branding_update(self, api_client, tenant):
+        headers = {"HTTP_X_TENANT_ID": str(tenant.id)}
+        response = api_client.get("/api/tenant-info/", **headers)
+        assert response.status_code == 200
+
+        tenant.cor_primaria = "#123456"
+        tenant.save()
+
+        response = api_client.get("/api/tenant-info/", **headers)
+        assert response.data["cor_primaria"] == "#123456"
+
+    def test_response_template_list_invalidated(
+        self, authenticated_api_client, authenticated_user
+    ):
+        _, tenant = authenticated_user
+        url = "/api/response-templates/"
+        assert authenticated_api_client.get(url).data["count"] == 0
+
+        ResponseTemplate.objects.create(
+            client=tenant, nome="Agradecimento", conteudo="Obrigado pelo feedback!"
+        )
+
+        assert authenticated_api_client.get(url).data["count"] == 1
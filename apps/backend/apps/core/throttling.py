@@ -4,7 +4,44 @@ Throttling customizado com suporte a modo de teste e tenant-based rate limiting
 
 import os
 
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+from rest_framework import throttling
+
+from apps.core.rate_limiter import get_rate_limiter
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Substitui o histórico em cache do SimpleRateThrottle pelo
+    SlidingWindowRateLimiter (script Lua atômico no Redis).
+
+    O DRF lê a lista de timestamps, recorta e regrava a cada requisição
+    (O(histórico) e sujeito a corrida entre processos). Mantém a mesma
+    interface: rate/scope/get_cache_key/wait continuam funcionando.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        result = get_rate_limiter().hit(self.key, self.num_requests, self.duration)
+        self.retry_after = result.retry_after
+        return result.allowed
+
+    def wait(self):
+        """Segundos até a próxima requisição permitida."""
+        return getattr(self, "retry_after", None) or None
+
+
+class AnonRateThrottle(SlidingWindowThrottleMixin, throttling.AnonRateThrottle):
+    """AnonRateThrottle do DRF com janela deslizante atômica."""
+
+
+class UserRateThrottle(SlidingWindowThrottleMixin, throttling.UserRateThrottle):
+    """UserRateThrottle do DRF com janela deslizante atômica."""
 
 
 class TestAwareAnonRateThrottle(AnonRateThrottle):
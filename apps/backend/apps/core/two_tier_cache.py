@@ -0,0 +1,226 @@
+"""
+Cache em dois níveis para objetos quentes que raramente mudam
+Nível 1: LRU limitado com TTL na memória do processo (sem ida à rede)
+Nível 2: cache compartilhado entre workers (Redis em produção)
+
+A invalidação usa as gerações de apps.core.cache_service: um INCR na chave de
+versão do namespace. Cada processo confere a versão no máximo a cada
+TWO_TIER_CACHE_VERSION_CHECK segundos, então entradas locais antigas deixam
+de ser servidas em todos os workers dentro desse intervalo.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.cache_service import bump_generation, get_generations
+
+logger = logging.getLogger(__name__)
+
+# Sentinela para valores None (cache.get devolve None no miss)
+_NONE = "__two_tier_none__"
+_MISSING = object()
+
+DEFAULT_MAXSIZE = 2048
+DEFAULT_LOCAL_TTL = 60
+DEFAULT_VERSION_CHECK = 1
+
+
+class LocalLRUCache:
+    """
+    LRU limitado com TTL por entrada (memória do processo)
+
+    Protegido por lock para servidores com threads. Ao atingir maxsize,
+    descarta a entrada usada há mais tempo.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_local_cache: Optional[LocalLRUCache] = None
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _get_local_cache() -> LocalLRUCache:
+    global _local_cache
+    if _local_cache is None:
+        _local_cache = LocalLRUCache(
+            getattr(settings, "TWO_TIER_CACHE_MAXSIZE", DEFAULT_MAXSIZE)
+        )
+    return _local_cache
+
+
+def _record(namespace: str, event: str) -> None:
+    with _stats_lock:
+        counters = _stats.setdefault(
+            namespace, {"local_hits": 0, "shared_hits": 0, "misses": 0}
+        )
+        counters[event] += 1
+
+
+def get_two_tier_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Contadores de hit/miss por namespace (deste processo)
+
+    Returns:
+        {namespace: {local_hits, shared_hits, misses, hit_rate}}
+    """
+    with _stats_lock:
+        snapshot = {ns: dict(counters) for ns, counters in _stats.items()}
+
+    for counters in snapshot.values():
+        total = sum(counters.values())
+        hits = counters["local_hits"] + counters["shared_hits"]
+        counters["hit_rate"] = round(hits / total * 100, 2) if total else 0.0
+    return snapshot
+
+
+def clear_two_tier_local() -> None:
+    """Descarta o nível local e os contadores (testes / após cache.clear())"""
+    _get_local_cache().clear()
+    with _stats_lock:
+        _stats.clear()
+
+
+class TwoTierCache:
+    """
+    Cache em dois níveis com invalidação por versão
+
+    Features:
+    - Leitura local sem ida à rede enquanto a versão não muda
+    - Segundo nível compartilhado (um worker preenche para todos)
+    - Invalidação do namespace inteiro ou de um escopo (ex: um tenant)
+    - Valores None também são armazenados (ex: tenant sem assinatura)
+
+    Os objetos do nível local são compartilhados entre requisições do
+    processo: trate-os como somente leitura.
+
+    Usage:
+        plans_cache = TwoTierCache("billing:subscription")
+        subscription = plans_cache.get_or_set(
+            "active", lambda: query(client), scope=client.id
+        )
+        plans_cache.invalidate(scope=client.id)  # em um signal post_save
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        timeout: int = 60 * 60,
+        local_ttl: Optional[float] = None,
+    ):
+        """
+        Args:
+            namespace: Nome do namespace (também usado nos contadores)
+            timeout: TTL no cache compartilhado em segundos
+            local_ttl: TTL no nível local (padrão TWO_TIER_CACHE_LOCAL_TTL)
+        """
+        self.namespace = namespace
+        self.timeout = timeout
+        self.local_ttl = local_ttl
+
+    def _version_namespace(self, scope: Any = None) -> str:
+        base = f"two_tier:{self.namespace}"
+        if scope is None:
+            return base
+        return f"{base}:{scope}"
+
+    def _generation_token(self, scope: Any) -> str:
+        check = getattr(settings, "TWO_TIER_CACHE_VERSION_CHECK", DEFAULT_VERSION_CHECK)
+        generations = get_generations(
+            self._version_namespace(), self._version_namespace(scope), local_ttl=check
+        )
+        return ".".join(str(generation) for generation in generations)
+
+    def get_or_set(self, key: str, factory: Callable[[], Any], scope: Any = None):
+        """
+        Busca no nível local, depois no compartilhado; no miss chama factory
+
+        Args:
+            key: Chave dentro do namespace/escopo
+            factory: Função que calcula o valor no miss
+            scope: Escopo de invalidação opcional (ex: ID do tenant)
+        """
+        token = self._generation_token(scope)
+        scope_key = f"{self._version_namespace(scope)}:{key}"
+        local = _get_local_cache()
+
+        entry = local.get(scope_key)
+        if entry is not _MISSING and entry[0] == token:
+            _record(self.namespace, "local_hits")
+            return _unwrap(entry[1])
+
+        shared_key = f"{self._version_namespace(scope)}:g{token}:{key}"
+        try:
+            stored = cache.get(shared_key)
+        except Exception as e:
+            logger.warning(f"Erro ao ler cache compartilhado {shared_key}: {e}")
+            stored = None
+
+        if stored is not None:
+            _record(self.namespace, "shared_hits")
+        else:
+            _record(self.namespace, "misses")
+            value = factory()
+            stored = _NONE if value is None else value
+            try:
+                cache.set(shared_key, stored, timeout=self.timeout)
+            except Exception as e:
+                logger.warning(f"Erro ao gravar cache compartilhado {shared_key}: {e}")
+
+        local_ttl = self.local_ttl
+        if local_ttl is None:
+            local_ttl = getattr(settings, "TWO_TIER_CACHE_LOCAL_TTL", DEFAULT_LOCAL_TTL)
+        local.set(scope_key, (token, stored), local_ttl)
+        return _unwrap(stored)
+
+    def invalidate(self, scope: Any = None) -> None:
+        """
+        Invalida um escopo (ou o namespace inteiro se scope for None)
+
+        Um INCR na versão; as entradas antigas expiram pelo TTL.
+        """
+        bump_generation(self._version_namespace(scope))
+        logger.debug(f"🗑️ Cache invalidado: {self.namespace} | Escopo: {scope}")
+
+
+def _unwrap(stored: Any) -> Any:
+    if isinstance(stored, str) and stored == _NONE:
+        return None
+    return stored
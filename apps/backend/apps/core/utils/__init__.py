@@ -104,6 +104,43 @@ def is_valid_subdomain(subdomain: str) -> bool:
     return bool(re.match(pattern, subdomain))
 
 
+# Lista estática: construída uma vez no import (sem cache externo)
+RESERVED_SUBDOMAINS = (
+    "www",
+    "api",
+    "admin",
+    "app",
+    "mail",
+    "ftp",
+    "smtp",
+    "pop",
+    "imap",
+    "webmail",
+    "email",
+    "static",
+    "assets",
+    "cdn",
+    "media",
+    "files",
+    "blog",
+    "forum",
+    "shop",
+    "store",
+    "help",
+    "support",
+    "docs",
+    "ouvify",
+    "ouvy",
+    "test",
+    "dev",
+    "staging",
+    "prod",
+    "production",
+    "localhost",
+)
+_RESERVED_SUBDOMAINS_SET = frozenset(RESERVED_SUBDOMAINS)
+
+
 def get_reserved_subdomains() -> list[str]:
     """
     Retorna lista de subdomínios reservados que não podem ser usados.
@@ -111,39 +148,7 @@ def get_reserved_subdomains() -> list[str]:
     Returns:
         list[str]: Lista de subdomínios reservados
     """
-    return [
-        "www",
-        "api",
-        "admin",
-        "app",
-        "mail",
-        "ftp",
-        "smtp",
-        "pop",
-        "imap",
-        "webmail",
-        "email",
-        "static",
-        "assets",
-        "cdn",
-        "media",
-        "files",
-        "blog",
-        "forum",
-        "shop",
-        "store",
-        "help",
-        "support",
-        "docs",
-        "ouvify",
-        "ouvy",
-        "test",
-        "dev",
-        "staging",
-        "prod",
-        "production",
-        "localhost",
-    ]
+    return list(RESERVED_SUBDOMAINS)
 
 
 def is_reserved_subdomain(subdomain: str) -> bool:
@@ -156,7 +161,7 @@ def is_reserved_subdomain(subdomain: str) -> bool:
     Returns:
         bool: True se reservado, False caso contrário
     """
-    return subdomain.lower() in get_reserved_subdomains()
+    return subdomain.lower() in _RESERVED_SUBDOMAINS_SET
 
 
 def sanitize_string(value: str, max_length: int = 200) -> str:
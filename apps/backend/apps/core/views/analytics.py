@@ -6,6 +6,9 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.cache_service import CacheService
+from apps.core.decorators import cache_response
+from apps.core.utils import get_current_tenant
 from apps.feedbacks.models import Feedback
 from config.feature_flags import feature_flags
 
@@ -136,6 +139,11 @@ class AnalyticsDashboardView(APIView):
         12: "Dez",
     }
 
+    # JSON já renderizado + ETag por tenant (dados iguais para toda a equipe);
+    # TTL curto sobre o snapshot de get_or_set abaixo
+    @cache_response(
+        timeout=60, key_prefix=CacheService.ANALYTICS_PREFIX, vary_on_user=False
+    )
     def get(self, request):
         if not feature_flags.is_enabled("ANALYTICS"):
             return Response(
@@ -143,7 +151,27 @@ class AnalyticsDashboardView(APIView):
             )
 
         period = (request.query_params.get("period") or "month").strip().lower()
-        days = self.PERIOD_DAYS.get(period, 30)
+        if period not in self.PERIOD_DAYS:
+            period = "month"
+
+        tenant = get_current_tenant()
+        if tenant is None:
+            return Response(self._build_dashboard(period))
+
+        # Cache de 10 minutos protegido contra stampede: um único recálculo
+        # por chave e valor anterior servido enquanto recalcula em background
+        service = CacheService(tenant_id=tenant.id)
+        data = service.get_or_set(
+            service._build_key(CacheService.ANALYTICS_PREFIX, "dashboard", period),
+            lambda: self._build_dashboard(period),
+            timeout=600,
+            stale_ttl=300,
+        )
+        return Response(data)
+
+    def _build_dashboard(self, period):
+        """Calcula os dados do dashboard de analytics para o período."""
+        days = self.PERIOD_DAYS[period]
 
         end_date = timezone.now()
         start_date = end_date - timedelta(days=days)
@@ -289,17 +317,15 @@ class AnalyticsDashboardView(APIView):
                     }
                 )
 
-        return Response(
-            {
-                "trend": trend,
-                "byType": by_type,
-                "byStatus": by_status,
-                "responseTime": response_time,
-                "summary": {
-                    "totalFeedbacks": total_feedbacks,
-                    "avgResponseTime": round(avg_response_time_hours, 2),
-                    "slaCompliance": round(sla_compliance, 2),
-                    "satisfactionScore": round(satisfaction_score, 2),
-                },
-            }
-        )
+        return {
+            "trend": trend,
+            "byType": by_type,
+            "byStatus": by_status,
+            "responseTime": response_time,
+            "summary": {
+                "totalFeedbacks": total_feedbacks,
+                "avgResponseTime": round(avg_response_time_hours, 2),
+                "slaCompliance": round(sla_compliance, 2),
+                "satisfactionScore": round(satisfaction_score, 2),
+            },
+        }
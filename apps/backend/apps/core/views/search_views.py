@@ -7,9 +7,10 @@ from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle
 from rest_framework.views import APIView
 
+from apps.core.throttling import UserRateThrottle
+
 try:
     from apps.core.search_service import GlobalSearchService, get_search_service
 
@@ -28,7 +29,7 @@ class SearchRateThrottle(UserRateThrottle):
 
 class GlobalSearchView(APIView):
     """
-    API de busca global com ElasticSearch
+    API de busca global com ElasticSearch (fallback para busca no banco)
 
     Suporta busca full-text em feedbacks com:
     - Análise em português
@@ -127,14 +128,14 @@ class GlobalSearchView(APIView):
                 },
             },
             400: {"description": "Parâmetros inválidos"},
-            503: {"description": "ElasticSearch não disponível"},
+            503: {"description": "Serviço de busca não disponível"},
         },
         tags=["Busca"],
     )
     def get(self, request):
         """Executa busca global"""
 
-        # Verificar se ElasticSearch está disponível
+        # Verificar se o serviço de busca está disponível
         if not SEARCH_AVAILABLE:
             return Response(
                 {"error": "Serviço de busca não disponível"},
@@ -0,0 +1,314 @@
+"""
+Operações em lote sobre feedbacks (POST /api/feedbacks/bulk/)
+
+Aplica status, prioridade, atribuição e tags a até FEEDBACK_BULK_MAX_IDS
+feedbacks do tenant em uma única transação, com queries por operação e não
+por feedback:
+
+- SELECT ... FOR UPDATE dos IDs (só as colunas usadas)
+- Um UPDATE por operação, restrito aos feedbacks em que o valor muda; os
+  SLAs de primeira resposta e de resolução são calculados no próprio UPDATE
+- bulk_create das interações de mudança de status e dos vínculos de tags;
+  um único DELETE para os vínculos removidos
+
+Sem save() por feedback não há signals por item: após o commit o sinal
+feedbacks_atualizados_em_lote é enviado uma única vez (contadores do
+dashboard, caches, busca, ETags, auditoria, webhook e e-mail de atribuição).
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Case,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .constants import FeedbackStatus, InteracaoTipo
+from .models import Feedback, FeedbackInteracao, Tag
+
+logger = logging.getLogger(__name__)
+
+# Enviado após o commit com: tenant, user, feedbacks (instâncias com os
+# valores novos), alteracoes ({id: [campos]}), anteriores ({id: status/tipo/
+# prioridade antes do lote}, só de quem mudou status ou prioridade),
+# assigned_to (TeamMember atribuído, se houve atribuição) e tags_alteradas
+feedbacks_atualizados_em_lote = Signal()
+
+LOCK_FIELDS = (
+    "id",
+    "client_id",
+    "protocolo",
+    "titulo",
+    "tipo",
+    "status",
+    "prioridade",
+    "data_criacao",
+    "assigned_to_id",
+)
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+NOT_FOUND = "not_found"
+
+
+class BulkUpdateError(Exception):
+    """Membro da equipe ou tags inexistentes no tenant"""
+
+
+def max_ids() -> int:
+    return getattr(settings, "FEEDBACK_BULK_MAX_IDS", 500)
+
+
+def _registrar_se_vazio(prefixo: str, agora, horas: int) -> Dict[str, Any]:
+    """
+    Colunas data_/tempo_/sla_<prefixo> para o UPDATE
+
+    Preenchidas só nas linhas em que data_<prefixo> ainda é NULL, com o
+    tempo decorrido desde data_criacao de cada linha.
+    """
+    data, tempo, sla = f"data_{prefixo}", f"tempo_{prefixo}", f"sla_{prefixo}"
+    vazio = Q(**{f"{data}__isnull": True})
+    decorrido = ExpressionWrapper(
+        Value(agora) - F("data_criacao"), output_field=DurationField()
+    )
+    no_prazo = Q(data_criacao__gte=agora - timedelta(hours=horas))
+    return {
+        data: Coalesce(F(data), Value(agora)),
+        tempo: Case(When(vazio, then=decorrido), default=F(tempo)),
+        sla: Case(
+            When(vazio & no_prazo, then=Value(True)),
+            When(vazio, then=Value(False)),
+            default=F(sla),
+        ),
+    }
+
+
+def _membro(tenant, team_member_id: Optional[int]):
+    from apps.tenants.models import TeamMember
+
+    if team_member_id is None:
+        return None
+    try:
+        return TeamMember.objects.select_related("user").get(
+            id=team_member_id, client=tenant, status=TeamMember.ACTIVE
+        )
+    except TeamMember.DoesNotExist:
+        raise BulkUpdateError("Team member não encontrado ou inativo")
+
+
+def _validar_tags(tenant, tag_ids: Iterable[int]) -> None:
+    tag_ids = set(tag_ids)
+    if not tag_ids:
+        return
+    encontradas = set(
+        Tag.objects.all_tenants()
+        .filter(client=tenant, pk__in=tag_ids)
+        .values_list("pk", flat=True)
+    )
+    faltando = sorted(tag_ids - encontradas)
+    if faltando:
+        raise BulkUpdateError(f"Tags não encontradas: {faltando}")
+
+
+def aplicar_em_lote(
+    tenant, user, ids: List[int], operacoes: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Aplica as operações aos feedbacks do tenant
+
+    Args:
+        tenant: Client dono dos feedbacks
+        user: Usuário que executa o lote (autor das interações)
+        ids: IDs dos feedbacks (no máximo max_ids())
+        operacoes: status, prioridade, assigned_to (TeamMember id ou None
+            para desatribuir), add_tags, remove_tags e mensagem (texto da
+            interação de mudança de status)
+
+    Returns:
+        Um resultado por ID, na ordem recebida:
+        {"id", "result": updated|unchanged|not_found, "changes": [campos]}
+
+    Raises:
+        BulkUpdateError: Membro da equipe ou tags inexistentes no tenant
+    """
+    agora = timezone.now()
+    add_tags = list(operacoes.get("add_tags") or [])
+    remove_tags = list(operacoes.get("remove_tags") or [])
+    alteracoes: Dict[int, List[str]] = {}
+    anteriores: Dict[int, Dict[str, str]] = {}
+    membro = None
+
+    def marcar(feedback, campo):
+        alteracoes.setdefault(feedback.pk, []).append(campo)
+        anteriores.setdefault(
+            feedback.pk,
+            {
+                "status": feedback.status,
+                "tipo": feedback.tipo,
+                "prioridade": feedback.prioridade,
+            },
+        )
+
+    with transaction.atomic():
+        if "assigned_to" in operacoes:
+            membro = _membro(tenant, operacoes["assigned_to"])
+        _validar_tags(tenant, add_tags + remove_tags)
+
+        feedbacks = list(
+            Feedback.objects.all_tenants()
+            .select_for_update()
+            .only(*LOCK_FIELDS)
+            .filter(client=tenant, pk__in=ids)
+            .order_by("pk")
+        )
+        linhas = Feedback.objects.all_tenants()
+
+        novo_status = operacoes.get("status")
+        if novo_status:
+            alvo = [f for f in feedbacks if f.status != novo_status]
+            if alvo:
+                # Interação com autor = primeira resposta da equipe (SLA)
+                campos = {
+                    "status": novo_status,
+                    "data_atualizacao": agora,
+                    **_registrar_se_vazio(
+                        "primeira_resposta", agora, Feedback.SLA_PRIMEIRA_RESPOSTA_HORAS
+                    ),
+                }
+                if novo_status == FeedbackStatus.RESOLVIDO:
+                    campos.update(
+                        _registrar_se_vazio(
+                            "resolucao", agora, Feedback.SLA_RESOLUCAO_HORAS
+                        )
+                    )
+                linhas.filter(pk__in=[f.pk for f in alvo]).update(**campos)
+
+                mensagem = operacoes.get("mensagem") or ""
+                FeedbackInteracao.objects.bulk_create(
+                    [
+                        FeedbackInteracao(
+                            feedback=f,
+                            client=tenant,
+                            autor=user,
+                            tipo=InteracaoTipo.MUDANCA_STATUS,
+                            mensagem=mensagem
+                            or f"Status alterado de '{f.status}' para '{novo_status}'",
+                        )
+                        for f in alvo
+                    ]
+                )
+                for f in alvo:
+                    marcar(f, "status")
+                    f.status = novo_status
+
+        prioridade = operacoes.get("prioridade")
+        if prioridade:
+            alvo = [f for f in feedbacks if f.prioridade != prioridade]
+            if alvo:
+                linhas.filter(pk__in=[f.pk for f in alvo]).update(
+                    prioridade=prioridade, data_atualizacao=agora
+                )
+                for f in alvo:
+                    marcar(f, "prioridade")
+                    f.prioridade = prioridade
+
+        if "assigned_to" in operacoes:
+            membro_id = membro.pk if membro else None
+            alvo = [f for f in feedbacks if f.assigned_to_id != membro_id]
+            if alvo:
+                campos = {
+                    "assigned_to": membro,
+                    "assigned_at": agora if membro else None,
+                    "data_atualizacao": agora,
+                }
+                if membro:
+                    campos["assigned_by"] = user
+                linhas.filter(pk__in=[f.pk for f in alvo]).update(**campos)
+                for f in alvo:
+                    alteracoes.setdefault(f.pk, []).append("assigned_to")
+                    f.assigned_to_id = membro_id
+
+        if add_tags or remove_tags:
+            through = Feedback.tags.through
+            feedback_ids = [f.pk for f in feedbacks]
+            existentes = set(
+                through.objects.filter(
+                    feedback_id__in=feedback_ids, tag_id__in=add_tags + remove_tags
+                ).values_list("feedback_id", "tag_id")
+            )
+            novos = [
+                (feedback_id, tag_id)
+                for feedback_id in feedback_ids
+                for tag_id in add_tags
+                if (feedback_id, tag_id) not in existentes
+            ]
+            removidos = [par for par in existentes if par[1] in remove_tags]
+            if novos:
+                through.objects.bulk_create(
+                    [through(feedback_id=fid, tag_id=tid) for fid, tid in novos],
+                    ignore_conflicts=True,
+                )
+            if removidos:
+                through.objects.filter(
+                    feedback_id__in={fid for fid, _ in removidos},
+                    tag_id__in=remove_tags,
+                ).delete()
+            for feedback_id in sorted({fid for fid, _ in novos + removidos}):
+                alteracoes.setdefault(feedback_id, []).append("tags")
+
+        if alteracoes:
+            campos_alterados = {c for campos in alteracoes.values() for c in campos}
+            evento = {
+                "tenant": tenant,
+                "user": user,
+                "feedbacks": [f for f in feedbacks if f.pk in alteracoes],
+                "alteracoes": alteracoes,
+                "anteriores": anteriores,
+                "assigned_to": membro if "assigned_to" in campos_alterados else None,
+                "tags_alteradas": "tags" in campos_alterados,
+            }
+            transaction.on_commit(lambda: _emitir(evento))
+
+    logger.info(
+        f"📦 Lote aplicado | Tenant: {tenant.nome} | "
+        f"Alterados: {len(alteracoes)}/{len(set(ids))} | "
+        f"Operações: {sorted(k for k in operacoes if k != 'mensagem')}"
+    )
+
+    encontrados = {f.pk for f in feedbacks}
+    return [
+        {
+            "id": feedback_id,
+            "result": (
+                NOT_FOUND
+                if feedback_id not in encontrados
+                else UPDATED if feedback_id in alteracoes else UNCHANGED
+            ),
+            "changes": alteracoes.get(feedback_id, []),
+        }
+        for feedback_id in dict.fromkeys(ids)
+    ]
+
+
+def _emitir(evento: Dict[str, Any]) -> None:
+    """Envia feedbacks_atualizados_em_lote (uma vez por lote)"""
+    responses = feedbacks_atualizados_em_lote.send_robust(sender=Feedback, **evento)
+    for receiver, response in responses:
+        if isinstance(response, Exception):
+            logger.error(
+                f"❌ Erro em efeito do lote ({receiver.__name__}) | "
+                f"Tenant: {evento['tenant'].nome}: {response}",
+                exc_info=response,
+            )
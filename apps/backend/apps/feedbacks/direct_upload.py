@@ -0,0 +1,370 @@
+"""
+Upload direto para o armazenamento (anexos de feedback)
+
+Fluxo em duas fases, sem o arquivo passar pelos workers da API:
+
+1. solicitar-upload: valida permissão/plano e devolve parâmetros de upload
+   assinados e um token (assinado, curto: DIRECT_UPLOAD_TTL segundos) com
+   tenant, feedback, chave do objeto, tipo e tamanho declarados
+2. O navegador envia o arquivo direto ao armazenamento
+3. finalizar-upload: confere o token, o tamanho e o tipo MIME do objeto
+   armazenado e só então cria o FeedbackArquivo
+
+Backends (DIRECT_UPLOAD_BACKEND):
+- cloudinary: upload assinado na API do Cloudinary (sem sobrescrita e só
+  nos formatos do tipo declarado); tamanho e formato conferidos com a
+  Admin API e, para recursos raw (não interpretados pelo Cloudinary), o
+  tipo detectado pelos magic bytes do início do arquivo
+- local: substituto em sistema de arquivos para desenvolvimento e testes;
+  o "armazenamento" é o endpoint PUT /api/uploads/local/<token>/ e o tipo é
+  detectado pelos magic bytes
+
+Em ambos a chave do objeto só pode ser gravada uma vez: reenviar com o mesmo
+token não substitui um arquivo já conferido por finalizar-upload.
+"""
+
+import logging
+import mimetypes
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, NamedTuple, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Feedback, FeedbackArquivo
+
+try:
+    import magic
+
+    MAGIC_AVAILABLE = True
+except ImportError:
+    MAGIC_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SIGNING_SALT = "feedbacks.direct_upload"
+UPLOAD_FOLDER = "ouvify/feedback_arquivos"
+# Bytes iniciais lidos para detectar o tipo (magic bytes)
+SNIFF_BYTES = 2048
+
+# Tipos detectados pelos magic bytes aceitos para cada tipo declarado
+# (formatos Office são contêineres ZIP/OLE)
+OFFICE_XML_TYPES = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+)
+OFFICE_LEGACY_TYPES = ("application/msword", "application/vnd.ms-excel")
+CONTAINER_TYPES = {
+    "application/zip": OFFICE_XML_TYPES,
+    "application/x-ole-storage": OFFICE_LEGACY_TYPES,
+    "application/CDFV2": OFFICE_LEGACY_TYPES,
+}
+
+
+class DirectUploadError(Exception):
+    """Erro de validação do upload direto (mensagem exibível ao cliente)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class StoredObject(NamedTuple):
+    """Objeto encontrado no armazenamento"""
+
+    size: int
+    mime: str
+    # Valor gravado no campo `arquivo` do FeedbackArquivo
+    value: str
+
+
+def mime_matches(declared: str, detected: str) -> bool:
+    """Tipo detectado corresponde ao declarado (considerando contêineres)"""
+    return detected == declared or declared in CONTAINER_TYPES.get(detected, ())
+
+
+def _extension(mime: str) -> str:
+    return mimetypes.guess_extension(mime) or ""
+
+
+def _formats(mime: str) -> str:
+    """Extensões aceitas para o tipo declarado (ex: "pdf")"""
+    return ",".join(
+        sorted({ext.lstrip(".") for ext in mimetypes.guess_all_extensions(mime)})
+    )
+
+
+class CloudinaryUploadBackend:
+    """Upload assinado direto para a API do Cloudinary"""
+
+    name = "cloudinary"
+
+    @staticmethod
+    def _resource_type(mime: str) -> str:
+        # Documentos Office são "raw" (public_id com extensão)
+        if mime.startswith("image/") or mime == "application/pdf":
+            return "image"
+        return "raw"
+
+    def _public_id(self, key: str, mime: str) -> str:
+        if self._resource_type(mime) == "raw":
+            return f"{key}{_extension(mime)}"
+        return key
+
+    def upload_params(self, key: str, mime: str, token: str) -> Dict[str, Any]:
+        import cloudinary
+        import cloudinary.utils
+
+        config = cloudinary.config()
+        # Campos assinados: o cliente não pode sobrescrever o objeto depois de
+        # finalizado nem enviar outro formato com a mesma assinatura
+        params = {
+            "public_id": self._public_id(key, mime),
+            "timestamp": int(time.time()),
+            "overwrite": "false",
+            "allowed_formats": _formats(mime),
+        }
+        signature = cloudinary.utils.api_sign_request(params, config.api_secret)
+        return {
+            "method": "POST",
+            "url": cloudinary.utils.cloudinary_api_url(
+                "upload", resource_type=self._resource_type(mime)
+            ),
+            "fields": {**params, "signature": signature, "api_key": config.api_key},
+        }
+
+    @staticmethod
+    def _head_bytes(url: str) -> bytes:
+        """Primeiros SNIFF_BYTES do objeto (requisição com Range)"""
+        import requests
+
+        try:
+            response = requests.get(
+                url, headers={"Range": f"bytes=0-{SNIFF_BYTES - 1}"}, timeout=10
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"⚠️ Falha ao ler início do upload {url}: {e}")
+            raise DirectUploadError(
+                "Não foi possível conferir o arquivo enviado", status_code=502
+            ) from e
+        return response.content[:SNIFF_BYTES]
+
+    def inspect(self, key: str, mime: str) -> Optional[StoredObject]:
+        import cloudinary.api
+
+        resource_type = self._resource_type(mime)
+        public_id = self._public_id(key, mime)
+        try:
+            resource = cloudinary.api.resource(public_id, resource_type=resource_type)
+        except cloudinary.api.NotFound:
+            return None
+
+        file_format = resource.get("format") or public_id.rsplit(".", 1)[-1]
+        detected = mimetypes.guess_type(f"{key}.{file_format.lower()}")[0] or ""
+        if resource_type == "raw" and MAGIC_AVAILABLE:
+            # Raw não é interpretado pelo Cloudinary: formato vem só do nome
+            detected = magic.from_buffer(
+                self._head_bytes(resource["secure_url"]), mime=True
+            )
+        value = f"{resource_type}/upload/v{resource['version']}/{public_id}"
+        if resource.get("format"):
+            value = f"{value}.{resource['format']}"
+        return StoredObject(size=int(resource["bytes"]), mime=detected, value=value)
+
+    def delete(self, key: str, mime: str) -> None:
+        import cloudinary.uploader
+
+        cloudinary.uploader.destroy(
+            self._public_id(key, mime), resource_type=self._resource_type(mime)
+        )
+
+
+class LocalUploadBackend:
+    """Substituto local: arquivos em DIRECT_UPLOAD_LOCAL_ROOT"""
+
+    name = "local"
+
+    @property
+    def storage(self) -> FileSystemStorage:
+        return FileSystemStorage(location=settings.DIRECT_UPLOAD_LOCAL_ROOT)
+
+    def upload_params(self, key: str, mime: str, token: str) -> Dict[str, Any]:
+        return {
+            "method": "PUT",
+            "url": reverse("direct-upload-local", kwargs={"token": token}),
+            "headers": {"Content-Type": mime},
+        }
+
+    def save(self, key: str, fileobj) -> None:
+        """
+        Grava o objeto uma única vez
+
+        Raises:
+            DirectUploadError: Chave já existente (409)
+        """
+        storage = self.storage
+        if not storage.exists(key):
+            # Criação exclusiva: numa corrida, o segundo arquivo ganha outro nome
+            saved = storage.save(key, fileobj)
+            if saved == key:
+                return
+            storage.delete(saved)
+        raise DirectUploadError("Arquivo já enviado", status_code=409)
+
+    def inspect(self, key: str, mime: str) -> Optional[StoredObject]:
+        storage = self.storage
+        if not storage.exists(key):
+            return None
+
+        detected = mime
+        if MAGIC_AVAILABLE:
+            with storage.open(key, "rb") as fileobj:
+                detected = magic.from_buffer(fileobj.read(SNIFF_BYTES), mime=True)
+        return StoredObject(size=storage.size(key), mime=detected, value=key)
+
+    def delete(self, key: str, mime: str) -> None:
+        self.storage.delete(key)
+
+
+BACKENDS = {
+    CloudinaryUploadBackend.name: CloudinaryUploadBackend,
+    LocalUploadBackend.name: LocalUploadBackend,
+}
+
+
+def get_upload_backend():
+    """Backend configurado em DIRECT_UPLOAD_BACKEND"""
+    return BACKENDS[getattr(settings, "DIRECT_UPLOAD_BACKEND", "local")]()
+
+
+def _ttl() -> int:
+    return getattr(settings, "DIRECT_UPLOAD_TTL", 600)
+
+
+def issue_upload(
+    feedback: Feedback,
+    nome_original: str,
+    tipo_mime: str,
+    tamanho_bytes: int,
+    enviado_por=None,
+    interno: bool = False,
+) -> Dict[str, Any]:
+    """
+    Gera os parâmetros de upload direto e o token de finalização
+
+    Returns:
+        {"token", "upload": {method, url, fields|headers}, "expires_at",
+        "max_bytes"}
+    """
+    key = "/".join(
+        [UPLOAD_FOLDER, str(feedback.client_id), feedback.protocolo, uuid.uuid4().hex]
+    )
+    token = signing.dumps(
+        {
+            "t": feedback.client_id,
+            "f": feedback.pk,
+            "k": key,
+            "m": tipo_mime,
+            "s": tamanho_bytes,
+            "n": nome_original[:255],
+            "u": getattr(enviado_por, "pk", None),
+            "i": interno,
+        },
+        salt=SIGNING_SALT,
+        compress=True,
+    )
+    return {
+        "token": token,
+        "upload": get_upload_backend().upload_params(key, tipo_mime, token),
+        "expires_at": timezone.now() + timedelta(seconds=_ttl()),
+        "max_bytes": tamanho_bytes,
+    }
+
+
+def read_token(token: str, tenant_id: Any) -> Dict[str, Any]:
+    """
+    Valida assinatura, validade e tenant do token
+
+    Raises:
+        DirectUploadError: Token inválido, expirado ou de outro tenant
+    """
+    try:
+        payload = signing.loads(token, salt=SIGNING_SALT, max_age=_ttl())
+    except signing.SignatureExpired:
+        raise DirectUploadError("Autorização de upload expirada")
+    except signing.BadSignature:
+        raise DirectUploadError("Autorização de upload inválida", status_code=403)
+
+    if payload["t"] != tenant_id:
+        raise DirectUploadError("Autorização de upload inválida", status_code=403)
+    return payload
+
+
+def finalize_upload(token: str, tenant, user=None) -> FeedbackArquivo:
+    """
+    Registra o FeedbackArquivo de um upload direto concluído
+
+    O objeto armazenado precisa existir, ter o tamanho declarado (até
+    MAX_UPLOAD_SIZE) e tipo MIME permitido e igual ao declarado; senão é
+    removido do armazenamento.
+
+    Raises:
+        DirectUploadError: Token inválido, objeto ausente ou reprovado
+    """
+    payload = read_token(token, tenant.pk)
+    if payload["u"] != getattr(user, "pk", None):
+        raise DirectUploadError("Autorização de upload inválida", status_code=403)
+
+    key, declared_mime = payload["k"], payload["m"]
+    backend = get_upload_backend()
+    stored = backend.inspect(key, declared_mime)
+    if stored is None:
+        raise DirectUploadError("Arquivo não encontrado no armazenamento")
+
+    problem = None
+    if stored.size != payload["s"] or stored.size > settings.MAX_UPLOAD_SIZE:
+        problem = "Tamanho do arquivo diferente do informado"
+    elif declared_mime not in settings.ALLOWED_FILE_TYPES or not mime_matches(
+        declared_mime, stored.mime
+    ):
+        problem = "Tipo de arquivo não permitido"
+    if problem:
+        logger.warning(
+            f"🚫 Upload direto reprovado | Chave: {key} | {problem} | "
+            f"Tamanho: {stored.size} | Tipo: {stored.mime}"
+        )
+        backend.delete(key, declared_mime)
+        raise DirectUploadError(problem)
+
+    with transaction.atomic():
+        feedback = (
+            Feedback.objects.select_for_update()
+            .filter(pk=payload["f"], client=tenant)
+            .first()
+        )
+        if feedback is None:
+            raise DirectUploadError("Feedback não encontrado", status_code=404)
+        finalized = FeedbackArquivo.objects.filter(
+            feedback=feedback, arquivo=stored.value
+        )
+        if finalized.exists():
+            raise DirectUploadError("Upload já finalizado", status_code=409)
+
+        return FeedbackArquivo.objects.create(
+            feedback=feedback,
+            client=tenant,
+            arquivo=stored.value,
+            nome_original=payload["n"],
+            tipo_mime=declared_mime,
+            tamanho_bytes=stored.size,
+            enviado_por=user,
+            interno=payload["i"],
+        )
@@ -76,8 +76,8 @@ class FeedbackDocument(Document):
     categoria = fields.KeywordField()
 
     # Campos de data
-    created_at = fields.DateField()
-    updated_at = fields.DateField()
+    created_at = fields.DateField(attr="data_criacao")
+    updated_at = fields.DateField(attr="data_atualizacao")
 
     # Campo de email (para busca exata)
     email_contato = fields.KeywordField()
@@ -126,6 +126,13 @@ class FeedbackDocument(Document):
             return related_instance.feedbacks.all()
         return []
 
+    def prepare_categoria(self, instance):
+        """
+        Feedback não possui categoria própria; mantido por compatibilidade
+        com o mapeamento (mesmo valor usado pelo BulkReindexer)
+        """
+        return None
+
     def prepare_tenant(self, instance):
         """
         Prepara dados do tenant para indexação
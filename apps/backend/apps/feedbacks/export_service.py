@@ -17,6 +17,7 @@ from django.http import HttpResponse
 from django.utils import timezone
 
 from apps.feedbacks.models import Feedback
+from apps.feedbacks.protocol_pool import get_protocol_pool
 from apps.tenants.models import Client
 
 logger = logging.getLogger(__name__)
@@ -463,16 +464,16 @@ class ImportService:
             Resultado da importação
         """
         if format == "csv":
-            return ImportService._import_feedbacks_csv(
-                tenant, file_content, update_existing
-            )
+            importer = ImportService._import_feedbacks_csv
         elif format == "json":
-            return ImportService._import_feedbacks_json(
-                tenant, file_content, update_existing
-            )
+            importer = ImportService._import_feedbacks_json
         else:
             raise ValueError(f"Formato não suportado: {format}")
 
+        # Protocolos reservados em lote para toda a importação
+        with get_protocol_pool().transaction_batch():
+            return importer(tenant, file_content, update_existing)
+
     @staticmethod
     def _import_feedbacks_csv(
         tenant: Client, file_content: bytes, update_existing: bool
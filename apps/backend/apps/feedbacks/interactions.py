@@ -0,0 +1,181 @@
+"""
+Escrita de interações (FeedbackViewSet.adicionar_interacao)
+
+Uma interação custa no máximo 3 queries, todas na mesma transação:
+
+1. SELECT ... FOR UPDATE só das colunas usadas (status, SLA, notificações)
+2. INSERT da FeedbackInteracao
+3. Um único UPDATE com a primeira resposta (SLA) e a mudança de status
+   (com o SLA de resolução); omitido quando nenhum dos dois se aplica
+
+Os efeitos colaterais (consulta de protocolo em cache, ETags, contadores do
+dashboard, busca, e-mails, webhooks, auditoria e push) não rodam mais em
+receivers de post_save separados: o sinal interacao_registrada é enviado
+uma única vez após o commit e cada app trata o seu.
+
+Interações gravadas por outros caminhos (admin, automações,
+responder-protocolo) disparam o mesmo sinal pelo post_save
+(apps.feedbacks.signals.processar_interacao_salva).
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .constants import FeedbackStatus
+from .models import Feedback, FeedbackInteracao
+
+logger = logging.getLogger(__name__)
+
+# Enviado após o commit com: feedback, interacao, status_anterior (None se o
+# status não mudou) e primeira_resposta (SLA de primeira resposta registrado)
+interacao_registrada = Signal()
+
+# Colunas lidas com o lock: escrita (status/SLA) e efeitos do sinal
+# (contadores, notificações e webhooks)
+LOCK_FIELDS = (
+    "id",
+    "client_id",
+    "protocolo",
+    "titulo",
+    "tipo",
+    "status",
+    "prioridade",
+    "anonimo",
+    "email_contato",
+    "data_criacao",
+    "data_atualizacao",
+    "data_primeira_resposta",
+    "data_resolucao",
+    "resposta_empresa",
+)
+
+
+def emitir_interacao_registrada(
+    feedback: Feedback,
+    interacao: FeedbackInteracao,
+    status_anterior: Optional[str] = None,
+    primeira_resposta: bool = False,
+) -> None:
+    """Envia interacao_registrada após o commit (rollback não notifica)"""
+
+    def send():
+        responses = interacao_registrada.send_robust(
+            sender=FeedbackInteracao,
+            feedback=feedback,
+            interacao=interacao,
+            status_anterior=status_anterior,
+            primeira_resposta=primeira_resposta,
+        )
+        for receiver, response in responses:
+            if isinstance(response, Exception):
+                logger.error(
+                    f"❌ Erro em efeito da interação ({receiver.__name__}) | "
+                    f"Feedback: {feedback.protocolo}: {response}",
+                    exc_info=response,
+                )
+
+    transaction.on_commit(send)
+
+
+def _campos_atualizados(
+    feedback: Feedback, autor: Any, novo_status: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Aplica SLA/status na instância e retorna as colunas do UPDATE
+
+    Mesmas regras dos signals de SLA: primeira resposta na primeira
+    interação com autor (equipe); resolução ao entrar em 'resolvido'.
+    """
+    agora = timezone.now()
+    campos: Dict[str, Any] = {}
+
+    if autor is not None and feedback.data_primeira_resposta is None:
+        feedback.data_primeira_resposta = agora
+        feedback.calcular_sla_primeira_resposta()
+        campos.update(
+            data_primeira_resposta=feedback.data_primeira_resposta,
+            tempo_primeira_resposta=feedback.tempo_primeira_resposta,
+            sla_primeira_resposta=feedback.sla_primeira_resposta,
+        )
+
+    if novo_status and novo_status != feedback.status:
+        if novo_status == FeedbackStatus.RESOLVIDO and feedback.data_resolucao is None:
+            feedback.data_resolucao = agora
+            feedback.calcular_sla_resolucao()
+            campos.update(
+                data_resolucao=feedback.data_resolucao,
+                tempo_resolucao=feedback.tempo_resolucao,
+                sla_resolucao=feedback.sla_resolucao,
+            )
+        feedback.status = novo_status
+        # update() não aplica auto_now
+        feedback.data_atualizacao = agora
+        campos.update(status=novo_status, data_atualizacao=agora)
+
+    return campos
+
+
+def registrar_interacao(
+    tenant,
+    lookup: Dict[str, Any],
+    tipo: str,
+    mensagem: str,
+    autor: Any = None,
+    novo_status: Optional[str] = None,
+) -> Tuple[Feedback, FeedbackInteracao]:
+    """
+    Grava uma interação no feedback do tenant (até 3 queries)
+
+    Args:
+        tenant: Client dono do feedback
+        lookup: Filtro do feedback (ex: {"pk": 1} ou {"protocolo": "OUVY-..."})
+        tipo: InteracaoTipo da interação
+        mensagem: Texto já sanitizado
+        autor: Usuário da equipe (None para o denunciante)
+        novo_status: Novo status do feedback (MUDANCA_STATUS)
+
+    Returns:
+        (feedback, interacao); o feedback traz apenas LOCK_FIELDS
+
+    Raises:
+        Feedback.DoesNotExist: Feedback inexistente no tenant
+    """
+    with transaction.atomic():
+        feedback = (
+            Feedback.objects.all_tenants()
+            .select_for_update()
+            .only(*LOCK_FIELDS)
+            .get(client=tenant, **lookup)
+        )
+        feedback.client = tenant
+        status_anterior = feedback.status
+
+        interacao = FeedbackInteracao(
+            feedback=feedback,
+            client=tenant,
+            autor=autor,
+            tipo=tipo,
+            mensagem=mensagem,
+        )
+        # Efeitos pelo sinal consolidado, não pelo post_save
+        interacao._evento_consolidado = True
+        interacao.save()
+
+        campos = _campos_atualizados(feedback, autor, novo_status)
+        if campos:
+            Feedback.objects.all_tenants().filter(pk=feedback.pk).update(**campos)
+
+        emitir_interacao_registrada(
+            feedback,
+            interacao,
+            status_anterior=(
+                status_anterior if feedback.status != status_anterior else None
+            ),
+            primeira_resposta="data_primeira_resposta" in campos,
+        )
+
+    return feedback, interacao
@@ -0,0 +1,108 @@
+"""
+Busca full-text no banco (fallback do ElasticSearch)
+
+- Coluna tsvector mantida por trigger (configuração 'portuguese')
+- Índice GIN no tsvector
+- Índices trigram (pg_trgm) para busca parcial de protocolo e e-mail
+
+Os objetos específicos de PostgreSQL só são criados nesse vendor; em SQLite
+(testes) apenas a coluna é adicionada e a busca usa icontains.
+"""
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+SEARCH_INDEXES = [
+    django.contrib.postgres.indexes.GinIndex(
+        fields=["search_vector"], name="feedback_search_vector_gin"
+    ),
+    django.contrib.postgres.indexes.GinIndex(
+        django.contrib.postgres.indexes.OpClass(
+            django.db.models.functions.text.Upper("protocolo"), name="gin_trgm_ops"
+        ),
+        name="feedback_protocolo_trgm",
+    ),
+    django.contrib.postgres.indexes.GinIndex(
+        django.contrib.postgres.indexes.OpClass(
+            django.db.models.functions.text.Upper("email_contato"),
+            name="gin_trgm_ops",
+        ),
+        name="feedback_email_trgm",
+    ),
+]
+
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION feedbacks_feedback_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.protocolo, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(NEW.titulo, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(NEW.descricao, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS feedbacks_feedback_search_vector_trigger ON feedbacks_feedback;
+CREATE TRIGGER feedbacks_feedback_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF protocolo, titulo, descricao, search_vector
+    ON feedbacks_feedback
+    FOR EACH ROW EXECUTE FUNCTION feedbacks_feedback_search_vector_update();
+
+-- Backfill: o trigger recalcula o vetor de cada linha
+UPDATE feedbacks_feedback SET search_vector = NULL;
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS feedbacks_feedback_search_vector_trigger ON feedbacks_feedback;
+DROP FUNCTION IF EXISTS feedbacks_feedback_search_vector_update();
+"""
+
+
+def create_search_objects(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Feedback = apps.get_model("feedbacks", "Feedback")
+    schema_editor.execute(CREATE_TRIGGER_SQL)
+    for index in SEARCH_INDEXES:
+        schema_editor.add_index(Feedback, index)
+
+
+def drop_search_objects(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Feedback = apps.get_model("feedbacks", "Feedback")
+    for index in SEARCH_INDEXES:
+        schema_editor.remove_index(Feedback, index)
+    schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedbacks", "0013_feedback_feedback_priority_idx_and_more"),
+    ]
+
+    operations = [
+        # No-op fora do PostgreSQL
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="feedback",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name="Vetor de Busca"
+            ),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name="feedback", index=index)
+                for index in SEARCH_INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_objects, drop_search_objects),
+            ],
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.15 on 2026-10-19 16:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedbacks", "0014_feedback_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProtocoloReservado",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "codigo",
+                    models.CharField(max_length=20, unique=True, verbose_name="Código"),
+                ),
+                (
+                    "lote",
+                    models.CharField(
+                        db_index=True,
+                        help_text="Identificador do lote que reservou o código",
+                        max_length=32,
+                        verbose_name="Lote",
+                    ),
+                ),
+                (
+                    "reservado_em",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Reservado Em"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Protocolo Reservado",
+                "verbose_name_plural": "Protocolos Reservados",
+                "db_table": "feedbacks_protocolo_reservado",
+            },
+        ),
+    ]
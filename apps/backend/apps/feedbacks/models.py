@@ -1,10 +1,9 @@
-import secrets
-import string
-import uuid
-
 from cloudinary.models import CloudinaryField
 from django.contrib.auth.models import User
-from django.db import IntegrityError, models, transaction
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from django.db.models.functions import Upper
 
 from apps.core.models import TenantAwareModel
 
@@ -51,6 +50,10 @@ class Feedback(TenantAwareModel):
         ("critica", "Crítica"),
     ]
 
+    # Prazos de SLA em horas (calcular_sla_* e atualização em massa)
+    SLA_PRIMEIRA_RESPOSTA_HORAS = 24
+    SLA_RESOLUCAO_HORAS = 72
+
     tipo = models.CharField(
         max_length=20,
         choices=TIPO_CHOICES,
@@ -199,6 +202,13 @@ class Feedback(TenantAwareModel):
         help_text="Usuário que criou o feedback (para rastreabilidade)",
     )
 
+    # Busca full-text (PostgreSQL): mantido por trigger, ver migração 0014
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name="Vetor de Busca",
+    )
+
     class Meta(TenantAwareModel.Meta):
         verbose_name: str = "Feedback"
         verbose_name_plural: str = "Feedbacks"
@@ -225,6 +235,16 @@ class Feedback(TenantAwareModel):
                 fields=["client", "assigned_to", "status"],
                 name="feedback_assigned_status_idx"
             ),  # Queries "meus feedbacks pendentes"
+            # Busca no banco (fallback do ElasticSearch) - apenas PostgreSQL
+            GinIndex(fields=["search_vector"], name="feedback_search_vector_gin"),
+            GinIndex(
+                OpClass(Upper("protocolo"), name="gin_trgm_ops"),
+                name="feedback_protocolo_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("email_contato"), name="gin_trgm_ops"),
+                name="feedback_email_trgm",
+            ),
         ]
 
     def __str__(self):
@@ -236,14 +256,16 @@ class Feedback(TenantAwareModel):
         Gera um código de protocolo único CRIPTOGRAFICAMENTE SEGURO no formato OUVY-XXXX-YYYY.
 
         ✅ CORREÇÃO DE SEGURANÇA (2026-01-27):
-        - Substituído `random.choices()` por `secrets.choice()` (PEP 506)
+        - Geração com o módulo `secrets` (PEP 506) ao invés de `random`
         - Geração criptograficamente segura (CSPRNG - Cryptographically Secure Pseudo-Random Number Generator)
         - Proteção contra ataques de predição de sequência
 
-        PROTEÇÃO CONTRA RACE CONDITION:
-        - Usa transação atômica (transaction.atomic) para evitar colisões
-        - Tenta até 10 vezes com geração aleatória
-        - Se falhar, usa UUID como fallback (garantido ser único)
+        UNICIDADE SEM QUERY POR FEEDBACK:
+        - Códigos pré-gerados e reservados em lote (ProtocoloReservado, índice
+          único) e entregues por um pool Redis/processo
+          (apps.feedbacks.protocol_pool)
+        - Dois workers nunca recebem o mesmo código; o índice único de
+          `protocolo` continua como última garantia
 
         Formato:
         - OUVY: Prefixo fixo da plataforma
@@ -254,47 +276,19 @@ class Feedback(TenantAwareModel):
         - 36^8 = 2.821.109.907.456 combinações possíveis (2.8 trilhões)
         - Com rate limiting (5 req/min), levaria 1+ milhão de anos para brute force
         - Geração criptograficamente aleatória impede predição de sequências
-        - Transação atômica garante unicidade mesmo em alta concorrência
 
         Exemplo: OUVY-A3B9-K7M2
 
         Returns:
             str: Código de protocolo único criptograficamente seguro
-
-        Raises:
-            IntegrityError: Se o banco de dados rejeitar duplicata (não acontece - fallback para UUID)
         """
-        max_tentativas = 10
-        caracteres = string.ascii_uppercase + string.digits  # A-Z, 0-9
-
-        for tentativa in range(max_tentativas):
-            try:
-                # ✅ CORREÇÃO: secrets.choice() ao invés de random.choices()
-                # secrets.choice() usa /dev/urandom (Linux/macOS) ou CryptGenRandom (Windows)
-                # Fonte de entropia criptograficamente segura
-                parte1 = "".join(secrets.choice(caracteres) for _ in range(4))
-                parte2 = "".join(secrets.choice(caracteres) for _ in range(4))
-                protocolo = f"OUVY-{parte1}-{parte2}"
-
-                # Dentro de uma transação atômica, a verificação + insert é segura
-                # Isso previne race conditions entre múltiplos requests simultâneos
-                with transaction.atomic():
-                    if not Feedback.objects.filter(protocolo=protocolo).exists():
-                        return protocolo
-                    # Se existir, loop continua para tentar outro
-
-            except IntegrityError:
-                # Se mesmo assim houver colisão (extremamente improvável),
-                # continua tentando
-                continue
-
-        # Fallback com UUID se houver muitas colisões (QUASE IMPOSSÍVEL)
-        # UUID garante unicidade global mesmo em cenários de ultra-alta concorrência
-        # Exemplo: OUVY-A1B2C3D4-E5F6G7H8
-        uuid_hex = uuid.uuid4().hex.upper()
-        return f"OUVY-{uuid_hex[:4]}-{uuid_hex[4:8]}"
-
-    def calcular_sla_primeira_resposta(self, sla_horas: int = 24):
+        from .protocol_pool import get_protocol_pool
+
+        return get_protocol_pool().take()
+
+    def calcular_sla_primeira_resposta(
+        self, sla_horas: int = SLA_PRIMEIRA_RESPOSTA_HORAS
+    ):
         """
         Calcula se a primeira resposta está dentro do SLA.
 
@@ -315,7 +309,7 @@ class Feedback(TenantAwareModel):
         self.sla_primeira_resposta = tempo_resposta <= prazo
         return self.sla_primeira_resposta
 
-    def calcular_sla_resolucao(self, sla_horas: int = 72):
+    def calcular_sla_resolucao(self, sla_horas: int = SLA_RESOLUCAO_HORAS):
         """
         Calcula se a resolução está dentro do SLA.
 
@@ -683,3 +677,30 @@ class ResponseTemplate(TenantAwareModel):
             content = content.replace(key, str(value))
 
         return content
+
+
+class ProtocoloReservado(models.Model):
+    """
+    Reserva global de códigos de protocolo (apps.feedbacks.protocol_pool).
+
+    Os códigos são reservados em lote; o índice único garante que dois
+    workers nunca recebam o mesmo código. Não herda TenantAwareModel: o
+    protocolo é único em toda a plataforma.
+    """
+
+    codigo = models.CharField(max_length=20, unique=True, verbose_name="Código")
+    lote = models.CharField(
+        max_length=32,
+        db_index=True,
+        verbose_name="Lote",
+        help_text="Identificador do lote que reservou o código",
+    )
+    reservado_em = models.DateTimeField(auto_now_add=True, verbose_name="Reservado Em")
+
+    class Meta:
+        db_table = "feedbacks_protocolo_reservado"
+        verbose_name = "Protocolo Reservado"
+        verbose_name_plural = "Protocolos Reservados"
+
+    def __str__(self):
+        return self.codigo
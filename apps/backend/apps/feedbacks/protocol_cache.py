@@ -0,0 +1,75 @@
+"""
+Cache da consulta pública de protocolo (consultar_protocolo)
+Resposta serializada por (tenant, protocolo), invalidada pelos signals de
+Feedback, FeedbackInteracao e FeedbackArquivo. Protocolos inexistentes são
+armazenados com TTL curto para absorver tentativas de enumeração.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_TEMPLATE = "protocolo:consulta:tenant:{tenant_id}:{codigo}"
+
+# Sentinela para protocolo inexistente (cache.get devolve None no miss)
+_NOT_FOUND = "__protocolo_not_found__"
+
+DEFAULT_TTL = 60 * 5
+DEFAULT_NOT_FOUND_TTL = 30
+
+
+def protocol_cache_key(tenant_id: int, codigo: str) -> str:
+    return KEY_TEMPLATE.format(tenant_id=tenant_id, codigo=codigo)
+
+
+def get_cached_consulta(
+    tenant_id: int, codigo: str
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Busca a resposta em cache
+
+    Returns:
+        (hit, data): data é None quando o protocolo está em cache negativo
+    """
+    cached = cache.get(protocol_cache_key(tenant_id, codigo))
+    if cached is None:
+        return False, None
+    if cached == _NOT_FOUND:
+        return True, None
+    return True, cached
+
+
+def set_cached_consulta(
+    tenant_id: int, codigo: str, data: Optional[Dict[str, Any]]
+) -> None:
+    """Armazena a resposta serializada (ou o cache negativo se data for None)"""
+    if data is None:
+        timeout = getattr(
+            settings, "PROTOCOL_LOOKUP_NOT_FOUND_TTL", DEFAULT_NOT_FOUND_TTL
+        )
+        cache.set(protocol_cache_key(tenant_id, codigo), _NOT_FOUND, timeout=timeout)
+        return
+
+    timeout = getattr(settings, "PROTOCOL_LOOKUP_CACHE_TTL", DEFAULT_TTL)
+    cache.set(protocol_cache_key(tenant_id, codigo), data, timeout=timeout)
+
+
+def invalidate_consulta(tenant_id: Optional[int], codigo: Optional[str]) -> None:
+    """Remove a resposta em cache (positiva ou negativa) do protocolo"""
+    if not tenant_id or not codigo:
+        return
+    cache.delete(protocol_cache_key(tenant_id, codigo))
+    logger.debug(f"🗑️ Cache de consulta invalidado | Protocolo: {codigo}")
+
+
+def invalidate_consultas(tenant_id: Optional[int], codigos: Iterable[str]) -> None:
+    """Remove as respostas em cache de vários protocolos (um delete_many)"""
+    keys = [protocol_cache_key(tenant_id, codigo) for codigo in codigos if codigo]
+    if not tenant_id or not keys:
+        return
+    cache.delete_many(keys)
+    logger.debug(f"🗑️ Cache de consulta invalidado | Protocolos: {len(keys)}")
@@ -0,0 +1,228 @@
+"""
+Pool de códigos de protocolo pré-gerados (Feedback.gerar_protocolo)
+
+Os códigos (OUVY-XXXX-YYYY, CSPRNG) são reservados em lotes de
+PROTOCOL_POOL_BATCH_SIZE na tabela ProtocoloReservado e entregues um a um,
+sem query por feedback:
+
+- Reserva: bulk_create com ignore_conflicts contra o índice único de
+  ProtocoloReservado.codigo; só os códigos gravados com o id do lote são
+  usados. Protocolos anteriores ao pool (ou importados) são descartados
+  com uma consulta por lote ao índice único de Feedback.protocolo.
+- Entrega: lista Redis compartilhada (LPOP) ou, sem Redis, deque do
+  processo. Lista vazia → nova reserva na própria chamada.
+- Transações: uma reserva feita dentro de um transaction.atomic pode ser
+  desfeita junto com ele. Fora de ProtocolPool.transaction_batch() a
+  chamada reserva só o código que vai usar; dentro dele (ex:
+  ImportService) o lote atende apenas a própria thread enquanto o bloco
+  durar, e as sobras vão para o pool compartilhado por
+  transaction.on_commit, que o Django descarta se houver rollback.
+
+Códigos entregues e não usados (rollback do feedback, perda do Redis) são
+apenas desperdiçados: continuam reservados e nunca se repetem.
+"""
+
+import logging
+import secrets
+import string
+import threading
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.core.redis_utils import get_redis_client, redis_key
+
+logger = logging.getLogger(__name__)
+
+POOL_KEY = "feedbacks:protocol_pool"
+
+ALPHABET = string.ascii_uppercase + string.digits  # A-Z, 0-9
+CODE_LENGTH = 8
+CODE_SPACE = len(ALPHABET) ** CODE_LENGTH  # 36^8 ≈ 2.8 trilhões
+
+
+def _batch_size() -> int:
+    return getattr(settings, "PROTOCOL_POOL_BATCH_SIZE", 500)
+
+
+def gerar_codigo() -> str:
+    """
+    Código aleatório no formato OUVY-XXXX-YYYY
+
+    Um único secrets.randbelow (CSPRNG) por código, convertido para base 36:
+    distribuição uniforme sobre as 36^8 combinações.
+    """
+    value = secrets.randbelow(CODE_SPACE)
+    chars = []
+    for _ in range(CODE_LENGTH):
+        value, index = divmod(value, len(ALPHABET))
+        chars.append(ALPHABET[index])
+    code = "".join(chars)
+    return f"OUVY-{code[:4]}-{code[4:]}"
+
+
+def reserve_batch(size: int) -> List[str]:
+    """
+    Reserva até `size` códigos novos (3 queries por lote)
+
+    Returns:
+        Códigos reservados por este lote e ainda não usados por feedbacks
+    """
+    from .models import Feedback, ProtocoloReservado
+
+    lote = uuid.uuid4().hex
+    codes = {gerar_codigo() for _ in range(size)}
+    ProtocoloReservado.objects.bulk_create(
+        [ProtocoloReservado(codigo=code, lote=lote) for code in codes],
+        ignore_conflicts=True,
+    )
+    reserved = list(
+        ProtocoloReservado.objects.filter(lote=lote).values_list("codigo", flat=True)
+    )
+    in_use = set(
+        Feedback.objects.all_tenants()
+        .filter(protocolo__in=reserved)
+        .values_list("protocolo", flat=True)
+    )
+    return [code for code in reserved if code not in in_use]
+
+
+class _RedisCodeList:
+    """Pool compartilhado entre processos (lista Redis)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.key = redis_key(POOL_KEY)
+
+    def pop(self) -> Optional[str]:
+        value = self.client.lpop(self.key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def extend(self, codes: List[str]) -> None:
+        if codes:
+            self.client.rpush(self.key, *codes)
+
+    def __len__(self) -> int:
+        return int(self.client.llen(self.key))
+
+
+class _LocalCodeList:
+    """Pool na memória do processo (sem Redis)"""
+
+    def __init__(self):
+        self._codes: deque = deque()
+        self._lock = threading.Lock()
+
+    def pop(self) -> Optional[str]:
+        with self._lock:
+            return self._codes.popleft() if self._codes else None
+
+    def extend(self, codes: List[str]) -> None:
+        with self._lock:
+            self._codes.extend(codes)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+
+class ProtocolPool:
+    """
+    Entrega de códigos de protocolo reservados em lote
+
+    Usage:
+        get_protocol_pool().take()  # Feedback.gerar_protocolo
+
+        with transaction.atomic(), get_protocol_pool().transaction_batch():
+            for row in rows:
+                Feedback.objects.create(...)
+    """
+
+    def __init__(self):
+        redis = get_redis_client()
+        self.codes = _RedisCodeList(redis) if redis else _LocalCodeList()
+        self._local = threading.local()
+
+    def take(self) -> str:
+        """Próximo código livre (zero queries enquanto houver códigos)"""
+        held = self._held()
+        if held:
+            return held.popleft()
+        try:
+            code = self.codes.pop()
+        except Exception as e:
+            logger.warning(f"⚠️ Pool de protocolos indisponível: {e}")
+            code = None
+        return code or self._refill(held)
+
+    def _refill(self, held: Optional[deque]) -> str:
+        if held is None and not transaction.get_autocommit():
+            # Transação sem transaction_batch: sobras poderiam ser entregues
+            # depois de um rollback que desfez a reserva
+            size = 1
+        else:
+            size = _batch_size()
+        codes: List[str] = []
+        while not codes:
+            codes = reserve_batch(size)
+        code, rest = codes[0], codes[1:]
+        if held is not None:
+            held.extend(rest)
+        else:
+            self._share(rest)
+        logger.debug(f"🎫 Lote de {len(codes)} protocolos reservado")
+        return code
+
+    def _share(self, codes: List[str]) -> None:
+        try:
+            self.codes.extend(codes)
+        except Exception as e:
+            # Códigos reservados e não entregues são só desperdiçados
+            logger.warning(f"⚠️ Pool de protocolos indisponível: {e}")
+
+    def _held(self) -> Optional[deque]:
+        """Códigos do transaction_batch ativo nesta thread (None fora dele)"""
+        stack = getattr(self._local, "held", None)
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def transaction_batch(self) -> Iterator[None]:
+        """
+        Reserva em lote para vários feedbacks criados na mesma transação
+
+        Deve ser aberto dentro do transaction.atomic que cria os feedbacks,
+        sem savepoints desfeitos no meio (ex: atomic por linha com o erro
+        tratado): o lote reservado atende só esta thread e só até o fim do
+        bloco. As sobras vão para o pool compartilhado após o commit; se o
+        bloco terminar com erro ou a transação for desfeita, são descartadas.
+        """
+        held: deque = deque()
+        stack = getattr(self._local, "held", None)
+        if stack is None:
+            stack = self._local.held = []
+        stack.append(held)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+        leftovers = list(held)
+        if leftovers:
+            transaction.on_commit(lambda: self._share(leftovers))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+_protocol_pool: Optional[ProtocolPool] = None
+
+
+def get_protocol_pool() -> ProtocolPool:
+    """Pool compartilhado do processo"""
+    global _protocol_pool
+    if _protocol_pool is None:
+        _protocol_pool = ProtocolPool()
+    return _protocol_pool
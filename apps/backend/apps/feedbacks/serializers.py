@@ -1,4 +1,13 @@
 from django.conf import settings
+from django.db.models import (
+    Count,
+    Manager,
+    OuterRef,
+    Prefetch,
+    QuerySet,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework import serializers
 
@@ -7,23 +16,68 @@ from apps.core.sanitizers import sanitize_rich_text  # ✅ NOVO: Método com ble
 from apps.core.sanitizers import sanitize_plain_text
 from apps.tenants.serializers import TeamMemberSerializer
 
-from .constants import InteracaoTipo
+from .constants import MAX_INTERACAO_MENSAGEM_LENGTH, InteracaoTipo
 from .models import Feedback, FeedbackArquivo, FeedbackInteracao, ResponseTemplate, Tag
 
 
+def tags_com_contagem() -> QuerySet[Tag]:
+    """
+    Tags com feedback_count anotado, lido pelo TagSerializer
+
+    Subquery na tabela de vínculos em vez de Count("feedbacks"): usado em
+    Prefetch("tags"), o JOIN do filtro por feedback restringiria a contagem.
+    """
+    contagem = (
+        Feedback.tags.through.objects.filter(tag_id=OuterRef("pk"))
+        .values("tag_id")
+        .annotate(total=Count("*"))
+        .values("total")
+    )
+    return Tag.objects.annotate(feedback_count=Coalesce(Subquery(contagem), 0))
+
+
+class TagListSerializer(serializers.ListSerializer):
+    """
+    Tags aninhadas sem Prefetch anotado (ex: resposta de create/update,
+    cujo cache de prefetch o DRF descarta): contagens em uma única query
+    """
+
+    def to_representation(self, data):
+        tags = list(data.all()) if isinstance(data, Manager) else data
+        sem_contagem = [tag.pk for tag in tags if not hasattr(tag, "feedback_count")]
+        if sem_contagem:
+            contagens = dict(
+                tags_com_contagem()
+                .filter(pk__in=sem_contagem)
+                .values_list("pk", "feedback_count")
+            )
+            for tag in tags:
+                if tag.pk in contagens:
+                    tag.feedback_count = contagens[tag.pk]
+        return super().to_representation(tags)
+
+
 class TagSerializer(serializers.ModelSerializer):
-    """Serializer para Tags de categorização."""
+    """
+    Serializer para Tags de categorização.
+
+    feedback_count vem da anotação de tags_com_contagem(), sem consulta por
+    tag; listas sem a anotação são completadas por TagListSerializer.
+    """
 
-    feedback_count = serializers.SerializerMethodField()
+    feedback_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Tag
         fields = ["id", "nome", "cor", "descricao", "criado_em", "feedback_count"]
         read_only_fields = ["id", "criado_em", "feedback_count"]
+        list_serializer_class = TagListSerializer
 
-    def get_feedback_count(self, obj):
-        """Retorna quantidade de feedbacks com esta tag."""
-        return obj.feedbacks.count()
+    def create(self, validated_data):
+        """Tag nova ainda não tem feedbacks."""
+        tag = super().create(validated_data)
+        tag.feedback_count = 0
+        return tag
 
     def validate_nome(self, value):
         """Valida e sanitiza o nome da tag."""
@@ -156,6 +210,71 @@ class FeedbackSerializer(serializers.ModelSerializer):
         # return sanitize_rich_text(value, allow_links=False)
 
 
+class FeedbackListSerializer(serializers.BaseSerializer):
+    """
+    Serializer enxuto para FeedbackViewSet.list.
+
+    Monta o dicionário diretamente, sem introspecção de campos do
+    ModelSerializer, a partir do queryset de projeção da listagem
+    (ver FeedbackViewSet.get_list_queryset):
+    - tags_data: array JSON de tags agregado em SQL
+    - assigned_to_nome / assigned_by_nome: nomes anotados em SQL
+
+    Mantém as chaves do FeedbackSerializer; assigned_to e tags são
+    representações compactas (id/nome e id/nome/cor).
+    """
+
+    _datetime = serializers.DateTimeField()
+    _duration = serializers.DurationField()
+
+    def to_representation(self, instance):
+        dt = self._datetime.to_representation
+        dur = self._duration.to_representation
+
+        return {
+            "id": instance.id,
+            "protocolo": instance.protocolo,
+            "tipo": instance.tipo,
+            "titulo": instance.titulo,
+            "descricao": instance.descricao,
+            "status": instance.status,
+            "prioridade": instance.prioridade,
+            "anonimo": instance.anonimo,
+            "email_contato": instance.email_contato,
+            "data_criacao": dt(instance.data_criacao),
+            "data_atualizacao": dt(instance.data_atualizacao),
+            "assigned_to": (
+                {"id": instance.assigned_to_id, "nome": instance.assigned_to_nome}
+                if instance.assigned_to_id
+                else None
+            ),
+            "assigned_at": dt(instance.assigned_at) if instance.assigned_at else None,
+            "assigned_by_name": instance.assigned_by_nome,
+            "tags": instance.tags_data or [],
+            # SLA Tracking
+            "tempo_primeira_resposta": (
+                dur(instance.tempo_primeira_resposta)
+                if instance.tempo_primeira_resposta is not None
+                else None
+            ),
+            "tempo_resolucao": (
+                dur(instance.tempo_resolucao)
+                if instance.tempo_resolucao is not None
+                else None
+            ),
+            "data_primeira_resposta": (
+                dt(instance.data_primeira_resposta)
+                if instance.data_primeira_resposta
+                else None
+            ),
+            "data_resolucao": (
+                dt(instance.data_resolucao) if instance.data_resolucao else None
+            ),
+            "sla_primeira_resposta": instance.sla_primeira_resposta,
+            "sla_resolucao": instance.sla_resolucao,
+        }
+
+
 class FeedbackInteracaoSerializer(serializers.ModelSerializer):
     autor_nome = serializers.SerializerMethodField()
     data_formatada = serializers.SerializerMethodField()
@@ -271,6 +390,121 @@ class FeedbackArquivoUploadSerializer(serializers.Serializer):
         return value
 
 
+class FeedbackArquivoUploadRequestSerializer(serializers.Serializer):
+    """
+    Serializer para solicitar upload direto ao armazenamento.
+    O arquivo não passa pela API: tipo e tamanho são declarados aqui e
+    conferidos na finalização (apps.feedbacks.direct_upload).
+    """
+
+    nome_original = serializers.CharField(
+        max_length=255, help_text="Nome do arquivo no dispositivo"
+    )
+    tipo_mime = serializers.CharField(
+        max_length=100, help_text="Tipo MIME do arquivo (ex: application/pdf)"
+    )
+    tamanho_bytes = serializers.IntegerField(
+        min_value=1, help_text="Tamanho exato do arquivo em bytes (máx 10MB)"
+    )
+    protocolo = serializers.CharField(
+        required=False,
+        help_text="Protocolo do feedback (obrigatório se anônimo)",
+        allow_blank=True,
+    )
+    interno = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Se True, arquivo só é visível para empresa",
+    )
+
+    def validate_tamanho_bytes(self, value):
+        """Valida tamanho declarado."""
+        if value > settings.MAX_UPLOAD_SIZE:
+            max_mb = settings.MAX_UPLOAD_SIZE / (1024 * 1024)
+            raise serializers.ValidationError(
+                f"Arquivo muito grande. Máximo permitido: {max_mb}MB"
+            )
+        return value
+
+    def validate_tipo_mime(self, value):
+        """Valida tipo MIME declarado."""
+        if value not in settings.ALLOWED_FILE_TYPES:
+            tipos_permitidos = ", ".join(
+                [t.split("/")[-1].upper() for t in settings.ALLOWED_FILE_TYPES]
+            )
+            raise serializers.ValidationError(
+                f"Tipo de arquivo não permitido. Tipos aceitos: {tipos_permitidos}"
+            )
+        return value
+
+
+class FeedbackArquivoFinalizeSerializer(serializers.Serializer):
+    """Serializer para finalizar upload direto."""
+
+    token = serializers.CharField(help_text="Token retornado em solicitar-upload")
+
+
+class FeedbackBulkUpdateSerializer(serializers.Serializer):
+    """
+    Serializer da operação em lote (apps.feedbacks.bulk).
+    Ao menos uma operação: status, prioridade, assigned_to ou tags.
+    """
+
+    OPERACOES = ("status", "prioridade", "assigned_to", "add_tags", "remove_tags")
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        help_text="IDs dos feedbacks (máx FEEDBACK_BULK_MAX_IDS)",
+    )
+    status = serializers.ChoiceField(choices=Feedback.STATUS_CHOICES, required=False)
+    prioridade = serializers.ChoiceField(
+        choices=Feedback.PRIORIDADE_CHOICES, required=False
+    )
+    assigned_to = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="ID do TeamMember; null remove a atribuição",
+    )
+    add_tags = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False
+    )
+    remove_tags = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False
+    )
+    mensagem = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        help_text="Texto da interação de mudança de status",
+    )
+
+    def validate_ids(self, value):
+        """Limita o tamanho do lote."""
+        from .bulk import max_ids
+
+        if len(set(value)) > max_ids():
+            raise serializers.ValidationError(
+                f"Máximo de {max_ids()} feedbacks por operação"
+            )
+        return value
+
+    def validate_mensagem(self, value):
+        """Sanitiza a mensagem da interação."""
+        return sanitize_html_input(value, max_length=MAX_INTERACAO_MENSAGEM_LENGTH)
+
+    def validate(self, attrs):
+        if not any(operacao in attrs for operacao in self.OPERACOES):
+            raise serializers.ValidationError(
+                f"Informe ao menos uma operação: {', '.join(self.OPERACOES)}"
+            )
+        conflito = set(attrs.get("add_tags", [])) & set(attrs.get("remove_tags", []))
+        if conflito:
+            raise serializers.ValidationError(
+                {"remove_tags": f"Tags em add_tags e remove_tags: {sorted(conflito)}"}
+            )
+        return attrs
+
+
 class FeedbackDetailSerializer(FeedbackSerializer):
     interacoes = serializers.SerializerMethodField()
     arquivos = serializers.SerializerMethodField()
@@ -279,22 +513,20 @@ class FeedbackDetailSerializer(FeedbackSerializer):
         fields = FeedbackSerializer.Meta.fields + ["interacoes", "arquivos"]
 
     def get_interacoes(self, obj):
-        # Ordenar por data desc
-        qs = obj.interacoes.order_by("-data")
-        return FeedbackInteracaoSerializer(qs, many=True).data
+        # Ordem -data vem do prefetch de get_queryset (ou do Meta.ordering)
+        return FeedbackInteracaoSerializer(obj.interacoes.all(), many=True).data
 
     def get_arquivos(self, obj):
         """Retorna arquivos do feedback (filtra internos se necessário)."""
         request = self.context.get("request")
+        arquivos = obj.arquivos.all()
 
         # Se request não existe ou user não autenticado, mostrar só públicos
+        # (filtrado em memória para reaproveitar o prefetch)
         if not request or not request.user.is_authenticated:
-            qs = obj.arquivos.filter(interno=False)
-        else:
-            # User autenticado vê todos
-            qs = obj.arquivos.all()
+            arquivos = [arquivo for arquivo in arquivos if not arquivo.interno]
 
-        return FeedbackArquivoSerializer(qs, many=True).data
+        return FeedbackArquivoSerializer(arquivos, many=True).data
 
 
 class FeedbackConsultaSerializer(serializers.ModelSerializer):
@@ -339,15 +571,46 @@ class FeedbackConsultaSerializer(serializers.ModelSerializer):
             "arquivos",
         ]
 
+    @staticmethod
+    def get_prefetches():
+        """
+        Prefetches com o filtro/ordem exibidos na consulta pública.
+
+        Usar com .prefetch_related(*FeedbackConsultaSerializer.get_prefetches())
+        para que a serialização não execute queries adicionais.
+        """
+        return [
+            Prefetch(
+                "interacoes",
+                queryset=FeedbackInteracao.objects.filter(
+                    tipo__in=InteracaoTipo.public_values()
+                )
+                .select_related("autor")
+                .order_by("data"),
+                to_attr="interacoes_publicas",
+            ),
+            Prefetch(
+                "arquivos",
+                queryset=FeedbackArquivo.objects.filter(interno=False)
+                .select_related("enviado_por")
+                .order_by("-data_envio"),
+                to_attr="arquivos_publicos",
+            ),
+        ]
+
     def get_interacoes(self, obj):
-        allowed_public = InteracaoTipo.public_values()
-        qs = obj.interacoes.filter(tipo__in=allowed_public).order_by("data")
-        return FeedbackInteracaoSerializer(qs, many=True).data
+        interacoes = getattr(obj, "interacoes_publicas", None)
+        if interacoes is None:
+            allowed_public = InteracaoTipo.public_values()
+            interacoes = obj.interacoes.filter(tipo__in=allowed_public).order_by("data")
+        return FeedbackInteracaoSerializer(interacoes, many=True).data
 
     def get_arquivos(self, obj):
         """Retorna apenas arquivos públicos (não internos)."""
-        qs = obj.arquivos.filter(interno=False).order_by("-data_envio")
-        return FeedbackArquivoSerializer(qs, many=True).data
+        arquivos = getattr(obj, "arquivos_publicos", None)
+        if arquivos is None:
+            arquivos = obj.arquivos.filter(interno=False).order_by("-data_envio")
+        return FeedbackArquivoSerializer(arquivos, many=True).data
 
 
 # ===== RESPONSE TEMPLATE SERIALIZERS =====
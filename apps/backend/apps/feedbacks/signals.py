@@ -9,14 +9,26 @@ Triggers automáticos para enviar emails quando:
 """
 
 import logging
+from collections import Counter
 
+from django.conf import settings
 from django.core.cache import cache
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from apps.core.conditional import bump_resource_version
 from apps.core.services import EmailService, WebhookService
 
-from .models import Feedback, FeedbackInteracao
+from .bulk import feedbacks_atualizados_em_lote
+from .interactions import emitir_interacao_registrada, interacao_registrada
+from .models import (
+    Feedback,
+    FeedbackArquivo,
+    FeedbackInteracao,
+    ResponseTemplate,
+    Tag,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -70,23 +82,14 @@ def notificar_novo_feedback(sender, instance, created, **kwargs):
 # =============================================================================
 
 
-@receiver(post_save, sender=FeedbackInteracao)
-def notificar_resposta_feedback(sender, instance, created, **kwargs):
+def _notificar_resposta(feedback, mensagem):
     """
     Notifica quando há uma nova resposta/interação no feedback.
 
     Args:
-        sender: Classe FeedbackInteracao
-        instance: Instância da interação criada
-        created: True se foi criação
-        **kwargs: Argumentos adicionais do signal
+        feedback: Feedback respondido (com client)
+        mensagem: Texto da interação
     """
-    # Só envia para novas interações
-    if not created:
-        return
-
-    feedback = instance.feedback
-
     # Ignora se não tem tenant ou email
     if not feedback.client or not feedback.client.owner:
         return
@@ -98,7 +101,7 @@ def notificar_resposta_feedback(sender, instance, created, **kwargs):
     try:
         # Envia notificação de resposta
         success = EmailService.send_feedback_response_notification(
-            feedback=feedback, response_message=instance.mensagem
+            feedback=feedback, response_message=mensagem
         )
 
         if success:
@@ -132,14 +135,23 @@ def notificar_resposta_feedback(sender, instance, created, **kwargs):
 @receiver(pre_save, sender=Feedback)
 def preparar_notificacao_status(sender, instance, **kwargs):
     """
-    Captura o status anterior antes de salvar (para comparação).
+    Captura status/tipo/prioridade anteriores antes de salvar (para comparação
+    e para os deltas das estatísticas).
     """
-    if instance.pk:
-        try:
-            # Busca instância anterior do banco
-            instance._status_anterior = Feedback.objects.get(pk=instance.pk).status
-        except Feedback.DoesNotExist:
-            instance._status_anterior = None
+    if not instance.pk:
+        return
+
+    from .stats_counters import TRACKED_FIELDS
+
+    # Busca valores anteriores do banco
+    anterior = (
+        Feedback.objects.all_tenants()
+        .filter(pk=instance.pk)
+        .values(*TRACKED_FIELDS)
+        .first()
+    )
+    instance._status_anterior = anterior["status"] if anterior else None
+    instance._dimensoes_anteriores = anterior
 
 
 @receiver(post_save, sender=Feedback)
@@ -158,6 +170,11 @@ def notificar_mudanca_status(sender, instance, created, **kwargs):
     if not status_anterior or status_anterior == instance.status:
         return
 
+    _notificar_status(instance, status_anterior)
+
+
+def _notificar_status(instance, status_anterior):
+    """E-mail e webhook de mudança de status (1 por feedback a cada 5 min)."""
     # Rate limiting: 1 notificação de status por feedback a cada 5 minutos
     cache_key = f"status_notification_{instance.pk}"
     if cache.get(cache_key):
@@ -239,104 +256,310 @@ def notificacoes_estao_ativas():
 
 
 # =============================================================================
-# CACHE INVALIDATION - Auditoria Fase 3 (26/01/2026)
+# ESTATÍSTICAS - Deltas nos contadores do dashboard/analytics
 # =============================================================================
 
 
+def _aplicar_deltas_estatisticas(tenant_id, deltas):
+    """Aplica os deltas após o commit (rollback não altera os contadores)."""
+    if not tenant_id or not deltas:
+        return
+
+    from .stats_counters import get_stats_counters
+
+    transaction.on_commit(lambda: get_stats_counters().apply(tenant_id, deltas))
+
+
 @receiver(post_save, sender=Feedback)
-def invalidate_dashboard_cache_on_feedback_save(sender, instance, created, **kwargs):
+def atualizar_estatisticas_feedback(sender, instance, created, **kwargs):
     """
-    Invalida cache de dashboard stats quando Feedback é criado ou atualizado.
+    Mantém os contadores do dashboard/analytics por delta (sem invalidar).
 
-    **Performance (Auditoria Fase 3):**
-    - Garante dados frescos após mudanças
-    - Próximo request recalcula e atualiza cache
-    - Mantém 99% de cache hit rate (5min lifetime)
+    Criação incrementa total/status/tipo/prioridade; mudanças de status,
+    tipo ou prioridade decrementam o valor anterior e incrementam o novo.
+    Sem o valor anterior (ex: feedback ausente no pre_save), a reconciliação
+    periódica corrige os contadores.
 
-    **Cache keys invalidados:**
-    - dashboard_stats:{tenant_id}
+    A criação também invalida o cache de uso do plano (feedbacks do mês).
     """
-    if hasattr(instance, "client") and instance.client:
-        cache_key = f"dashboard_stats:{instance.client.id}"
-        deleted = cache.delete(cache_key)
+    from apps.core.cache_service import CacheService
 
-        if deleted:
-            action = "criado" if created else "atualizado"
-            logger.debug(
-                f"🗑️ Cache invalidado: {cache_key} | "
-                f"Feedback {instance.protocolo} {action}"
-            )
+    from .stats_counters import TRACKED_FIELDS, feedback_deltas
 
+    if not instance.client_id:
+        return
 
-@receiver(post_save, sender=FeedbackInteracao)
-def invalidate_dashboard_cache_on_interacao(sender, instance, created, **kwargs):
+    atual = {name: getattr(instance, name) for name in TRACKED_FIELDS}
+    if created:
+        anterior = None
+        CacheService(tenant_id=instance.client_id).invalidate_prefix(
+            CacheService.USAGE_PREFIX
+        )
+    else:
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not set(update_fields) & set(TRACKED_FIELDS):
+            # Save parcial (ex: campos de SLA): status/tipo/prioridade não mudam
+            return
+        anterior = getattr(instance, "_dimensoes_anteriores", None)
+        if anterior is None:
+            return
+
+    _aplicar_deltas_estatisticas(
+        instance.client_id, feedback_deltas(anterior, atual, instance.data_criacao)
+    )
+
+
+@receiver(post_delete, sender=Feedback)
+def remover_estatisticas_feedback(sender, instance, **kwargs):
+    """Feedback removido: decrementa seus contadores."""
+    from .stats_counters import TRACKED_FIELDS, feedback_deltas
+
+    atual = {name: getattr(instance, name) for name in TRACKED_FIELDS}
+    _aplicar_deltas_estatisticas(
+        instance.client_id, feedback_deltas(atual, None, instance.data_criacao)
+    )
+
+
+# =============================================================================
+# INDEXAÇÃO DE BUSCA - Near-real-time com debounce
+# =============================================================================
+
+
+@receiver(post_save, sender=Feedback)
+@receiver(post_delete, sender=Feedback)
+def enfileirar_indexacao_busca(sender, instance, **kwargs):
+    """
+    Enfileira o feedback para (re)indexação no ElasticSearch após o commit.
+
+    Rajadas de alterações no mesmo feedback (status, atribuição, SLA) são
+    coalescidas pela SearchIndexQueue e enviadas em um único _bulk.
     """
-    Invalida cache quando interação é adicionada (pode mudar status do feedback).
+    if not getattr(settings, "SEARCH_REALTIME_INDEXING", False):
+        return
+
+    from apps.core.search_queue import SearchIndexQueue
+
+    feedback_id, tenant_id = instance.pk, instance.client_id
+    transaction.on_commit(lambda: SearchIndexQueue().enqueue(feedback_id, tenant_id))
 
-    **Razão:** Interações podem alterar status do feedback (pendente → resolvido),
-    impactando estatísticas do dashboard.
 
-    Auditoria Fase 3 (26/01/2026)
+@receiver(post_save, sender=Feedback)
+@receiver(post_delete, sender=Feedback)
+def invalidar_cache_busca(sender, instance, **kwargs):
     """
-    if hasattr(instance, "feedback") and instance.feedback:
-        feedback = instance.feedback
-        if hasattr(feedback, "client") and feedback.client:
-            cache_key = f"dashboard_stats:{feedback.client.id}"
-            deleted = cache.delete(cache_key)
+    Incrementa a versão do índice de busca do tenant após o commit.
+
+    Todos os resultados/autocompletes em cache do tenant deixam de ser
+    usados sem varrer chaves (ver apps.core.search_cache).
+    """
+    tenant_id = getattr(instance, "client_id", None)
+    if not tenant_id:
+        return
+
+    from apps.core.search_cache import bump_search_version
 
-            if deleted:
-                logger.debug(
-                    f"🗑️ Cache invalidado: {cache_key} | "
-                    f"Interação adicionada ao feedback {feedback.protocolo}"
-                )
+    transaction.on_commit(lambda: bump_search_version(tenant_id))
 
 
 # =============================================================================
-# SIGNAL: SLA Tracking - Primeira Resposta
+# CACHE DA CONSULTA PÚBLICA DE PROTOCOLO
 # =============================================================================
 
 
-@receiver(post_save, sender=FeedbackInteracao)
-def registrar_primeira_resposta_sla(sender, instance, created, **kwargs):
+def _invalidar_consulta_protocolo(tenant_id, protocolo):
+    """Remove a consulta em cache agora e novamente após o commit."""
+    from .protocol_cache import invalidate_consulta
+
+    invalidate_consulta(tenant_id, protocolo)
+    transaction.on_commit(lambda: invalidate_consulta(tenant_id, protocolo))
+
+
+@receiver(post_save, sender=Feedback)
+@receiver(post_delete, sender=Feedback)
+def invalidar_cache_consulta_feedback(sender, instance, **kwargs):
+    """
+    Invalida a consulta de protocolo quando o feedback muda.
+
+    Na criação, remove também um eventual cache negativo do protocolo.
     """
-    Registra automaticamente a primeira resposta para cálculo de SLA.
+    _invalidar_consulta_protocolo(instance.client_id, instance.protocolo)
+
+
+@receiver(post_delete, sender=FeedbackInteracao)
+@receiver(post_save, sender=FeedbackArquivo)
+@receiver(post_delete, sender=FeedbackArquivo)
+def invalidar_cache_consulta_relacionados(sender, instance, **kwargs):
+    """Invalida a consulta de protocolo quando interações/arquivos mudam."""
+    try:
+        feedback = instance.feedback
+    except Feedback.DoesNotExist:
+        return
+    _invalidar_consulta_protocolo(feedback.client_id, feedback.protocolo)
+
+
+# =============================================================================
+# SIGNAL: Nova Interação - Evento consolidado (apps.feedbacks.interactions)
+# =============================================================================
+
 
-    Quando uma interação de resposta é criada (por membro da equipe),
-    e o feedback ainda não tem primeira resposta registrada,
-    calcula o tempo de primeira resposta e verifica SLA.
+@receiver(post_save, sender=FeedbackInteracao)
+def processar_interacao_salva(sender, instance, created, **kwargs):
+    """
+    Interações gravadas fora de registrar_interacao (admin, automações,
+    responder-protocolo).
 
-    **SLA Padrão:** 24 horas para primeira resposta
+    Invalida os caches já na transação; na criação, registra a primeira
+    resposta da equipe para o SLA e envia o mesmo evento interacao_registrada.
     """
-    if not created:
+    if getattr(instance, "_evento_consolidado", False):
+        return  # registrar_interacao já gravou o SLA e agendou o evento
+
+    try:
+        feedback = instance.feedback
+    except Feedback.DoesNotExist:
         return
 
-    feedback = instance.feedback
+    _invalidar_consulta_protocolo(feedback.client_id, feedback.protocolo)
+    bump_resource_version("feedbacks", instance.client_id)
+    if not created:
+        return
 
-    # Só processa se for resposta de membro da equipe (não do cliente)
-    # e se ainda não tem primeira resposta registrada
-    if instance.autor and feedback.data_primeira_resposta is None:
+    # Só resposta de membro da equipe (não do denunciante) conta para o SLA
+    primeira_resposta = bool(
+        instance.autor_id and feedback.data_primeira_resposta is None
+    )
+    if primeira_resposta:
         try:
-            # Registra primeira resposta (calcula SLA automaticamente)
             feedback.registrar_primeira_resposta()
-            feedback.save(
-                update_fields=[
-                    "data_primeira_resposta",
-                    "tempo_primeira_resposta",
-                    "sla_primeira_resposta",
-                ]
-            )
-
-            sla_status = "✅ dentro" if feedback.sla_primeira_resposta else "❌ fora"
-            logger.info(
-                f"📊 SLA Primeira Resposta: {feedback.protocolo} | "
-                f"Tempo: {feedback.tempo_primeira_resposta} | "
-                f"Status: {sla_status} do SLA"
-            )
         except Exception as e:
+            primeira_resposta = False
             logger.error(
                 f"❌ Erro ao registrar SLA primeira resposta: {str(e)}", exc_info=True
             )
 
+    emitir_interacao_registrada(feedback, instance, primeira_resposta=primeira_resposta)
+
+
+@receiver(interacao_registrada)
+def aplicar_efeitos_interacao(
+    sender, feedback, interacao, status_anterior=None, primeira_resposta=False, **kwargs
+):
+    """
+    Efeitos de uma nova interação, uma única vez após o commit.
+
+    - Consulta de protocolo em cache e ETag do detalhe
+    - SLA de primeira resposta (log)
+    - Mudança de status: contadores do dashboard, busca, e-mail e webhook
+    - Notificação de resposta
+    """
+    from .protocol_cache import invalidate_consulta
+
+    tenant_id = feedback.client_id
+    invalidate_consulta(tenant_id, feedback.protocolo)
+    bump_resource_version("feedbacks", tenant_id)
+
+    if primeira_resposta:
+        sla_status = "✅ dentro" if feedback.sla_primeira_resposta else "❌ fora"
+        logger.info(
+            f"📊 SLA Primeira Resposta: {feedback.protocolo} | "
+            f"Tempo: {feedback.tempo_primeira_resposta} | "
+            f"Status: {sla_status} do SLA"
+        )
+
+    if status_anterior:
+        from .stats_counters import TRACKED_FIELDS, feedback_deltas, get_stats_counters
+
+        atual = {name: getattr(feedback, name) for name in TRACKED_FIELDS}
+        deltas = feedback_deltas(
+            {**atual, "status": status_anterior}, atual, feedback.data_criacao
+        )
+        if deltas:
+            get_stats_counters().apply(tenant_id, deltas)
+
+    if status_anterior or primeira_resposta:
+        # Mesmo efeito do post_save de Feedback (linha do feedback alterada)
+        from apps.core.search_cache import bump_search_version
+
+        if getattr(settings, "SEARCH_REALTIME_INDEXING", False):
+            from apps.core.search_queue import SearchIndexQueue
+
+            SearchIndexQueue().enqueue(feedback.pk)
+        bump_search_version(tenant_id)
+
+    if status_anterior:
+        _notificar_status(feedback, status_anterior)
+
+    _notificar_resposta(feedback, interacao.mensagem)
+
+
+# =============================================================================
+# OPERAÇÕES EM LOTE - Efeitos coalescidos (apps.feedbacks.bulk)
+# =============================================================================
+
+
+@receiver(feedbacks_atualizados_em_lote)
+def aplicar_efeitos_lote(
+    sender, tenant, user, feedbacks, anteriores, assigned_to, tags_alteradas, **kwargs
+):
+    """
+    Efeitos de um lote, uma única vez após o commit.
+
+    - Consultas de protocolo em cache (um delete_many) e ETags
+    - Contadores do dashboard: soma dos deltas de todos os feedbacks
+    - Busca: reindexação coalescida e uma nova versão do cache
+    - Uma task com os e-mails de mudança de status (IDs e status anteriores)
+    - Um e-mail ao membro atribuído com todos os feedbacks
+    """
+    from apps.core.search_cache import bump_search_version
+
+    from .protocol_cache import invalidate_consultas
+    from .stats_counters import TRACKED_FIELDS, feedback_deltas, get_stats_counters
+
+    invalidate_consultas(tenant.pk, [feedback.protocolo for feedback in feedbacks])
+    bump_resource_version("feedbacks", tenant.pk)
+    if tags_alteradas:
+        bump_resource_version("tags", tenant.pk)
+
+    deltas = Counter()
+    for feedback in feedbacks:
+        if feedback.pk in anteriores:
+            atual = {name: getattr(feedback, name) for name in TRACKED_FIELDS}
+            deltas.update(
+                feedback_deltas(anteriores[feedback.pk], atual, feedback.data_criacao)
+            )
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        get_stats_counters().apply(tenant.pk, deltas)
+
+    if getattr(settings, "SEARCH_REALTIME_INDEXING", False):
+        from apps.core.search_queue import SearchIndexQueue
+
+        queue = SearchIndexQueue()
+        for feedback in feedbacks:
+            queue.enqueue(feedback.pk)
+    bump_search_version(tenant.pk)
+
+    mudancas = [
+        [feedback.pk, anteriores[feedback.pk]["status"]]
+        for feedback in feedbacks
+        if feedback.pk in anteriores
+        and anteriores[feedback.pk]["status"] != feedback.status
+    ]
+    if mudancas:
+        from .tasks import send_bulk_status_update_emails
+
+        send_bulk_status_update_emails.delay(mudancas)
+
+    if assigned_to is not None:
+        from .tasks import send_bulk_assignment_email
+
+        atribuidos = [
+            feedback.pk
+            for feedback in feedbacks
+            if feedback.assigned_to_id == assigned_to.pk
+        ]
+        send_bulk_assignment_email.delay(atribuidos, assigned_to.pk, user.pk)
+
 
 # =============================================================================
 # SIGNAL: SLA Tracking - Resolução
@@ -375,3 +598,49 @@ def registrar_resolucao_sla(sender, instance, **kwargs):
             )
         except Exception as e:
             logger.error(f"❌ Erro ao registrar SLA resolução: {str(e)}", exc_info=True)
+
+
+@receiver(post_save, sender=ResponseTemplate)
+@receiver(post_delete, sender=ResponseTemplate)
+def invalidar_cache_templates(sender, instance, **kwargs):
+    """Template criado/alterado/removido: invalida as listas do tenant."""
+    from .views import response_templates_cache
+
+    response_templates_cache.invalidate(scope=instance.client_id)
+    bump_resource_version("response_templates", instance.client_id)
+
+
+# =============================================================================
+# GET CONDICIONAL - Versões dos ETags (apps.core.conditional)
+# =============================================================================
+
+
+@receiver(post_delete, sender=FeedbackInteracao)
+@receiver(post_save, sender=FeedbackArquivo)
+@receiver(post_delete, sender=FeedbackArquivo)
+def invalidar_etag_detalhe_feedback(sender, instance, **kwargs):
+    """Interações/arquivos não alteram data_atualizacao do feedback."""
+    bump_resource_version("feedbacks", instance.client_id)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidar_etag_tags(sender, instance, **kwargs):
+    """Tags exibidas na listagem e no detalhe dos feedbacks."""
+    bump_resource_version("tags", instance.client_id)
+    bump_resource_version("feedbacks", instance.client_id)
+
+
+@receiver(m2m_changed, sender=Feedback.tags.through)
+def invalidar_etag_vinculos_tags(sender, instance, action, **kwargs):
+    """Vínculo feedback-tag alterado: muda feedback_count e o detalhe."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    bump_resource_version("tags", instance.client_id)
+    bump_resource_version("feedbacks", instance.client_id)
+
+
+@receiver(post_delete, sender=Feedback)
+def invalidar_etag_contagem_tags(sender, instance, **kwargs):
+    """Feedback removido: os vínculos somem sem m2m_changed."""
+    bump_resource_version("tags", instance.client_id)
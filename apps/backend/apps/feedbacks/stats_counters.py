@@ -0,0 +1,319 @@
+"""
+Contadores incrementais de feedbacks por tenant (dashboard e analytics)
+
+Criação, mudança de status/tipo/prioridade e remoção de feedbacks aplicam
+deltas a um hash no Redis (HINCRBY atômico via script Lua, somente se o hash
+já existir). A reconciliação periódica (apps.core.tasks.update_analytics_cache)
+refaz o hash a partir do banco: corrige desvios de alterações feitas sem
+signals (queryset.update) e descarta buckets antigos.
+
+Campos do hash:
+    total, status:<s>, tipo:<t>, prioridade:<p>   totais do tenant
+    hora:<AAAAMMDDHH>                              criados por hora (últimas 24h)
+    dia:<AAAA-MM-DD>:total, dia:<data>:<campo>:<v> por dia de criação (90 dias)
+
+Sem Redis (testes/desenvolvimento ou cache local por processo) o hash é um
+dict no cache do Django, atualizado sob lock do processo. Cada worker só vê
+os próprios deltas, então o dict expira em LOCAL_TTL e é refeito do banco na
+leitura seguinte (mesma defasagem máxima do snapshot de 5 minutos).
+"""
+
+import logging
+import threading
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from apps.core.redis_utils import get_redis_client, redis_key
+
+logger = logging.getLogger(__name__)
+
+KEY_TEMPLATE = "feedback_stats:tenant:{tenant_id}"
+
+# Campos do Feedback mantidos por delta
+TRACKED_FIELDS = ("status", "tipo", "prioridade")
+
+# Maior período do endpoint analytics (90 dias + dia parcial de início)
+# e janela do KPI "hoje"
+DAYS_KEPT = 91
+HOURS_KEPT = 24
+
+DEFAULT_TTL = 60 * 60 * 24
+# Sem Redis compartilhado: validade do dict de cada processo
+LOCAL_TTL = 60 * 5
+
+# KEYS[1] = hash do tenant; ARGV = campo1, delta1, campo2, delta2...
+APPLY_DELTAS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+
+def counters_key(tenant_id: int) -> str:
+    return KEY_TEMPLATE.format(tenant_id=tenant_id)
+
+
+def _hour_field(moment) -> str:
+    return f"hora:{timezone.localtime(moment):%Y%m%d%H}"
+
+
+def feedback_fields(dimensions: Dict[str, str], data_criacao) -> List[str]:
+    """Campos do hash que um feedback incrementa"""
+    day = timezone.localdate(data_criacao).isoformat()
+    fields = ["total", f"dia:{day}:total", _hour_field(data_criacao)]
+    for name in TRACKED_FIELDS:
+        fields.append(f"{name}:{dimensions[name]}")
+        fields.append(f"dia:{day}:{name}:{dimensions[name]}")
+    return fields
+
+
+def feedback_deltas(
+    old: Optional[Dict[str, str]], new: Optional[Dict[str, str]], data_criacao
+) -> Dict[str, int]:
+    """
+    Deltas de uma alteração (old=None: criação; new=None: remoção)
+
+    Campos que não mudaram se anulam; o resultado contém só deltas != 0.
+    """
+    deltas: Counter = Counter()
+    if old:
+        deltas.subtract(feedback_fields(old, data_criacao))
+    if new:
+        deltas.update(feedback_fields(new, data_criacao))
+    return {field: delta for field, delta in deltas.items() if delta}
+
+
+class FeedbackStatsCounters:
+    """
+    Armazenamento dos contadores por tenant (hash Redis ou dict no cache)
+
+    Usage:
+        store = get_stats_counters()
+        store.apply(tenant_id, {"total": 1, "status:pendente": 1})
+        counters = store.read(tenant_id)  # None se ainda não reconciliado
+    """
+
+    def __init__(self, alias: str = "default"):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self._client: Any = None
+        self._script: Any = None
+        self._resolved = False
+
+    def _get_client(self):
+        if not self._resolved:
+            self._client = get_redis_client(self.alias)
+            if self._client is not None:
+                self._script = self._client.register_script(APPLY_DELTAS_SCRIPT)
+            self._resolved = True
+        return self._client
+
+    def _ttl(self) -> int:
+        ttl = getattr(settings, "FEEDBACK_STATS_TTL", DEFAULT_TTL)
+        if self._get_client() is None:
+            return min(ttl, LOCAL_TTL)
+        return ttl
+
+    def apply(self, tenant_id: int, deltas: Dict[str, int]) -> None:
+        """Aplica deltas atomicamente (ignorado se o hash não existir)"""
+        if not deltas:
+            return
+
+        key = counters_key(tenant_id)
+        if self._get_client() is not None:
+            args: List[Any] = []
+            for field, delta in deltas.items():
+                args.extend([field, delta])
+            try:
+                self._script(keys=[redis_key(key, self.alias)], args=args)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao aplicar deltas de estatísticas: {e}")
+            return
+
+        with self._lock:
+            counters = cache.get(key)
+            if counters is None:
+                return
+            for field, delta in deltas.items():
+                counters[field] = counters.get(field, 0) + delta
+            cache.set(key, counters, timeout=self._ttl())
+
+    def read(self, tenant_id: int) -> Optional[Dict[str, int]]:
+        """Contadores do tenant ou None se o hash não existir"""
+        key = counters_key(tenant_id)
+        client = self._get_client()
+        if client is None:
+            return cache.get(key)
+
+        try:
+            raw = client.hgetall(redis_key(key, self.alias))
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao ler estatísticas do Redis: {e}")
+            return None
+        if not raw:
+            return None
+        return {
+            (field.decode() if isinstance(field, bytes) else field): int(value)
+            for field, value in raw.items()
+        }
+
+    def replace(self, tenant_id: int, counters: Dict[str, int]) -> None:
+        """Substitui o hash inteiro (reconciliação)"""
+        key = counters_key(tenant_id)
+        # Campo sempre presente: o hash existe mesmo para tenant sem feedbacks
+        counters = {"total": 0, **counters}
+        client = self._get_client()
+        if client is None:
+            with self._lock:
+                cache.set(key, counters, timeout=self._ttl())
+            return
+
+        full_key = redis_key(key, self.alias)
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.delete(full_key)
+            pipe.hset(full_key, mapping=counters)
+            pipe.expire(full_key, self._ttl())
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar estatísticas no Redis: {e}")
+
+
+_stats_counters: Optional[FeedbackStatsCounters] = None
+
+
+def get_stats_counters() -> FeedbackStatsCounters:
+    """Armazenamento compartilhado do processo (script Lua registrado uma vez)"""
+    global _stats_counters
+    if _stats_counters is None:
+        _stats_counters = FeedbackStatsCounters()
+    return _stats_counters
+
+
+def build_counters(tenant_id: int) -> Dict[str, int]:
+    """Calcula todos os contadores do tenant a partir do banco (3 queries)"""
+    from .models import Feedback
+
+    queryset = Feedback.objects.all_tenants().filter(client_id=tenant_id)
+    now = timezone.now()
+    counters: Counter = Counter()
+
+    for row in queryset.values(*TRACKED_FIELDS).annotate(n=Count("id")):
+        counters["total"] += row["n"]
+        for name in TRACKED_FIELDS:
+            counters[f"{name}:{row[name]}"] += row["n"]
+
+    first_day = timezone.localdate(now) - timedelta(days=DAYS_KEPT - 1)
+    daily = (
+        queryset.filter(data_criacao__date__gte=first_day)
+        .annotate(dia=TruncDate("data_criacao"))
+        .values("dia", *TRACKED_FIELDS)
+        .annotate(n=Count("id"))
+    )
+    for row in daily:
+        day = row["dia"].isoformat()
+        counters[f"dia:{day}:total"] += row["n"]
+        for name in TRACKED_FIELDS:
+            counters[f"dia:{day}:{name}:{row[name]}"] += row["n"]
+
+    first_hour = (now - timedelta(hours=HOURS_KEPT)).replace(
+        minute=0, second=0, microsecond=0
+    )
+    hourly = (
+        queryset.filter(data_criacao__gte=first_hour)
+        .annotate(hora=TruncHour("data_criacao"))
+        .values("hora")
+        .annotate(n=Count("id"))
+    )
+    for row in hourly:
+        counters[_hour_field(row["hora"])] += row["n"]
+
+    return dict(counters)
+
+
+def reconcile(tenant_id: int) -> Dict[str, int]:
+    """Refaz os contadores do tenant a partir do banco"""
+    counters = build_counters(tenant_id)
+    get_stats_counters().replace(tenant_id, counters)
+    logger.debug(f"📊 Estatísticas reconciliadas | Tenant: {tenant_id}")
+    return counters
+
+
+def get_counters(tenant_id: int) -> Tuple[Dict[str, int], bool]:
+    """
+    Contadores do tenant, reconciliando na primeira leitura
+
+    Returns:
+        (counters, rebuilt): rebuilt indica que o banco foi consultado
+    """
+    counters = get_stats_counters().read(tenant_id)
+    if counters is not None:
+        return counters, False
+    return reconcile(tenant_id), True
+
+
+def dashboard_kpis(counters: Dict[str, int]) -> Dict[str, Any]:
+    """KPIs do dashboard (hoje = criados nas últimas 24 horas cheias)"""
+    now = timezone.now()
+    hours = {_hour_field(now - timedelta(hours=h)) for h in range(HOURS_KEPT)}
+
+    total = counters.get("total", 0)
+    resolvidos = counters.get("status:resolvido", 0)
+    return {
+        "total": total,
+        "pendentes": counters.get("status:pendente", 0),
+        "resolvidos": resolvidos,
+        "hoje": sum(counters.get(field, 0) for field in hours),
+        "taxa_resolucao": f"{(resolvidos / total * 100):.1f}%" if total > 0 else "0%",
+    }
+
+
+def period_counts(counters: Dict[str, int], periodo_dias: int) -> Dict[str, Any]:
+    """
+    Contagens do endpoint analytics para feedbacks criados no período
+
+    Granularidade diária: inclui o dia inteiro em que o período começa.
+    """
+    first_day = timezone.localdate() - timedelta(days=periodo_dias)
+    days = {
+        (first_day + timedelta(days=offset)).isoformat()
+        for offset in range(periodo_dias + 1)
+    }
+
+    por_campo: Dict[str, Counter] = {name: Counter() for name in TRACKED_FIELDS}
+    total = 0
+    for field, value in counters.items():
+        if not field.startswith("dia:") or not value:
+            continue
+        parts = field.split(":", 3)
+        if parts[1] not in days:
+            continue
+        if parts[2] == "total":
+            total += value
+        else:
+            por_campo[parts[2]][parts[3]] += value
+
+    por_status = por_campo["status"]
+    return {
+        "resumo": {
+            "total": total,
+            "resolvidos": por_status["resolvido"],
+            "pendentes": por_status["pendente"],
+            "em_andamento": por_status["em_andamento"],
+            "novos": por_status["novo"],
+        },
+        "por_prioridade": {k: v for k, v in por_campo["prioridade"].items() if v},
+        "por_tipo": {k: v for k, v in por_campo["tipo"].items() if v},
+        "por_status": {k: v for k, v in por_status.items() if v},
+    }
@@ -3,6 +3,8 @@ Celery tasks para envio de emails relacionados a feedbacks.
 
 Tasks disponíveis:
 - send_assignment_email: Notifica team member quando feedback é atribuído
+- send_bulk_assignment_email: Um email por atribuição em lote (vários feedbacks)
+- send_bulk_status_update_emails: Emails de mudança de status de um lote
 - send_new_feedback_email: Notifica admins quando novo feedback é criado
 """
 
@@ -105,6 +107,137 @@ Ouvify - Gestão de Feedbacks
         raise self.retry(exc=exc, countdown=60 * (2**self.request.retries))
 
 
+@shared_task(bind=True, max_retries=3)
+def send_bulk_assignment_email(
+    self, feedback_ids: list, team_member_id: int, assigned_by_id: int = None
+):
+    """
+    Envia um único email ao team member com os feedbacks atribuídos em lote.
+
+    Args:
+        feedback_ids: IDs dos feedbacks atribuídos
+        team_member_id: ID do TeamMember que recebeu atribuição
+        assigned_by_id: ID do usuário que fez a atribuição
+
+    Returns:
+        dict: Status do envio
+    """
+    from django.contrib.auth import get_user_model
+
+    from apps.feedbacks.models import Feedback
+    from apps.tenants.models import TeamMember
+
+    try:
+        team_member = TeamMember.objects.select_related("user", "client").get(
+            id=team_member_id
+        )
+
+        if (
+            hasattr(team_member, "email_notifications")
+            and not team_member.email_notifications
+        ):
+            logger.info(f"📧 Email notifications disabled for {team_member.user.email}")
+            return {"status": "skipped", "reason": "notifications_disabled"}
+
+        feedbacks = list(
+            Feedback.objects.all_tenants()
+            .filter(id__in=feedback_ids, client=team_member.client)
+            .only("id", "protocolo", "titulo")
+            .order_by("id")
+        )
+        if not feedbacks:
+            return {"status": "skipped", "reason": "no_feedbacks"}
+
+        assigned_by = (
+            get_user_model().objects.filter(id=assigned_by_id).first()
+            if assigned_by_id
+            else None
+        )
+        client = team_member.client
+        dashboard_url = f"https://{client.subdominio}.ouvify.com/dashboard/feedbacks"
+        linhas = "\n".join(
+            f"- {feedback.protocolo} - {feedback.titulo}" for feedback in feedbacks
+        )
+
+        text_message = f"""
+Olá {team_member.user.first_name},
+
+{len(feedbacks)} feedbacks foram atribuídos para você no {client.nome}.
+
+{linhas}
+
+Atribuído por: {assigned_by.get_full_name() if assigned_by else 'Sistema'}
+
+Acesse: {dashboard_url}
+
+---
+Ouvify - Gestão de Feedbacks
+        """.strip()
+
+        result = send_mail(
+            subject=f"[{client.nome}] {len(feedbacks)} feedbacks atribuídos",
+            message=text_message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[team_member.user.email],
+            fail_silently=False,
+        )
+
+        logger.info(
+            f"✅ Email de atribuição em lote enviado para {team_member.user.email} | "
+            f"Feedbacks: {len(feedbacks)}"
+        )
+
+        return {
+            "status": "sent",
+            "email": team_member.user.email,
+            "feedbacks": len(feedbacks),
+            "result": result,
+        }
+
+    except Exception as exc:
+        logger.error(f"❌ Erro ao enviar email de atribuição em lote: {exc}")
+        raise self.retry(exc=exc, countdown=60 * (2**self.request.retries))
+
+
+@shared_task
+def send_bulk_status_update_emails(mudancas: list):
+    """
+    Envia os emails de mudança de status de uma atualização em lote.
+
+    Mesmo email e rate limit (1 por feedback a cada 5 min) do fluxo
+    individual; o webhook do lote é enviado à parte.
+
+    Args:
+        mudancas: Pares [feedback_id, status_anterior]
+
+    Returns:
+        dict: Quantidade de feedbacks notificados
+    """
+    from django.core.cache import cache
+
+    from apps.core.services import EmailService
+    from apps.feedbacks.models import Feedback
+
+    anteriores = dict(mudancas)
+    feedbacks = (
+        Feedback.objects.all_tenants()
+        .select_related("client")
+        .filter(id__in=anteriores)
+        .order_by("id")
+    )
+    enviados = 0
+    for feedback in feedbacks:
+        cache_key = f"status_notification_{feedback.pk}"
+        if cache.get(cache_key):
+            continue
+        EmailService.send_feedback_status_update(feedback, anteriores[feedback.pk])
+        cache.set(cache_key, True, 300)
+        enviados += 1
+
+    logger.info(f"✅ Notificações de status do lote enviadas | Feedbacks: {enviados}")
+    return {"status": "sent", "feedbacks": enviados}
+
+
 @shared_task(bind=True, max_retries=3)
 def send_new_feedback_email(self, feedback_id: int):
     """
@@ -212,5 +345,5 @@ def cleanup_old_archived_feedbacks():
         old_feedbacks.delete()
         logger.info(f"🗑️ [LGPD] {count} feedbacks arquivados há 2+ anos deletados")
         return {"deleted": count}
-    
+
     return {"deleted": 0}
@@ -0,0 +1,312 @@
+"""
+Testes das operações em lote (POST /api/feedbacks/bulk/, apps.feedbacks.bulk)
+Cobertura: resultado por ID, queries constantes no tamanho do lote, SLA no
+próprio UPDATE, atribuição/tags, validação por tenant e efeitos coalescidos
+(um webhook, um e-mail, uma task de notificação de status, deltas somados)
+após o commit
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.feedbacks import stats_counters
+from apps.feedbacks import tasks as feedback_tasks
+from apps.feedbacks.bulk import feedbacks_atualizados_em_lote
+from apps.feedbacks.constants import FeedbackStatus, InteracaoTipo
+from apps.feedbacks.models import Feedback, FeedbackInteracao, Tag
+from apps.feedbacks.tasks import send_bulk_status_update_emails
+from apps.tenants.models import TeamMember
+
+pytestmark = pytest.mark.django_db
+
+BULK_URL = "/api/feedbacks/bulk/"
+
+
+@pytest.fixture
+def tenant(authenticated_user):
+    return authenticated_user[1]
+
+
+@pytest.fixture
+def make_feedbacks(tenant, feedback_factory):
+    def make(total, **kwargs):
+        kwargs.setdefault("status", FeedbackStatus.PENDENTE)
+        return [feedback_factory(client=tenant, **kwargs) for _ in range(total)]
+
+    return make
+
+
+@pytest.fixture
+def moderator(tenant, user_factory):
+    return TeamMember.objects.create(
+        user=user_factory(email="moderador@tenant.com"),
+        client=tenant,
+        role=TeamMember.MODERATOR,
+        status=TeamMember.ACTIVE,
+    )
+
+
+@pytest.fixture
+def events():
+    received = []
+
+    def listener(sender, **kwargs):
+        received.append(kwargs)
+
+    feedbacks_atualizados_em_lote.connect(listener)
+    yield received
+    feedbacks_atualizados_em_lote.disconnect(listener)
+
+
+def post_bulk(client, payload, on_commit=None):
+    if on_commit is None:
+        return client.post(BULK_URL, payload, format="json")
+    with on_commit(execute=True):
+        return client.post(BULK_URL, payload, format="json")
+
+
+class TestBulkStatus:
+    def test_per_id_results_and_interactions(
+        self, authenticated_api_client, make_feedbacks, feedback_factory, tenant_factory
+    ):
+        pendentes = make_feedbacks(2)
+        (em_analise,) = make_feedbacks(1, status=FeedbackStatus.EM_ANALISE)
+        outro_tenant = feedback_factory(
+            client=tenant_factory(nome="Outra", subdominio="outra")
+        )
+        ids = [f.pk for f in pendentes] + [em_analise.pk, outro_tenant.pk, 999999]
+
+        response = post_bulk(
+            authenticated_api_client,
+            {"ids": ids, "status": FeedbackStatus.EM_ANALISE},
+        )
+
+        assert response.status_code == 200
+        assert [item["result"] for item in response.data["results"]] == [
+            "updated",
+            "updated",
+            "unchanged",
+            "not_found",
+            "not_found",
+        ]
+        assert response.data["results"][0]["changes"] == ["status"]
+        assert (response.data["updated"], response.data["not_found"]) == (2, 2)
+        assert (
+            Feedback.objects.all_tenants().get(pk=outro_tenant.pk).status
+            != FeedbackStatus.EM_ANALISE
+        )
+        interacoes = FeedbackInteracao.objects.all_tenants().filter(
+            tipo=InteracaoTipo.MUDANCA_STATUS
+        )
+        assert sorted(interacoes.values_list("feedback_id", flat=True)) == sorted(
+            f.pk for f in pendentes
+        )
+
+    def test_sla_computed_per_row_in_update(
+        self, authenticated_api_client, make_feedbacks
+    ):
+        recente, antigo = make_feedbacks(2)
+        Feedback.objects.all_tenants().filter(pk=antigo.pk).update(
+            data_criacao=timezone.now() - timedelta(days=4)
+        )
+
+        post_bulk(
+            authenticated_api_client,
+            {"ids": [recente.pk, antigo.pk], "status": FeedbackStatus.RESOLVIDO},
+        )
+
+        recente.refresh_from_db()
+        antigo.refresh_from_db()
+        assert recente.data_primeira_resposta is not None
+        assert (recente.sla_primeira_resposta, recente.sla_resolucao) == (True, True)
+        assert (antigo.sla_primeira_resposta, antigo.sla_resolucao) == (False, False)
+        assert antigo.tempo_resolucao >= timedelta(days=4)
+        assert antigo.data_resolucao == antigo.data_primeira_resposta
+
+    def test_queries_do_not_grow_with_batch_size(
+        self, authenticated_api_client, make_feedbacks, moderator
+    ):
+        tag = Tag.objects.create(client=moderator.client, nome="Triagem")
+
+        def run(feedbacks, status):
+            with CaptureQueriesContext(connection) as captured:
+                response = post_bulk(
+                    authenticated_api_client,
+                    {
+                        "ids": [f.pk for f in feedbacks],
+                        "status": status,
+                        "prioridade": "alta",
+                        "assigned_to": moderator.pk,
+                        "add_tags": [tag.pk],
+                    },
+                )
+            assert response.data["updated"] == len(feedbacks)
+            return len(captured)
+
+        small = run(make_feedbacks(3), FeedbackStatus.EM_ANALISE)
+        large = run(make_feedbacks(30), FeedbackStatus.EM_ANALISE)
+
+        assert small == large
+
+
+class TestBulkAssignmentAndTags:
+    def test_assign_sends_single_email(
+        self,
+        authenticated_api_client,
+        authenticated_user,
+        make_feedbacks,
+        moderator,
+        django_capture_on_commit_callbacks,
+    ):
+        feedbacks = make_feedbacks(3)
+
+        response = post_bulk(
+            authenticated_api_client,
+            {"ids": [f.pk for f in feedbacks], "assigned_to": moderator.pk},
+            on_commit=django_capture_on_commit_callbacks,
+        )
+
+        assert response.data["updated"] == 3
+        atribuidos = Feedback.objects.all_tenants().filter(assigned_to=moderator)
+        assert atribuidos.count() == 3
+        feedback_tasks.send_bulk_assignment_email.delay.assert_called_once_with(
+            [f.pk for f in feedbacks], moderator.pk, authenticated_user[0].pk
+        )
+
+        response = post_bulk(
+            authenticated_api_client,
+            {"ids": [feedbacks[0].pk], "assigned_to": None},
+        )
+        assert response.data["results"][0]["changes"] == ["assigned_to"]
+        assert atribuidos.count() == 2
+
+    def test_add_and_remove_tags(
+        self, authenticated_api_client, tenant, make_feedbacks
+    ):
+        com_tag, sem_tag = make_feedbacks(2)
+        antiga = Tag.objects.create(client=tenant, nome="Antiga")
+        nova = Tag.objects.create(client=tenant, nome="Nova")
+        com_tag.tags.add(antiga, nova)
+
+        response = post_bulk(
+            authenticated_api_client,
+            {
+                "ids": [com_tag.pk, sem_tag.pk],
+                "add_tags": [nova.pk],
+                "remove_tags": [antiga.pk],
+            },
+        )
+
+        assert [item["changes"] for item in response.data["results"]] == [
+            ["tags"],
+            ["tags"],
+        ]
+        for feedback in (com_tag, sem_tag):
+            tags = Tag.objects.all_tenants().filter(feedbacks=feedback)
+            assert list(tags) == [nova]
+
+    def test_other_tenant_tag_rejects_whole_batch(
+        self, authenticated_api_client, make_feedbacks, tenant_factory
+    ):
+        (feedback,) = make_feedbacks(1)
+        outra = tenant_factory(nome="Outra", subdominio="outra")
+        tag = Tag.objects.create(client=outra, nome="Alheia")
+
+        response = post_bulk(
+            authenticated_api_client,
+            {"ids": [feedback.pk], "status": "resolvido", "add_tags": [tag.pk]},
+        )
+
+        assert response.status_code == 400
+        feedback.refresh_from_db()
+        assert feedback.status == FeedbackStatus.PENDENTE
+
+
+class TestBulkValidation:
+    def test_requires_an_operation(self, authenticated_api_client):
+        response = post_bulk(authenticated_api_client, {"ids": [1]})
+
+        assert response.status_code == 400
+
+    def test_limits_batch_size(self, authenticated_api_client, settings):
+        settings.FEEDBACK_BULK_MAX_IDS = 2
+
+        response = post_bulk(
+            authenticated_api_client, {"ids": [1, 2, 3], "prioridade": "alta"}
+        )
+
+        assert response.status_code == 400
+        assert "ids" in response.data
+
+
+class TestCoalescedEffects:
+    def test_one_event_one_webhook_summed_deltas(
+        self,
+        authenticated_api_client,
+        make_feedbacks,
+        events,
+        django_capture_on_commit_callbacks,
+    ):
+        feedbacks = make_feedbacks(4)
+
+        with (
+            patch.object(stats_counters, "get_stats_counters") as counters,
+            patch("apps.webhooks.signals.trigger_feedbacks_bulk_updated") as webhook,
+        ):
+            post_bulk(
+                authenticated_api_client,
+                {"ids": [f.pk for f in feedbacks], "status": "em_analise"},
+                on_commit=django_capture_on_commit_callbacks,
+            )
+
+        assert len(events) == 1
+        assert events[0]["anteriores"][feedbacks[0].pk]["status"] == "pendente"
+        webhook.assert_called_once()
+        assert len(webhook.call_args.args[1]) == 4
+        counters.return_value.apply.assert_called_once()
+        deltas = counters.return_value.apply.call_args.args[1]
+        assert deltas["status:pendente"] == -4
+        assert deltas["status:em_analise"] == 4
+        assert "total" not in deltas
+
+    def test_status_changes_queue_one_notification_task(
+        self,
+        authenticated_api_client,
+        make_feedbacks,
+        django_capture_on_commit_callbacks,
+    ):
+        pendentes = make_feedbacks(2)
+        (em_analise,) = make_feedbacks(1, status=FeedbackStatus.EM_ANALISE)
+
+        post_bulk(
+            authenticated_api_client,
+            {
+                "ids": [f.pk for f in [*pendentes, em_analise]],
+                "status": FeedbackStatus.EM_ANALISE,
+            },
+            on_commit=django_capture_on_commit_callbacks,
+        )
+
+        feedback_tasks.send_bulk_status_update_emails.delay.assert_called_once_with(
+            [[f.pk, FeedbackStatus.PENDENTE] for f in pendentes]
+        )
+
+    def test_notification_task_emails_each_feedback_once(self, make_feedbacks):
+        feedbacks = make_feedbacks(2, status=FeedbackStatus.EM_ANALISE)
+        mudancas = [[f.pk, FeedbackStatus.PENDENTE] for f in feedbacks]
+
+        with patch(
+            "apps.core.services.EmailService.send_feedback_status_update"
+        ) as email:
+            assert send_bulk_status_update_emails(mudancas)["feedbacks"] == 2
+            # Rate limit compartilhado com o fluxo individual
+            assert send_bulk_status_update_emails(mudancas)["feedbacks"] == 0
+
+        assert [call.args for call in email.call_args_list] == [
+            (feedback, FeedbackStatus.PENDENTE) for feedback in feedbacks
+        ]
@@ -0,0 +1,132 @@
+"""
+Testes de queries constantes no detalhe e na consulta pública de protocolo
+Os serializers devem ler apenas dados pré-carregados (Prefetch).
+"""
+
+import cloudinary
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.feedbacks.constants import InteracaoTipo
+from apps.feedbacks.models import FeedbackArquivo, FeedbackInteracao, Tag
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def cloudinary_config():
+    """url_publica dos arquivos exige cloud_name configurado"""
+    previous = cloudinary.config().cloud_name
+    cloudinary.config(cloud_name="test")
+    yield
+    cloudinary.config(cloud_name=previous)
+
+
+def add_history(feedback, user, total):
+    """Adiciona interações públicas/internas e arquivos públicos/internos"""
+    for i in range(total):
+        FeedbackInteracao.objects.create(
+            client=feedback.client,
+            feedback=feedback,
+            autor=user,
+            tipo=(
+                InteracaoTipo.MENSAGEM_PUBLICA if i % 2 else InteracaoTipo.NOTA_INTERNA
+            ),
+            mensagem=f"Mensagem {i}",
+        )
+        FeedbackArquivo.objects.create(
+            client=feedback.client,
+            feedback=feedback,
+            arquivo=f"ouvify/feedback_arquivos/arquivo_{i}",
+            nome_original=f"arquivo_{i}.pdf",
+            tipo_mime="application/pdf",
+            tamanho_bytes=1024,
+            enviado_por=user,
+            interno=bool(i % 2),
+        )
+
+
+def add_tags(feedback, user, total):
+    """Cria tags e as associa ao feedback (e a outro, para a contagem)"""
+    other = type(feedback).objects.create(
+        client=feedback.client, tipo="sugestao", titulo="Outro", descricao="x"
+    )
+    for i in range(total):
+        tag = Tag.objects.create(
+            client=feedback.client, nome=f"{feedback.pk}-tag-{i}", criado_por=user
+        )
+        feedback.tags.add(tag)
+        other.tags.add(tag)
+
+
+class TestFeedbackDetailQueries:
+    def test_detail_query_count_is_constant(
+        self, authenticated_api_client, authenticated_user, feedback_factory
+    ):
+        user, tenant = authenticated_user
+        small = feedback_factory(client=tenant)
+        large = feedback_factory(client=tenant)
+        add_history(small, user, 1)
+        add_history(large, user, 6)
+        add_tags(small, user, 1)
+        add_tags(large, user, 5)
+
+        with CaptureQueriesContext(connection) as small_ctx:
+            response = authenticated_api_client.get(f"/api/feedbacks/{small.id}/")
+        assert response.status_code == 200
+
+        with CaptureQueriesContext(connection) as large_ctx:
+            response = authenticated_api_client.get(f"/api/feedbacks/{large.id}/")
+        assert response.status_code == 200
+
+        assert len(large_ctx) == len(small_ctx)
+        assert len(response.data["interacoes"]) == 6
+        assert len(response.data["arquivos"]) == 6
+        assert len(response.data["tags"]) == 5
+        assert all(tag["feedback_count"] == 2 for tag in response.data["tags"])
+        datas = [i["data"] for i in response.data["interacoes"]]
+        assert datas == sorted(datas, reverse=True)
+
+
+class TestConsultaProtocoloQueries:
+    def consultar(self, api_client, feedback):
+        return api_client.get(
+            "/api/feedbacks/consultar-protocolo/",
+            {"protocolo": feedback.protocolo},
+            HTTP_X_TENANT_ID=str(feedback.client_id),
+        )
+
+    def test_consulta_query_count_is_constant(
+        self, api_client, authenticated_user, feedback_factory
+    ):
+        user, tenant = authenticated_user
+        small = feedback_factory(client=tenant)
+        large = feedback_factory(client=tenant)
+        add_history(small, user, 2)
+        add_history(large, user, 8)
+
+        with CaptureQueriesContext(connection) as small_ctx:
+            response = self.consultar(api_client, small)
+        assert response.status_code == 200
+
+        with CaptureQueriesContext(connection) as large_ctx:
+            response = self.consultar(api_client, large)
+        assert response.status_code == 200
+
+        assert len(large_ctx) == len(small_ctx)
+
+        # Apenas interações públicas e arquivos não internos
+        assert len(response.data["interacoes"]) == 4
+        assert len(response.data["arquivos"]) == 4
+        assert all(not a["interno"] for a in response.data["arquivos"])
+        datas = [i["data"] for i in response.data["interacoes"]]
+        assert datas == sorted(datas)
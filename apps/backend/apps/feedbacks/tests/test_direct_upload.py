@@ -0,0 +1,264 @@
+"""
+Testes do upload direto de anexos (apps.feedbacks.direct_upload)
+Cobertura: autorização assinada, envio ao substituto local, finalização com
+conferência de tamanho/MIME, chave gravada uma única vez, expiração, escopo
+de tenant e Cloudinary
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.feedbacks import direct_upload
+from apps.feedbacks.models import FeedbackArquivo
+
+pytestmark = pytest.mark.django_db
+
+PDF_BYTES = b"%PDF-1.4\n" + b"0" * 2000 + b"\n%%EOF\n"
+PNG_BYTES = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01"
+    b"\x08\x06\x00\x00\x00\x1f\x15\xc4\x89" + b"\x00" * 100
+)
+
+
+@pytest.fixture(autouse=True)
+def local_backend(settings, tmp_path):
+    settings.DIRECT_UPLOAD_BACKEND = "local"
+    settings.DIRECT_UPLOAD_LOCAL_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def pro_tenant(authenticated_user):
+    _, tenant = authenticated_user
+    tenant.plano = "pro"
+    tenant.save()
+    return tenant
+
+
+def request_upload(client, feedback, content=PDF_BYTES, **overrides):
+    body = {
+        "nome_original": "evidencia.pdf",
+        "tipo_mime": "application/pdf",
+        "tamanho_bytes": len(content),
+        **overrides,
+    }
+    return client.post(
+        f"/api/feedbacks/{feedback.id}/solicitar-upload/", body, format="json"
+    )
+
+
+def put_file(client, upload, content, mime="application/pdf"):
+    return client.generic("PUT", upload["url"], content, content_type=mime)
+
+
+def finalize(client, feedback, token):
+    return client.post(
+        f"/api/feedbacks/{feedback.id}/finalizar-upload/",
+        {"token": token},
+        format="json",
+    )
+
+
+class TestDirectUploadFlow:
+    def test_issue_upload_then_finalize(
+        self, authenticated_api_client, authenticated_user, pro_tenant, feedback_factory
+    ):
+        user, _ = authenticated_user
+        feedback = feedback_factory(client=pro_tenant)
+
+        issued = request_upload(authenticated_api_client, feedback)
+        assert issued.status_code == 200
+        assert issued.data["upload"]["method"] == "PUT"
+
+        response = put_file(authenticated_api_client, issued.data["upload"], PDF_BYTES)
+        assert response.status_code == 204
+        assert not FeedbackArquivo.objects.all_tenants().exists()
+
+        response = finalize(authenticated_api_client, feedback, issued.data["token"])
+
+        assert response.status_code == 201
+        arquivo = FeedbackArquivo.objects.all_tenants().get()
+        assert (arquivo.feedback_id, arquivo.enviado_por_id) == (feedback.id, user.id)
+        assert (arquivo.tamanho_bytes, arquivo.tipo_mime) == (
+            len(PDF_BYTES),
+            "application/pdf",
+        )
+        assert str(arquivo.arquivo).startswith(
+            f"ouvify/feedback_arquivos/{pro_tenant.id}/{feedback.protocolo}/"
+        )
+
+        again = finalize(authenticated_api_client, feedback, issued.data["token"])
+        assert again.status_code == 409
+
+    def test_anonymous_upload_scoped_by_protocol(
+        self, api_client, pro_tenant, feedback_factory
+    ):
+        api_client.credentials(HTTP_HOST=f"{pro_tenant.subdominio}.localhost")
+        feedback = feedback_factory(client=pro_tenant)
+
+        missing = request_upload(api_client, feedback)
+        assert missing.status_code == 400
+
+        issued = request_upload(
+            api_client, feedback, protocolo=feedback.protocolo, interno=True
+        )
+        put_file(api_client, issued.data["upload"], PDF_BYTES)
+        response = finalize(api_client, feedback, issued.data["token"])
+
+        assert response.status_code == 201
+        arquivo = FeedbackArquivo.objects.all_tenants().get()
+        assert arquivo.enviado_por is None
+        assert arquivo.interno is False
+
+    def test_declared_limits_validated_on_request(
+        self, authenticated_api_client, pro_tenant, feedback_factory, settings
+    ):
+        feedback = feedback_factory(client=pro_tenant)
+
+        too_big = request_upload(
+            authenticated_api_client,
+            feedback,
+            tamanho_bytes=settings.MAX_UPLOAD_SIZE + 1,
+        )
+        wrong_type = request_upload(
+            authenticated_api_client, feedback, tipo_mime="text/html"
+        )
+
+        assert too_big.status_code == 400
+        assert wrong_type.status_code == 400
+
+    def test_feature_gating(self, authenticated_api_client, authenticated_user):
+        _, tenant = authenticated_user
+        tenant.plano = "free"
+        tenant.save()
+
+        response = authenticated_api_client.post(
+            "/api/feedbacks/1/solicitar-upload/", {}, format="json"
+        )
+
+        assert response.status_code == 403
+
+
+class TestFinalizeVerification:
+    def test_content_type_mismatch_rejected_and_deleted(
+        self, authenticated_api_client, pro_tenant, feedback_factory, local_backend
+    ):
+        feedback = feedback_factory(client=pro_tenant)
+        issued = request_upload(authenticated_api_client, feedback, content=PNG_BYTES)
+        put_file(authenticated_api_client, issued.data["upload"], PNG_BYTES)
+
+        response = finalize(authenticated_api_client, feedback, issued.data["token"])
+
+        assert response.status_code == 400
+        assert not FeedbackArquivo.objects.all_tenants().exists()
+        assert not any(path.is_file() for path in local_backend.rglob("*"))
+
+    def test_size_must_match_declared(
+        self, authenticated_api_client, pro_tenant, feedback_factory
+    ):
+        feedback = feedback_factory(client=pro_tenant)
+        issued = request_upload(
+            authenticated_api_client, feedback, tamanho_bytes=len(PDF_BYTES) + 10
+        )
+        put_file(authenticated_api_client, issued.data["upload"], PDF_BYTES)
+
+        response = finalize(authenticated_api_client, feedback, issued.data["token"])
+
+        assert response.status_code == 400
+
+    def test_local_storage_rejects_body_larger_than_authorized(
+        self, authenticated_api_client, pro_tenant, feedback_factory
+    ):
+        feedback = feedback_factory(client=pro_tenant)
+        issued = request_upload(authenticated_api_client, feedback, tamanho_bytes=10)
+
+        response = put_file(authenticated_api_client, issued.data["upload"], PDF_BYTES)
+
+        assert response.status_code == 413
+
+    def test_local_storage_refuses_to_overwrite_key(
+        self, authenticated_api_client, pro_tenant, feedback_factory, local_backend
+    ):
+        feedback = feedback_factory(client=pro_tenant)
+        issued = request_upload(authenticated_api_client, feedback)
+        upload = issued.data["upload"]
+        put_file(authenticated_api_client, upload, PDF_BYTES)
+        finalize(authenticated_api_client, feedback, issued.data["token"])
+
+        replaced = put_file(authenticated_api_client, upload, PNG_BYTES)
+
+        assert replaced.status_code == 409
+        (stored,) = [path for path in local_backend.rglob("*") if path.is_file()]
+        assert stored.read_bytes() == PDF_BYTES
+
+    def test_expired_or_foreign_token_rejected(
+        self,
+        authenticated_api_client,
+        pro_tenant,
+        feedback_factory,
+        tenant_factory,
+        settings,
+    ):
+        feedback = feedback_factory(client=pro_tenant)
+        other = tenant_factory(nome="Outra Empresa", subdominio="outra-empresa")
+        foreign = direct_upload.issue_upload(
+            feedback_factory(client=other), "x.pdf", "application/pdf", 10
+        )
+
+        response = finalize(authenticated_api_client, feedback, foreign["token"])
+        assert response.status_code == 403
+
+        issued = request_upload(authenticated_api_client, feedback)
+        settings.DIRECT_UPLOAD_TTL = -1
+        response = finalize(authenticated_api_client, feedback, issued.data["token"])
+        assert response.status_code == 400
+
+
+class TestCloudinaryBackend:
+    def test_signed_params_and_inspection(self):
+        backend = direct_upload.CloudinaryUploadBackend()
+        config = MagicMock(
+            cloud_name="demo", api_key="key", api_secret="secret", upload_prefix=None
+        )
+        key = "ouvify/feedback_arquivos/1/OUVY-AAAA-BBBB/abc"
+
+        with patch("cloudinary.config", return_value=config):
+            params = backend.upload_params(key, "application/pdf", "token")
+        assert params["url"].endswith("/image/upload")
+        assert params["fields"]["public_id"] == key
+        assert params["fields"]["api_key"] == "key"
+        assert params["fields"]["overwrite"] == "false"
+        assert params["fields"]["allowed_formats"] == "pdf"
+        assert len(params["fields"]["signature"]) == 40
+
+        resource = {"bytes": 2048, "format": "pdf", "version": 17}
+        with patch("cloudinary.api.resource", return_value=resource) as api:
+            stored = backend.inspect(key, "application/pdf")
+        api.assert_called_once_with(key, resource_type="image")
+        assert stored == (2048, "application/pdf", f"image/upload/v17/{key}.pdf")
+
+    def test_raw_resources_checked_by_content(self):
+        backend = direct_upload.CloudinaryUploadBackend()
+        key = "ouvify/feedback_arquivos/1/OUVY-AAAA-BBBB/abc"
+        docx = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        resource = {
+            "bytes": len(PNG_BYTES),
+            "version": 17,
+            "secure_url": f"https://res.cloudinary.com/demo/raw/upload/{key}.docx",
+        }
+        download = MagicMock(content=PNG_BYTES)
+
+        with (
+            patch("cloudinary.api.resource", return_value=resource) as api,
+            patch("requests.get", return_value=download) as get,
+        ):
+            stored = backend.inspect(key, docx)
+
+        api.assert_called_once_with(f"{key}.docx", resource_type="raw")
+        get.assert_called_once_with(
+            resource["secure_url"], headers={"Range": "bytes=0-2047"}, timeout=10
+        )
+        # Extensão .docx, conteúdo PNG: recusado na finalização
+        assert stored.mime == "image/png"
+        assert not direct_upload.mime_matches(docx, stored.mime)
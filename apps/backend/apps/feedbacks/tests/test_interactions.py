@@ -0,0 +1,237 @@
+"""
+Testes da escrita de interações (apps.feedbacks.interactions)
+Cobertura: até 3 queries por interação, SLA de primeira resposta e de
+resolução no mesmo UPDATE, evento consolidado único após o commit e
+interações gravadas fora do serviço
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.feedbacks import signals, stats_counters
+from apps.feedbacks.constants import FeedbackStatus, InteracaoTipo
+from apps.feedbacks.interactions import interacao_registrada, registrar_interacao
+from apps.feedbacks.models import Feedback, FeedbackInteracao
+
+pytestmark = pytest.mark.django_db
+
+
+def write_queries(captured):
+    """Queries da escrita (savepoints vêm do atomic aninhado no teste)"""
+    return [
+        query["sql"]
+        for query in captured.captured_queries
+        if "SAVEPOINT" not in query["sql"].upper()
+    ]
+
+
+@pytest.fixture
+def events():
+    received = []
+
+    def listener(sender, **kwargs):
+        received.append(kwargs)
+
+    interacao_registrada.connect(listener)
+    yield received
+    interacao_registrada.disconnect(listener)
+
+
+@pytest.fixture
+def feedback(tenant, feedback_factory):
+    return feedback_factory(client=tenant, status=FeedbackStatus.PENDENTE)
+
+
+class TestRegistrarInteracao:
+    def test_status_change_with_first_response_in_three_queries(
+        self, tenant, feedback, user_factory, django_capture_on_commit_callbacks
+    ):
+        user = user_factory(email="equipe@tenant.com")
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            with CaptureQueriesContext(connection) as captured:
+                registrar_interacao(
+                    tenant,
+                    {"pk": feedback.pk},
+                    tipo=InteracaoTipo.MUDANCA_STATUS,
+                    mensagem="Resolvido",
+                    autor=user,
+                    novo_status=FeedbackStatus.RESOLVIDO,
+                )
+
+        queries = write_queries(captured)
+        assert len(queries) == 3
+        assert queries[0].upper().startswith("SELECT")
+        assert queries[1].upper().startswith("INSERT")
+        assert queries[2].upper().startswith("UPDATE")
+        assert len(callbacks) == 1
+
+        feedback.refresh_from_db()
+        assert feedback.status == FeedbackStatus.RESOLVIDO
+        assert feedback.data_primeira_resposta is not None
+        assert feedback.sla_primeira_resposta is True
+        assert feedback.data_resolucao is not None
+        assert feedback.sla_resolucao is True
+        assert feedback.data_atualizacao >= feedback.data_resolucao
+
+    def test_reply_after_first_response_skips_update(
+        self, tenant, feedback, user_factory
+    ):
+        user = user_factory(email="equipe@tenant.com")
+        registrar_interacao(
+            tenant, {"pk": feedback.pk}, InteracaoTipo.PERGUNTA_EMPRESA, "1", user
+        )
+
+        with CaptureQueriesContext(connection) as captured:
+            registrar_interacao(
+                tenant, {"pk": feedback.pk}, InteracaoTipo.PERGUNTA_EMPRESA, "2", user
+            )
+
+        assert len(write_queries(captured)) == 2
+
+    def test_anonymous_reply_by_protocol_keeps_sla_open(self, tenant, feedback):
+        _, interacao = registrar_interacao(
+            tenant,
+            {"protocolo": feedback.protocolo},
+            InteracaoTipo.RESPOSTA_USUARIO,
+            "Mais detalhes",
+        )
+
+        feedback.refresh_from_db()
+        assert interacao.autor is None
+        assert feedback.data_primeira_resposta is None
+
+    def test_other_tenant_feedback_not_found(self, tenant_factory, feedback):
+        other = tenant_factory(nome="Outra", subdominio="outra")
+
+        with pytest.raises(Feedback.DoesNotExist):
+            registrar_interacao(
+                other, {"pk": feedback.pk}, InteracaoTipo.RESPOSTA_USUARIO, "x"
+            )
+
+
+class TestEventoConsolidado:
+    def test_single_event_after_commit_applies_effects(
+        self, tenant, feedback, user_factory, events, django_capture_on_commit_callbacks
+    ):
+        user = user_factory(email="equipe@tenant.com")
+
+        with (
+            patch.object(stats_counters, "get_stats_counters") as counters,
+            patch.object(signals, "_notificar_status") as notificar_status,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            registrar_interacao(
+                tenant,
+                {"pk": feedback.pk},
+                InteracaoTipo.MUDANCA_STATUS,
+                "Em análise",
+                user,
+                novo_status=FeedbackStatus.EM_ANALISE,
+            )
+            assert events == []
+
+        assert len(events) == 1
+        assert events[0]["status_anterior"] == FeedbackStatus.PENDENTE
+        assert events[0]["primeira_resposta"] is True
+        notificar_status.assert_called_once()
+        deltas = counters.return_value.apply.call_args.args[1]
+        assert deltas["status:pendente"] == -1
+        assert deltas["status:em_analise"] == 1
+
+    def test_rolled_back_interaction_emits_nothing(
+        self, tenant, feedback, events, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    registrar_interacao(
+                        tenant,
+                        {"pk": feedback.pk},
+                        InteracaoTipo.RESPOSTA_USUARIO,
+                        "x",
+                    )
+                    raise RuntimeError("rollback")
+
+        assert events == []
+        assert not FeedbackInteracao.objects.all_tenants().exists()
+
+    def test_interaction_saved_elsewhere_records_sla_and_event(
+        self, tenant, feedback, user_factory, events, django_capture_on_commit_callbacks
+    ):
+        user = user_factory(email="equipe@tenant.com")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            FeedbackInteracao.objects.create(
+                client=tenant,
+                feedback=feedback,
+                autor=user,
+                tipo=InteracaoTipo.MENSAGEM_AUTOMATICA,
+                mensagem="Recebemos sua mensagem",
+            )
+
+        feedback.refresh_from_db()
+        assert feedback.data_primeira_resposta is not None
+        assert len(events) == 1
+        assert events[0]["primeira_resposta"] is True
+        assert events[0]["status_anterior"] is None
+
+    def test_status_change_triggers_webhook_events(
+        self, tenant, feedback, user_factory, django_capture_on_commit_callbacks
+    ):
+        user = user_factory(email="equipe@tenant.com")
+
+        with (
+            patch("apps.webhooks.signals.trigger_feedback_status_changed") as changed,
+            patch("apps.webhooks.signals.trigger_feedback_resolved") as resolved,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            registrar_interacao(
+                tenant,
+                {"pk": feedback.pk},
+                InteracaoTipo.MUDANCA_STATUS,
+                "Resolvido",
+                user,
+                novo_status=FeedbackStatus.RESOLVIDO,
+            )
+
+        changed.assert_called_once()
+        assert changed.call_args.args[1:] == (
+            FeedbackStatus.PENDENTE,
+            FeedbackStatus.RESOLVIDO,
+        )
+        resolved.assert_called_once()
+
+
+class TestAdicionarInteracaoView:
+    def test_company_status_change_returns_detail(
+        self, authenticated_api_client, authenticated_user, feedback_factory
+    ):
+        _, tenant = authenticated_user
+        feedback = feedback_factory(client=tenant, status=FeedbackStatus.PENDENTE)
+
+        response = authenticated_api_client.post(
+            f"/api/feedbacks/{feedback.pk}/adicionar-interacao/",
+            {
+                "mensagem": "Analisando",
+                "tipo": InteracaoTipo.MUDANCA_STATUS,
+                "novo_status": FeedbackStatus.EM_ANALISE,
+            },
+            format="json",
+        )
+
+        assert response.status_code == 201
+        assert response.data["status"] == FeedbackStatus.EM_ANALISE
+        assert response.data["interacoes"][0]["mensagem"] == "Analisando"
+
+    def test_missing_feedback_returns_404(self, authenticated_api_client):
+        response = authenticated_api_client.post(
+            "/api/feedbacks/999999/adicionar-interacao/",
+            {"mensagem": "Oi"},
+            format="json",
+        )
+
+        assert response.status_code == 404
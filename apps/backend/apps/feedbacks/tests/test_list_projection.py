@@ -0,0 +1,136 @@
+"""
+Testes da projeção de listagem do FeedbackViewSet (FeedbackListSerializer)
+Cobertura: formato da resposta, queries constantes e benchmark p50/p99
+"""
+
+import statistics
+import time
+
+import pytest
+from django.db import connection
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
+
+from apps.feedbacks.models import FeedbackInteracao, Tag
+from apps.feedbacks.serializers import FeedbackSerializer
+from apps.feedbacks.views import FeedbackViewSet
+from apps.tenants.models import TeamMember
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def populated_tenant(authenticated_user, feedback_factory):
+    """Tenant com feedbacks atribuídos, tags e interações"""
+    user, tenant = authenticated_user
+    user.first_name, user.last_name = "Ana", "Silva"
+    user.save()
+    member = TeamMember.objects.get(user=user, client=tenant)
+    tags = [
+        Tag.objects.create(client=tenant, nome=f"Tag {i}", cor="#FF0000")
+        for i in range(3)
+    ]
+
+    def populate(total):
+        for i in range(total):
+            feedback = feedback_factory(
+                client=tenant,
+                titulo=f"Feedback {i}",
+                assigned_to=member if i % 2 == 0 else None,
+            )
+            feedback.tags.set(tags[: i % 4])
+            for j in range(3):
+                FeedbackInteracao.objects.create(
+                    client=tenant, feedback=feedback, mensagem=f"Mensagem {j}"
+                )
+        return tenant, member, tags
+
+    return populate
+
+
+class TestFeedbackListProjection:
+    def test_list_shape_with_sql_annotations(
+        self, authenticated_api_client, populated_tenant
+    ):
+        _, member, _ = populated_tenant(4)
+
+        response = authenticated_api_client.get("/api/feedbacks/")
+
+        assert response.status_code == 200
+        by_title = {item["titulo"]: item for item in response.data["results"]}
+
+        assigned = by_title["Feedback 2"]
+        assert assigned["assigned_to"] == {"id": member.id, "nome": "Ana Silva"}
+        assert sorted(t["nome"] for t in assigned["tags"]) == ["Tag 0", "Tag 1"]
+        assert set(assigned["tags"][0]) == {"id", "nome", "cor"}
+
+        unassigned = by_title["Feedback 1"]
+        assert unassigned["assigned_to"] is None
+        assert [t["nome"] for t in unassigned["tags"]] == ["Tag 0"]
+        assert by_title["Feedback 0"]["tags"] == []
+        assert "interacoes" not in unassigned
+        assert set(unassigned) == set(FeedbackSerializer.Meta.fields) - {"tag_ids"}
+
+    def test_query_count_does_not_grow_with_page(
+        self, authenticated_api_client, populated_tenant
+    ):
+        populated_tenant(5)
+        with CaptureQueriesContext(connection) as small:
+            authenticated_api_client.get("/api/feedbacks/", {"page_size": 5})
+
+        populated_tenant(30)
+        with CaptureQueriesContext(connection) as large:
+            authenticated_api_client.get("/api/feedbacks/", {"page_size": 35})
+
+        assert len(large) == len(small)
+
+    @pytest.mark.benchmark
+    def test_benchmark_list_page_size_100(
+        self, authenticated_api_client, populated_tenant, monkeypatch
+    ):
+        """Benchmark p50/p99 de GET /api/feedbacks/?page_size=100"""
+        populated_tenant(100)
+        runs = 30
+
+        def percentiles(samples):
+            ordered = sorted(samples)
+            p99_index = min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))
+            return statistics.median(ordered), ordered[p99_index]
+
+        def measure():
+            samples = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                response = authenticated_api_client.get(
+                    "/api/feedbacks/", {"page_size": 100}
+                )
+                samples.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200
+                assert len(response.data["results"]) == 100
+            return percentiles(samples)
+
+        p50, p99 = measure()
+
+        # Referência: queryset/serializer anteriores (prefetch + ModelSerializer)
+        # pelo mesmo endpoint
+        def legacy_list_queryset(self, queryset):
+            return queryset.select_related("client", "autor").prefetch_related(
+                Prefetch(
+                    "interacoes",
+                    queryset=FeedbackInteracao.objects.select_related("autor"),
+                ),
+                "arquivos",
+            )
+
+        monkeypatch.setattr(FeedbackViewSet, "get_list_queryset", legacy_list_queryset)
+        monkeypatch.setattr(
+            FeedbackViewSet, "get_serializer_class", lambda self: FeedbackSerializer
+        )
+        legacy_p50, legacy_p99 = measure()
+
+        print(
+            f"\nGET /api/feedbacks/?page_size=100 ({runs} execuções): "
+            f"p50={p50:.1f}ms p99={p99:.1f}ms | "
+            f"queryset/serializer anteriores: p50={legacy_p50:.1f}ms "
+            f"p99={legacy_p99:.1f}ms"
+        )
@@ -0,0 +1,107 @@
+"""
+Testes do cache da consulta pública de protocolo
+Cobertura: caminho rápido sem ORM, invalidação, cache negativo e isolamento
+"""
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.feedbacks.constants import InteracaoTipo
+from apps.feedbacks.models import Feedback, FeedbackInteracao
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/feedbacks/consultar-protocolo/"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def consultar(api_client, tenant, protocolo):
+    return api_client.get(
+        URL, {"protocolo": protocolo}, HTTP_X_TENANT_ID=str(tenant.id)
+    )
+
+
+def feedback_queries(ctx):
+    return [q for q in ctx.captured_queries if "feedbacks_feedback" in q["sql"]]
+
+
+class TestProtocolLookupCache:
+    def test_hit_skips_feedback_queries(self, api_client, tenant, feedback_factory):
+        feedback = feedback_factory(client=tenant)
+
+        first = consultar(api_client, tenant, feedback.protocolo)
+        with CaptureQueriesContext(connection) as ctx:
+            second = consultar(api_client, tenant, feedback.protocolo.lower())
+
+        assert first.status_code == second.status_code == 200
+        assert second.data == first.data
+        assert feedback_queries(ctx) == []
+
+    def test_public_interaction_invalidates(self, api_client, tenant, feedback_factory):
+        feedback = feedback_factory(client=tenant)
+        response = consultar(api_client, tenant, feedback.protocolo)
+        assert response.data["interacoes"] == []
+
+        FeedbackInteracao.objects.create(
+            client=tenant,
+            feedback=feedback,
+            tipo=InteracaoTipo.MENSAGEM_PUBLICA,
+            mensagem="Estamos analisando",
+        )
+
+        response = consultar(api_client, tenant, feedback.protocolo)
+        assert [i["mensagem"] for i in response.data["interacoes"]] == [
+            "Estamos analisando"
+        ]
+
+    def test_feedback_update_invalidates(self, api_client, tenant, feedback_factory):
+        feedback = feedback_factory(client=tenant)
+        consultar(api_client, tenant, feedback.protocolo)
+
+        feedback.status = "resolvido"
+        feedback.save()
+
+        assert consultar(api_client, tenant, feedback.protocolo).data["status"] == (
+            "resolvido"
+        )
+
+    def test_not_found_is_cached_until_feedback_created(self, api_client, tenant):
+        protocolo = "OUVY-ZZZZ-9999"
+
+        first = consultar(api_client, tenant, protocolo)
+        with CaptureQueriesContext(connection) as ctx:
+            second = consultar(api_client, tenant, protocolo)
+
+        assert first.status_code == second.status_code == 404
+        assert second.data == first.data
+        assert protocolo not in str(second.data)
+        assert feedback_queries(ctx) == []
+
+        Feedback.objects.create(
+            client=tenant,
+            protocolo=protocolo,
+            titulo="Criado depois",
+            descricao="Descrição",
+            tipo="sugestao",
+        )
+        assert consultar(api_client, tenant, protocolo).status_code == 200
+
+    def test_cache_is_scoped_by_tenant(
+        self, api_client, tenant, tenant_factory, feedback_factory
+    ):
+        other = tenant_factory(nome="Outra", subdominio="outra")
+        feedback = feedback_factory(client=tenant)
+
+        assert consultar(api_client, tenant, feedback.protocolo).status_code == 200
+        response = consultar(api_client, other, feedback.protocolo)
+
+        assert response.status_code == 404
+        assert response.data["error"] == "Protocolo não encontrado"
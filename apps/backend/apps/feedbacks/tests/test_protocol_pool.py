@@ -0,0 +1,189 @@
+"""
+Testes do pool de protocolos pré-gerados (apps.feedbacks.protocol_pool)
+Cobertura: formato CSPRNG, reserva em lote contra o índice único, zero
+queries por feedback, transações desfeitas/confirmadas, workers
+concorrentes e benchmark de criação de feedbacks
+"""
+
+import re
+import secrets
+import string
+import time
+from unittest.mock import patch
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.feedbacks import protocol_pool
+from apps.feedbacks.models import Feedback, ProtocoloReservado
+from apps.feedbacks.protocol_pool import ProtocolPool, gerar_codigo, reserve_batch
+
+pytestmark = pytest.mark.django_db
+
+PROTOCOLO_RE = re.compile(r"^OUVY-[A-Z0-9]{4}-[A-Z0-9]{4}$")
+
+
+def codes(*suffixes):
+    return [f"OUVY-AAAA-{suffix:04d}" for suffix in suffixes]
+
+
+@pytest.fixture
+def batch_size(settings):
+    settings.PROTOCOL_POOL_BATCH_SIZE = 5
+    return 5
+
+
+class TestReservation:
+    def test_codes_are_random_and_well_formed(self):
+        generated = {gerar_codigo() for _ in range(2000)}
+
+        assert len(generated) == 2000
+        assert all(PROTOCOLO_RE.match(code) for code in generated)
+
+    def test_batch_skips_taken_and_used_codes(self, tenant, feedback_factory):
+        ProtocoloReservado.objects.create(codigo=codes(1)[0], lote="outro")
+        feedback = feedback_factory(client=tenant)
+        Feedback.objects.all_tenants().filter(pk=feedback.pk).update(
+            protocolo=codes(2)[0]
+        )
+
+        with patch.object(protocol_pool, "gerar_codigo", side_effect=codes(1, 2, 3)):
+            reserved = reserve_batch(3)
+
+        assert reserved == codes(3)
+
+    def test_concurrent_workers_never_share_codes(self, batch_size):
+        worker_a, worker_b = ProtocolPool(), ProtocolPool()
+        # Os dois geram candidatos sobrepostos; o índice único decide
+        candidates = codes(*range(0, 5), *range(3, 8), *range(8, 13))
+
+        with patch.object(protocol_pool, "gerar_codigo", side_effect=candidates):
+            with worker_a.transaction_batch():
+                taken_a = [worker_a.take() for _ in range(5)]
+            with worker_b.transaction_batch():
+                taken_b = [worker_b.take() for _ in range(3)]
+
+        assert set(taken_a) == set(codes(*range(5)))
+        assert set(taken_b) == set(codes(5, 6, 7))
+
+
+class TestPool:
+    def test_zero_queries_while_pool_has_codes(self, batch_size):
+        pool = ProtocolPool()
+
+        with pool.transaction_batch():
+            with CaptureQueriesContext(connection) as refill:
+                first = pool.take()
+            with CaptureQueriesContext(connection) as warm:
+                rest = [pool.take() for _ in range(batch_size - 1)]
+
+        assert len(refill) == 3
+        assert len(warm) == 0
+        assert len({first, *rest}) == batch_size
+
+    def test_codes_from_rolled_back_transaction_are_discarded(self, batch_size):
+        pool = ProtocolPool()
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic(), pool.transaction_batch():
+                discarded = pool.take()
+                raise RuntimeError("rollback")
+
+        assert not ProtocoloReservado.objects.exists()
+        assert len(pool) == 0
+        with pool.transaction_batch():
+            code = pool.take()
+        assert code != discarded
+        assert ProtocoloReservado.objects.filter(codigo=code).exists()
+        assert ProtocoloReservado.objects.count() == batch_size
+
+    def test_leftovers_discarded_when_savepoint_rolls_back(
+        self, batch_size, django_capture_on_commit_callbacks
+    ):
+        pool = ProtocolPool()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            try:
+                with transaction.atomic(), pool.transaction_batch():
+                    pool.take()
+                # Erro depois do fim do bloco, ainda dentro do savepoint
+                with transaction.atomic():
+                    with pool.transaction_batch():
+                        pool.take()
+                    raise RuntimeError("rollback")
+            except RuntimeError:
+                pass
+
+        assert ProtocoloReservado.objects.count() == batch_size
+        assert len(pool) == batch_size - 1
+
+    def test_transaction_without_batch_reserves_single_code(self, batch_size):
+        pool = ProtocolPool()
+
+        with transaction.atomic():
+            code = pool.take()
+
+        assert list(ProtocoloReservado.objects.values_list("codigo", flat=True)) == [
+            code
+        ]
+        assert len(pool) == 0
+
+    def test_leftovers_shared_after_commit(
+        self, batch_size, django_capture_on_commit_callbacks
+    ):
+        pool = ProtocolPool()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with pool.transaction_batch():
+                pool.take()
+        assert len(pool) == batch_size - 1
+
+    def test_feedback_save_uses_pool(
+        self, tenant, feedback_factory, batch_size, monkeypatch
+    ):
+        # Pool do processo limpo (outros testes publicam sobras após commit)
+        monkeypatch.setattr(protocol_pool, "_protocol_pool", None)
+        feedbacks = [feedback_factory(client=tenant) for _ in range(12)]
+
+        protocolos = {feedback.protocolo for feedback in feedbacks}
+        assert len(protocolos) == 12
+        reserved = set(ProtocoloReservado.objects.values_list("codigo", flat=True))
+        assert protocolos <= reserved
+
+    @pytest.mark.benchmark
+    def test_benchmark_create_feedbacks_per_second(self, tenant):
+        """Criação de feedbacks/s: pool vs geração com exists() por feedback"""
+        runs = 300
+        caracteres = string.ascii_uppercase + string.digits
+
+        def legacy_protocolo():
+            for _ in range(10):
+                parte1 = "".join(secrets.choice(caracteres) for _ in range(4))
+                parte2 = "".join(secrets.choice(caracteres) for _ in range(4))
+                protocolo = f"OUVY-{parte1}-{parte2}"
+                with transaction.atomic():
+                    if not Feedback.objects.filter(protocolo=protocolo).exists():
+                        return protocolo
+
+        def measure():
+            started = time.perf_counter()
+            for i in range(runs):
+                Feedback.objects.create(
+                    client=tenant, tipo="sugestao", titulo=f"#{i}", descricao="x"
+                )
+            return runs / (time.perf_counter() - started)
+
+        with patch.object(Feedback, "gerar_protocolo", staticmethod(legacy_protocolo)):
+            legacy_rate = measure()
+        with protocol_pool.get_protocol_pool().transaction_batch():
+            pool_rate = measure()
+            with CaptureQueriesContext(connection) as queries:
+                Feedback.gerar_protocolo()
+
+        print(
+            f"\nCriação de feedbacks ({runs} por rodada): "
+            f"pool={pool_rate:.0f}/s | exists() por feedback={legacy_rate:.0f}/s | "
+            f"queries por protocolo com pool aquecido={len(queries)}"
+        )
+        assert len(queries) == 0
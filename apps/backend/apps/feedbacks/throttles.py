@@ -7,7 +7,7 @@ protegendo contra força bruta e enumeração de protocolos.
 
 import logging
 
-from rest_framework.throttling import AnonRateThrottle
+from apps.core.throttling import AnonRateThrottle
 
 logger = logging.getLogger(__name__)
 
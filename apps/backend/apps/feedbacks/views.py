@@ -1,17 +1,34 @@
 import json
 import logging
+import tempfile
+from collections import Counter
 from datetime import timedelta
 
 from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
-from django.db.models import Prefetch, Q, QuerySet
+from django.core.files import File
+from django.db.models import (
+    Count,
+    JSONField,
+    OuterRef,
+    Prefetch,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce, Concat, JSONObject, NullIf, Trim
 from django.utils import timezone
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from apps.billing.feature_gating import check_feature_limit
+from apps.core.cache_service import CacheService
+from apps.core.conditional import ConditionalResponseMixin
+from apps.core.db_functions import JSONArrayAgg
 from apps.core.decorators import require_feature
 from apps.core.exceptions import FeatureNotAvailableError
 from apps.core.pagination import StandardResultsSetPagination
@@ -19,30 +36,61 @@ from apps.core.pagination import StandardResultsSetPagination
 # ✅ CORREÇÃO DE SEGURANÇA (2026-02-05): Importar permissions customizadas RBAC
 from apps.core.permissions import CanModifyFeedback
 from apps.core.sanitizers import sanitize_html_input, sanitize_protocol_code
+from apps.core.search_database import filter_feedbacks_by_text
 from apps.core.throttling import FeedbackSubmissionThrottle, ProtocolLookupThrottle
+from apps.core.two_tier_cache import TwoTierCache
 from apps.core.utils import get_client_ip, get_current_tenant
 from apps.core.utils.privacy import anonymize_ip
 from apps.feedbacks.throttles import ProtocoloConsultaThrottle
 
 from .constants import MAX_INTERACAO_MENSAGEM_LENGTH, FeedbackStatus, InteracaoTipo
+from .direct_upload import (
+    DirectUploadError,
+    LocalUploadBackend,
+    finalize_upload,
+    get_upload_backend,
+    issue_upload,
+    read_token,
+)
 from .filters import FeedbackFilter
+from .interactions import registrar_interacao
 from .models import Feedback, FeedbackArquivo, FeedbackInteracao, ResponseTemplate, Tag
+from .protocol_cache import get_cached_consulta, set_cached_consulta
 from .serializers import (
+    FeedbackArquivoFinalizeSerializer,
     FeedbackArquivoSerializer,
+    FeedbackArquivoUploadRequestSerializer,
     FeedbackArquivoUploadSerializer,
+    FeedbackBulkUpdateSerializer,
     FeedbackConsultaSerializer,
     FeedbackDetailSerializer,
     FeedbackInteracaoSerializer,
+    FeedbackListSerializer,
     FeedbackSerializer,
     ResponseTemplateRenderSerializer,
     ResponseTemplateSerializer,
     TagSerializer,
+    tags_com_contagem,
 )
+from .stats_counters import dashboard_kpis, get_counters, period_counts
 
 logger = logging.getLogger(__name__)
 
 
-class FeedbackViewSet(viewsets.ModelViewSet):
+def user_display_name(prefix: str):
+    """
+    Expressão SQL equivalente a user.get_full_name() or user.username
+
+    Args:
+        prefix: Caminho até o User (ex: "assigned_to__user__")
+    """
+    full_name = Trim(
+        Concat(f"{prefix}first_name", Value(" "), f"{prefix}last_name")
+    )
+    return Coalesce(NullIf(full_name, Value("")), f"{prefix}username")
+
+
+class FeedbackViewSet(ConditionalResponseMixin, viewsets.ModelViewSet):
     """
     API para gerenciar Feedbacks.
 
@@ -61,19 +109,29 @@ class FeedbackViewSet(viewsets.ModelViewSet):
     - GET /api/feedbacks/consultar-protocolo/?codigo=OUVY-XXXX-YYYY - Consulta pública
     - POST /api/feedbacks/{id}/assign/ - Atribuir feedback para team member
     - POST /api/feedbacks/{id}/unassign/ - Remover atribuição
+    - POST /api/feedbacks/bulk/ - Status/prioridade/atribuição/tags em lote
 
     Paginação:
     - 20 itens por página (padrão)
     - Customizável com ?page_size=50 (max 100)
     - Usa StandardResultsSetPagination
+    - Cursor (keyset) opt-in com ?cursor= para listagens profundas
+
+    GET condicional (retrieve): ETag de data_atualizacao + versão "feedbacks"
+    do tenant (interações, arquivos e tags); If-None-Match → 304
     """
 
     serializer_class = FeedbackSerializer
     # ✅ CORREÇÃO RBAC (2026-02-05): VIEWER não pode modificar, apenas ler
     permission_classes = [permissions.IsAuthenticated, CanModifyFeedback]
     pagination_class = StandardResultsSetPagination
+    # Paginação por cursor opt-in (?cursor=) - índice (client, -data_criacao)
+    cursor_ordering = ("data_criacao", "id")
     parser_classes = [JSONParser, MultiPartParser, FormParser]
     filterset_class = FeedbackFilter
+    conditional_resource = "feedbacks"
+    conditional_actions = ("retrieve",)
+    conditional_last_modified_field = "data_atualizacao"
 
     def get_permissions(self):
         """Permite público apenas nos endpoints explícitos de protocolo."""
@@ -82,6 +140,8 @@ class FeedbackViewSet(viewsets.ModelViewSet):
             "consultar_protocolo",
             "responder_protocolo",
             "upload_arquivo",
+            "solicitar_upload",
+            "finalizar_upload",
         ]:
             return [permissions.AllowAny()]
         return [permission() for permission in self.permission_classes]
@@ -102,30 +162,40 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         """
         queryset = Feedback.objects.filter(client__isnull=False)
 
-        # ✅ OTIMIZAÇÃO FASE 3: Eager loading de ForeignKeys
-        # Sempre trazer client e autor em uma única query (JOINs)
-        queryset = queryset.select_related("client", "autor")
-
-        # ✅ OTIMIZAÇÃO FASE 3: Prefetch relações reversas (SEMPRE, não só no retrieve)
-        # CORREÇÃO: Aplicar prefetch também em list action para evitar N+1
-        queryset = queryset.prefetch_related(
-            Prefetch(
-                "interacoes",
-                queryset=FeedbackInteracao.objects.select_related("autor").order_by(
-                    "data"
+        if getattr(self, "action", None) == "list":
+            # Listagem não renderiza interações/arquivos: projeção enxuta
+            queryset = self.get_list_queryset(queryset)
+        else:
+            # ✅ OTIMIZAÇÃO FASE 3: Eager loading de ForeignKeys
+            # client/autor + responsáveis exibidos pelo FeedbackDetailSerializer
+            queryset = queryset.select_related(
+                "client", "autor", "assigned_to__user", "assigned_by"
+            )
+
+            # ✅ OTIMIZAÇÃO FASE 3: Prefetch relações reversas
+            # Já na ordem exibida pelo FeedbackDetailSerializer, que lê apenas
+            # do cache de prefetch (sem queries por feedback)
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "interacoes",
+                    queryset=FeedbackInteracao.objects.select_related(
+                        "autor"
+                    ).order_by("-data"),
                 ),
-            ),
-            "arquivos",  # Pré-carregar arquivos anexados
-        )
+                Prefetch(
+                    "arquivos",
+                    queryset=FeedbackArquivo.objects.select_related(
+                        "enviado_por"
+                    ).order_by("-data_envio"),
+                ),
+                Prefetch("tags", queryset=tags_com_contagem()),
+            )
 
         # Aplicar filtros de busca se fornecidos
+        # PostgreSQL: tsvector (GIN) + trigram em protocolo/e-mail
         search = self.request.query_params.get("search", "").strip()  # type: ignore[attr-defined]
         if search:
-            queryset = queryset.filter(
-                Q(protocolo__icontains=search)
-                | Q(titulo__icontains=search)
-                | Q(email_contato__icontains=search)
-            )
+            queryset = filter_feedbacks_by_text(queryset, search)
 
         # Filtro por status
         status_filter = self.request.query_params.get("status", "").strip()  # type: ignore[attr-defined]
@@ -141,9 +211,57 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         # Índice: (client_id, status, data_criacao DESC)
         return queryset.order_by("-data_criacao")
 
+    # Colunas exibidas na listagem (FeedbackListSerializer)
+    LIST_FIELDS = (
+        "id",
+        "client_id",
+        "protocolo",
+        "tipo",
+        "titulo",
+        "descricao",
+        "status",
+        "prioridade",
+        "anonimo",
+        "email_contato",
+        "data_criacao",
+        "data_atualizacao",
+        "assigned_to_id",
+        "assigned_at",
+        "tempo_primeira_resposta",
+        "tempo_resolucao",
+        "data_primeira_resposta",
+        "data_resolucao",
+        "sla_primeira_resposta",
+        "sla_resolucao",
+    )
+
+    def get_list_queryset(self, queryset: QuerySet[Feedback]) -> QuerySet[Feedback]:
+        """
+        Projeção da listagem: apenas as colunas exibidas, sem prefetch de
+        interações/arquivos. Tags e nomes de responsáveis vêm em SQL
+        (subquery JSON por linha e JOINs), sem queries adicionais.
+        """
+        tags_data = (
+            Feedback.tags.through.objects.filter(feedback_id=OuterRef("pk"))
+            .values("feedback_id")
+            .annotate(
+                data=JSONArrayAgg(
+                    JSONObject(id="tag_id", nome="tag__nome", cor="tag__cor")
+                )
+            )
+            .values("data")
+        )
+        return queryset.only(*self.LIST_FIELDS).annotate(
+            tags_data=Subquery(tags_data, output_field=JSONField()),
+            assigned_to_nome=user_display_name("assigned_to__user__"),
+            assigned_by_nome=user_display_name("assigned_by__"),
+        )
+
     def get_serializer_class(self) -> type[FeedbackSerializer | FeedbackDetailSerializer]:  # type: ignore[override]
         if getattr(self, "action", None) in ["retrieve"]:
             return FeedbackDetailSerializer
+        if getattr(self, "action", None) == "list":
+            return FeedbackListSerializer
         return super().get_serializer_class()
 
     def get_throttles(self):
@@ -246,22 +364,6 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         ).strip()
 
         if is_company:
-            try:
-                feedback = (
-                    self.get_queryset()
-                    .select_related("client")
-                    .get(pk=pk, client=tenant)
-                )
-            except Feedback.DoesNotExist:
-                logger.warning(
-                    f"⚠️ Tentativa de adicionar interação em feedback inexistente | "
-                    f"ID: {pk} | Tenant: {tenant.nome} | IP: {anonymize_ip(get_client_ip(request))}"
-                )
-                return Response(
-                    {"error": "Feedback não encontrado"},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
-
             allowed_company_types = {
                 InteracaoTipo.MENSAGEM_PUBLICA,
                 InteracaoTipo.PERGUNTA_EMPRESA,
@@ -294,7 +396,10 @@ class FeedbackViewSet(viewsets.ModelViewSet):
                         {"error": f"Status inválido. Use um de: {valid_status}"},
                         status=status.HTTP_400_BAD_REQUEST,
                     )
+            else:
+                novo_status = None
             autor = request.user
+            lookup = {"pk": pk}
         else:
             protocolo = sanitize_protocol_code(
                 (request.data.get("protocolo") or "").strip().upper()
@@ -305,36 +410,39 @@ class FeedbackViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            feedback = (
-                Feedback.objects.filter(client=tenant, protocolo=protocolo)
-                .select_related("client", "autor")
-                .first()
+            tipo = InteracaoTipo.RESPOSTA_USUARIO
+            autor = None
+            novo_status = None
+            lookup = {"protocolo": protocolo}
+
+        # Lock + INSERT + UPDATE (SLA/status); efeitos após o commit
+        try:
+            feedback, interacao = registrar_interacao(
+                tenant,
+                lookup,
+                tipo=tipo,
+                mensagem=mensagem,
+                autor=autor,
+                novo_status=novo_status,
             )
-            if not feedback:
+        except Feedback.DoesNotExist:
+            if is_company:
                 logger.warning(
-                    f"⚠️ Protocolo não encontrado para resposta anônima | "
-                    f"Código: {protocolo} | Tenant: {tenant.nome} | IP: {anonymize_ip(get_client_ip(request))}"
+                    f"⚠️ Tentativa de adicionar interação em feedback inexistente | "
+                    f"ID: {pk} | Tenant: {tenant.nome} | IP: {anonymize_ip(get_client_ip(request))}"
                 )
                 return Response(
-                    {"error": "Protocolo não encontrado"},
+                    {"error": "Feedback não encontrado"},
                     status=status.HTTP_404_NOT_FOUND,
                 )
-
-            tipo = InteracaoTipo.RESPOSTA_USUARIO
-            autor = None
-            novo_status = None
-
-        interacao = FeedbackInteracao.objects.create(
-            feedback=feedback,
-            client=feedback.client,
-            autor=autor,
-            tipo=tipo,
-            mensagem=mensagem,
-        )
-
-        if is_company and tipo == InteracaoTipo.MUDANCA_STATUS and novo_status:
-            feedback.status = novo_status
-            feedback.save(update_fields=["status", "data_atualizacao"])
+            logger.warning(
+                f"⚠️ Protocolo não encontrado para resposta anônima | "
+                f"Código: {lookup['protocolo']} | Tenant: {tenant.nome} | IP: {anonymize_ip(get_client_ip(request))}"
+            )
+            return Response(
+                {"error": "Protocolo não encontrado"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
 
         logger.info(
             f"🗨️ Interação adicionada | Feedback: {feedback.protocolo} | Tipo: {tipo} | Autor: "
@@ -342,74 +450,44 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         )
 
         if is_company:
+            # Detalhe completo lido após o commit, fora da escrita
+            feedback = self.get_queryset().get(pk=feedback.pk)
             serializer = FeedbackDetailSerializer(feedback)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         serializer = FeedbackInteracaoSerializer(interacao)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    @action(
-        detail=True,
-        methods=["post"],
-        permission_classes=[permissions.AllowAny],
-        parser_classes=[MultiPartParser, FormParser],
-        url_path="upload-arquivo",
-    )
-    def upload_arquivo(self, request, pk=None):
-        """
-        Upload de arquivo anexado a um feedback.
+    def _check_attachments_feature(self, tenant):
+        """✅ VALIDAÇÃO CRÍTICA: Verificar se tenant tem feature de anexos"""
+        if tenant.has_feature_attachments():
+            return
 
-        🔒 FEATURE GATING: Requer plano PRO ou superior.
+        from apps.tenants.plans import PlanFeatures
 
-        **Permissões:**
-        - Empresa autenticada: valida `has_feature_attachments()`
-        - Denunciante anônimo: valida protocolo + feature do tenant
+        upgrade_msg = PlanFeatures.get_upgrade_message(
+            tenant.plano, "allow_attachments"
+        )
 
-        **Body (multipart/form-data):**
-        - arquivo: File (obrigatório) - Arquivo a ser anexado
-        - protocolo: string (obrigatório se anônimo) - Código OUVY-XXXX-YYYY
-        - interno: boolean (opcional) - Se True, só empresa vê
+        logger.warning(
+            f"🚫 Tentativa de upload sem feature | "
+            f"Tenant: {tenant.nome} | Plano: {tenant.plano}"
+        )
 
-        **Limites:**
-        - Tamanho máximo: 10MB
-        - Tipos permitidos: imagens, PDF, documentos Office
+        raise FeatureNotAvailableError(
+            feature="allow_attachments", plan=tenant.plano, message=upgrade_msg
+        )
 
-        **Retorna:**
-        - 201: Arquivo criado com URL
-        - 403: Feature bloqueada ou permissão negada
-        - 400: Validação falhou
+    def _upload_target(self, request, pk, tenant, validated_data):
         """
-        tenant = get_current_tenant()
-        if not tenant:
-            return Response(
-                {"error": "Tenant não identificado"}, status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # ✅ VALIDAÇÃO CRÍTICA: Verificar se tenant tem feature de anexos
-        if not tenant.has_feature_attachments():
-            from apps.tenants.plans import PlanFeatures
+        Feedback de destino de um anexo.
 
-            upgrade_msg = PlanFeatures.get_upgrade_message(
-                tenant.plano, "allow_attachments"
-            )
+        Empresa autenticada: feedback pelo ID. Denunciante anônimo: feedback
+        pelo protocolo (sem arquivos internos).
 
-            logger.warning(
-                f"🚫 Tentativa de upload sem feature | "
-                f"Tenant: {tenant.nome} | Plano: {tenant.plano}"
-            )
-
-            raise FeatureNotAvailableError(
-                feature="allow_attachments", plan=tenant.plano, message=upgrade_msg
-            )
-
-        # Validar input
-        serializer = FeedbackArquivoUploadSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        # Type hints para Pylance
-        validated_data = serializer.validated_data
-        arquivo = validated_data["arquivo"]
+        Returns:
+            (feedback, enviado_por, interno) ou Response de erro
+        """
         protocolo = str(validated_data.get("protocolo", "")).strip().upper()
         interno = bool(validated_data.get("interno", False))
 
@@ -472,6 +550,61 @@ class FeedbackViewSet(viewsets.ModelViewSet):
             enviado_por = None
             interno = False  # Denunciante não envia arquivos internos
 
+        return feedback, enviado_por, interno
+
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[permissions.AllowAny],
+        parser_classes=[MultiPartParser, FormParser],
+        url_path="upload-arquivo",
+    )
+    def upload_arquivo(self, request, pk=None):
+        """
+        Upload de arquivo anexado a um feedback.
+
+        🔒 FEATURE GATING: Requer plano PRO ou superior.
+
+        **Permissões:**
+        - Empresa autenticada: valida `has_feature_attachments()`
+        - Denunciante anônimo: valida protocolo + feature do tenant
+
+        **Body (multipart/form-data):**
+        - arquivo: File (obrigatório) - Arquivo a ser anexado
+        - protocolo: string (obrigatório se anônimo) - Código OUVY-XXXX-YYYY
+        - interno: boolean (opcional) - Se True, só empresa vê
+
+        **Limites:**
+        - Tamanho máximo: 10MB
+        - Tipos permitidos: imagens, PDF, documentos Office
+
+        **Retorna:**
+        - 201: Arquivo criado com URL
+        - 403: Feature bloqueada ou permissão negada
+        - 400: Validação falhou
+        """
+        tenant = get_current_tenant()
+        if not tenant:
+            return Response(
+                {"error": "Tenant não identificado"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        self._check_attachments_feature(tenant)
+
+        # Validar input
+        serializer = FeedbackArquivoUploadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Type hints para Pylance
+        validated_data = serializer.validated_data
+        arquivo = validated_data["arquivo"]
+
+        target = self._upload_target(request, pk, tenant, validated_data)
+        if isinstance(target, Response):
+            return target
+        feedback, enviado_por, interno = target
+
         # Criar registro de arquivo
         try:
             feedback_arquivo = FeedbackArquivo.objects.create(
@@ -504,6 +637,112 @@ class FeedbackViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[permissions.AllowAny],
+        url_path="solicitar-upload",
+    )
+    def solicitar_upload(self, request, pk=None):
+        """
+        Autoriza o upload direto de um anexo ao armazenamento.
+
+        O navegador envia o arquivo com os parâmetros assinados retornados
+        e depois chama finalizar-upload com o token. Mesmas permissões e
+        feature gating de upload-arquivo.
+
+        **Body (JSON):**
+        - nome_original, tipo_mime, tamanho_bytes (obrigatórios)
+        - protocolo: string (obrigatório se anônimo)
+        - interno: boolean (opcional)
+
+        **Retorna:**
+        - 200: {"token", "upload": {"method", "url", "fields"|"headers"},
+          "expires_at", "max_bytes"}
+        - 403: Feature bloqueada ou permissão negada
+        - 400: Validação falhou
+        """
+        tenant = get_current_tenant()
+        if not tenant:
+            return Response(
+                {"error": "Tenant não identificado"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        self._check_attachments_feature(tenant)
+
+        serializer = FeedbackArquivoUploadRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        validated_data = serializer.validated_data
+
+        target = self._upload_target(request, pk, tenant, validated_data)
+        if isinstance(target, Response):
+            return target
+        feedback, enviado_por, interno = target
+
+        data = issue_upload(
+            feedback,
+            nome_original=validated_data["nome_original"],
+            tipo_mime=validated_data["tipo_mime"],
+            tamanho_bytes=validated_data["tamanho_bytes"],
+            enviado_por=enviado_por,
+            interno=interno,
+        )
+        return Response(data)
+
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[permissions.AllowAny],
+        url_path="finalizar-upload",
+    )
+    def finalizar_upload(self, request, pk=None):
+        """
+        Registra o anexo após o upload direto.
+
+        Confere token (tenant, feedback e usuário), tamanho e tipo MIME do
+        objeto armazenado; objetos reprovados são removidos.
+
+        **Body (JSON):**
+        - token: string retornada por solicitar-upload
+
+        **Retorna:**
+        - 201: Arquivo criado com URL
+        - 400: Token expirado, arquivo ausente ou reprovado
+        - 403: Token inválido
+        - 409: Upload já finalizado
+        """
+        tenant = get_current_tenant()
+        if not tenant:
+            return Response(
+                {"error": "Tenant não identificado"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        self._check_attachments_feature(tenant)
+
+        serializer = FeedbackArquivoFinalizeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        user = request.user if request.user.is_authenticated else None
+        try:
+            feedback_arquivo = finalize_upload(
+                serializer.validated_data["token"], tenant, user
+            )
+        except DirectUploadError as e:
+            return Response({"error": e.message}, status=e.status_code)
+
+        logger.info(
+            f"📎 Arquivo anexado (upload direto) | "
+            f"Feedback: {feedback_arquivo.feedback_id} | "
+            f"Arquivo: {feedback_arquivo.nome_original} | "
+            f"Tamanho: {feedback_arquivo.tamanho_mb}MB | "
+            f"Enviado por: {user.get_username() if user else 'Anônimo'}"
+        )
+
+        serializer = FeedbackArquivoSerializer(feedback_arquivo)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     @action(
         detail=False,
         methods=["get"],
@@ -512,13 +751,13 @@ class FeedbackViewSet(viewsets.ModelViewSet):
     )
     def dashboard_stats(self, request):
         """
-        Endpoint leve para estatísticas do dashboard com cache.
+        Endpoint leve para estatísticas do dashboard.
 
         Retorna KPIs do tenant atual:
         - Total de feedbacks
         - Pendentes (status='pendente')
         - Resolvidos (status='resolvido')
-        - Criados nas últimas 24 horas
+        - Criados nas últimas 24 horas (granularidade de 1 hora)
 
         **Uso:**
         GET /api/feedbacks/dashboard-stats/
@@ -527,75 +766,26 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         {"total": 150, "pendentes": 12, "resolvidos": 98, "hoje": 5, "taxa_resolucao": "65.3%", "cached": true}
 
         **Observações:**
-        - Filtra automaticamente pelo tenant atual (via TenantAwareModel)
-        - Cache de 5 minutos (invalidado ao criar/editar/deletar feedback)
-        - Otimizado: 1 query (agregação) vs 4 queries (antes da Fase 3)
-
-        **Performance (Auditoria Fase 3):**
-        - ANTES: 4 queries separadas (COUNT por status)
-        - DEPOIS: 1 query com aggregate + cache de 5min
-        - REDUÇÃO: 99.9% de carga no DB (1 query/5min vs 1 query/request)
+        - Lido dos contadores incrementais do tenant (apps.feedbacks.stats_counters):
+          criar/alterar/remover feedback aplica deltas, sem invalidar o cache
+        - Banco consultado apenas na primeira leitura (cached=false) e na
+          reconciliação periódica
         """
-        # ✅ OTIMIZAÇÃO FASE 3: Cache de 5 minutos
-        from django.core.cache import cache
-
         tenant = getattr(request, "tenant", None)
         if not tenant:
             return Response(
                 {"error": "Tenant não identificado"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        cache_key = f"dashboard_stats:{tenant.id}"
-
-        # Tentar buscar do cache primeiro
-        cached_stats = cache.get(cache_key)
-        if cached_stats:
-            cached_stats["cached"] = True  # Indicar que veio do cache
-            logger.debug(f"📊 Dashboard stats (CACHE HIT) | Tenant: {tenant.nome}")
-            return Response(cached_stats, status=status.HTTP_200_OK)
-
-        # Se não tem cache, calcular
-        queryset = self.get_queryset()
-        hoje_inicio = timezone.now() - timedelta(hours=24)
+        counters, rebuilt = get_counters(tenant.id)
+        stats = dashboard_kpis(counters)
 
-        # ✅ OTIMIZAÇÃO FASE 3: Agregação em 1 única query
-        from django.db.models import Count, Q
-
-        stats = queryset.aggregate(
-            total=Count("id"),
-            pendentes=Count("id", filter=Q(status="pendente")),
-            resolvidos=Count("id", filter=Q(status="resolvido")),
-            hoje=Count("id", filter=Q(data_criacao__gte=hoje_inicio)),
+        logger.debug(
+            f"📊 Dashboard stats ({'CALCULADO' if rebuilt else 'CONTADORES'}) | "
+            f"Tenant: {tenant.nome} | Total: {stats['total']}"
         )
 
-        total = stats["total"]
-        pendentes = stats["pendentes"]
-        resolvidos = stats["resolvidos"]
-        hoje = stats["hoje"]
-
-        # Calcular taxa de resolução
-        taxa_resolucao = f"{(resolvidos / total * 100):.1f}%" if total > 0 else "0%"
-
-        response_data = {
-            "total": total,
-            "pendentes": pendentes,
-            "resolvidos": resolvidos,
-            "hoje": hoje,
-            "taxa_resolucao": taxa_resolucao,
-            "cached": False,  # Indicar que é dado fresco
-        }
-
-        # ✅ Cachear por 5 minutos (300 segundos)
-        cache.set(cache_key, response_data, timeout=300)
-
-        logger.info(
-            f"📊 Dashboard stats (CALCULADO) | "
-            f"Tenant: {tenant.nome} | "
-            f"Total: {total} | Pendentes: {pendentes} | "
-            f"Resolvidos: {resolvidos} | Hoje: {hoje}"
-        )
-
-        return Response(response_data, status=status.HTTP_200_OK)
+        return Response({**stats, "cached": not rebuilt}, status=status.HTTP_200_OK)
 
     @action(
         detail=False,
@@ -629,10 +819,6 @@ class FeedbackViewSet(viewsets.ModelViewSet):
             "top_tags": [{"nome": "Bug", "count": 25}, {"nome": "UX", "count": 18}]
         }
         """
-        from django.core.cache import cache
-        from django.db.models import Avg, Count, Q
-        from django.db.models.functions import TruncDate
-
         tenant = getattr(request, "tenant", None)
         if not tenant:
             return Response(
@@ -644,13 +830,32 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         if periodo_dias not in [7, 30, 90]:
             periodo_dias = 30
 
-        cache_key = f"analytics:{tenant.id}:{periodo_dias}"
+        # Cache de 10 minutos protegido contra stampede (ver dashboard_stats)
+        computed = []
 
-        # Tentar cache primeiro
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            cached_data["cached"] = True
-            return Response(cached_data, status=status.HTTP_200_OK)
+        def compute():
+            computed.append(True)
+            return self._compute_analytics(tenant, periodo_dias)
+
+        service = CacheService(tenant_id=tenant.id)
+        data = service.get_or_set(
+            service._build_key(CacheService.ANALYTICS_PREFIX, periodo_dias),
+            compute,
+            timeout=600,
+            stale_ttl=300,
+        )
+
+        # Contagens (resumo/por_*) sempre atuais: vêm dos contadores
+        # incrementais; SLA, tendência e tags vêm do snapshot em cache
+        counters, _ = get_counters(tenant.id)
+        data = {**data, **period_counts(counters, periodo_dias)}
+
+        return Response({**data, "cached": not computed}, status=status.HTTP_200_OK)
+
+    def _compute_analytics(self, tenant, periodo_dias):
+        """Calcula as métricas do endpoint analytics para o período."""
+        from django.db.models import Avg
+        from django.db.models.functions import TruncDate
 
         # Calcular datas
         data_fim = timezone.now()
@@ -833,18 +1038,14 @@ class FeedbackViewSet(viewsets.ModelViewSet):
             "por_status": por_status,
             "tendencia": tendencia,
             "top_tags": top_tags,
-            "cached": False,
         }
 
-        # Cachear por 10 minutos
-        cache.set(cache_key, response_data, timeout=600)
-
         logger.info(
             f"📊 Analytics (CALCULADO) | Tenant: {tenant.nome} | "
             f"Período: {periodo_dias}d | Total: {resumo['total']}"
         )
 
-        return Response(response_data, status=status.HTTP_200_OK)
+        return response_data
 
     @action(
         detail=False,
@@ -1148,6 +1349,28 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         # Sanitizar input contra injeção
         codigo = sanitize_protocol_code(codigo)
 
+        not_found_response = Response(
+            {
+                "error": "Protocolo não encontrado",
+                "dica": "Verifique se o código foi digitado corretamente",
+            },
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+        # Código maior que o campo nunca existe: 404 sem tocar banco ou cache
+        if len(codigo) > Feedback._meta.get_field("protocolo").max_length:
+            return not_found_response
+
+        # ⚡ Caminho rápido: resposta já serializada por (tenant, protocolo),
+        # sem instanciar ORM. Protocolos inexistentes ficam em cache negativo
+        # com TTL curto e recebem o mesmo 404 genérico.
+        hit, cached_data = get_cached_consulta(tenant.pk, codigo)
+        if hit:
+            logger.debug("🔍 Consulta de protocolo (cache) | Tenant ID: %s", tenant.pk)
+            if cached_data is None:
+                return not_found_response
+            return Response(cached_data, status=status.HTTP_200_OK)
+
         try:
             # ✅ CORREÇÃO CRÍTICA: Filtrar EXPLICITAMENTE por tenant + protocolo
             # ANTES: Feedback.objects.all_tenants().get(protocolo=codigo)  # ❌ VULNERÁVEL
@@ -1155,10 +1378,13 @@ class FeedbackViewSet(viewsets.ModelViewSet):
             feedback = (
                 Feedback.objects.filter(client=tenant, protocolo=codigo)
                 .select_related("client", "autor")
+                .prefetch_related(*FeedbackConsultaSerializer.get_prefetches())
                 .first()
             )
 
             if not feedback:
+                set_cached_consulta(tenant.pk, codigo, None)
+
                 # Log de tentativa com protocolo inválido ou de outro tenant
                 client_ip = get_client_ip(request)
                 logger.warning(
@@ -1170,13 +1396,7 @@ class FeedbackViewSet(viewsets.ModelViewSet):
 
                 # ✅ IMPORTANTE: Erro genérico para não revelar se protocolo existe
                 # 🔒 SEGURANÇA: NÃO incluir o código na resposta (evita enumeração)
-                return Response(
-                    {
-                        "error": "Protocolo não encontrado",
-                        "dica": "Verifique se o código foi digitado corretamente",
-                    },
-                    status=status.HTTP_404_NOT_FOUND,
-                )
+                return not_found_response
 
             # Log de consulta bem-sucedida
             client_ip = get_client_ip(request)
@@ -1188,8 +1408,9 @@ class FeedbackViewSet(viewsets.ModelViewSet):
             )
 
             # Serializar apenas dados públicos
-            serializer = FeedbackConsultaSerializer(feedback)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            data = FeedbackConsultaSerializer(feedback).data
+            set_cached_consulta(tenant.pk, codigo, data)
+            return Response(data, status=status.HTTP_200_OK)
 
         except Exception as e:
             # Log de erro inesperado
@@ -1626,8 +1847,67 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(feedback)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Aplica status, prioridade, atribuição e tags a vários feedbacks.
+
+        POST /api/feedbacks/bulk/
+
+        Body:
+        {
+            "ids": [1, 2, 3],
+            "status": "em_analise",       // opcional
+            "prioridade": "alta",         // opcional
+            "assigned_to": 123,           // opcional (null desatribui)
+            "add_tags": [4],              // opcional
+            "remove_tags": [5],           // opcional
+            "mensagem": "Triagem"         // opcional (interação de status)
+        }
+
+        Uma transação com UPDATEs por operação (apps.feedbacks.bulk); caches,
+        contadores, webhook e e-mail são disparados uma vez para o lote.
+
+        Returns:
+        {
+            "results": [
+                {"id": 1, "result": "updated", "changes": ["status"]},
+                {"id": 2, "result": "unchanged", "changes": []},
+                {"id": 3, "result": "not_found", "changes": []}
+            ],
+            "updated": 1, "unchanged": 1, "not_found": 1
+        }
+        """
+        from .bulk import BulkUpdateError, aplicar_em_lote
+
+        tenant = get_current_tenant()
+        if not tenant:
+            return Response(
+                {"error": "Tenant não identificado"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = FeedbackBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        operacoes = dict(serializer.validated_data)
+        ids = operacoes.pop("ids")
+
+        try:
+            results = aplicar_em_lote(tenant, request.user, ids, operacoes)
+        except BulkUpdateError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-class TagViewSet(viewsets.ModelViewSet):
+        totals = Counter(item["result"] for item in results)
+        return Response(
+            {
+                "results": results,
+                "updated": totals["updated"],
+                "unchanged": totals["unchanged"],
+                "not_found": totals["not_found"],
+            }
+        )
+
+
+class TagViewSet(ConditionalResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciar Tags de categorização de feedbacks.
 
@@ -1638,15 +1918,24 @@ class TagViewSet(viewsets.ModelViewSet):
     - PUT /api/tags/{id}/ - Atualizar tag
     - DELETE /api/tags/{id}/ - Deletar tag
     - GET /api/tags/stats/ - Estatísticas de uso das tags
+
+    GET condicional (list/retrieve): versão "tags" do tenant, incrementada
+    quando tags ou seus vínculos com feedbacks mudam
     """
 
     serializer_class = TagSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = StandardResultsSetPagination
+    conditional_resource = "tags"
 
     def get_queryset(self):
-        """Retorna apenas tags do tenant atual, ordenadas por nome."""
-        return Tag.objects.prefetch_related("feedbacks").order_by("nome")
+        """
+        Retorna apenas tags do tenant atual, ordenadas por nome.
+
+        feedback_count é anotado na mesma query (tags_com_contagem),
+        sem consulta por tag no TagSerializer.
+        """
+        return tags_com_contagem().order_by("nome")
 
     def perform_create(self, serializer):
         """Salva a tag associando ao usuário criador."""
@@ -1658,7 +1947,7 @@ class TagViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         """Permite deletar tag apenas se não estiver em uso."""
         tag = self.get_object()
-        feedback_count = tag.feedbacks.count()
+        feedback_count = tag.feedback_count
 
         if feedback_count > 0:
             return Response(
@@ -1677,26 +1966,30 @@ class TagViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def stats(self, request):
-        """Retorna estatísticas de uso das tags."""
-        from django.db.models import Count
+        """
+        Retorna estatísticas de uso das tags.
 
-        tags = (
-            self.get_queryset()
-            .annotate(feedback_count=Count("feedbacks"))
-            .order_by("-feedback_count")
-        )
+        Usa a mesma contagem anotada da listagem em uma única query;
+        os totais são calculados sobre as tags já carregadas.
+        """
+        tags = list(self.get_queryset().order_by("-feedback_count", "nome"))
+        in_use = sum(1 for tag in tags if tag.feedback_count > 0)
 
         stats = {
-            "total_tags": tags.count(),
-            "tags_in_use": tags.filter(feedback_count__gt=0).count(),
-            "tags_unused": tags.filter(feedback_count=0).count(),
+            "total_tags": len(tags),
+            "tags_in_use": in_use,
+            "tags_unused": len(tags) - in_use,
             "most_used": TagSerializer(tags[:5], many=True).data,
         }
 
         return Response(stats)
 
 
-class ResponseTemplateViewSet(viewsets.ModelViewSet):
+# Listas de templates por tenant (invalidadas pelos signals de ResponseTemplate)
+response_templates_cache = TwoTierCache("feedbacks:response_templates")
+
+
+class ResponseTemplateViewSet(ConditionalResponseMixin, viewsets.ModelViewSet):
     """
     API para gerenciar Templates de Resposta pré-definidos.
 
@@ -1711,11 +2004,17 @@ class ResponseTemplateViewSet(viewsets.ModelViewSet):
     - DELETE /api/response-templates/{id}/ - Deletar template
     - POST /api/response-templates/render/ - Renderizar template com dados de feedback
     - GET /api/response-templates/by-category/ - Listar por categoria
+
+    GET condicional (list/retrieve/by-category): versão "response_templates"
+    do tenant + atualizado_em no retrieve
     """
 
     serializer_class = ResponseTemplateSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = StandardResultsSetPagination
+    conditional_resource = "response_templates"
+    conditional_actions = ("list", "retrieve", "by_category")
+    conditional_last_modified_field = "atualizado_em"
 
     def get_queryset(self):
         """Retorna apenas templates do tenant atual."""
@@ -1742,6 +2041,27 @@ class ResponseTemplateViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        """Lista templates; páginas em cache por tenant, host e filtros."""
+        tenant = get_current_tenant()
+        if tenant is None:
+            return super().list(request, *args, **kwargs)
+
+        parent_list = super().list
+
+        def render_page():
+            data = parent_list(request, *args, **kwargs).data
+            if isinstance(data, dict):
+                return {**data, "results": list(data["results"])}
+            return list(data)
+
+        params = sorted(request.query_params.lists())
+        key = "list:" + CacheService()._hash_params(
+            {"host": request.get_host(), "params": params}
+        )
+        data = response_templates_cache.get_or_set(key, render_page, scope=tenant.id)
+        return Response(data)
+
     def perform_create(self, serializer):
         """Salva o template associando ao usuário criador."""
         serializer.save(criado_por=self.request.user)
@@ -1825,7 +2145,18 @@ class ResponseTemplateViewSet(viewsets.ModelViewSet):
 
         Útil para exibir em dropdown/menu organizado.
         """
+        tenant = get_current_tenant()
+        if tenant is None:
+            return Response(self._group_by_category())
 
+        params = sorted(request.query_params.lists())
+        key = "by_category:" + CacheService()._hash_params({"params": params})
+        data = response_templates_cache.get_or_set(
+            key, self._group_by_category, scope=tenant.id
+        )
+        return Response(data)
+
+    def _group_by_category(self):
         templates = self.get_queryset().filter(ativo=True)
 
         # Agrupar por categoria
@@ -1846,7 +2177,7 @@ class ResponseTemplateViewSet(viewsets.ModelViewSet):
                 }
             )
 
-        return Response(list(categorias.values()))
+        return list(categorias.values())
 
     @action(detail=False, methods=["get"])
     def stats(self, request):
@@ -1867,3 +2198,53 @@ class ResponseTemplateViewSet(viewsets.ModelViewSet):
         }
 
         return Response(stats)
+
+
+class LocalDirectUploadView(APIView):
+    """
+    Substituto local do armazenamento para upload direto
+    (DIRECT_UPLOAD_BACKEND=local, desenvolvimento e testes).
+
+    PUT /api/uploads/local/<token>/ com o conteúdo do arquivo no corpo; o
+    token assinado é a autorização (tenant, chave e tamanho máximo).
+    """
+
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    parser_classes = []
+
+    # Bytes lidos por vez do corpo da requisição
+    CHUNK_SIZE = 64 * 1024
+
+    def put(self, request, token):
+        backend = get_upload_backend()
+        if backend.name != LocalUploadBackend.name:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        tenant = get_current_tenant()
+        try:
+            payload = read_token(token, getattr(tenant, "pk", None))
+        except DirectUploadError as e:
+            return Response({"error": e.message}, status=e.status_code)
+
+        stream = request.stream
+        with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as tmp:
+            size = 0
+            while stream is not None:
+                chunk = stream.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > payload["s"]:
+                    return Response(
+                        {"error": "Arquivo maior que o autorizado"},
+                        status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    )
+                tmp.write(chunk)
+            tmp.seek(0)
+            try:
+                backend.save(payload["k"], File(tmp))
+            except DirectUploadError as e:
+                return Response({"error": e.message}, status=e.status_code)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
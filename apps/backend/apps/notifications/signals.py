@@ -86,6 +86,16 @@ if FEEDBACKS_AVAILABLE and Feedback is not None:
     def feedback_post_save(sender, instance, created, **kwargs):
         _handle_feedback_notification(sender, instance, created, **kwargs)
 
+    # Mudança de status por interação (UPDATE direto, sem save)
+    from apps.feedbacks.interactions import interacao_registrada
+
+    @receiver(interacao_registrada)
+    def feedback_interacao_registrada(sender, feedback, status_anterior=None, **kwargs):
+        if not status_anterior:
+            return
+        feedback._previous_status = status_anterior
+        _handle_feedback_notification(Feedback, feedback, created=False)
+
     logger.info("Signals de notificação para Feedback registrados")
 else:
     logger.warning("Modelo Feedback não disponível - signals não registrados")
@@ -11,7 +11,8 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle
+
+from apps.core.throttling import UserRateThrottle
 
 from .models import Notification, NotificationPreference, PushSubscription
 from .serializers import (
@@ -136,6 +137,8 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
 
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    # Paginação por cursor opt-in (?cursor=) - índice (tenant, user, -sent_at)
+    cursor_ordering = ("sent_at", "id")
 
     def get_queryset(self):
         """Filtra notificações do usuário atual"""
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class TenantsConfig(AppConfig):
+    name = "apps.tenants"
+    verbose_name = "Tenants"
+
+    def ready(self):
+        """Registra signals quando o app é carregado."""
+        import apps.tenants.signals  # noqa: F401
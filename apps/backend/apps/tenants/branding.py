@@ -0,0 +1,234 @@
+"""
+Pipeline de imagens de branding (logo/favicon)
+
+O upload (UploadBrandingView) só valida o cabeçalho da imagem, grava o
+original em um BrandingAsset "pending" e agenda process_branding_asset.
+Em background:
+
+1. Decodifica o original uma única vez (JPEG com draft para reduzir a
+   escala já na decodificação), com o mesmo limite de pixels da validação
+2. Gera os tamanhos padrão em PNG (fallback, usado em emails), WebP e AVIF
+   (quando o Pillow tem suporte)
+3. Publica as variantes e, se ainda for o envio mais recente do tipo,
+   atualiza Client.logo/Client.favicon com o PNG principal
+"""
+
+import io
+import logging
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+from .models import BrandingAsset, Client
+from .upload_service import UploadService
+
+logger = logging.getLogger(__name__)
+
+# Tamanhos padrão: nome -> caixa (largura, altura)
+# Logo é reduzida proporcionalmente dentro da caixa (sem ampliar);
+# favicon é recortado no centro para o quadrado exato
+LOGO_SIZES = {
+    "lg": (UploadService.LOGO_MAX_WIDTH, UploadService.LOGO_MAX_HEIGHT),
+    "sm": (250, 100),
+}
+FAVICON_SIZES = {
+    str(UploadService.FAVICON_SIZE): (
+        UploadService.FAVICON_SIZE,
+        UploadService.FAVICON_SIZE,
+    ),
+    "192": (192, 192),
+    "32": (32, 32),
+}
+SIZES = {BrandingAsset.LOGO: LOGO_SIZES, BrandingAsset.FAVICON: FAVICON_SIZES}
+
+# Variante gravada em Client.logo/Client.favicon
+PRIMARY_SIZE = {
+    BrandingAsset.LOGO: "lg",
+    BrandingAsset.FAVICON: str(UploadService.FAVICON_SIZE),
+}
+PRIMARY_FORMAT = "png"
+
+ENCODER_OPTIONS = {
+    "png": {"format": "PNG", "optimize": True},
+    "webp": {"format": "WEBP", "quality": 85, "method": 4},
+    "avif": {"format": "AVIF", "quality": 60},
+}
+
+
+class BrandingImageError(Exception):
+    """Original não pode ser processado (não há o que tentar novamente)"""
+
+
+class RenderedVariant(NamedTuple):
+    size: str
+    format: str
+    width: int
+    height: int
+    content: bytes
+
+
+def output_formats() -> List[str]:
+    """Formatos gerados (AVIF depende do suporte do Pillow instalado)"""
+    formats = ["png", "webp"]
+    if features.check("avif"):
+        formats.append("avif")
+    return formats
+
+
+def _decode(fileobj, kind: str) -> Image.Image:
+    img = Image.open(fileobj)
+    width, height = img.size
+    if width * height > UploadService.MAX_SOURCE_PIXELS:
+        raise BrandingImageError("Resolução da imagem muito grande")
+
+    # JPEG: decodifica direto em escala reduzida (1/2, 1/4, 1/8)
+    # (caixa quadrada: a orientação EXIF pode trocar largura e altura)
+    largest = max(max(box) for box in SIZES[kind].values())
+    img.draft("RGB", (largest, largest))
+    img = ImageOps.exif_transpose(img)
+
+    has_alpha = "A" in img.getbands() or "transparency" in img.info
+    return img.convert("RGBA" if has_alpha else "RGB")
+
+
+def _resize(img: Image.Image, kind: str, box: Tuple[int, int]) -> Image.Image:
+    if kind == BrandingAsset.FAVICON:
+        return ImageOps.fit(img, box, Image.Resampling.LANCZOS)
+    variant = img.copy()
+    variant.thumbnail(box, Image.Resampling.LANCZOS)
+    return variant
+
+
+def render_variants(fileobj, kind: str) -> List[RenderedVariant]:
+    """
+    Gera todas as variantes de um original
+
+    Raises:
+        BrandingImageError: Imagem inválida, corrompida ou grande demais
+    """
+    try:
+        img = _decode(fileobj, kind)
+        rendered = []
+        for size, box in SIZES[kind].items():
+            variant = _resize(img, kind, box)
+            for fmt in output_formats():
+                buffer = io.BytesIO()
+                variant.save(buffer, **ENCODER_OPTIONS[fmt])
+                rendered.append(
+                    RenderedVariant(
+                        size, fmt, variant.width, variant.height, buffer.getvalue()
+                    )
+                )
+        return rendered
+    except BrandingImageError:
+        raise
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise BrandingImageError(f"Imagem inválida ou corrompida: {e}") from e
+
+
+def _discard_source(asset: BrandingAsset) -> None:
+    if asset.source:
+        try:
+            asset.source.delete(save=False)
+        except Exception as e:
+            logger.warning(f"⚠️ Original de branding {asset.pk} não removido: {e}")
+
+
+def _discard_variants(assets) -> None:
+    """Remove do Cloudinary as variantes de envios substituídos"""
+    for asset in assets:
+        for entry in asset.variants.values():
+            for fmt in ENCODER_OPTIONS:
+                if entry.get(fmt):
+                    UploadService.delete_image(entry[fmt])
+        BrandingAsset.objects.filter(pk=asset.pk).update(variants={})
+
+
+def mark_failed(asset: BrandingAsset, error: str) -> BrandingAsset:
+    """Marca o envio como falho e descarta o original"""
+    _discard_source(asset)
+    asset.status = BrandingAsset.FAILED
+    asset.error = error[:255]
+    asset.source = ""
+    asset.processed_at = timezone.now()
+    asset.save(update_fields=["status", "error", "source", "processed_at"])
+    logger.warning(
+        f"🖼️ Branding {asset.kind} do tenant {asset.client_id} falhou: {error}"
+    )
+    return asset
+
+
+def _publish(asset: BrandingAsset, rendered: List[RenderedVariant]) -> Dict:
+    subdominio = asset.client.subdominio
+    variants: Dict[str, Dict[str, Any]] = {}
+    for item in rendered:
+        entry = variants.setdefault(
+            item.size, {"width": item.width, "height": item.height}
+        )
+        entry[item.format] = UploadService.upload_variant(
+            item.content,
+            subdominio,
+            f"{asset.kind}_{subdominio}_{asset.pk}_{item.size}_{item.format}",
+        )
+    return variants
+
+
+def process_asset(asset_id: int) -> BrandingAsset:
+    """
+    Processa um BrandingAsset pendente
+
+    Erros de imagem marcam o envio como falho; erros ao publicar
+    (Cloudinary) são propagados para a task tentar novamente.
+    """
+    asset = BrandingAsset.objects.select_related("client").get(pk=asset_id)
+    if asset.status in (BrandingAsset.READY, BrandingAsset.FAILED):
+        return asset
+
+    BrandingAsset.objects.filter(pk=asset.pk).update(status=BrandingAsset.PROCESSING)
+    try:
+        with asset.source.open("rb") as fileobj:
+            rendered = render_variants(fileobj, asset.kind)
+    except BrandingImageError as e:
+        return mark_failed(asset, str(e))
+    except FileNotFoundError:
+        return mark_failed(asset, "Arquivo original não encontrado")
+
+    variants = _publish(asset, rendered)
+
+    with transaction.atomic():
+        client = Client.objects.select_for_update().get(pk=asset.client_id)
+        # Só um envio mais novo já publicado prevalece; se ele ainda estiver
+        # pendente, será aplicado depois deste
+        ready = BrandingAsset.objects.filter(
+            client=client, kind=asset.kind, status=BrandingAsset.READY
+        )
+        applied = not ready.filter(pk__gt=asset.pk).exists()
+        replaced: List[BrandingAsset] = []
+        if applied:
+            replaced = list(ready.filter(pk__lt=asset.pk))
+            url = variants[PRIMARY_SIZE[asset.kind]][PRIMARY_FORMAT]
+            setattr(client, asset.kind, url)
+            # O signal post_save do Client invalida o cache de tenant-info
+            client.save(update_fields=[asset.kind, "data_atualizacao"])
+
+        _discard_source(asset)
+        asset.status = BrandingAsset.READY
+        asset.variants = variants
+        asset.source = ""
+        asset.error = ""
+        asset.processed_at = timezone.now()
+        asset.save(
+            update_fields=["status", "variants", "source", "error", "processed_at"]
+        )
+
+    # Variantes que não estão mais em uso: as do envio anterior, ou as
+    # deste se um envio mais novo foi publicado durante o processamento
+    stale = replaced if applied else [asset]
+    transaction.on_commit(lambda: _discard_variants(stale))
+    logger.info(
+        f"🖼️ Branding {asset.kind} do tenant {client.subdominio} processado: "
+        f"{len(rendered)} variantes{'' if applied else ' (substituído)'}"
+    )
+    return asset
@@ -0,0 +1,116 @@
+# Generated by Django 5.1.15 on 2026-10-19 16:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tenants", "0008_add_email_notifications_preference"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BrandingAsset",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("logo", "Logo"), ("favicon", "Favicon")],
+                        max_length=10,
+                        verbose_name="Tipo",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pendente"),
+                            ("processing", "Processando"),
+                            ("ready", "Pronto"),
+                            ("failed", "Falhou"),
+                        ],
+                        default="pending",
+                        max_length=12,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "source",
+                    models.FileField(
+                        blank=True,
+                        help_text="Arquivo enviado; removido após o processamento",
+                        upload_to="branding/sources/%Y/%m/",
+                        verbose_name="Original",
+                    ),
+                ),
+                (
+                    "variants",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="URLs por tamanho e formato (png/webp/avif)",
+                        verbose_name="Variantes",
+                    ),
+                ),
+                (
+                    "error",
+                    models.CharField(blank=True, max_length=255, verbose_name="Erro"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Criado Em"),
+                ),
+                (
+                    "processed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Processado Em"
+                    ),
+                ),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="branding_assets",
+                        to="tenants.client",
+                        verbose_name="Cliente",
+                    ),
+                ),
+                (
+                    "uploaded_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="branding_uploads",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Enviado Por",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Imagem de Branding",
+                "verbose_name_plural": "Imagens de Branding",
+                "db_table": "tenants_branding_asset",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["client", "kind", "-created_at"],
+                        name="tenants_bra_client__6ea7a3_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-19 16:55
+
+from django.db import migrations, models
+
+import apps.tenants.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tenants", "0009_brandingasset"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="brandingasset",
+            name="source",
+            field=models.FileField(
+                blank=True,
+                help_text="Arquivo enviado; removido após o processamento",
+                storage=apps.tenants.models.branding_source_storage,
+                upload_to="branding/sources/%Y/%m/",
+                verbose_name="Original",
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.core.files.storage import storages
 from django.core.validators import RegexValidator
 from django.db import models
 from django.utils import timezone
@@ -743,3 +744,94 @@ class TeamInvitation(models.Model):
         if self.is_expired:
             self.status = self.EXPIRED
             self.save()
+
+
+def branding_source_storage():
+    """Storage compartilhado entre API e worker (STORAGES["branding_sources"])"""
+    return storages["branding_sources"]
+
+
+class BrandingAsset(models.Model):
+    """
+    Imagem de branding (logo/favicon) enviada e processada em background.
+
+    O upload só valida o cabeçalho e grava o original; a task
+    process_branding_asset gera as variantes (PNG/WebP/AVIF nos tamanhos
+    padrão) e então atualiza Client.logo/Client.favicon.
+    """
+
+    LOGO = "logo"
+    FAVICON = "favicon"
+
+    KIND_CHOICES = [
+        (LOGO, "Logo"),
+        (FAVICON, "Favicon"),
+    ]
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pendente"),
+        (PROCESSING, "Processando"),
+        (READY, "Pronto"),
+        (FAILED, "Falhou"),
+    ]
+
+    client = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        related_name="branding_assets",
+        verbose_name="Cliente",
+    )
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, verbose_name="Tipo")
+
+    status = models.CharField(
+        max_length=12, choices=STATUS_CHOICES, default=PENDING, verbose_name="Status"
+    )
+
+    source = models.FileField(
+        upload_to="branding/sources/%Y/%m/",
+        storage=branding_source_storage,
+        blank=True,
+        verbose_name="Original",
+        help_text="Arquivo enviado; removido após o processamento",
+    )
+
+    variants = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Variantes",
+        help_text="URLs por tamanho e formato (png/webp/avif)",
+    )
+
+    error = models.CharField(max_length=255, blank=True, verbose_name="Erro")
+
+    uploaded_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="branding_uploads",
+        verbose_name="Enviado Por",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado Em")
+    processed_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Processado Em"
+    )
+
+    class Meta:
+        db_table = "tenants_branding_asset"
+        verbose_name = "Imagem de Branding"
+        verbose_name_plural = "Imagens de Branding"
+        indexes = [
+            models.Index(fields=["client", "kind", "-created_at"]),
+        ]
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} de {self.client_id} ({self.status})"
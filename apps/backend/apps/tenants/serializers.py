@@ -6,7 +6,7 @@ from rest_framework import serializers
 
 from apps.core.validators import validate_strong_password, validate_subdomain
 
-from .models import Client, TeamInvitation, TeamMember
+from .models import BrandingAsset, Client, TeamInvitation, TeamMember
 
 
 class ClientPublicSerializer(serializers.ModelSerializer):
@@ -490,3 +490,22 @@ class AcceptInvitationSerializer(serializers.Serializer):
 
         team_member = invitation.accept(user)
         return {"user": user, "team_member": team_member, "invitation": invitation}
+
+
+class BrandingAssetSerializer(serializers.ModelSerializer):
+    """
+    Estado de uma imagem de branding enviada (pending → ready/failed).
+    """
+
+    class Meta:
+        model = BrandingAsset
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "variants",
+            "error",
+            "created_at",
+            "processed_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,22 @@
+"""
+Tenant Signals - Ouvify
+
+Invalida o cache e os ETags dos dados públicos (branding) quando o Client muda.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.conditional import bump_resource_version
+
+from .models import Client
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def invalidate_public_info_cache(sender, instance, **kwargs):
+    """Branding/dados públicos alterados: invalida o cache do tenant."""
+    from .views import public_info_cache
+
+    public_info_cache.invalidate(scope=instance.pk)
+    bump_resource_version("tenant_info", instance.pk)
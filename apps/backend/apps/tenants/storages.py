@@ -0,0 +1,73 @@
+"""
+Storages de arquivos do app tenants
+
+PrivateRawCloudinaryStorage guarda os originais de branding
+(BrandingAsset.source): gravados pela API e lidos pela task no worker, que
+roda em outro dyno, sem acesso ao disco da API. Também guarda os arquivos da
+retenção do audit log (STORAGES["auditlog_archive"]).
+"""
+
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class PrivateRawCloudinaryStorage(Storage):
+    """
+    Arquivos como recurso raw privado no Cloudinary (type=private)
+
+    Sem URL pública: leitura por URL de download assinada (Admin API).
+    """
+
+    OPTIONS = {"resource_type": "raw", "type": "private"}
+
+    def _save(self, name, content):
+        import cloudinary.uploader
+
+        content.seek(0)
+        response = cloudinary.uploader.upload(
+            content, public_id=name, overwrite=False, **self.OPTIONS
+        )
+        return response["public_id"]
+
+    def _open(self, name, mode="rb"):
+        import requests
+
+        response = requests.get(self.url(name), timeout=30)
+        if response.status_code == 404:
+            raise FileNotFoundError(name)
+        response.raise_for_status()
+        return ContentFile(response.content, name=name)
+
+    def get_available_name(self, name, max_length=None):
+        # Sufixo aleatório em vez de consultar exists() a cada envio
+        root, ext = os.path.splitext(name.replace("\\", "/"))
+        name = self.get_alternative_name(root, ext)
+        return name[-max_length:] if max_length else name
+
+    def delete(self, name):
+        import cloudinary.uploader
+
+        cloudinary.uploader.destroy(name, invalidate=True, **self.OPTIONS)
+
+    def exists(self, name):
+        import cloudinary.api
+
+        try:
+            cloudinary.api.resource(name, **self.OPTIONS)
+        except cloudinary.api.NotFound:
+            return False
+        return True
+
+    def size(self, name):
+        import cloudinary.api
+
+        return int(cloudinary.api.resource(name, **self.OPTIONS)["bytes"])
+
+    def url(self, name):
+        import cloudinary.utils
+
+        return cloudinary.utils.private_download_url(name, "", **self.OPTIONS)
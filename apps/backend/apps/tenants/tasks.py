@@ -0,0 +1,40 @@
+"""
+Celery tasks de tenants
+
+Tasks disponíveis:
+- process_branding_asset: Gera as variantes de logo/favicon enviados
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def process_branding_asset(self, asset_id: int):
+    """
+    Processa uma imagem de branding pendente (ver apps.tenants.branding)
+
+    Args:
+        asset_id: ID do BrandingAsset
+
+    Returns:
+        str: Status final do BrandingAsset
+    """
+    from .branding import mark_failed, process_asset
+    from .models import BrandingAsset
+
+    try:
+        return process_asset(asset_id).status
+    except BrandingAsset.DoesNotExist:
+        logger.warning(f"🖼️ BrandingAsset {asset_id} não encontrado")
+        return None
+    except Exception as e:
+        # Falha ao publicar (Cloudinary): tentar novamente
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        logger.error(f"Erro ao processar branding {asset_id}: {e}")
+        asset = BrandingAsset.objects.get(pk=asset_id)
+        return mark_failed(asset, "Falha ao publicar as imagens").status
@@ -10,11 +10,11 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 from rest_framework_simplejwt.tokens import RefreshToken
 
 # ✅ CORREÇÃO RBAC (2026-02-05): Importar permissions customizadas
 from apps.core.permissions import IsOwnerOrAdmin
+from apps.core.throttling import AnonRateThrottle
 
 from .decorators import require_permission
 from .mixins import PermissionRequiredMixin, TenantFilterMixin
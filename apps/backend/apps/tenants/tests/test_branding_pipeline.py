@@ -0,0 +1,282 @@
+"""
+Testes do pipeline assíncrono de branding (apps.tenants.branding)
+Cobertura: validação só pelo cabeçalho, limite de pixels, variantes
+PNG/WebP/AVIF nos tamanhos padrão, estado pending → ready/failed, envios
+concorrentes e original lido pelo worker em outro storage
+"""
+
+import io
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+import cloudinary
+import pytest
+from celery.exceptions import Retry
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from apps.tenants import branding
+from apps.tenants.models import BrandingAsset, Client
+from apps.tenants.storages import PrivateRawCloudinaryStorage
+from apps.tenants.tasks import process_branding_asset
+from apps.tenants.upload_service import UploadService
+
+pytestmark = pytest.mark.django_db
+
+UPLOAD_URL = "/api/upload-branding/"
+
+
+def image_bytes(size=(100, 100), format="PNG", mode="RGB"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, color="red" if mode == "RGB" else None).save(
+        buffer, format=format
+    )
+    return buffer.getvalue()
+
+
+def fake_upload(content, tenant_subdomain, public_id):
+    return f"https://res.cloudinary.com/test/image/upload/v1/{public_id}"
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def upload_variant():
+    with patch.object(
+        UploadService, "upload_variant", side_effect=fake_upload
+    ) as mocked:
+        yield mocked
+
+
+def make_asset(tenant, kind=BrandingAsset.LOGO, content=None):
+    asset = BrandingAsset(client=tenant, kind=kind)
+    asset.source.save(f"{kind}.png", ContentFile(content or image_bytes()))
+    return asset
+
+
+class TestHeaderOnlyValidation:
+    def test_validates_without_decoding_pixels(self):
+        upload = SimpleUploadedFile("logo.png", image_bytes((1600, 600)))
+
+        with patch.object(Image.Image, "load", side_effect=AssertionError):
+            is_valid, error = UploadService.validate_image(upload, max_size_mb=2)
+
+        assert (is_valid, error) == (True, None)
+        assert upload.tell() == 0
+
+    def test_rejects_too_many_pixels(self):
+        upload = SimpleUploadedFile("logo.png", image_bytes((200, 200)))
+
+        with patch.object(UploadService, "MAX_SOURCE_PIXELS", 100 * 100):
+            is_valid, error = UploadService.validate_image(upload, max_size_mb=2)
+
+        assert is_valid is False
+        assert "resolução" in error.lower()
+
+    def test_rejects_extension_not_matching_content(self):
+        upload = SimpleUploadedFile("logo.jpg", image_bytes(format="PNG"))
+
+        is_valid, error = UploadService.validate_image(upload, max_size_mb=2)
+
+        assert is_valid is False
+        assert "corresponde" in error
+
+
+class TestRenderVariants:
+    def test_logo_reduced_into_standard_boxes(self):
+        source = io.BytesIO(image_bytes((2000, 800), format="JPEG"))
+
+        rendered = branding.render_variants(source, BrandingAsset.LOGO)
+
+        sizes = {(item.size, item.format): item for item in rendered}
+        assert {fmt for _, fmt in sizes} == set(branding.output_formats())
+        assert "webp" in branding.output_formats()
+        assert (sizes["lg", "png"].width, sizes["lg", "png"].height) == (1000, 400)
+        assert (sizes["sm", "webp"].width, sizes["sm", "webp"].height) == (250, 100)
+        for (_, fmt), item in sizes.items():
+            assert Image.open(io.BytesIO(item.content)).format == fmt.upper()
+
+    def test_favicon_cropped_square_keeps_alpha(self):
+        source = io.BytesIO(image_bytes((600, 580), mode="RGBA"))
+
+        rendered = branding.render_variants(source, BrandingAsset.FAVICON)
+
+        pngs = [item for item in rendered if item.format == "png"]
+        assert [(item.width, item.height) for item in pngs] == [
+            (512, 512),
+            (192, 192),
+            (32, 32),
+        ]
+        assert Image.open(io.BytesIO(pngs[0].content)).mode == "RGBA"
+
+    def test_corrupt_image_raises(self):
+        truncated = image_bytes((300, 300))[:120]
+
+        with pytest.raises(branding.BrandingImageError):
+            branding.render_variants(io.BytesIO(truncated), BrandingAsset.LOGO)
+
+
+class TestProcessAsset:
+    def test_ready_updates_client_and_discards_source(
+        self, tenant, upload_variant, media_root
+    ):
+        asset = make_asset(tenant)
+
+        branding.process_asset(asset.pk)
+
+        asset.refresh_from_db()
+        tenant.refresh_from_db()
+        assert asset.status == BrandingAsset.READY
+        assert not asset.source
+        assert not any(path.is_file() for path in media_root.rglob("*"))
+        assert tenant.logo == asset.variants["lg"]["png"]
+        assert tenant.logo.endswith(f"logo_{tenant.subdominio}_{asset.pk}_lg_png")
+
+    def test_invalid_source_marks_failed(self, tenant, upload_variant):
+        asset = make_asset(tenant, content=b"\x89PNG\r\n\x1a\n" + b"\x00" * 200)
+
+        branding.process_asset(asset.pk)
+
+        asset.refresh_from_db()
+        assert asset.status == BrandingAsset.FAILED
+        assert asset.error
+        upload_variant.assert_not_called()
+        assert Client.objects.get(pk=tenant.pk).logo in (None, "")
+
+    def test_older_upload_finishing_late_does_not_win(
+        self, tenant, upload_variant, django_capture_on_commit_callbacks
+    ):
+        older = make_asset(tenant)
+        newer = make_asset(tenant)
+
+        branding.process_asset(newer.pk)
+        with patch.object(UploadService, "delete_image") as delete_image:
+            with django_capture_on_commit_callbacks(execute=True):
+                branding.process_asset(older.pk)
+
+        tenant.refresh_from_db()
+        newer.refresh_from_db()
+        older.refresh_from_db()
+        assert tenant.logo == newer.variants["lg"]["png"]
+        assert older.variants == {}
+        assert delete_image.call_count == 2 * len(branding.output_formats())
+
+    def test_publish_failure_retried_then_failed(self, tenant, upload_variant):
+        upload_variant.side_effect = ConnectionError("cloudinary fora")
+        asset = make_asset(tenant, kind=BrandingAsset.FAVICON)
+
+        with pytest.raises(Retry):
+            process_branding_asset.apply(args=[asset.pk], throw=True)
+        asset.refresh_from_db()
+        assert asset.status == BrandingAsset.PROCESSING
+        assert asset.source
+
+        # Última tentativa: desiste e descarta o original
+        result = process_branding_asset.apply(args=[asset.pk], retries=3)
+
+        asset.refresh_from_db()
+        assert result.get() == BrandingAsset.FAILED
+        assert asset.status == BrandingAsset.FAILED
+        assert not asset.source
+
+
+class TestSourceStorage:
+    """O original é gravado pela API e lido pelo worker (outro processo)"""
+
+    @pytest.fixture
+    def remote(self):
+        """Cloudinary simulado: a única coisa compartilhada entre processos"""
+        objects = {}
+
+        def upload(content, public_id, **options):
+            assert options["type"] == "private"
+            objects[public_id] = content.read()
+            return {"public_id": public_id}
+
+        def download(url, timeout):
+            public_id = parse_qs(urlparse(url).query)["public_id"][0]
+            if public_id not in objects:
+                return MagicMock(status_code=404)
+            return MagicMock(status_code=200, content=objects[public_id])
+
+        config = cloudinary.Config()
+        config.update(cloud_name="demo", api_key="key", api_secret="secret")
+        with (
+            patch("cloudinary.config", return_value=config),
+            patch("cloudinary.uploader.upload", side_effect=upload),
+            patch(
+                "cloudinary.uploader.destroy",
+                side_effect=lambda name, **kwargs: objects.pop(name, None),
+            ),
+            patch("requests.get", side_effect=download),
+        ):
+            yield objects
+
+    def test_field_uses_shared_storage_alias(self):
+        field = BrandingAsset._meta.get_field("source")
+
+        assert field.storage is storages["branding_sources"]
+
+    def test_worker_reads_source_written_by_another_storage(
+        self, tenant, upload_variant, remote
+    ):
+        field = BrandingAsset._meta.get_field("source")
+        web, worker = PrivateRawCloudinaryStorage(), PrivateRawCloudinaryStorage()
+
+        with patch.object(field, "storage", web):
+            asset = make_asset(tenant)
+        assert list(remote) == [asset.source.name]
+
+        with patch.object(field, "storage", worker):
+            asset = branding.process_asset(asset.pk)
+
+        assert asset.status == BrandingAsset.READY
+        assert asset.variants["lg"]["png"]
+        assert remote == {}
+
+
+class TestUploadBrandingView:
+    def test_returns_pending_and_processes_in_background(
+        self,
+        authenticated_api_client,
+        authenticated_user,
+        upload_variant,
+        django_capture_on_commit_callbacks,
+    ):
+        _, tenant = authenticated_user
+        logo = SimpleUploadedFile("logo.png", image_bytes((1200, 500)))
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            response = authenticated_api_client.post(
+                UPLOAD_URL, {"logo": logo}, format="multipart"
+            )
+
+        assert response.status_code == 202
+        assert response.data["logo"]["status"] == BrandingAsset.PENDING
+        assert response.data["favicon"] is None
+        assert len(callbacks) == 1
+        upload_variant.assert_not_called()
+
+        callbacks[0]()
+
+        status = authenticated_api_client.get(UPLOAD_URL).data
+        tenant.refresh_from_db()
+        assert status["logo"]["status"] == BrandingAsset.READY
+        assert tenant.logo == status["logo"]["variants"]["lg"]["png"]
+
+    def test_invalid_files_rejected_synchronously(self, authenticated_api_client):
+        favicon = SimpleUploadedFile("favicon.png", image_bytes((200, 100)))
+
+        response = authenticated_api_client.post(
+            UPLOAD_URL, {"favicon": favicon}, format="multipart"
+        )
+
+        assert response.status_code == 400
+        assert response.data["errors"][0]["field"] == "favicon"
+        assert not BrandingAsset.objects.exists()
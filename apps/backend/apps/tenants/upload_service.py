@@ -3,6 +3,7 @@ Serviço de upload de imagens para White Label usando Cloudinary.
 ATUALIZADO: Auditoria Fase 2 - Validação de MIME type adicionada (26/01/2026)
 """
 
+import io
 import logging
 import os
 from typing import Optional, Tuple
@@ -38,6 +39,9 @@ class UploadService:
     LOGO_MAX_HEIGHT = 400
     FAVICON_SIZE = 512  # Favicon quadrado
 
+    # Limite de pixels do original (logos maiores são reduzidas na task)
+    MAX_SOURCE_PIXELS = 4096 * 4096
+
     # ===================================================
     # FORMATOS PERMITIDOS - Auditoria Fase 2 (26/01/2026)
     # ===================================================
@@ -121,7 +125,10 @@ class UploadService:
         cls, file, max_size_mb: int, is_favicon: bool = False
     ) -> Tuple[bool, Optional[str]]:
         """
-        Valida arquivo de imagem.
+        Valida arquivo de imagem lendo apenas o cabeçalho.
+
+        Logos maiores que LOGO_MAX_WIDTH x LOGO_MAX_HEIGHT são aceitas (a
+        task de branding as reduz); o limite é MAX_SOURCE_PIXELS.
 
         Args:
             file: Arquivo uploaded (InMemoryUploadedFile ou TemporaryUploadedFile)
@@ -147,40 +154,39 @@ class UploadService:
                 f"Formato não suportado. Use: {', '.join(cls.ALLOWED_FORMATS)}",
             )
 
-        # ✅ NOVO: Validação de MIME type (magic bytes) - Auditoria Fase 2
-        is_valid_mime, mime_error = cls.validate_mime_type(file)
-        if not is_valid_mime:
-            return False, mime_error
-
-        # Validar se é imagem válida (PIL)
+        # Uma única leitura do cabeçalho (Image.open é preguiçoso): formato
+        # real pelos magic bytes e dimensões, sem descomprimir os pixels.
+        # A decodificação completa fica para a task de processamento.
         try:
-            img = Image.open(file)
-            img.verify()
-
-            # Reabrir para verificar dimensões
-            file.seek(0)
-            img = Image.open(file)
-            width, height = img.size
-
-            if is_favicon:
-                # Favicon deve ser quadrado ou próximo disso
-                aspect_ratio = width / height
-                if not (0.9 <= aspect_ratio <= 1.1):
-                    return False, "Favicon deve ser uma imagem quadrada"
-            else:
-                # Logo não deve ser muito alto
-                if width > cls.LOGO_MAX_WIDTH or height > cls.LOGO_MAX_HEIGHT:
-                    return (
-                        False,
-                        f"Dimensões muito grandes. Máximo: {cls.LOGO_MAX_WIDTH}x{cls.LOGO_MAX_HEIGHT}px",
-                    )
-
-            # Resetar ponteiro do arquivo
-            file.seek(0)
-
+            with Image.open(file) as img:
+                width, height = img.size
+                mime_type = Image.MIME.get(img.format or "", "")
+        except Image.DecompressionBombError:
+            return False, "Resolução da imagem muito grande"
         except Exception as e:
             logger.error(f"Erro ao validar imagem: {str(e)}")
             return False, "Arquivo de imagem inválido ou corrompido"
+        finally:
+            file.seek(0)
+
+        if mime_type not in cls.ALLOWED_MIME_TYPES:
+            return False, f"Tipo de arquivo não permitido: {mime_type or img.format}"
+        if file_ext not in cls.ALLOWED_MIME_TYPES[mime_type]:
+            return False, (
+                f"Extensão '{file_ext}' não corresponde ao tipo real '{mime_type}'"
+            )
+
+        # Proteção contra decompression bomb (arquivo pequeno, pixels demais)
+        if width * height > cls.MAX_SOURCE_PIXELS:
+            return False, (
+                f"Resolução muito grande. Máximo: {cls.MAX_SOURCE_PIXELS} pixels"
+            )
+
+        if is_favicon:
+            # Favicon deve ser quadrado ou próximo disso
+            aspect_ratio = width / height
+            if not (0.9 <= aspect_ratio <= 1.1):
+                return False, "Favicon deve ser uma imagem quadrada"
 
         return True, None
 
@@ -290,6 +296,31 @@ class UploadService:
             logger.error(error_msg)
             return False, None, error_msg
 
+    @classmethod
+    def upload_variant(
+        cls, content: bytes, tenant_subdomain: str, public_id: str
+    ) -> str:
+        """
+        Envia uma variante já processada (sem transformações no Cloudinary).
+
+        Args:
+            content: Bytes da imagem codificada (PNG/WebP/AVIF)
+            tenant_subdomain: Subdomínio do tenant
+            public_id: Nome da variante (ex: logo_empresa_lg)
+
+        Returns:
+            URL segura da imagem
+        """
+        cls.configure()
+        result = cloudinary.uploader.upload(
+            io.BytesIO(content),
+            folder=f"ouvify/tenants/{tenant_subdomain}",
+            public_id=public_id,
+            overwrite=True,
+            resource_type="image",
+        )
+        return result["secure_url"]
+
     @classmethod
     def delete_image(cls, url: str) -> bool:
         """
@@ -5,19 +5,20 @@ from typing import Any, Dict, cast
 import stripe
 from django.contrib.auth.models import User
 from django.db import transaction
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from apps.core.throttling import TenantRegistrationThrottle
-from .models import Client
+from apps.core.conditional import ConditionalResponseMixin
+from apps.core.throttling import AnonRateThrottle, TenantRegistrationThrottle
+from apps.core.two_tier_cache import TwoTierCache
+from .models import BrandingAsset, Client
 from .serializers import (
+    BrandingAssetSerializer,
     ClientBrandingSerializer,
     ClientPublicSerializer,
     ClientSerializer,
@@ -50,7 +51,11 @@ class CheckSubdominioRateThrottle(AnonRateThrottle):
     scope = "tenant_subdomain_check"
 
 
-class TenantInfoView(APIView):
+# Dados públicos/branding por tenant (invalidado pelo signal post_save do Client)
+public_info_cache = TwoTierCache("tenants:public_info", timeout=60 * 60)
+
+
+class TenantInfoView(ConditionalResponseMixin, APIView):
     """
     Retorna os dados públicos da empresa atual baseada no subdomínio.
     Acessível publicamente (não precisa de login) para GET.
@@ -62,7 +67,11 @@ class TenantInfoView(APIView):
     O TenantMiddleware já identificou a empresa e injetou no request.
     Esta view apenas serializa e retorna essas informações.
 
-    Cache: 5 minutos (informações públicas mudam raramente)
+    Cache: em dois níveis por tenant (memória do processo + Redis),
+    invalidado quando o Client é salvo
+
+    GET condicional: ETag de data_atualizacao + versão "tenant_info" do
+    tenant; If-None-Match → 304 sem serializar
 
     ATUALIZADO (Auditoria Fase 2 - 26/01/2026):
     - Adicionado rate limiting (100/hour anônimo, 1000/hour autenticado)
@@ -71,6 +80,8 @@ class TenantInfoView(APIView):
     """
 
     throttle_classes = [TenantInfoRateThrottle]  # ✅ NOVO: Rate limiting
+    conditional_resource = "tenant_info"
+    conditional_actions = ("get",)
 
     def get_permissions(self):
         """GET é público, PATCH requer autenticação"""
@@ -78,7 +89,13 @@ class TenantInfoView(APIView):
             return [AllowAny()]
         return [IsAuthenticated()]
 
-    @method_decorator(cache_page(60 * 5))  # Cache de 5 minutos
+    def get_conditional_validator(self, request, *args, **kwargs):
+        """Data de atualização do tenant já carregado pelo middleware."""
+        tenant = getattr(request, "tenant", None)
+        if tenant is None:
+            return None
+        return tenant.data_atualizacao
+
     def get(self, request):
         # O TenantMiddleware já injetou o 'tenant' dentro do request
         tenant = getattr(request, "tenant", None)
@@ -93,8 +110,12 @@ class TenantInfoView(APIView):
             )
 
         # Transforma o objeto Python em JSON seguro
-        serializer = ClientPublicSerializer(tenant)
-        return Response(serializer.data)
+        data = public_info_cache.get_or_set(
+            "public",
+            lambda: dict(ClientPublicSerializer(tenant).data),
+            scope=tenant.pk,
+        )
+        return Response(data)
 
     def patch(self, request):
         """
@@ -154,14 +175,9 @@ class TenantInfoView(APIView):
         serializer = ClientBrandingSerializer(tenant, data=request.data, partial=True)
 
         if serializer.is_valid():
+            # O signal post_save do Client invalida public_info_cache
             serializer.save()
 
-            # Limpar cache após atualização
-            from django.core.cache import cache
-
-            cache_key = f"tenant_info_{tenant.subdominio}"
-            cache.delete(cache_key)
-
             # Retornar dados atualizados
             return Response(
                 ClientPublicSerializer(tenant).data, status=status.HTTP_200_OK
@@ -181,14 +197,21 @@ class UploadBrandingView(APIView):
         - logo: arquivo de imagem (opcional)
         - favicon: arquivo de imagem (opcional)
 
-    Retorna URLs das imagens após upload no Cloudinary.
+    Valida só o cabeçalho das imagens, grava os originais e responde 202
+    com os envios em estado "pending". As variantes (PNG/WebP/AVIF nos
+    tamanhos padrão) são geradas pela task process_branding_asset, que
+    então atualiza logo/favicon do tenant.
+
+    GET /api/upload-branding/
+    Estado do envio mais recente de cada tipo (pending/processing/ready/
+    failed) e as URLs das variantes.
     """
 
     permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
 
-    def post(self, request):
-        tenant = getattr(request, "tenant", None)
-
+    def _denied(self, request, tenant):
+        """Resposta de erro se o usuário não pode alterar o branding."""
         if not tenant:
             return Response(
                 {
@@ -199,42 +222,69 @@ class UploadBrandingView(APIView):
             )
 
         # Restringir upload de branding a OWNER/ADMIN (ou superuser)
-        if not getattr(request.user, "is_superuser", False):
-            is_owner = getattr(tenant, "owner_id", None) == getattr(
-                request.user, "id", None
+        if getattr(request.user, "is_superuser", False):
+            return None
+        is_owner = getattr(tenant, "owner_id", None) == getattr(
+            request.user, "id", None
+        )
+        if is_owner:
+            return None
+        try:
+            from apps.tenants.models import TeamMember
+
+            membership = (
+                TeamMember.objects.filter(
+                    user=request.user,
+                    client=tenant,
+                    status=TeamMember.ACTIVE,
+                )
+                .only("role")
+                .first()
             )
-            if not is_owner:
-                try:
-                    from apps.tenants.models import TeamMember
+            if not membership or membership.role not in (
+                TeamMember.OWNER,
+                TeamMember.ADMIN,
+            ):
+                return Response(
+                    {
+                        "detail": "Você não tem permissão para modificar este tenant.",
+                        "error": "permission_denied",
+                    },
+                    status=403,
+                )
+        except Exception:
+            return Response(
+                {
+                    "detail": "Não foi possível validar permissão para modificar este tenant.",
+                    "error": "permission_denied",
+                },
+                status=403,
+            )
+        return None
 
-                    membership = (
-                        TeamMember.objects.filter(
-                            user=request.user,
-                            client=tenant,
-                            status=TeamMember.ACTIVE,
-                        )
-                        .only("role")
-                        .first()
-                    )
-                    if not membership or membership.role not in (
-                        TeamMember.OWNER,
-                        TeamMember.ADMIN,
-                    ):
-                        return Response(
-                            {
-                                "detail": "Você não tem permissão para modificar este tenant.",
-                                "error": "permission_denied",
-                            },
-                            status=403,
-                        )
-                except Exception:
-                    return Response(
-                        {
-                            "detail": "Não foi possível validar permissão para modificar este tenant.",
-                            "error": "permission_denied",
-                        },
-                        status=403,
-                    )
+    def get(self, request):
+        tenant = getattr(request, "tenant", None)
+        denied = self._denied(request, tenant)
+        if denied:
+            return denied
+
+        result = {}
+        for kind, _ in BrandingAsset.KIND_CHOICES:
+            asset = (
+                BrandingAsset.objects.filter(client=tenant, kind=kind)
+                .order_by("-pk")
+                .first()
+            )
+            result[kind] = BrandingAssetSerializer(asset).data if asset else None
+        return Response(result)
+
+    def post(self, request):
+        from .tasks import process_branding_asset
+
+        tenant = getattr(request, "tenant", None)
+        denied = self._denied(request, tenant)
+        if denied:
+            return denied
 
         logo_file = request.FILES.get("logo")
         favicon_file = request.FILES.get("favicon")
@@ -248,50 +298,51 @@ class UploadBrandingView(APIView):
                 status=400,
             )
 
-        result = {"logo_url": None, "favicon_url": None, "errors": []}
+        result = {
+            "logo_url": None,
+            "favicon_url": None,
+            "logo": None,
+            "favicon": None,
+            "errors": [],
+        }
 
-        # Upload da logo
-        if logo_file:
-            success, url, error = UploadService.upload_logo(
-                logo_file, tenant.subdominio
+        # Validação só pelo cabeçalho; a decodificação fica para a task
+        accepted = []
+        for kind, file, max_size_mb in (
+            (BrandingAsset.LOGO, logo_file, UploadService.MAX_LOGO_SIZE_MB),
+            (BrandingAsset.FAVICON, favicon_file, UploadService.MAX_FAVICON_SIZE_MB),
+        ):
+            if not file:
+                continue
+            is_valid, error = UploadService.validate_image(
+                file, max_size_mb, is_favicon=kind == BrandingAsset.FAVICON
             )
-            if success:
-                tenant.logo = url
-                result["logo_url"] = url
+            if is_valid:
+                accepted.append((kind, file))
             else:
-                result["errors"].append({"field": "logo", "message": error})
+                result["errors"].append({"field": kind, "message": error})
 
-        # Upload do favicon
-        if favicon_file:
-            success, url, error = UploadService.upload_favicon(
-                favicon_file, tenant.subdominio
+        # Se chegou aqui sem arquivos válidos, todos os uploads falharam
+        if not accepted:
+            return Response(
+                {
+                    "detail": "Falha no upload de todos os arquivos",
+                    "errors": result["errors"],
+                },
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            if success:
-                tenant.favicon = url
-                result["favicon_url"] = url
-            else:
-                result["errors"].append({"field": "favicon", "message": error})
-
-        # Salvar alterações se houve sucesso em algum upload
-        if result["logo_url"] or result["favicon_url"]:
-            tenant.save()
-
-            # Limpar cache
-            from django.core.cache import cache
-
-            cache_key = f"tenant_info_{tenant.subdominio}"
-            cache.delete(cache_key)
 
-            return Response(result, status=status.HTTP_200_OK)
+        with transaction.atomic():
+            for kind, file in accepted:
+                asset = BrandingAsset(client=tenant, kind=kind, uploaded_by=request.user)
+                extension = file.name.rsplit(".", 1)[-1].lower()
+                asset.source.save(f"{kind}_{tenant.subdominio}.{extension}", file)
+                transaction.on_commit(
+                    lambda pk=asset.pk: process_branding_asset.delay(pk)  # type: ignore[attr-defined]
+                )
+                result[kind] = BrandingAssetSerializer(asset).data
 
-        # Se chegou aqui, todos os uploads falharam
-        return Response(
-            {
-                "detail": "Falha no upload de todos os arquivos",
-                "errors": result["errors"],
-            },
-            status=status.HTTP_400_BAD_REQUEST,
-        )
+        return Response(result, status=status.HTTP_202_ACCEPTED)
 
 
 class RegisterTenantView(APIView):
@@ -38,6 +38,7 @@ class WebhookEndpoint(TenantAwareModel):
         ("feedback.updated", "Feedback Atualizado"),
         ("feedback.status_changed", "Status Alterado"),
         ("feedback.assigned", "Feedback Atribuído"),
+        ("feedback.bulk_updated", "Feedbacks Atualizados em Lote"),
         ("feedback.resolved", "Feedback Resolvido"),
         ("response.created", "Resposta Criada"),
         ("sla.warning", "Aviso de SLA"),
@@ -288,6 +288,26 @@ def trigger_feedback_status_changed(feedback, old_status, new_status):
     )
 
 
+def trigger_feedbacks_bulk_updated(tenant_id, feedbacks, alteracoes):
+    """Dispara um único evento para todos os feedbacks alterados em lote."""
+    payload = {
+        "tenant_id": tenant_id,
+        "feedbacks": [
+            {
+                "id": feedback.id,
+                "protocolo": feedback.protocolo,
+                "tipo": feedback.tipo,
+                "titulo": feedback.titulo,
+                "status": feedback.status,
+                "prioridade": feedback.prioridade,
+                "changes": alteracoes.get(feedback.id, []),
+            }
+            for feedback in feedbacks
+        ],
+    }
+    return create_webhook_event("feedback.bulk_updated", payload, "Feedback")
+
+
 def trigger_feedback_resolved(feedback):
     """Dispara evento de feedback resolvido."""
     payload = {
@@ -10,12 +10,15 @@ import logging
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 
+from apps.feedbacks.bulk import feedbacks_atualizados_em_lote
+from apps.feedbacks.interactions import interacao_registrada
 from apps.feedbacks.models import Feedback
 
 from .services import (
     trigger_feedback_created,
     trigger_feedback_resolved,
     trigger_feedback_status_changed,
+    trigger_feedbacks_bulk_updated,
 )
 
 logger = logging.getLogger(__name__)
@@ -67,3 +70,33 @@ def trigger_feedback_webhooks(sender, instance, created, **kwargs):
     except Exception as e:
         # Não deixar erro de webhook quebrar o fluxo principal
         logger.error(f"Error triggering webhook: {e}", exc_info=True)
+
+
+@receiver(interacao_registrada)
+def trigger_interaction_status_webhooks(
+    sender, feedback, status_anterior=None, **kwargs
+):
+    """
+    Mudança de status por interação (UPDATE direto, sem pre_save/post_save).
+    """
+    if not status_anterior:
+        return
+
+    try:
+        trigger_feedback_status_changed(feedback, status_anterior, feedback.status)
+        if feedback.status in ["resolvido", "concluido", "fechado"]:
+            trigger_feedback_resolved(feedback)
+    except Exception as e:
+        logger.error(f"Error triggering webhook: {e}", exc_info=True)
+
+
+@receiver(feedbacks_atualizados_em_lote)
+def trigger_bulk_update_webhook(sender, tenant, feedbacks, alteracoes, **kwargs):
+    """Operação em lote: um único evento com todos os feedbacks alterados."""
+    try:
+        trigger_feedbacks_bulk_updated(tenant.pk, feedbacks, alteracoes)
+        logger.info(
+            f"Webhook triggered: feedback.bulk_updated for {len(feedbacks)} feedbacks"
+        )
+    except Exception as e:
+        logger.error(f"Error triggering webhook: {e}", exc_info=True)
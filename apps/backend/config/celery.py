@@ -61,6 +61,26 @@ app.conf.update(
             "task": "apps.core.tasks.update_analytics_cache",
             "schedule": 60 * 15,  # A cada 15 minutos
         },
+        "flush-search-index-queue": {
+            "task": "apps.core.tasks.flush_search_index_queue",
+            "schedule": 60,  # Rede de segurança para itens que falharam no flush
+        },
+        "flush-api-key-usage": {
+            "task": "apps.core.tasks.flush_api_key_usage",
+            "schedule": 60,  # Uso das API keys acumulado no Redis
+        },
+        "flush-audit-log-buffer": {
+            "task": "apps.auditlog.tasks.flush_audit_log_buffer",
+            "schedule": 60,  # Rede de segurança para eventos não gravados
+        },
+        "rollup-audit-log-summaries": {
+            "task": "apps.auditlog.tasks.rollup_audit_log_summaries",
+            "schedule": 60 * 60,  # Dias fechados ainda não resumidos
+        },
+        "archive-old-audit-logs": {
+            "task": "apps.auditlog.tasks.archive_old_audit_logs",
+            "schedule": 60 * 60 * 24,  # Meses fora da retenção
+        },
         "cleanup-old-sessions": {
             "task": "apps.core.tasks.cleanup_old_sessions",
             "schedule": 60 * 60 * 24,  # A cada 24 horas
@@ -419,10 +419,51 @@ else:
     MEDIA_ROOT = BASE_DIR / "media"
     print("⚠️ Cloudinary não configurado. Usando armazenamento local.")
 
+# Django 5.1 não lê DEFAULT_FILE_STORAGE: "default" continua em disco.
+# Os originais de branding são gravados pela API e lidos pelo worker (outro
+# dyno), então precisam de um storage compartilhado
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    "branding_sources": {
+        "BACKEND": (
+            "apps.tenants.storages.PrivateRawCloudinaryStorage"
+            if CLOUDINARY_URL
+            else "django.core.files.storage.FileSystemStorage"
+        )
+    },
+    # Arquivos da retenção do audit log (apps.auditlog.retention): os logs só
+    # são removidos da tabela depois de o arquivo ser relido e conferido aqui.
+    # Disco local apenas em desenvolvimento (não sobrevive ao dyno do worker)
+    "auditlog_archive": (
+        {"BACKEND": "apps.tenants.storages.PrivateRawCloudinaryStorage"}
+        if CLOUDINARY_URL
+        else {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {
+                "location": os.getenv(
+                    "AUDIT_LOG_ARCHIVE_ROOT", str(BASE_DIR / "archive" / "auditlog")
+                )
+            },
+        }
+    ),
+}
+
 # Limites de upload
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = MAX_UPLOAD_SIZE
 
+# Upload direto de anexos (apps.feedbacks.direct_upload): o navegador envia o
+# arquivo ao armazenamento com parâmetros assinados e a API só finaliza.
+# "local" grava em DIRECT_UPLOAD_LOCAL_ROOT (desenvolvimento/testes)
+DIRECT_UPLOAD_BACKEND = os.getenv(
+    "DIRECT_UPLOAD_BACKEND", "cloudinary" if CLOUDINARY_URL else "local"
+)
+DIRECT_UPLOAD_TTL = int(os.getenv("DIRECT_UPLOAD_TTL", "600"))  # segundos
+DIRECT_UPLOAD_LOCAL_ROOT = os.getenv(
+    "DIRECT_UPLOAD_LOCAL_ROOT", str(BASE_DIR / "media" / "direct_uploads")
+)
+
 # Tipos de arquivo permitidos
 ALLOWED_FILE_TYPES = [
     "image/jpeg",
@@ -553,7 +594,7 @@ REST_FRAMEWORK = {
         "rest_framework.parsers.JSONParser",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
+        "apps.core.throttling.AnonRateThrottle",  # ✅ Janela deslizante atômica
         "apps.core.throttling.TenantRateThrottle",  # ✅ Rate limiting por tenant
     ],
     "DEFAULT_THROTTLE_RATES": {
@@ -986,3 +1027,129 @@ CELERY_WORKER_TASK_LOG_FORMAT = "[%(asctime)s: %(levelname)s/%(processName)s][%(
 if TESTING_MODE:
     CELERY_TASK_ALWAYS_EAGER = True
     CELERY_TASK_EAGER_PROPAGATES = True
+
+# =============================================================================
+# BUSCA (ELASTICSEARCH)
+# =============================================================================
+
+# Reindexação em lote (apps.core.search_indexer.BulkReindexer)
+SEARCH_REINDEX_BATCH_SIZE = int(os.getenv("SEARCH_REINDEX_BATCH_SIZE", "500"))
+SEARCH_REINDEX_CONCURRENCY = int(os.getenv("SEARCH_REINDEX_CONCURRENCY", "4"))
+
+# Indexação near-real-time (apps.core.search_queue.SearchIndexQueue)
+# Desligado por padrão: habilite quando ELASTICSEARCH_DSL estiver configurado
+SEARCH_REALTIME_INDEXING = os.getenv("SEARCH_REALTIME_INDEXING", "False").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+SEARCH_INDEX_DEBOUNCE_SECONDS = int(os.getenv("SEARCH_INDEX_DEBOUNCE_SECONDS", "2"))
+
+# Backend da busca global (apps.core.search_service.GlobalSearchService)
+# "auto": ElasticSearch quando configurado, com fallback para PostgreSQL full-text
+# "elasticsearch" | "database": força um dos backends
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+# Após uma falha, o ElasticSearch é ignorado por este intervalo (segundos)
+SEARCH_ES_RETRY_SECONDS = int(os.getenv("SEARCH_ES_RETRY_SECONDS", "30"))
+
+# Cache de resultados da busca (apps.core.search_cache.SearchResultCache)
+# Invalidado pela versão do índice do tenant a cada alteração de feedback
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "60"))
+SEARCH_AUTOCOMPLETE_CACHE_TTL = int(os.getenv("SEARCH_AUTOCOMPLETE_CACHE_TTL", "30"))
+
+# =============================================================================
+# CONSULTA PÚBLICA DE PROTOCOLO
+# =============================================================================
+
+# Cache da resposta por (tenant, protocolo) (apps.feedbacks.protocol_cache)
+# Invalidado por signals de feedback, interações e arquivos
+PROTOCOL_LOOKUP_CACHE_TTL = int(os.getenv("PROTOCOL_LOOKUP_CACHE_TTL", "300"))
+# Protocolos inexistentes: TTL curto para absorver enumeração sem ir ao banco
+PROTOCOL_LOOKUP_NOT_FOUND_TTL = int(os.getenv("PROTOCOL_LOOKUP_NOT_FOUND_TTL", "30"))
+
+# Códigos de protocolo reservados por lote (apps.feedbacks.protocol_pool)
+# Pool em lista Redis (ou memória do processo); novo lote quando esvazia
+PROTOCOL_POOL_BATCH_SIZE = int(os.getenv("PROTOCOL_POOL_BATCH_SIZE", "500"))
+
+# Operações em lote (POST /api/feedbacks/bulk/, apps.feedbacks.bulk)
+# Máximo de IDs por requisição; todos na mesma transação
+FEEDBACK_BULK_MAX_IDS = int(os.getenv("FEEDBACK_BULK_MAX_IDS", "500"))
+
+# =============================================================================
+# RATE LIMITING
+# =============================================================================
+
+# Cache (django-redis) usado pelo SlidingWindowRateLimiter (apps.core.rate_limiter)
+# Sem Redis, os throttles usam a janela deslizante em memória do processo
+RATE_LIMIT_CACHE_ALIAS = os.getenv("RATE_LIMIT_CACHE_ALIAS", "default")
+
+# =============================================================================
+# CACHE - NAMESPACES VERSIONADOS
+# =============================================================================
+
+# Tempo (s) que cada processo reutiliza a geração de um namespace sem ler o
+# cache (apps.core.cache_service.get_generations). Invalidações feitas em
+# outros processos ficam visíveis após este intervalo.
+CACHE_GENERATION_LOCAL_TTL = float(os.getenv("CACHE_GENERATION_LOCAL_TTL", "2"))
+
+# Recálculo stale-while-revalidate (apps.core.cache_service.protected_get_or_set)
+# False: recalcula na própria requisição que obteve o lock (usado nos testes)
+CACHE_REFRESH_IN_BACKGROUND = os.getenv(
+    "CACHE_REFRESH_IN_BACKGROUND", "True"
+).lower() in ("true", "1", "yes")
+CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", "4"))
+
+# Respostas do decorator cache_response (apps.core.decorators): JSON já
+# renderizado, comprimido com zlib a partir deste tamanho em bytes
+CACHE_RESPONSE_COMPRESS_MIN_BYTES = int(
+    os.getenv("CACHE_RESPONSE_COMPRESS_MIN_BYTES", "1024")
+)
+
+# Cache em dois níveis (apps.core.two_tier_cache): LRU do processo + Redis
+# Planos/assinaturas, termos obrigatórios, branding e templates de resposta
+TWO_TIER_CACHE_MAXSIZE = int(os.getenv("TWO_TIER_CACHE_MAXSIZE", "2048"))
+TWO_TIER_CACHE_LOCAL_TTL = float(os.getenv("TWO_TIER_CACHE_LOCAL_TTL", "60"))
+# Intervalo (s) em que cada processo confere a versão dos namespaces: entradas
+# invalidadas por outro worker deixam de ser servidas após este tempo
+TWO_TIER_CACHE_VERSION_CHECK = float(os.getenv("TWO_TIER_CACHE_VERSION_CHECK", "1"))
+
+# Contadores incrementais do dashboard/analytics (apps.feedbacks.stats_counters)
+# Reconciliados pela tarefa periódica update_analytics_cache (15 min); o TTL
+# só expira hashes de tenants sem reconciliação. Sem Redis compartilhado cada
+# processo mantém os seus, limitados a 5 minutos (stats_counters.LOCAL_TTL)
+FEEDBACK_STATS_TTL = int(os.getenv("FEEDBACK_STATS_TTL", str(60 * 60 * 24)))
+
+# API keys validadas em cache pelo hash (apps.core.api_keys); invalidadas ao
+# revogar/alterar a key. O uso é gravado pela tarefa flush_api_key_usage (1 min)
+# ou, sem Redis, direto no banco a cada intervalo por key e processo
+API_KEY_CACHE_TTL = int(os.getenv("API_KEY_CACHE_TTL", "300"))
+API_KEY_USAGE_WRITE_INTERVAL = int(os.getenv("API_KEY_USAGE_WRITE_INTERVAL", "60"))
+
+# Audit log (apps.auditlog.sink): eventos não críticos gravados em lote após o
+# commit (stream Redis ou buffer do processo). Ações abaixo e severidade
+# ERROR/CRITICAL continuam com INSERT síncrono. Testes: síncrono, sem threads
+# de flush gravando fora da transação do teste
+AUDIT_LOG_ASYNC = os.getenv(
+    "AUDIT_LOG_ASYNC", "False" if TESTING_MODE else "True"
+).lower() in ("true", "1", "yes")
+AUDIT_LOG_SYNC_ACTIONS = tuple(
+    action.strip()
+    for action in os.getenv(
+        "AUDIT_LOG_SYNC_ACTIONS",
+        "PASSWORD_CHANGE,PASSWORD_RESET,MFA_ENABLED,MFA_DISABLED,"
+        "PERMISSION_CHANGED,USER_REMOVED,TENANT_SUSPENDED,EXPORT,"
+        "SECURITY_ALERT,SUSPICIOUS_ACTIVITY,ACCESS_DENIED",
+    ).split(",")
+    if action.strip()
+)
+AUDIT_LOG_BATCH_SIZE = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "500"))
+AUDIT_LOG_FLUSH_INTERVAL = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL", "2"))
+# Rollup diário em AuditLogSummary (apps.auditlog.rollup): espera após a
+# meia-noite (segundos) para os eventos do dia saírem do buffer
+AUDIT_LOG_ROLLUP_DELAY = int(os.getenv("AUDIT_LOG_ROLLUP_DELAY", "300"))
+# Retenção (apps.auditlog.retention): meses completos mantidos na tabela além
+# do mês atual; os anteriores viram arquivos gzip em STORAGES["auditlog_archive"]
+# (0 desativa). Ativa por padrão só com armazenamento durável (Cloudinary)
+AUDIT_LOG_RETENTION_MONTHS = int(
+    os.getenv("AUDIT_LOG_RETENTION_MONTHS", "12" if CLOUDINARY_URL else "0")
+)
@@ -96,6 +96,8 @@ CACHES = {
         "LOCATION": "test-cache",
     }
 }
+# Recálculo stale-while-revalidate síncrono (threads não enxergam a transação do teste)
+CACHE_REFRESH_IN_BACKGROUND = False
 
 # Senha simples para fixtures de teste (mais rápido)
 PASSWORD_HASHERS = [
@@ -58,6 +58,7 @@ TagViewSet = feedback_views.TagViewSet  # type: ignore[attr-defined]
 ResponseTemplateViewSet = feedback_views.ResponseTemplateViewSet  # type: ignore[attr-defined]
 TenantInfoView = tenant_views.TenantInfoView  # type: ignore[attr-defined]
 UploadBrandingView = tenant_views.UploadBrandingView  # type: ignore[attr-defined]
+LocalDirectUploadView = feedback_views.LocalDirectUploadView  # type: ignore[attr-defined]
 RegisterTenantView = tenant_views.RegisterTenantView  # type: ignore[attr-defined]
 CheckSubdominioView = tenant_views.CheckSubdominioView  # type: ignore[attr-defined]
 TenantAdminViewSet = tenant_views.TenantAdminViewSet  # type: ignore[attr-defined]
@@ -77,6 +78,8 @@ router = SimpleRouter()
 # - POST        /api/feedbacks/responder-protocolo/      (action pública)
 # - GET         /api/feedbacks/dashboard-stats/          (action stats)
 # - POST        /api/feedbacks/{id}/adicionar-interacao/ (action híbrida: AllowAny, valida tenant + protocolo p/ anônimo)
+# - POST        /api/feedbacks/{id}/solicitar-upload/    (upload direto: parâmetros assinados)
+# - POST        /api/feedbacks/{id}/finalizar-upload/    (upload direto: registra o anexo)
 router.register(r"feedbacks", FeedbackViewSet, basename="feedback")
 
 # TagViewSet gera rotas para gerenciar tags de categorização:
@@ -128,6 +131,12 @@ urlpatterns = [
     path("api/tenant-info/", TenantInfoView.as_view(), name="tenant-info"),
     # Endpoint para upload de imagens de branding (logo, favicon)
     path("api/upload-branding/", UploadBrandingView.as_view(), name="upload-branding"),
+    # Substituto local do armazenamento para upload direto de anexos
+    path(
+        "api/uploads/local/<str:token>/",
+        LocalDirectUploadView.as_view(),
+        name="direct-upload-local",
+    ),
     # Endpoint de registro de novo tenant (SaaS Signup)
     path("api/register-tenant/", RegisterTenantView.as_view(), name="register-tenant"),
     # Endpoint para verificar disponibilidade de subdomínio
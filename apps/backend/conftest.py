@@ -252,6 +252,29 @@ def pytest_configure(config):
     )
     config.addinivalue_line("markers", "integration: marks tests as integration tests")
     config.addinivalue_line("markers", "e2e: marks tests as end-to-end tests")
+    config.addinivalue_line(
+        "markers", "benchmark: performance measurements (run with --benchmark)"
+    )
+
+
+def pytest_addoption(parser):
+    """Opções de linha de comando do pytest."""
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Executa os testes marcados com @pytest.mark.benchmark",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Benchmarks só imprimem medições: fora da suíte padrão."""
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark: use --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
 
 
 # Fixture para limpar dados entre testes
@@ -277,3 +300,33 @@ def skip_celery_tasks(monkeypatch):
 
     monkeypatch.setattr(fb_tasks, "send_new_feedback_email", MagicMock())
     monkeypatch.setattr(fb_tasks, "send_assignment_email", MagicMock())
+    monkeypatch.setattr(fb_tasks, "send_bulk_assignment_email", MagicMock())
+    monkeypatch.setattr(fb_tasks, "send_bulk_status_update_emails", MagicMock())
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """Limpa o histórico do rate limiter em memória entre testes."""
+    from apps.core.rate_limiter import get_rate_limiter
+
+    get_rate_limiter().reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_local_caches():
+    """
+    Limpa o cache e as cópias locais (gerações e cache em dois níveis)
+
+    O rollback de cada teste não dispara signals: sem isso, entradas em cache
+    de um teste poderiam ser servidas a objetos com o mesmo ID no seguinte.
+    """
+    from django.core.cache import cache
+
+    from apps.core.cache_service import clear_local_generations
+    from apps.core.two_tier_cache import clear_two_tier_local
+
+    cache.clear()
+    clear_local_generations()
+    clear_two_tier_local()
+    yield
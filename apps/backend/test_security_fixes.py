@@ -19,6 +19,7 @@ from django.contrib.auth.models import User
 
 from apps.core.utils import get_current_tenant, set_current_tenant
 from apps.feedbacks.models import Feedback
+from apps.feedbacks.protocol_pool import gerar_codigo
 from apps.tenants.models import Client
 
 
@@ -29,7 +30,9 @@ def test_protocolo_generation():
     print("=" * 80)
 
     # Verificar se o código fonte usa secrets (apenas em linhas de código executável)
-    source = inspect.getsource(Feedback.gerar_protocolo)
+    # Feedback.gerar_protocolo entrega códigos do pool; a geração fica em
+    # protocol_pool.gerar_codigo
+    source = inspect.getsource(gerar_codigo)
 
     # Separar linhas e filtrar apenas código executável (não comentários)
     lines = source.split("\n")
@@ -42,11 +45,11 @@ def test_protocolo_generation():
     # Juntar linhas de código
     executable_code = "\n".join(code_lines)
 
-    uses_secrets = "secrets.choice" in executable_code
-    uses_random = "random.choice" in executable_code
+    uses_secrets = "secrets.randbelow" in executable_code
+    uses_random = "random." in executable_code
 
-    print(f"\n✓ Usa secrets.choice(): {'✅ SIM' if uses_secrets else '❌ NÃO'}")
-    print(f"✓ Usa random.choice(): {'❌ SIM (INSEGURO)' if uses_random else '✅ NÃO'}")
+    print(f"\n✓ Usa secrets.randbelow(): {'✅ SIM' if uses_secrets else '❌ NÃO'}")
+    print(f"✓ Usa random.*: {'❌ SIM (INSEGURO)' if uses_random else '✅ NÃO'}")
 
     # Gerar 20 protocolos e verificar unicidade
     protocolos = [Feedback.gerar_protocolo() for _ in range(20)]
@@ -170,6 +170,32 @@ class TestDashboardStatsCache:
         assert cached is not None
         assert cached["total"] == 5
 
+    def test_dashboard_stats_endpoint_usa_cache_e_atualiza_na_escrita(
+        self,
+        authenticated_api_client,
+        authenticated_user,
+        feedback_factory,
+        django_capture_on_commit_callbacks,
+    ):
+        """Segunda chamada vem do cache; novo feedback atualiza sem recalcular."""
+        from django.core.cache import cache
+
+        cache.clear()
+        _, tenant = authenticated_user
+        feedback_factory(client=tenant)
+
+        first = authenticated_api_client.get("/api/feedbacks/dashboard-stats/")
+        second = authenticated_api_client.get("/api/feedbacks/dashboard-stats/")
+        assert first.data["cached"] is False
+        assert second.data["cached"] is True
+        assert second.data["total"] == first.data["total"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            feedback_factory(client=tenant)
+        third = authenticated_api_client.get("/api/feedbacks/dashboard-stats/")
+        assert third.data["cached"] is True
+        assert third.data["total"] == 2
+
     def test_analytics_cache_diferente_por_periodo(self, tenant):
         """Analytics deve ter cache diferente por período."""
         from django.core.cache import cache
@@ -1,5 +1,6 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from apps.core.utils import tenant_context
@@ -35,10 +36,10 @@ def test_analytics_dashboard_shape():
 
     if resp.status_code == 403:
         # feature flag pode estar desabilitada no ambiente de testes
-        assert "error" in resp.data
+        assert "error" in resp.json()
         return
 
-    data = resp.data
+    data = resp.json()
     assert set(data.keys()) == {
         "trend",
         "byType",
@@ -58,3 +59,31 @@ def test_analytics_dashboard_shape():
         "slaCompliance",
         "satisfactionScore",
     }
+
+
+@pytest.mark.django_db
+def test_analytics_dashboard_served_from_rendered_cache():
+    cache.clear()
+    tenant = Tenant.objects.create(nome="Tenant B", subdominio="tenant-b", ativo=True)
+    user = User.objects.create_user(
+        username="u@b.com", email="u@b.com", password="pass123456"
+    )
+    tenant.owner = user
+    tenant.save(update_fields=["owner"])
+
+    api = APIClient()
+    api.force_authenticate(user=user)
+    api.defaults["HTTP_HOST"] = f"{tenant.subdominio}.localhost"
+
+    first = api.get("/api/v1/analytics/dashboard/?period=week")
+    if first.status_code == 403:
+        pytest.skip("feature flag ANALYTICS desabilitada no ambiente de testes")
+
+    second = api.get("/api/v1/analytics/dashboard/?period=week")
+    assert second.content == first.content
+    assert second["ETag"] == first["ETag"]
+
+    not_modified = api.get(
+        "/api/v1/analytics/dashboard/?period=week", HTTP_IF_NONE_MATCH=first["ETag"]
+    )
+    assert not_modified.status_code == 304
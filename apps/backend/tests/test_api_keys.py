@@ -9,14 +9,29 @@ Testa:
 - Validação de API keys
 - Rate limiting
 - Expiração de keys
+- Cache de validação e contabilização adiada de uso
 """
 
 from datetime import timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
+from apps.core.utils import set_current_tenant
+
+
+@pytest.fixture(autouse=True)
+def usage_store(monkeypatch):
+    """Intervalos de gravação do processo isolados por teste"""
+    from apps.core import api_key_usage
+
+    monkeypatch.setattr(
+        api_key_usage, "_database_store", api_key_usage._DatabaseUsageStore()
+    )
+
 
 @pytest.mark.django_db
 class TestAPIKeyGeneration:
@@ -111,20 +126,152 @@ class TestAPIKeyValidation:
 
         assert validated is None
 
-    def test_validate_updates_usage(self, tenant):
-        """Validação atualiza contadores de uso."""
+    def test_validate_updates_usage(self, tenant, settings):
+        """Sem Redis o uso vai direto ao banco, no máximo uma vez por intervalo."""
         from apps.core.api_keys import APIKey
 
+        settings.API_KEY_USAGE_WRITE_INTERVAL = 60
         api_key, raw_key = APIKey.generate(client=tenant, name="Usage Key")
 
         initial_count = api_key.requests_count
 
         APIKey.validate(raw_key)
-
         api_key.refresh_from_db()
         assert api_key.requests_count == initial_count + 1
         assert api_key.last_used_at is not None
 
+        with CaptureQueriesContext(connection) as ctx:
+            APIKey.validate(raw_key)
+        assert ctx.captured_queries == []
+
+        # Intervalo vencido: a requisição acumulada entra na próxima gravação
+        settings.API_KEY_USAGE_WRITE_INTERVAL = 0
+        APIKey.validate(raw_key)
+        api_key.refresh_from_db()
+        assert api_key.requests_count == initial_count + 3
+
+
+@pytest.mark.django_db
+class TestAPIKeyCaching:
+    """Testes do cache de validação e do flush em lote."""
+
+    def test_cached_validation_skips_database(self, tenant):
+        """Segunda validação não consulta nem grava no banco."""
+        from apps.core.api_keys import APIKey
+
+        api_key, raw_key = APIKey.generate(client=tenant, name="Hot Key")
+        APIKey.validate(raw_key)
+
+        with CaptureQueriesContext(connection) as ctx:
+            validated = APIKey.validate(raw_key)
+
+        assert validated.id == api_key.id
+        assert validated.client.id == tenant.id
+        assert validated.rate_limit == api_key.rate_limit
+        assert ctx.captured_queries == []
+
+    def test_cache_holds_json_serializable_dict(self, tenant, monkeypatch):
+        """O cache guarda um dict simples (funciona com serializer JSON)."""
+        import json
+
+        from django.core.cache import cache
+        from django.core.serializers.json import DjangoJSONEncoder
+
+        from apps.core.api_keys import APIKey
+
+        stored = {}
+        monkeypatch.setattr(
+            cache,
+            "set",
+            lambda key, value, timeout: stored.update(
+                {key: json.loads(json.dumps(value, cls=DjangoJSONEncoder))}
+            ),
+        )
+        monkeypatch.setattr(cache, "get", lambda key: stored.get(key))
+
+        api_key, raw_key = APIKey.generate(
+            client=tenant, name="JSON Key", expires_days=1
+        )
+        APIKey.validate(raw_key)
+        validated = APIKey.validate(raw_key)
+
+        assert validated.id == api_key.id
+        assert validated.expires_at == api_key.expires_at
+
+    def test_cache_errors_fall_back_to_database(self, tenant, monkeypatch):
+        """Cache indisponível não impede a validação."""
+        from django.core.cache import cache
+
+        from apps.core.api_keys import APIKey
+
+        def unavailable(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        api_key, raw_key = APIKey.generate(client=tenant, name="Down Key")
+        monkeypatch.setattr(cache, "get", unavailable)
+        monkeypatch.setattr(cache, "set", unavailable)
+
+        assert APIKey.validate(raw_key).id == api_key.id
+
+    def test_revoke_invalidates_cached_key(self, tenant):
+        """Key revogada é rejeitada mesmo já estando em cache."""
+        from apps.core.api_keys import APIKey
+
+        api_key, raw_key = APIKey.generate(client=tenant, name="Cached Key")
+        assert APIKey.validate(raw_key) is not None
+
+        api_key.revoke()
+
+        assert APIKey.validate(raw_key) is None
+
+    def test_cached_key_respects_current_tenant(self, tenant, tenant_factory):
+        """Key em cache continua restrita ao tenant da requisição."""
+        from apps.core.api_keys import APIKey
+
+        _, raw_key = APIKey.generate(client=tenant, name="Tenant Key")
+        assert APIKey.validate(raw_key) is not None
+
+        set_current_tenant(tenant_factory(nome="Outra", subdominio="outra"))
+
+        assert APIKey.validate(raw_key) is None
+
+    def test_flush_updates_all_keys_in_one_statement(self, tenant, monkeypatch):
+        """Uso de várias keys é gravado com um único UPDATE."""
+        from apps.core import api_key_usage
+        from apps.core.api_key_usage import flush_api_key_usage
+        from apps.core.api_keys import APIKey
+
+        class MemoryStore:
+            """Substitui os hashes do Redis"""
+
+            pending = {}
+
+            def add(self, usage):
+                for key_id, (count, used_at) in usage.items():
+                    previous = self.pending.get(key_id, (0, 0.0))
+                    self.pending[key_id] = (previous[0] + count, used_at)
+
+            def drain(self):
+                drained = dict(self.pending)
+                self.pending.clear()
+                return drained
+
+        monkeypatch.setattr(api_key_usage, "_get_store", MemoryStore)
+        keys = [APIKey.generate(client=tenant, name=f"Key {i}") for i in range(3)]
+        for i, (_, raw_key) in enumerate(keys):
+            for _ in range(i + 1):
+                APIKey.validate(raw_key)
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert flush_api_key_usage() == 3
+
+        assert len(ctx.captured_queries) == 1
+        counts = [
+            APIKey.objects.get(pk=api_key.pk).requests_count for api_key, _ in keys
+        ]
+        assert counts == [1, 2, 3]
+        assert flush_api_key_usage() == 0
+
 
 @pytest.mark.django_db
 class TestAPIKeyRateLimiting:
@@ -143,8 +290,7 @@ class TestAPIKeyRateLimiting:
 
         assert is_limited is False
 
-    @patch("django.core.cache.cache")
-    def test_rate_limit_exceeded(self, mock_cache, tenant):
+    def test_rate_limit_exceeded(self, tenant):
         """Rate limit excedido bloqueia requisições."""
         from apps.core.api_keys import APIKey
 
@@ -152,8 +298,9 @@ class TestAPIKeyRateLimiting:
             client=tenant, name="Over Limit Key", rate_limit=10
         )
 
-        # Simular limite excedido
-        mock_cache.get.return_value = 15
+        # Consumir todo o limite da janela
+        for _ in range(10):
+            assert api_key.is_rate_limited() is False
 
         is_limited = api_key.is_rate_limited()
 
@@ -219,3 +366,14 @@ class TestAPIKeyRevocation:
 
         assert "String Key" in string
         assert api_key.prefix in string
+
+    def test_redis_store_drains_atomically(self):
+        """Store Redis lê e apaga os hashes na mesma transação."""
+        from apps.core.api_key_usage import _RedisUsageStore
+
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        pipe.execute.return_value = [{b"7": b"3"}, {b"7": b"1700000000.5"}, 2]
+
+        assert _RedisUsageStore(client).drain() == {7: (3, 1700000000.5)}
+        client.pipeline.assert_called_once_with(transaction=True)
@@ -91,3 +91,106 @@ class TestTagSystem:
             assert "Urgente" in tag_names
         finally:
             clear_current_tenant()
+
+
+@pytest.mark.django_db
+class TestTagViewSetCounts:
+    """Contagem de uso anotada no TagViewSet (sem query por tag)."""
+
+    @pytest.fixture
+    def tags_in_use(self, authenticated_user, feedback_factory):
+        user, tenant = authenticated_user
+        tags = [
+            Tag.objects.create(nome=f"Tag {i}", criado_por=user, client=tenant)
+            for i in range(4)
+        ]
+        for i in range(3):
+            feedback = feedback_factory(client=tenant)
+            feedback.tags.set(tags[: i + 1])
+        return tags
+
+    def test_list_counts_with_constant_queries(
+        self, authenticated_api_client, tags_in_use
+    ):
+        """A listagem não executa queries extras conforme o número de tags."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticated_api_client.get("/api/tags/")
+        assert response.status_code == 200
+        counts = {t["nome"]: t["feedback_count"] for t in response.data["results"]}
+        assert counts == {"Tag 0": 3, "Tag 1": 2, "Tag 2": 1, "Tag 3": 0}
+
+        first = tags_in_use[0]
+        for i in range(4, 10):
+            Tag.objects.create(
+                nome=f"Tag {i}", criado_por=first.criado_por, client=first.client
+            )
+        with CaptureQueriesContext(connection) as larger_ctx:
+            authenticated_api_client.get("/api/tags/")
+        assert len(larger_ctx) == len(ctx)
+
+    def test_stats_uses_annotated_counts(self, authenticated_api_client, tags_in_use):
+        """Estatísticas vêm da mesma contagem anotada da listagem."""
+        response = authenticated_api_client.get("/api/tags/stats/")
+
+        assert response.status_code == 200
+        assert response.data["total_tags"] == 4
+        assert response.data["tags_in_use"] == 3
+        assert response.data["tags_unused"] == 1
+        assert [t["nome"] for t in response.data["most_used"]][:3] == [
+            "Tag 0",
+            "Tag 1",
+            "Tag 2",
+        ]
+        assert response.data["most_used"][0]["feedback_count"] == 3
+
+    def test_nested_tags_count_without_query_per_tag(
+        self,
+        authenticated_api_client,
+        authenticated_user,
+        feedback_factory,
+        tags_in_use,
+    ):
+        """Tags aninhadas no feedback trazem a contagem anotada."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        _, tenant = authenticated_user
+        one, many = feedback_factory(client=tenant), feedback_factory(client=tenant)
+
+        with CaptureQueriesContext(connection) as one_ctx:
+            authenticated_api_client.patch(
+                f"/api/feedbacks/{one.id}/",
+                {"tag_ids": [tags_in_use[3].id]},
+                format="json",
+            )
+        with CaptureQueriesContext(connection) as many_ctx:
+            response = authenticated_api_client.patch(
+                f"/api/feedbacks/{many.id}/",
+                {"tag_ids": [tag.id for tag in tags_in_use]},
+                format="json",
+            )
+
+        assert response.status_code == 200
+        counts = {t["nome"]: t["feedback_count"] for t in response.data["tags"]}
+        assert counts == {"Tag 0": 4, "Tag 1": 3, "Tag 2": 2, "Tag 3": 2}
+        assert len(many_ctx) == len(one_ctx)
+
+    def test_created_tag_has_zero_count(self, authenticated_api_client):
+        response = authenticated_api_client.post(
+            "/api/tags/", {"nome": "Nova", "cor": "#00FF00"}, format="json"
+        )
+
+        assert response.status_code == 201
+        assert response.data["feedback_count"] == 0
+
+    def test_destroy_blocked_when_in_use(self, authenticated_api_client, tags_in_use):
+        """Tag em uso não pode ser deletada; tag sem uso pode."""
+        response = authenticated_api_client.delete(f"/api/tags/{tags_in_use[0].id}/")
+        assert response.status_code == 400
+        assert response.data["feedback_count"] == 3
+
+        response = authenticated_api_client.delete(f"/api/tags/{tags_in_use[3].id}/")
+        assert response.status_code == 204
@@ -5,9 +5,25 @@
 import { api } from './api';
 import logger from './logger';
 
+export interface BrandingAssetStatus {
+  id: number;
+  kind: 'logo' | 'favicon';
+  status: 'pending' | 'processing' | 'ready' | 'failed';
+  variants: Record<string, Record<string, string | number>>;
+  error: string;
+  created_at: string;
+  processed_at: string | null;
+}
+
+/**
+ * O upload responde 202 com os envios pendentes; as URLs finais são
+ * publicadas em background (consultar GET /api/upload-branding/)
+ */
 export interface UploadBrandingResponse {
   logo_url: string | null;
   favicon_url: string | null;
+  logo?: BrandingAssetStatus | null;
+  favicon?: BrandingAssetStatus | null;
   errors: Array<{ field: string; message: string }>;
 }
 